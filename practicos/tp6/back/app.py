@@ -1,17 +1,46 @@
 # app.py
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+
+import json
+import secrets
+from collections import defaultdict
+from typing import Literal, NamedTuple
+
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from datetime import datetime, date, time
 
 # Importar tus módulos internos
 from back.src.modelos.visitante import Visitante
 from back.src.modelos.turno import Turno
 from back.src.servicio_inscripcion import ServicioInscripcion
-from back.src.repositorios.turno_repo import RepositorioTurno
-from back.src.repositorios.inscripcion_repo import InscripcionRepo
-from back.src.repositorios.actividad_repo import RepositorioActividad
-from back.src.repositorios.visitante_repo import VisitanteRepo
+from back.src.repositorios.turno_repo import (
+    RepositorioTurno,
+    fecha_canonica,
+    hora_canonica,
+)
+from back.src.repositorios.almacenes import ALMACEN_SQLITE
+from back.src.repositorios.migraciones import aplicar_migraciones
+from back.src.repositorios.correo_repo import CorreoPendienteRepo
+from back.src.repositorios.instrumentacion import INSTRUMENTACION
+from back.src.repositorios.conexion import configurar_conexiones
+from back.src.repositorios.reintentos import REINTENTOS
+from back.src.repositorios.asincrono import (
+    cerrar_ejecutor,
+    configurar_ejecutor,
+    ejecutar_en_bd,
+)
 from back.src.excepciones import (
     ErrorSinCupo,
     ErrorTerminosNoAceptados,
@@ -23,21 +52,107 @@ from back.src.excepciones import (
     ErrorAnticipacion,
     ErrorEmailInvalido,
     ErrorFechaPasada,
+    ErrorLote,
+    ErrorBDOcupada,
+    ValidacionError,
+)
+from back.src.indice_choques import IndiceChoquesEnMemoria
+from back.src.cache_respuestas import Entrada, coincide_etag, etag_codificado
+from back.src.serializacion import (
+    a_json,
+    comprimir,
+    elegir_codificacion,
+    turnos_a_json,
+    turnos_a_ndjson,
+)
+from back.src.configuracion import cargar_configuracion
+from back.src.contenedor import (
+    ContenedorApp,
+    crear_contenedor,
+    obtener_contenedor,
+    precalentar,
+)
+from back.src.outbox_correo import TrabajadorOutbox
+from back.src.paginacion import (
+    LIMITE_MAXIMO,
+    LIMITE_POR_DEFECTO,
+    codificar_cursor,
+    decodificar_cursor,
+    paginas_turnos,
+    paginas_turnos_async,
 )
-from back.src.servicio_correo import ServicioCorreo
 
+from back.src.metricas import (
+    CACHE_RESPUESTAS,
+    METRICAS,
+    MiddlewareMetricas,
+    medir_etapa,
+    registrar_error_validacion,
+)
+from back.src.eventos_cupo import BUS_CUPOS, RESINCRONIZAR, BusCupos
 
-app = FastAPI(title="EcoHarmony Park API")
+MEDIA_NDJSON = "application/x-ndjson"
+MEDIA_JSON = "application/json"
+RUTA_ACTIVIDADES = "/api/actividades"
+RUTA_TURNOS = "/api/turnos"
+CLAVE_ACTIVIDADES = ("actividades",)
+HEADER_CURSOR = "X-Siguiente-Cursor"
+MEDIA_METRICAS = "text/plain; version=0.0.4; charset=utf-8"
+LATIDO_SSE = 15.0  # segundos sin eventos antes de mandar un ping
+LIMITE_LOTE = 100  # inscripciones por POST /api/inscripciones/lote
 
 
-# --- Habilitar CORS para permitir peticiones desde React ---
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # en producción poner tu dominio
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    config = cargar_configuracion()
+    # Espera por el lock de escritura y reintentos si otro proceso lo tiene
+    configurar_conexiones(config.sqlite_busy_ms)
+    REINTENTOS.configurar(config.sqlite_reintentos)
+
+    # Llevar el esquema de la BD a la última versión antes de recibir tráfico
+    aplicar_migraciones()
+
+    # Repositorios (SQLite o memoria según ECOPARK_ALMACEN), pool, catálogo
+    # y correo: se arman una vez y los endpoints los reciben por Depends
+    contenedor = crear_contenedor(config)
+    app.state.contenedor = contenedor
+
+    if app.state.modo_async:
+        configurar_ejecutor(config.hilos_bd)
+    # Conexiones, sentencias y catálogo listos antes del primer request
+    precalentar(contenedor, app.state.modo_async)
+    if config.sql_instrumentar:
+        INSTRUMENTACION.configurar(
+            True, config.sql_umbral_ms, config.sql_log_lentas or None
+        )
+
+    if contenedor.escritor is not None:
+        contenedor.escritor.iniciar()
+
+    # Trabajador que envía los comprobantes encolados en el outbox
+    # (el almacenamiento en memoria no tiene outbox)
+    trabajador = None
+    if config.outbox_activo and config.almacen == ALMACEN_SQLITE:
+        trabajador = TrabajadorOutbox(
+            CorreoPendienteRepo(),
+            contenedor.correo,
+            tamano_lote=config.outbox_tamano_lote,
+            intervalo=config.outbox_intervalo,
+            max_intentos=config.outbox_max_intentos,
+        )
+        trabajador.iniciar()
+
+    # Los deltas de cupo se reparten a los clientes SSE en este event loop
+    BUS_CUPOS.vincular(asyncio.get_running_loop())
+    try:
+        yield
+    finally:
+        BUS_CUPOS.desvincular()
+        if contenedor.escritor is not None:
+            contenedor.escritor.detener()
+        if trabajador is not None:
+            trabajador.detener()
+        cerrar_ejecutor()
 
 
 # --- Modelos de entrada (para FastAPI) ---
@@ -57,222 +172,980 @@ class InscripcionIn(BaseModel):
     acepta_terminos: bool
 
 
-# --- Endpoint principal ---
-@app.post("/api/inscribirse")
-def inscribirse(payload: InscripcionIn):
+class LoteInscripcionesIn(BaseModel):
+    inscripciones: list[InscripcionIn] = Field(
+        min_length=1, max_length=LIMITE_LOTE
+    )
+
+
+class ValidarDnisIn(BaseModel):
+    fecha: str  # formato YYYY-MM-DD
+    hora: str  # formato HH:MM
+    dnis: list[int]
+
+
+# --- Lógica de los endpoints (sincrónica, compartida por ambos modos) ---
+def horario_canonico(fecha, hora) -> tuple[str, str]:
+    """
+    ('YYYY-MM-DD', 'HH:MM') para consultar la BD, que compara fecha y hora
+    por igualdad. 400 si alguna no es ISO.
+    """
     try:
-        # 1️⃣ Repositorios y datos auxiliares
-        repo_insc = InscripcionRepo()
-        repo_turno = RepositorioTurno()
-        repo_act = RepositorioActividad()
-        repo_visit = VisitanteRepo()
-
-        # Buscar la actividad en la BD
-        act = repo_act.obtener_por_nombre(payload.actividad)
-        if not act:
-            raise HTTPException(status_code=404, detail="Actividad no encontrada")
-
-        # Buscar el turno correspondiente
-        turnos = repo_turno.obtener_por_actividad_y_fecha(
-            act[0], payload.fecha, payload.fecha
-        )
-        turno_match = next((t for t in turnos if t[3] == payload.hora), None)
-        if not turno_match:
-            raise HTTPException(status_code=404, detail="Turno no encontrado")
-
-        # turno_match = (id, actividad_id, fecha, hora, cupo_disponible)
-        # capacidad máxima de la actividad
-        cap_max = repo_act.obtener_por_id(act[0])[2]
-        turno = Turno(
-            id=turno_match[0],
-            actividad_nombre=payload.actividad,
-            fecha=datetime.strptime(payload.fecha, "%Y-%m-%d").date(),
-            hora=datetime.strptime(payload.hora, "%H:%M").time(),
-            cupo_ocupado=(
-                cap_max - turno_match[4]
-            ),  # capacidad_maxima - cupo_disponible
-        )
-
-        # 2️⃣ Validaciones de participantes
-        # 2.1) Duplicados en el mismo payload
-        dnis = [v.dni for v in payload.participantes]
-        if len(dnis) != len(set(dnis)):
-            raise HTTPException(
-                status_code=400, detail="DNI duplicado en la misma inscripción"
-            )
+        return fecha_canonica(fecha), hora_canonica(hora)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Fecha u hora inválida, se espera YYYY-MM-DD y HH:MM",
+        )
 
-        # 2.2) Choque de horario para cada DNI en cualquier actividad
-        for v in payload.participantes:
-            if repo_visit.existe_choque_por_dni_y_fecha_hora(
-                v.dni, payload.fecha, payload.hora
-            ):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"El DNI {v.dni} ya tiene una inscripción en ese horario",
-                )
 
-        # 2.3) Nombre solo letras y espacios (sin números ni caracteres especiales)
-        for v in payload.participantes:
-            nombre = (v.nombre or "").strip()
-            if not nombre:
-                raise HTTPException(status_code=400, detail="El nombre es requerido")
-            if not all((ch.isalpha() or ch.isspace()) for ch in nombre):
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"El nombre del participante con DNI {v.dni} solo puede contener letras y espacios",
-                )
+def con_horario_canonico(payload):
+    """Copia del pedido con fecha y hora canónicas (ver horario_canonico)."""
+    fecha, hora = horario_canonico(payload.fecha, payload.hora)
+    return payload.model_copy(update={"fecha": fecha, "hora": hora})
 
-        # 2.4) Crear modelos de dominio
-        participantes = [Visitante(**v.dict()) for v in payload.participantes]
 
-        # 3️⃣ Configuración de actividades (deberías moverla a una constante)
-        setup_actividades = {
-            "Safari": {"capacidad": 8, "requiere_talle": False, "edad_minima": 0},
-            "Palestra": {"capacidad": 12, "requiere_talle": True, "edad_minima": 12},
-            "Jardinería": {"capacidad": 12, "requiere_talle": False, "edad_minima": 0},
-            "Tirolesa": {"capacidad": 10, "requiere_talle": True, "edad_minima": 8},
-        }
+def armar_turno(payload: InscripcionIn, act, fila) -> Turno:
+    # fila = (id, actividad_id, fecha, hora, cupo_disponible)
+    return Turno(
+        id=fila[0],
+        actividad_nombre=payload.actividad,
+        # fecha y hora ya coinciden con las del turno en la BD (ISO)
+        fecha=date.fromisoformat(payload.fecha),
+        hora=time.fromisoformat(payload.hora),
+        # capacidad_maxima - cupo_disponible
+        cupo_ocupado=act.capacidad_maxima - fila[4],
+    )
 
-        # 4️⃣ Servicio principal
-        # --- Inicializar servicio de correo ---
-        servicio_correo = ServicioCorreo(
-            remitente="inscripcionesecoharmonypark@gmail.com",
-            password_app="odqn rlpj ntjl azud",  # 👈 la clave de aplicación de Gmail
-        )
-        # obtener inscripciones previas desde la BD
-        inscripciones_previas = (
-            repo_insc.obtener_todas() if hasattr(repo_insc, "obtener_todas") else []
-        )
-        repo_insc.inscripciones = (
-            inscripciones_previas  # el servicio las usará internamente
+
+def validar_dnis_unicos(payload: InscripcionIn) -> list[int]:
+    dnis = [v.dni for v in payload.participantes]
+    if len(dnis) != len(set(dnis)):
+        raise HTTPException(
+            status_code=400, detail="DNI duplicado en la misma inscripción"
         )
-        servicio = ServicioInscripcion(
-            setup_actividades, [turno], repo_insc, servicio_correo=servicio_correo
+    return dnis
+
+
+def validar_nombres(payload: InscripcionIn):
+    for v in payload.participantes:
+        nombre = (v.nombre or "").strip()
+        if not nombre:
+            raise HTTPException(
+                status_code=400, detail="El nombre es requerido"
+            )
+        if not all((ch.isalpha() or ch.isspace()) for ch in nombre):
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"El nombre del participante con DNI {v.dni} solo "
+                    "puede contener letras y espacios"
+                ),
+            )
+
+
+def preparar_inscripcion(payload: InscripcionIn, contenedor: ContenedorApp):
+    """
+    Pasos 1 a 4: valida el pedido y arma la Inscripcion lista para reservar.
+    `payload` ya viene con fecha y hora canónicas (con_horario_canonico).
+    """
+    # 1️⃣ Repositorios y datos auxiliares (del contenedor de la app)
+    catalogo = contenedor.catalogo
+    repo_insc = contenedor.repos.inscripciones
+    repo_turno = contenedor.repos.turnos
+    repo_visit = contenedor.repos.visitantes
+
+    # Buscar la actividad en el catálogo
+    act = catalogo.por_nombre(payload.actividad)
+    if not act:
+        raise HTTPException(status_code=404, detail="Actividad no encontrada")
+
+    # Buscar el turno correspondiente
+    with medir_etapa("buscar_turno"):
+        turnos = repo_turno.obtener_por_actividad_y_fecha(
+            act.id, payload.fecha, payload.fecha
         )
-        inscripcion = servicio.inscribir(
+    turno_match = next((t for t in turnos if t[3] == payload.hora), None)
+    if not turno_match:
+        raise HTTPException(status_code=404, detail="Turno no encontrado")
+
+    turno = armar_turno(payload, act, turno_match)
+
+    # 2️⃣ Validaciones de participantes
+    # 2.1) Duplicados en el mismo payload
+    dnis = validar_dnis_unicos(payload)
+
+    # 2.2) Choque de horario de los DNI en cualquier actividad (una consulta)
+    with medir_etapa("choques"):
+        choques = repo_visit.dnis_con_choque(dnis, payload.fecha, payload.hora)
+    for v in payload.participantes:
+        if v.dni in choques:
+            raise HTTPException(
+                status_code=400,
+                detail=f"El DNI {v.dni} ya tiene una inscripción "
+                "en ese horario",
+            )
+
+    # 2.3) Nombre solo letras y espacios (sin números ni caracteres especiales)
+    validar_nombres(payload)
+
+    # 2.4) Crear modelos de dominio
+    participantes = [
+        Visitante(**v.model_dump()) for v in payload.participantes
+    ]
+
+    # 3️⃣ Reglas de las actividades (derivadas de la tabla Actividad)
+    setup_actividades = catalogo.setup_actividades()
+
+    # 4️⃣ Servicio principal
+    # Los choques de este horario ya se consultaron en 2.2: el índice
+    # del servicio se arma con ese resultado en vez de volver a la BD
+    indice_choques = IndiceChoquesEnMemoria()
+    indice_choques.agregar(payload.fecha, payload.hora, choques)
+    servicio = ServicioInscripcion(
+        setup_actividades,
+        [turno],
+        repo_insc,
+        indice_choques=indice_choques,
+    )
+    with medir_etapa("servicio"):
+        return servicio.inscribir(
             turno=turno,
             participantes=participantes,
             acepta_terminos=payload.acepta_terminos,
             email_contacto=payload.email,
         )
 
-        # 5️⃣ Guardar inscripción y visitantes
-        inscripcion_id = repo_insc.guardar(inscripcion)
-        # Actualizar cupo disponible: cap_max - cupo_ocupado_actualizado
-        nuevo_disponible = max(0, cap_max - getattr(turno, "cupo_ocupado", 0))
-        repo_turno.actualizar_cupo(turno.id, nuevo_disponible)
 
-        # 6️⃣ Enviar comprobante con N° de inscripción
-        try:
-            servicio_correo.enviar_comprobante(
-                inscripcion, payload.email, id_inscripcion=inscripcion_id
+def respuesta_inscripcion(payload: InscripcionIn, inscripcion_id: int) -> dict:
+    return {
+        "ok": True,
+        "id_inscripcion": inscripcion_id,
+        "mensaje": (
+            f"Inscripción confirmada para {payload.actividad} "
+            f"el {payload.fecha} a las {payload.hora}"
+        ),
+    }
+
+
+def error_inscripcion(error: Exception) -> HTTPException:
+    """Respuesta HTTP para un error de la inscripción."""
+    if isinstance(error, HTTPException):
+        return error
+    if isinstance(
+        error,
+        (
+            ErrorSinCupo,
+            ErrorTerminosNoAceptados,
+            ErrorHorarioInvalido,
+            ErrorFaltaTalle,
+            ErrorRestriccionEdad,
+            ErrorParqueCerrado,
+            ErrorChoqueHorario,
+            ErrorAnticipacion,
+            ErrorEmailInvalido,
+            ErrorFechaPasada,
+        ),
+    ):
+        registrar_error_validacion(error)
+        return HTTPException(status_code=400, detail=str(error))
+    if isinstance(error, ErrorBDOcupada):
+        return bd_ocupada(error)
+    return HTTPException(status_code=500, detail=f"Error interno: {error}")
+
+
+def procesar_inscripcion(payload: InscripcionIn, contenedor: ContenedorApp):
+    try:
+        payload = con_horario_canonico(payload)
+        inscripcion = preparar_inscripcion(payload, contenedor)
+
+        # 5️⃣ Descontar cupo y guardar inscripción y visitantes en una sola
+        # transacción (lanza ErrorSinCupo si otra reserva ganó el cupo).
+        # 6️⃣ El comprobante queda en el outbox en esa misma transacción y lo
+        # envía el TrabajadorOutbox en segundo plano.
+        # Con ECOPARK_ESCRITURA_AGRUPADA la reserva se confirma junto con
+        # las de otros pedidos en un solo COMMIT del escritor agrupado.
+        reservador = contenedor.escritor or contenedor.repos.inscripciones
+        with medir_etapa("reservar"):
+            inscripcion_id = reservador.reservar(
+                inscripcion, encolar_comprobante=True
             )
-        except Exception as e:
-            # Loguear pero no romper la respuesta de éxito
-            print(
-                f"Advertencia: No se pudo enviar el correo de comprobante. Error: {e}"
+
+        # No insertar nuevamente visitantes aquí: ya se insertaron en
+        # InscripcionRepo.reservar()
+        return respuesta_inscripcion(payload, inscripcion_id)
+
+    except Exception as e:
+        raise error_inscripcion(e)
+
+
+def bd_ocupada(error: ErrorBDOcupada) -> HTTPException:
+    # Otro proceso retuvo el lock de escritura más que todos los reintentos:
+    # no se guardó nada y el cliente puede volver a intentar
+    return HTTPException(
+        status_code=503, detail=str(error), headers={"Retry-After": "1"}
+    )
+
+
+def _detalle_lote(errores: dict) -> dict:
+    return {
+        "mensaje": "No se guardó ninguna inscripción del lote",
+        "errores": [
+            {"indice": indice, "detalle": detalle}
+            for indice, detalle in sorted(errores.items())
+        ],
+    }
+
+
+def procesar_lote(payload: LoteInscripcionesIn, contenedor: ContenedorApp):
+    """
+    Valida todas las inscripciones del lote con un único ServicioInscripcion
+    (catálogo, turnos y choques compartidos) y las reserva en una sola
+    transacción. Si alguna falla no se guarda ninguna y el 400 lista cada
+    error con su posición en el lote.
+    """
+    try:
+        catalogo = contenedor.catalogo
+        repos = contenedor.repos
+        repo_insc = repos.inscripciones
+        errores = {}
+
+        # Fecha y hora canónicas: una inválida es un error de su posición
+        items = []
+        for indice, item in enumerate(payload.inscripciones):
+            try:
+                items.append((indice, con_horario_canonico(item)))
+            except HTTPException as e:
+                errores[indice] = e.detail
+
+        # 1️⃣ Turnos: una consulta por fecha distinta del lote
+        repo_turno = repos.turnos
+        filas_por_fecha = {}
+        for fecha in {item.fecha for _, item in items}:
+            filas = repo_turno.obtener_por_fecha(fecha)
+            filas_por_fecha[fecha] = {(f[1], f[3]): f for f in filas}
+
+        # Un Turno por id, compartido: el servicio va sumando el cupo del lote
+        turnos = {}
+        validos = []
+        for indice, item in items:
+            try:
+                act = catalogo.por_nombre(item.actividad)
+                if not act:
+                    raise HTTPException(
+                        status_code=404, detail="Actividad no encontrada"
+                    )
+                fila = filas_por_fecha[item.fecha].get((act.id, item.hora))
+                if not fila:
+                    raise HTTPException(
+                        status_code=404, detail="Turno no encontrado"
+                    )
+                dnis = validar_dnis_unicos(item)
+                validar_nombres(item)
+            except HTTPException as e:
+                errores[indice] = e.detail
+                continue
+            if fila[0] not in turnos:
+                turnos[fila[0]] = armar_turno(item, act, fila)
+            validos.append((indice, item, turnos[fila[0]], dnis))
+
+        # 2️⃣ Choques: una consulta por horario con todos los DNI del lote.
+        # El servicio los revisa y registra cada inscripción que acepta, así
+        # que un DNI repetido en el mismo horario dentro del lote también choca
+        repo_visit = repos.visitantes
+        dnis_por_horario = defaultdict(set)
+        for _, item, _, dnis in validos:
+            dnis_por_horario[(item.fecha, item.hora)].update(dnis)
+        indice_choques = IndiceChoquesEnMemoria()
+        for (fecha, hora), dnis in dnis_por_horario.items():
+            indice_choques.agregar(
+                fecha, hora, repo_visit.dnis_con_choque(dnis, fecha, hora)
             )
 
-        # No insertar nuevamente visitantes aquí: ya se insertaron en InscripcionRepo.guardar()
+        # 3️⃣ Reglas de negocio con un solo servicio para todo el lote
+        servicio = ServicioInscripcion(
+            catalogo.setup_actividades(),
+            list(turnos.values()),
+            repo_insc,
+            indice_choques=indice_choques,
+        )
+        inscripciones = []
+        for indice, item, turno, _ in validos:
+            try:
+                inscripciones.append(
+                    servicio.inscribir(
+                        turno=turno,
+                        participantes=[
+                            Visitante(**v.model_dump())
+                            for v in item.participantes
+                        ],
+                        acepta_terminos=item.acepta_terminos,
+                        email_contacto=item.email,
+                    )
+                )
+            except ValidacionError as e:
+                registrar_error_validacion(e)
+                errores[indice] = str(e)
+
+        if errores:
+            raise HTTPException(status_code=400, detail=_detalle_lote(errores))
+
+        # 4️⃣ Una sola transacción: cupos, inscripciones y comprobantes
+        ids = repo_insc.reservar_lote(inscripciones, encolar_comprobante=True)
         return {
             "ok": True,
-            "id_inscripcion": inscripcion_id,
-            "mensaje": f"Inscripción confirmada para {payload.actividad} el {payload.fecha} a las {payload.hora}",
+            "ids_inscripcion": ids,
+            "mensaje": f"{len(ids)} inscripciones confirmadas",
         }
 
-    except (
-        ErrorSinCupo,
-        ErrorTerminosNoAceptados,
-        ErrorHorarioInvalido,
-        ErrorFaltaTalle,
-        ErrorRestriccionEdad,
-        ErrorParqueCerrado,
-        ErrorChoqueHorario,
-        ErrorAnticipacion,
-        ErrorEmailInvalido,
-        ErrorFechaPasada,
-    ) as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+
+    except ErrorLote as e:
+        # Otra reserva ganó el cupo o el horario entre validar y el commit
+        for _, error in e.errores:
+            registrar_error_validacion(error)
+        raise HTTPException(
+            status_code=400,
+            detail=_detalle_lote(
+                {indice: str(error) for indice, error in e.errores}
+            ),
+        )
+
+    except ErrorBDOcupada as e:
+        raise bd_ocupada(e)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
 
 
-@app.get("/api/actividades")
-def listar_actividades():
+def actividad_a_dict(a):
+    return {
+        "id": a.id,
+        "nombre": a.nombre,
+        "cupos": a.capacidad_maxima,
+        "requiere_talle": a.requiere_vestimenta,
+        "edad_min": a.edad_minima,
+    }
+
+
+def turno_a_dict(t):
+    # t es una tupla (id, actividad_id, fecha, hora, cupo_disponible)
+    return {
+        "id": t[0],
+        "actividad_id": t[1],
+        "fecha": t[2],
+        "hora": t[3],
+        "cupos_disponibles": t[4],
+    }
+
+
+def lineas_ndjson(turnos) -> bytes:
+    # Un bloque por página: una línea JSON por turno
+    return turnos_a_ndjson(turnos)
+
+
+def turnos_a_respuesta(turnos, limite=None):
+    """(cuerpo JSON, headers) de los turnos de una fecha o de una página."""
+    headers = {}
+    if limite is not None and len(turnos) == limite:
+        headers[HEADER_CURSOR] = codificar_cursor(turnos[-1])
+    return turnos_a_json(turnos), headers
+
+
+class EncabezadosLectura(NamedTuple):
+    if_none_match: str | None
+    accept_encoding: str | None
+
+
+async def encabezados_lectura(
+    if_none_match: str | None = Header(None),
+    accept_encoding: str | None = Header(None),
+) -> EncabezadosLectura:
+    return EncabezadosLectura(if_none_match, accept_encoding)
+
+
+def _codificacion(
+    contenedor: ContenedorApp, cuerpo: bytes, encabezados: EncabezadosLectura
+):
+    minimo = contenedor.config.compresion_minimo
+    if not minimo or len(cuerpo) < minimo:
+        return None
+    return elegir_codificacion(encabezados.accept_encoding)
+
+
+def respuesta_json(
+    contenedor: ContenedorApp, cuerpo: bytes, headers, encabezados
+) -> Response:
+    """Cuerpo ya serializado, comprimido si supera el mínimo; sin ETag."""
+    headers = dict(headers)
+    codificacion = _codificacion(contenedor, cuerpo, encabezados)
+    if codificacion is not None:
+        cuerpo = comprimir(cuerpo, codificacion)
+        headers.update(
+            {"Content-Encoding": codificacion, "Vary": "Accept-Encoding"}
+        )
+    return Response(cuerpo, media_type=MEDIA_JSON, headers=headers)
+
+
+def respuesta_cacheada(
+    contenedor: ContenedorApp, entrada: Entrada, encabezados, ruta, resultado
+) -> Response:
+    """200 con el cuerpo guardado, o 304 si el cliente ya tiene ese ETag."""
+    codificacion = _codificacion(contenedor, entrada.cuerpo, encabezados)
+    etag = etag_codificado(entrada.etag, codificacion)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        **entrada.headers,
+    }
+    if coincide_etag(encabezados.if_none_match, etag):
+        CACHE_RESPUESTAS.inc(ruta, "no_modificado")
+        return Response(status_code=304, headers=headers)
+    CACHE_RESPUESTAS.inc(ruta, resultado)
+    cuerpo = entrada.cuerpo
+    if codificacion is not None:
+        # La versión comprimida también queda guardada en la entrada
+        cuerpo = entrada.comprimido(codificacion)
+        headers["Content-Encoding"] = codificacion
+    return Response(cuerpo, media_type=MEDIA_JSON, headers=headers)
+
+
+def buscar_en_cache(
+    contenedor: ContenedorApp, ruta, clave, version, encabezados
+):
+    """Respuesta para `clave` si ya se armó con esta versión de los datos."""
+    if contenedor.cache is None:
+        return None
+    entrada = contenedor.cache.obtener(clave, version)
+    if entrada is None:
+        return None
+    return respuesta_cacheada(
+        contenedor, entrada, encabezados, ruta, "acierto"
+    )
+
+
+def responder(
+    contenedor: ContenedorApp,
+    ruta,
+    clave,
+    version,
+    cuerpo: bytes,
+    headers,
+    encabezados,
+):
+    """Guarda el cuerpo serializado en el cache (si está activo) y responde."""
+    if contenedor.cache is None:
+        return respuesta_json(contenedor, cuerpo, headers, encabezados)
+    entrada = contenedor.cache.guardar(clave, version, cuerpo, headers)
+    return respuesta_cacheada(contenedor, entrada, encabezados, ruta, "fallo")
+
+
+def _version_turnos(contenedor: ContenedorApp):
+    # Se lee antes de consultar la BD (ver CacheRespuestas.guardar)
+    if contenedor.cache is None:
+        return None
+    return contenedor.version_datos.actual()
+
+
+async def _version_turnos_async(contenedor: ContenedorApp):
+    # Entre procesos la versión lee PRAGMA data_version: va al ejecutor de BD
+    version_datos = contenedor.version_datos
+    if contenedor.cache is not None and version_datos.data_version is not None:
+        return await ejecutar_en_bd(version_datos.actual)
+    return _version_turnos(contenedor)
+
+
+def _leer_cursor(cursor: str | None):
     try:
-        repo_act = RepositorioActividad()
-        actividades = repo_act.obtener_todas()
-
-        out = []
-        for a in actividades:
-            # a es una tupla (id, nombre, capacidad_maxima, requiere_vestimenta, edad_minima)
-            out.append(
-                {
-                    "id": a[0],
-                    "nombre": a[1],
-                    "cupos": a[2],
-                    "requiere_talle": bool(a[3]),
-                    "edad_min": a[4] if len(a) > 4 else 0,
-                }
-            )
-        return out
+        return decodificar_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def evento_sse(nombre: str, datos) -> str:
+    return f"event: {nombre}\ndata: {json.dumps(datos)}\n\n"
 
+
+async def flujo_turnos(
+    fecha: str, bus: BusCupos = BUS_CUPOS, latido=LATIDO_SSE, repo_turno=None
+):
+    """
+    Eventos SSE de una fecha: primero el snapshot de sus turnos y después
+    solo los deltas de cupo. Si el cliente se atrasa se reenvía el snapshot.
+    """
+    repo_turno = repo_turno or RepositorioTurno()
+    # Suscribirse antes de leer el snapshot para no perder deltas en el medio
+    suscripcion = bus.suscribir(fecha)
+    try:
+        enviar_snapshot = True
+        while True:
+            if enviar_snapshot:
+                turnos = await repo_turno.asincrono.obtener_por_fecha(fecha)
+                yield evento_sse("snapshot", [turno_a_dict(t) for t in turnos])
+                enviar_snapshot = False
+            evento = await suscripcion.siguiente(latido)
+            if evento is None:
+                # Comentario SSE: mantiene viva la conexión a través de proxies
+                yield ": ping\n\n"
+            elif evento is RESINCRONIZAR:
+                enviar_snapshot = True
+            else:
+                yield evento_sse("cupo", evento)
+    finally:
+        bus.desuscribir(suscripcion)
+
+
+async def turnos_stream(
+    fecha: str, contenedor: ContenedorApp = Depends(obtener_contenedor)
+):
+    """Server-Sent Events con la disponibilidad de los turnos de ?fecha=."""
+    try:
+        fecha = fecha_canonica(fecha)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Fecha inválida, se espera YYYY-MM-DD"
+        )
+    return StreamingResponse(
+        flujo_turnos(fecha, repo_turno=contenedor.repos.turnos),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# --- Endpoints sincrónicos (corren en el threadpool de Starlette) ---
+def inscribirse(
+    payload: InscripcionIn,
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    return procesar_inscripcion(payload, contenedor)
+
+
+def inscribirse_lote(
+    payload: LoteInscripcionesIn,
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    return procesar_lote(payload, contenedor)
+
+
+def listar_actividades(
+    encabezados: EncabezadosLectura = Depends(encabezados_lectura),
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    try:
+        catalogo = contenedor.catalogo
+        version = catalogo.version()
+        cacheada = buscar_en_cache(
+            contenedor,
+            RUTA_ACTIVIDADES,
+            CLAVE_ACTIVIDADES,
+            version,
+            encabezados,
+        )
+        if cacheada is not None:
+            return cacheada
+        cuerpo = a_json([actividad_a_dict(a) for a in catalogo.todas()])
+        return responder(
+            contenedor,
+            RUTA_ACTIVIDADES,
+            CLAVE_ACTIVIDADES,
+            version,
+            cuerpo,
+            {},
+            encabezados,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error al listar actividades: {str(e)}"
         )
 
 
-@app.get("/api/turnos")
-def listar_turnos(fecha: str | None = None):
+def listar_turnos(
+    fecha: str | None = None,
+    cursor: str | None = None,
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    formato: Literal["json", "ndjson"] = "json",
+    encabezados: EncabezadosLectura = Depends(encabezados_lectura),
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
     """
     Si se pasa ?fecha=YYYY-MM-DD, devuelve los turnos de ese día.
-    Si no se pasa, devuelve todos los turnos desde hoy en adelante.
+    Si no se pasa, devuelve los turnos desde hoy en adelante paginados por
+    keyset: ?limite=N y ?cursor=<X-Siguiente-Cursor de la página anterior>.
+    Con ?formato=ndjson transmite todos los turnos desde el cursor, uno
+    por línea.
+    Las respuestas JSON llevan ETag: con If-None-Match vigente responde 304.
     """
+    despues = _leer_cursor(cursor)
     try:
-        repo_turno = RepositorioTurno()
+        repo_turno = contenedor.repos.turnos
+        hoy = datetime.now().strftime("%Y-%m-%d")
+
+        if not fecha and formato == "ndjson":
+            paginas = paginas_turnos(repo_turno, hoy, despues)
+            return StreamingResponse(
+                (lineas_ndjson(p) for p in paginas), media_type=MEDIA_NDJSON
+            )
+
+        clave = ("turnos", fecha) if fecha else ("turnos", hoy, cursor, limite)
+        version = _version_turnos(contenedor)
+        cacheada = buscar_en_cache(
+            contenedor, RUTA_TURNOS, clave, version, encabezados
+        )
+        if cacheada is not None:
+            return cacheada
 
         if fecha:
             # Buscar turnos exactos para la fecha dada
-            turnos = repo_turno.obtener_por_fecha(fecha)
-        else:
-            # Buscar todos los turnos desde hoy en adelante
-            hoy = datetime.now().strftime("%Y-%m-%d")
-            turnos = repo_turno.ejecutar(
-                """
-                SELECT id, actividad_id, fecha, hora, cupo_disponible
-                FROM Turno
-                WHERE fecha >= ?
-                ORDER BY fecha, hora
-            """,
-                (hoy,),
-                fetchall=True,
+            cuerpo, headers = turnos_a_respuesta(
+                repo_turno.obtener_por_fecha(fecha)
             )
+        else:
+            pagina = repo_turno.obtener_pagina_desde(hoy, despues, limite)
+            cuerpo, headers = turnos_a_respuesta(pagina, limite)
+        return responder(
+            contenedor,
+            RUTA_TURNOS,
+            clave,
+            version,
+            cuerpo,
+            headers,
+            encabezados,
+        )
 
-        out = [
-            {
-                "id": t[0],
-                "actividad_id": t[1],
-                "fecha": t[2],
-                "hora": t[3],
-                "cupos_disponibles": t[4],
-            }
-            for t in turnos
-        ]
-
-        return out
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Fecha inválida, se espera YYYY-MM-DD"
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al listar turnos: {str(e)}")
 
 
-@app.get("/api/validar-dni")
-def validar_dni(dni: int, fecha: str, hora: str):
-    """Devuelve {existe: true/false} si el DNI ya está inscripto en cualquier actividad en esa fecha y hora."""
+def validar_dni(
+    dni: int,
+    fecha: str,
+    hora: str,
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    """
+    Devuelve {existe: true/false} si el DNI ya está inscripto en cualquier
+    actividad en esa fecha y hora.
+    """
+    fecha, hora = horario_canonico(fecha, hora)
     try:
-        repo_visit = VisitanteRepo()
+        repo_visit = contenedor.repos.visitantes
         existe = repo_visit.existe_choque_por_dni_y_fecha_hora(dni, fecha, hora)
         return {"existe": bool(existe)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al validar DNI: {str(e)}")
+
+
+def validar_dnis(
+    payload: ValidarDnisIn,
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    """
+    Valida varios DNI en una sola consulta y devuelve los que ya están
+    inscriptos en esa fecha y hora.
+    """
+    payload = con_horario_canonico(payload)
+    try:
+        repo_visit = contenedor.repos.visitantes
+        choques = repo_visit.dnis_con_choque(
+            payload.dnis, payload.fecha, payload.hora
+        )
+        return {"choques": sorted(choques)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al validar DNIs: {str(e)}"
+        )
+
+
+# --- Endpoints async (la BD se usa desde el ejecutor dedicado) ---
+async def inscribirse_async(
+    payload: InscripcionIn,
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    escritor = contenedor.escritor
+    if escritor is None or not escritor.activo:
+        # Toda la reserva corre en un solo salto al ejecutor de BD
+        return await ejecutar_en_bd(procesar_inscripcion, payload, contenedor)
+    # Con el escritor agrupado solo la validación usa un hilo de BD: el
+    # COMMIT de la tanda se espera en el event loop
+    try:
+        payload = con_horario_canonico(payload)
+        inscripcion = await ejecutar_en_bd(
+            preparar_inscripcion, payload, contenedor
+        )
+        with medir_etapa("reservar"):
+            inscripcion_id = await asyncio.wrap_future(
+                escritor.encolar(inscripcion, encolar_comprobante=True)
+            )
+        return respuesta_inscripcion(payload, inscripcion_id)
+    except Exception as e:
+        raise error_inscripcion(e)
+
+
+async def inscribirse_lote_async(
+    payload: LoteInscripcionesIn,
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    return await ejecutar_en_bd(procesar_lote, payload, contenedor)
+
+
+async def listar_actividades_async(
+    encabezados: EncabezadosLectura = Depends(encabezados_lectura),
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    try:
+        catalogo = contenedor.catalogo
+        version = await ejecutar_en_bd(catalogo.version)
+        cacheada = buscar_en_cache(
+            contenedor,
+            RUTA_ACTIVIDADES,
+            CLAVE_ACTIVIDADES,
+            version,
+            encabezados,
+        )
+        if cacheada is not None:
+            return cacheada
+        actividades = await ejecutar_en_bd(catalogo.todas)
+        cuerpo = a_json([actividad_a_dict(a) for a in actividades])
+        return responder(
+            contenedor,
+            RUTA_ACTIVIDADES,
+            CLAVE_ACTIVIDADES,
+            version,
+            cuerpo,
+            {},
+            encabezados,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al listar actividades: {str(e)}"
+        )
+
+
+async def listar_turnos_async(
+    fecha: str | None = None,
+    cursor: str | None = None,
+    limite: int = Query(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    formato: Literal["json", "ndjson"] = "json",
+    encabezados: EncabezadosLectura = Depends(encabezados_lectura),
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    """
+    Si se pasa ?fecha=YYYY-MM-DD, devuelve los turnos de ese día.
+    Si no se pasa, devuelve los turnos desde hoy en adelante paginados por
+    keyset: ?limite=N y ?cursor=<X-Siguiente-Cursor de la página anterior>.
+    Con ?formato=ndjson transmite todos los turnos desde el cursor, uno
+    por línea.
+    Las respuestas JSON llevan ETag: con If-None-Match vigente responde 304.
+    """
+    despues = _leer_cursor(cursor)
+    try:
+        repo_turno = contenedor.repos.turnos
+        hoy = datetime.now().strftime("%Y-%m-%d")
+
+        if not fecha and formato == "ndjson":
+            paginas = paginas_turnos_async(repo_turno, hoy, despues)
+            return StreamingResponse(
+                (lineas_ndjson(p) async for p in paginas),
+                media_type=MEDIA_NDJSON,
+            )
+
+        # Un acierto no consulta las tablas de turnos; entre procesos solo
+        # pasa por el ejecutor para leer PRAGMA data_version
+        clave = ("turnos", fecha) if fecha else ("turnos", hoy, cursor, limite)
+        version = await _version_turnos_async(contenedor)
+        cacheada = buscar_en_cache(
+            contenedor, RUTA_TURNOS, clave, version, encabezados
+        )
+        if cacheada is not None:
+            return cacheada
+
+        if fecha:
+            turnos = await repo_turno.asincrono.obtener_por_fecha(fecha)
+            cuerpo, headers = turnos_a_respuesta(turnos)
+        else:
+            pagina = await repo_turno.asincrono.obtener_pagina_desde(
+                hoy, despues, limite
+            )
+            cuerpo, headers = turnos_a_respuesta(pagina, limite)
+        return responder(
+            contenedor,
+            RUTA_TURNOS,
+            clave,
+            version,
+            cuerpo,
+            headers,
+            encabezados,
+        )
+
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="Fecha inválida, se espera YYYY-MM-DD"
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al listar turnos: {str(e)}"
+        )
+
+
+async def validar_dni_async(
+    dni: int,
+    fecha: str,
+    hora: str,
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    """
+    Devuelve {existe: true/false} si el DNI ya está inscripto en cualquier
+    actividad en esa fecha y hora.
+    """
+    fecha, hora = horario_canonico(fecha, hora)
+    try:
+        repo_visit = contenedor.repos.visitantes
+        existe = await repo_visit.asincrono.existe_choque_por_dni_y_fecha_hora(
+            dni, fecha, hora
+        )
+        return {"existe": bool(existe)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al validar DNI: {str(e)}"
+        )
+
+
+async def validar_dnis_async(
+    payload: ValidarDnisIn,
+    contenedor: ContenedorApp = Depends(obtener_contenedor),
+):
+    """
+    Valida varios DNI en una sola consulta y devuelve los que ya están
+    inscriptos en esa fecha y hora.
+    """
+    payload = con_horario_canonico(payload)
+    try:
+        repo_visit = contenedor.repos.visitantes
+        choques = await repo_visit.asincrono.dnis_con_choque(
+            payload.dnis, payload.fecha, payload.hora
+        )
+        return {"choques": sorted(choques)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error al validar DNIs: {str(e)}"
+        )
+
+
+def exponer_metricas():
+    """Métricas en formato de texto de Prometheus."""
+    return PlainTextResponse(METRICAS.exponer(), media_type=MEDIA_METRICAS)
+
+
+# --- Administración ---
+def verificar_admin(
+    request: Request, x_admin_token: str | None = Header(None)
+):
+    """Sin ECOPARK_ADMIN_TOKEN las rutas de administración no existen (404)."""
+    token = request.app.state.config.admin_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(x_admin_token or "", token):
+        raise HTTPException(
+            status_code=403, detail="Token de administración inválido"
+        )
+
+
+OrdenSQL = Literal["total_ms", "promedio_ms", "max_ms", "cantidad", "lentas"]
+
+
+async def estadisticas_sql(
+    orden: OrdenSQL = "total_ms",
+    limite: int = Query(50, ge=1, le=500),
+):
+    """Estadísticas por forma de consulta (con ECOPARK_SQL_INSTRUMENTAR=1)."""
+    return {
+        "activa": INSTRUMENTACION.activa,
+        "umbral_ms": INSTRUMENTACION.umbral_ms,
+        "consultas": INSTRUMENTACION.estadisticas.resumen(orden, limite),
+    }
+
+
+async def reiniciar_estadisticas_sql():
+    INSTRUMENTACION.estadisticas.reiniciar()
+    return {"ok": True}
+
+
+RUTAS_ADMIN = [
+    ("GET", "/api/admin/sql", estadisticas_sql),
+    ("POST", "/api/admin/sql/reiniciar", reiniciar_estadisticas_sql),
+]
+
+
+# (método, ruta, endpoint sincrónico, endpoint async)
+RUTAS = [
+    ("POST", "/api/inscribirse", inscribirse, inscribirse_async),
+    (
+        "POST",
+        "/api/inscripciones/lote",
+        inscribirse_lote,
+        inscribirse_lote_async,
+    ),
+    ("GET", "/api/actividades", listar_actividades, listar_actividades_async),
+    ("GET", "/api/turnos", listar_turnos, listar_turnos_async),
+    # El stream es async en ambos modos: un hilo por cliente no escala
+    ("GET", "/api/turnos/stream", turnos_stream, turnos_stream),
+    ("GET", "/api/validar-dni", validar_dni, validar_dni_async),
+    ("POST", "/api/validar-dnis", validar_dnis, validar_dnis_async),
+]
+
+
+def crear_app(
+    modo_async: bool | None = None, metricas: bool | None = None
+) -> FastAPI:
+    """
+    Crea la app. En modo async los endpoints son `async def` y la BD se usa
+    desde un ejecutor dedicado; en modo sincrónico son `def` y Starlette los
+    corre en su threadpool. Por defecto se toma ECOPARK_MODO_ASYNC.
+    Con `metricas` se miden todos los pedidos (ECOPARK_METRICAS).
+    """
+    config = cargar_configuracion()
+    if modo_async is None:
+        modo_async = config.modo_async
+    if metricas is None:
+        metricas = config.metricas
+
+    app = FastAPI(title="EcoHarmony Park API", lifespan=lifespan)
+    app.state.modo_async = modo_async
+    app.state.config = config
+
+    # --- Habilitar CORS para permitir peticiones desde React ---
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # en producción poner tu dominio
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[HEADER_CURSOR, "ETag"],
+    )
+
+    for metodo, ruta, endpoint, endpoint_async in RUTAS:
+        app.add_api_route(
+            ruta, endpoint_async if modo_async else endpoint, methods=[metodo]
+        )
+    app.add_api_route("/metrics", exponer_metricas, methods=["GET"])
+    for metodo, ruta, endpoint in RUTAS_ADMIN:
+        app.add_api_route(
+            ruta,
+            endpoint,
+            methods=[metodo],
+            dependencies=[Depends(verificar_admin)],
+        )
+    if metricas:
+        app.add_middleware(MiddlewareMetricas)
+    return app
+
+
+app = crear_app()
@@ -0,0 +1,78 @@
+"""Utilidades compartidas por los benchmarks: bases de datos sintéticas."""
+
+import sqlite3
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+from back.src.repositorios.migraciones import aplicar_migraciones
+
+ACTIVIDADES = [
+    ("Safari", 8, 0, None),
+    ("Palestra", 12, 1, 12),
+    ("Jardinería", 12, 0, None),
+    ("Tirolesa", 10, 1, 8),
+]
+
+HORAS = [f"{h:02d}:{m:02d}" for h in range(9, 18) for m in (0, 30)]
+
+
+def crear_bd_sintetica(dias=28, directorio=None) -> Path:
+    """Crea una BD temporal con las actividades base y `dias` de turnos."""
+    directorio = Path(directorio or tempfile.mkdtemp(prefix="bench_ecopark_"))
+    ruta = directorio / "bd_bench.db"
+    aplicar_migraciones(ruta)
+    conn = sqlite3.connect(ruta)
+    conn.executemany(
+        "INSERT INTO Actividad (nombre, capacidad_maxima, requiere_vestimenta,"
+        " edad_minima) VALUES (?, ?, ?, ?)",
+        ACTIVIDADES,
+    )
+    hoy = date.today()
+    conn.executemany(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) VALUES"
+        " (?, ?, ?, ?)",
+        (
+            (act_id, (hoy + timedelta(days=d)).isoformat(), hora, cupo)
+            for act_id, (_, cupo, _, _) in enumerate(ACTIVIDADES, start=1)
+            for d in range(dias)
+            for hora in HORAS
+        ),
+    )
+    conn.commit()
+    conn.close()
+    return ruta
+
+
+def cargar_inscripciones(ruta, cantidad, dni_inicial=10_000_000) -> int:
+    """
+    Agrega `cantidad` inscripciones de un visitante repartidas entre los
+    turnos (sin descontar cupo). Devuelve el próximo DNI libre.
+    """
+    conn = sqlite3.connect(ruta)
+    turnos = [t for (t,) in conn.execute("SELECT id FROM Turno ORDER BY id")]
+    maximo = conn.execute("SELECT COALESCE(MAX(id), 0) FROM Inscripcion")
+    inicio = maximo.fetchone()[0] + 1
+    with conn:
+        conn.executemany(
+            "INSERT INTO Inscripcion "
+            "(id, turno_id, email_contacto, total_personas, acepta_terminos) "
+            "VALUES (?, ?, 'bench@ecopark.com', 1, 1)",
+            ((inicio + i, turnos[i % len(turnos)]) for i in range(cantidad)),
+        )
+        conn.executemany(
+            "INSERT INTO Visitante (inscripcion_id, nombre, dni, edad, talle) "
+            "VALUES (?, 'Visitante', ?, 30, 'M')",
+            ((inicio + i, dni_inicial + i) for i in range(cantidad)),
+        )
+    conn.close()
+    return dni_inicial + cantidad
+
+
+def ampliar_cupos(ruta, cupo=1_000_000):
+    """Capacidad y cupo enormes: las reservas de un benchmark no se agotan."""
+    conn = sqlite3.connect(ruta)
+    with conn:
+        conn.execute("UPDATE Actividad SET capacidad_maxima = ?", (cupo,))
+        conn.execute("UPDATE Turno SET cupo_disponible = ?", (cupo,))
+    conn.close()
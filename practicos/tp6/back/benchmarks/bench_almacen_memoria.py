@@ -0,0 +1,242 @@
+"""
+Benchmark: almacenamiento en memoria con 1M de visitantes (500k inscripciones
+de 2 personas repartidas en 5000 turnos).
+
+Compara el RepositorioEnMemoria anterior (una lista de dataclasses sin
+__slots__ que se recorre en cada consulta) con AlmacenMemoria (modelos con
+__slots__ e índices por turno, por horario y por DNI):
+  - memoria: tracemalloc al cargar las inscripciones (los modelos con y sin
+    __slots__ por separado, para ver cuánto suman los índices),
+  - velocidad: choque de un DNI en un horario, inscripciones de un turno y
+    búsqueda por DNI.
+La memoria y los tiempos se miden en corridas separadas (tracemalloc
+ralentiza las asignaciones).
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_almacen_memoria [inscripciones]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Optional
+
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.memoria import (
+    AlmacenMemoria,
+    InscripcionRepoMemoria,
+    VisitanteRepoMemoria,
+)
+
+DIAS = 250
+HORAS = (
+    "09:00", "10:30", "12:00", "14:00", "15:30",
+    "17:00", "18:30", "20:00", "21:30", "23:00",
+)
+CONSULTAS = 200
+
+
+# Modelos como estaban antes (sin __slots__)
+@dataclass
+class VisitanteAnterior:
+    nombre: str
+    dni: int
+    edad: int
+    talle: Optional[str] = None
+
+
+@dataclass
+class TurnoAnterior:
+    id: int
+    actividad_nombre: str
+    fecha: date
+    hora: str
+    cupo_ocupado: int
+
+
+@dataclass
+class InscripcionAnterior:
+    turno: TurnoAnterior
+    visitantes: List[VisitanteAnterior]
+    total_personas: int
+    acepta_terminos: bool
+    email_contacto: str
+
+
+def horarios():
+    inicio = date(2026, 1, 1)
+    return [
+        ((inicio + timedelta(days=d)).isoformat(), h)
+        for d in range(DIAS)
+        for h in HORAS
+    ]
+
+
+def cargar_lista(cantidad):
+    turnos = [
+        TurnoAnterior(i + 1, "Safari", f, h, 0)
+        for i, (f, h) in enumerate(horarios())
+    ]
+    return [
+        InscripcionAnterior(
+            turnos[i % len(turnos)],
+            [
+                VisitanteAnterior("Visitante", 2 * i, 30, "M"),
+                VisitanteAnterior("Visitante", 2 * i + 1, 30, "M"),
+            ],
+            2,
+            True,
+            "grupo@ecopark.com",
+        )
+        for i in range(cantidad)
+    ]
+
+
+def cargar_lista_slots(cantidad):
+    turnos = [
+        Turno(i + 1, "Safari", f, h, 0) for i, (f, h) in enumerate(horarios())
+    ]
+    return [
+        Inscripcion(
+            turnos[i % len(turnos)],
+            [
+                Visitante("Visitante", 2 * i, 30, "M"),
+                Visitante("Visitante", 2 * i + 1, 30, "M"),
+            ],
+            2,
+            True,
+            "grupo@ecopark.com",
+        )
+        for i in range(cantidad)
+    ]
+
+
+def cargar_almacen(cantidad):
+    almacen = AlmacenMemoria()
+    actividad = almacen.agregar_actividad("Safari", 10_000)
+    ids = [
+        almacen.agregar_turno(actividad, f, h, 10_000) for f, h in horarios()
+    ]
+    turnos = [almacen.modelo_turno(t) for t in ids]
+    for i in range(cantidad):
+        almacen.insertar(
+            Inscripcion(
+                turnos[i % len(turnos)],
+                [
+                    Visitante("Visitante", 2 * i, 30, "M"),
+                    Visitante("Visitante", 2 * i + 1, 30, "M"),
+                ],
+                2,
+                True,
+                "grupo@ecopark.com",
+            )
+        )
+    return almacen
+
+
+def medir_memoria(cargar, cantidad):
+    gc.collect()
+    tracemalloc.start()
+    datos = cargar(cantidad)
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del datos
+    gc.collect()
+    return actual, pico
+
+
+def por_consulta(funcion, argumentos):
+    inicio = time.perf_counter()
+    for args in argumentos:
+        funcion(*args)
+    return (time.perf_counter() - inicio) / len(argumentos)
+
+
+def main(cantidad=500_000):
+    print(
+        f"{cantidad:,} inscripciones, {2 * cantidad:,} visitantes, "
+        f"{DIAS * len(HORAS)} turnos"
+    )
+    memoria = {}
+    for nombre, cargar in (
+        ("lista sin __slots__", cargar_lista),
+        ("lista con __slots__", cargar_lista_slots),
+        ("AlmacenMemoria", cargar_almacen),
+    ):
+        memoria[nombre], pico = medir_memoria(cargar, cantidad)
+        print(
+            f"  memoria {nombre:<20}: {memoria[nombre] / 2**20:8.1f} MiB "
+            f"(pico {pico / 2**20:.1f} MiB)"
+        )
+    con_slots = memoria["lista con __slots__"]
+    indices = memoria["AlmacenMemoria"] - con_slots
+    ahorro = 1 - con_slots / memoria["lista sin __slots__"]
+    print(
+        f"  (__slots__ ahorra {ahorro:.0%}; "
+        f"los índices suman {indices / 2**20:.1f} MiB)"
+    )
+
+    lista = cargar_lista(cantidad)
+    almacen = cargar_almacen(cantidad)
+    repo_insc = InscripcionRepoMemoria(almacen)
+    repo_visit = VisitanteRepoMemoria(almacen)
+    todos = horarios()
+    paso = max(cantidad // CONSULTAS, 1)
+    # (dni, fecha, hora, turno_id) de inscripciones de todo el almacén
+    muestras = [
+        (2 * i, *todos[i % len(todos)], i % len(todos) + 1)
+        for i in range(0, cantidad, paso)
+    ]
+
+    def choque_lista(dni, fecha, hora):
+        return any(
+            ins.turno.fecha == fecha
+            and ins.turno.hora == hora
+            and any(v.dni == dni for v in ins.visitantes)
+            for ins in lista
+        )
+
+    def turno_lista(turno_id):
+        return [ins for ins in lista if ins.turno.id == turno_id]
+
+    def dni_lista(dni):
+        return next(
+            (v for ins in lista for v in ins.visitantes if v.dni == dni), None
+        )
+
+    casos = (
+        (
+            "choque DNI en horario",
+            choque_lista,
+            repo_visit.existe_choque_por_dni_y_fecha_hora,
+            [(d, f, h) for d, f, h, _ in muestras],
+        ),
+        (
+            "inscripciones de un turno",
+            turno_lista,
+            repo_insc.obtener_por_turno,
+            [(t,) for *_, t in muestras],
+        ),
+        (
+            "visitante por DNI",
+            dni_lista,
+            repo_visit.obtener_por_dni,
+            [(d,) for d, *_ in muestras],
+        ),
+    )
+    for nombre, lento, rapido, argumentos in casos:
+        antes = por_consulta(lento, argumentos[:10])
+        ahora = por_consulta(rapido, argumentos)
+        print(
+            f"  {nombre:<26}: lista {antes * 1e3:9.2f} ms "
+            f"· índice {ahora * 1e6:7.2f} µs (x{antes / ahora:,.0f})"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,83 @@
+"""
+Benchmark: sondeo de GET /api/turnos (una fecha y una página de 500) y
+GET /api/actividades con el cache de respuestas apagado, con el cache
+(200 desde los bytes guardados) y con If-None-Match (304 sin cuerpo).
+La app corre en proceso (cliente ASGI) sobre una BD sintética de 28 días.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_cache_respuestas [pedidos] [sync|async]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from back.benchmarks._bd import crear_bd_sintetica
+from back.benchmarks.suite import fecha_reservable
+from back.src.repositorios import base
+from back.src.repositorios.conexion import cerrar_pools
+
+
+async def sondear(http, url, params, pedidos, con_etag):
+    headers = {}
+    if con_etag:
+        primera = await http.get(url, params=params)
+        headers["If-None-Match"] = primera.headers["etag"]
+    inicio = time.perf_counter()
+    for _ in range(pedidos):
+        res = await http.get(url, params=params, headers=headers)
+        assert res.status_code == (304 if con_etag else 200), res.status_code
+    return (time.perf_counter() - inicio) / pedidos
+
+
+async def correr(cache, con_etag, pedidos, modo_async):
+    from back.app import crear_app, lifespan
+
+    os.environ["ECOPARK_CACHE_RESPUESTAS"] = "1" if cache else "0"
+    app = crear_app(modo_async=modo_async, metricas=False)
+    fecha = fecha_reservable().isoformat()
+    casos = {
+        "turnos de una fecha": ("/api/turnos", {"fecha": fecha}),
+        "página de 500 turnos": ("/api/turnos", {"limite": 500}),
+        "actividades": ("/api/actividades", {}),
+    }
+    async with lifespan(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transporte, base_url="http://bench"
+        ) as http:
+            return {
+                nombre: await sondear(http, url, params, pedidos, con_etag)
+                for nombre, (url, params) in casos.items()
+            }
+
+
+def main(pedidos=500, modo="async"):
+    db_path = crear_bd_sintetica(dias=28)
+    base.DB_PATH = db_path
+    os.environ["ECOPARK_OUTBOX_ACTIVO"] = "0"
+    variantes = {
+        "sin cache": (False, False),
+        "cache (200)": (True, False),
+        "If-None-Match (304)": (True, True),
+    }
+    resultados = {
+        nombre: asyncio.run(correr(cache, con_etag, pedidos, modo == "async"))
+        for nombre, (cache, con_etag) in variantes.items()
+    }
+    cerrar_pools()
+
+    print(
+        f"BD: {db_path} ({pedidos} pedidos por caso, modo {modo}), ms/pedido"
+    )
+    print(f"{'':<22}" + "".join(f"{nombre:>22}" for nombre in variantes))
+    for caso in resultados["sin cache"]:
+        fila = "".join(f"{resultados[v][caso] * 1e3:22.3f}" for v in variantes)
+        print(f"{caso:<22}{fila}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500, *sys.argv[2:3])
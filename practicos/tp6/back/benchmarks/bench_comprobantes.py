@@ -0,0 +1,140 @@
+"""
+Throughput del renderizado de comprobantes.
+
+Compara el armado anterior (f-string completa + lectura del logo desde
+disco + MIMEImage nuevo en cada envío) contra RenderizadorComprobante,
+que compila la plantilla y codifica el logo una sola vez.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_comprobantes [cantidad]
+"""
+
+import sys
+import time
+from datetime import date, time as hora_del_dia
+from email.mime.image import MIMEImage
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from back.src.comprobante import (
+    PLANTILLA_COMPROBANTE,
+    RenderizadorComprobante,
+    buscar_logo,
+)
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+
+
+def _comprobantes(cantidad):
+    turno = Turno(
+        id=1,
+        actividad_nombre="Palestra",
+        fecha=date(2025, 10, 15),
+        hora=hora_del_dia(14, 0),
+        cupo_ocupado=0,
+    )
+    for n in range(cantidad):
+        visitantes = [
+            Visitante(
+                nombre=f"Visitante {n}-{i}",
+                dni=n * 10 + i,
+                edad=20 + i,
+                talle="M",
+            )
+            for i in range(4)
+        ]
+        email = f"v{n}@mail.com"
+        inscripcion = Inscripcion(
+            turno, visitantes, len(visitantes), True, email
+        )
+        yield inscripcion, email, n
+
+
+def html_anterior(inscripcion, email, id_inscripcion):
+    """Equivalente al generar_html_comprobante original (sin escapar)."""
+    participantes = "".join(
+        [
+            f"<li>{v.nombre} (DNI: {v.dni}, "
+            f"Edad: {v.edad}{' - Talle ' + v.talle if v.talle else ''})</li>"
+            for v in inscripcion.visitantes
+        ]
+    )
+    fila_id = (
+        '<tr><td style="padding: 10px;"><strong>N° Inscripción:</strong></td>'
+        f'<td style="padding: 10px;">{id_inscripcion}</td></tr>'
+    )
+    return PLANTILLA_COMPROBANTE.format(
+        fila_id=fila_id,
+        actividad=inscripcion.turno.actividad_nombre,
+        fecha=inscripcion.turno.fecha.strftime("%d/%m/%Y"),
+        hora=inscripcion.turno.hora.strftime("%H:%M"),
+        email=email,
+        participantes=participantes,
+    )
+
+
+def mensaje_anterior(inscripcion, email, id_inscripcion, ruta_logo):
+    mensaje = MIMEMultipart("related")
+    mensaje.attach(
+        MIMEText(html_anterior(inscripcion, email, id_inscripcion), "html")
+    )
+    with open(ruta_logo, "rb") as f:
+        img = MIMEImage(f.read())
+        img.add_header("Content-ID", "<logo>")
+        mensaje.attach(img)
+    return mensaje
+
+
+def medir(nombre, funcion, cantidad):
+    inicio = time.perf_counter()
+    funcion()
+    total = time.perf_counter() - inicio
+    print(
+        f"{nombre:<28} {cantidad / total:10.0f} comprobantes/s  "
+        f"({total:.2f} s)"
+    )
+
+
+def main(cantidad=10_000):
+    ruta_logo = buscar_logo()
+    renderizador = RenderizadorComprobante(ruta_logo)
+    print(
+        f"{cantidad} comprobantes, "
+        f"logo de {ruta_logo.stat().st_size // 1024} KiB"
+    )
+
+    medir(
+        "HTML anterior",
+        lambda: [html_anterior(*c) for c in _comprobantes(cantidad)],
+        cantidad,
+    )
+    medir(
+        "HTML renderizar_lote",
+        lambda: list(renderizador.renderizar_lote(_comprobantes(cantidad))),
+        cantidad,
+    )
+
+    # El armado MIME anterior relee y recodifica el logo: se mide con
+    # menos mensajes
+    mensajes = max(1, cantidad // 100)
+    medir(
+        "mensaje MIME anterior",
+        lambda: [
+            mensaje_anterior(*c, ruta_logo).as_bytes()
+            for c in _comprobantes(mensajes)
+        ],
+        mensajes,
+    )
+    medir(
+        "mensaje MIME renderizador",
+        lambda: [
+            renderizador.serializar_mensaje(i, e, "parque@ecoharmony.com", n)
+            for i, e, n in _comprobantes(mensajes)
+        ],
+        mensajes,
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
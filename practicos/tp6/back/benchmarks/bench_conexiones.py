@@ -0,0 +1,65 @@
+"""
+Micro-benchmark: latencia por consulta abriendo y cerrando una conexión
+por sentencia (comportamiento anterior de RepositorioBase) contra el
+pool de conexiones por hilo.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_conexiones [repeticiones]
+"""
+
+import sqlite3
+import sys
+import time
+
+from back.benchmarks._bd import crear_bd_sintetica
+from back.src.repositorios.turno_repo import RepositorioTurno
+
+CONSULTA = (
+    "SELECT * FROM Turno WHERE actividad_id = ? AND fecha >= ? AND fecha <= ?"
+)
+
+
+def consulta_abrir_cerrar(db_path, params):
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    cur.execute(CONSULTA, params)
+    resultado = cur.fetchall()
+    conn.close()
+    return resultado
+
+
+def medir(nombre, funcion, repeticiones):
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        funcion(i)
+    total = time.perf_counter() - inicio
+    print(f"{nombre:<22} {total / repeticiones * 1e6:9.1f} µs/consulta")
+    return total
+
+
+def main(repeticiones=5000):
+    db_path = crear_bd_sintetica()
+    repo = RepositorioTurno(db_path)
+    filas = repo.ejecutar("SELECT DISTINCT fecha FROM Turno", fetchall=True)
+    fechas = [r[0] for r in filas]
+
+    def params(i):
+        fecha = fechas[i % len(fechas)]
+        return (i % 4 + 1, fecha, fecha)
+
+    print(f"BD: {db_path} ({repeticiones} consultas)")
+    t_viejo = medir(
+        "abrir/cerrar",
+        lambda i: consulta_abrir_cerrar(db_path, params(i)),
+        repeticiones,
+    )
+    t_pool = medir(
+        "pool por hilo",
+        lambda i: repo.obtener_por_actividad_y_fecha(*params(i)),
+        repeticiones,
+    )
+    print(f"aceleración: x{t_viejo / t_pool:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
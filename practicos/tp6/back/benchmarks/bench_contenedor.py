@@ -0,0 +1,182 @@
+"""
+Benchmark: asignaciones de memoria por pedido, medidas con tracemalloc.
+
+1. procesar_inscripcion con las dependencias armadas en cada pedido
+   (repositorios, pool, catálogo cargado de la BD, servicio de correo)
+   contra el ContenedorApp que se arma una vez en el lifespan.
+2. Pedidos HTTP completos por ASGI en los dos modos de la app.
+
+Se informa el pico de memoria asignada por encima de la base durante cada
+pedido (los objetos temporales que arma) y los bloques que quedan vivos al
+terminar. La latencia se mide en otra corrida, sin tracemalloc.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_contenedor [pedidos]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+from back.benchmarks._bd import ampliar_cupos, crear_bd_sintetica
+from back.benchmarks.bench_lote import grupos
+from back.benchmarks.suite import fecha_reservable
+from back.src.repositorios import base
+from back.src.repositorios.conexion import cerrar_pools
+
+
+def medir_procesar(contenedor_por_pedido, payloads):
+    """Medianas de (pico en bytes, bloques retenidos, segundos) por pedido."""
+    from back.app import procesar_inscripcion
+
+    picos, bloques, tiempos = [], [], []
+    for trazar, lote in ((True, payloads[::2]), (False, payloads[1::2])):
+        if trazar:
+            tracemalloc.start()
+        for payload in lote:
+            if trazar:
+                tracemalloc.reset_peak()
+                actual, _ = tracemalloc.get_traced_memory()
+                vivos = sys.getallocatedblocks()
+            inicio = time.perf_counter()
+            procesar_inscripcion(payload, contenedor_por_pedido())
+            if trazar:
+                picos.append(tracemalloc.get_traced_memory()[1] - actual)
+                bloques.append(sys.getallocatedblocks() - vivos)
+            else:
+                tiempos.append(time.perf_counter() - inicio)
+        if trazar:
+            tracemalloc.stop()
+    return (
+        statistics.median(picos),
+        statistics.median(bloques),
+        statistics.median(tiempos),
+    )
+
+
+def comparar_armado(cantidad):
+    from back.app import InscripcionIn
+    from back.src.configuracion import cargar_configuracion
+    from back.src.contenedor import crear_contenedor, precalentar
+
+    config = cargar_configuracion()
+    compartido = crear_contenedor(config)
+    precalentar(compartido, modo_async=False)
+    fecha = fecha_reservable().isoformat()
+    variantes = (
+        ("armado por pedido", lambda: crear_contenedor(config)),
+        ("contenedor de la app", lambda: compartido),
+    )
+    print("procesar_inscripcion:")
+    for i, (nombre, contenedor) in enumerate(variantes):
+        pedidos = grupos(fecha, 2 * cantidad, 50_000_000 + i * 1_000_000)
+        payloads = [InscripcionIn(**p) for p in pedidos]
+        pico, bloques, segundos = medir_procesar(contenedor, payloads)
+        print(
+            f"  {nombre:<24} pico {pico / 1024:7.1f} KiB"
+            f" · bloques retenidos {bloques:+5.0f}"
+            f" · {segundos * 1e3:6.3f} ms"
+        )
+
+
+async def medir_pedidos(http, pedidos, trazar):
+    """(picos en bytes, bloques retenidos, segundos) de cada pedido."""
+    picos, bloques, tiempos = [], [], []
+    for enviar in pedidos:
+        if trazar:
+            tracemalloc.reset_peak()
+            actual, _ = tracemalloc.get_traced_memory()
+            vivos = sys.getallocatedblocks()
+        inicio = time.perf_counter()
+        (await enviar(http)).raise_for_status()
+        tiempos.append(time.perf_counter() - inicio)
+        if trazar:
+            picos.append(tracemalloc.get_traced_memory()[1] - actual)
+            bloques.append(sys.getallocatedblocks() - vivos)
+    return picos, bloques, tiempos
+
+
+def casos(fecha, cantidad, dni_inicial):
+    def inscribirse(payload):
+        return lambda http: http.post("/api/inscribirse", json=payload)
+
+    def turnos(http):
+        return http.get("/api/turnos", params={"fecha": fecha})
+
+    def validar(http):
+        return http.get(
+            "/api/validar-dni",
+            params={"dni": 1, "fecha": fecha, "hora": "10:00"},
+        )
+
+    return {
+        "POST /api/inscribirse": [
+            inscribirse(p) for p in grupos(fecha, cantidad, dni_inicial)
+        ],
+        "GET /api/turnos?fecha": [turnos] * cantidad,
+        "GET /api/validar-dni": [validar] * cantidad,
+    }
+
+
+async def correr(modo_async, cantidad):
+    from back.app import crear_app, lifespan
+
+    app = crear_app(modo_async=modo_async, metricas=False)
+    fecha = fecha_reservable().isoformat()
+    # Cada corrida con DNI propios
+    dni = 70_000_000 if modo_async else 80_000_000
+    resultados = {}
+    async with lifespan(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transporte, base_url="http://bench"
+        ) as http:
+            # Calentamiento: primer uso de cada hilo, conexión y sentencia
+            for pedidos in casos(fecha, 20, dni).values():
+                await medir_pedidos(http, pedidos, trazar=False)
+            tracemalloc.start()
+            medidos = casos(fecha, cantidad, dni + 1_000_000)
+            for nombre, pedidos in medidos.items():
+                picos, bloques, _ = await medir_pedidos(
+                    http, pedidos, trazar=True
+                )
+                resultados[nombre] = [
+                    statistics.median(picos),
+                    statistics.median(bloques),
+                ]
+            tracemalloc.stop()
+            cronometrados = casos(fecha, cantidad, dni + 2_000_000)
+            for nombre, pedidos in cronometrados.items():
+                _, _, tiempos = await medir_pedidos(
+                    http, pedidos, trazar=False
+                )
+                resultados[nombre].append(statistics.median(tiempos))
+    return resultados
+
+
+def main(cantidad=300):
+    db_path = crear_bd_sintetica(dias=4)
+    ampliar_cupos(db_path)
+    base.DB_PATH = db_path
+    os.environ["ECOPARK_OUTBOX_ACTIVO"] = "0"
+    print(f"{cantidad} pedidos por caso (medianas)")
+    comparar_armado(cantidad)
+    for modo_async in (False, True):
+        print(f"modo {'async' if modo_async else 'sync'}:")
+        resultados = asyncio.run(correr(modo_async, cantidad))
+        for nombre, (pico, bloques, segundos) in resultados.items():
+            print(
+                f"  {nombre:<24} pico {pico / 1024:7.1f} KiB"
+                f" · bloques retenidos {bloques:+5.0f}"
+                f" · {segundos * 1e3:6.2f} ms"
+            )
+        cerrar_pools()
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
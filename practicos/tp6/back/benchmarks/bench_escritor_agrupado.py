@@ -0,0 +1,128 @@
+"""
+Benchmark: POST /api/inscribirse en modo async (crear_app(modo_async=True))
+con un COMMIT por reserva contra el escritor agrupado
+(ECOPARK_ESCRITURA_AGRUPADA=1, varias reservas por COMMIT). N clientes
+reservan a la vez mientras otros leen GET /api/turnos: se informan las
+reservas por segundo, las reservas por COMMIT y la latencia de las
+lecturas. Se mide con synchronous=NORMAL (la configuración de la app) y con
+synchronous=FULL, donde cada COMMIT hace fsync.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_escritor_agrupado [clientes] [por_cliente]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from back.benchmarks._bd import HORAS, ampliar_cupos, crear_bd_sintetica
+from back.benchmarks.suite import fecha_reservable
+from back.src.metricas import ESCRITOR_LOTE
+from back.src.repositorios import base, conexion
+from back.src.repositorios.conexion import cerrar_pools
+
+LECTORES = 8
+PAUSA_LECTURA = 0.005
+
+
+def grupo(fecha, hora, dni):
+    return {
+        "actividad": "Jardinería",
+        "fecha": fecha,
+        "hora": hora,
+        "participantes": [{"nombre": "Ana", "dni": dni, "edad": 30}],
+        "acepta_terminos": True,
+        "email": "bench@ecopark.com",
+    }
+
+
+async def reservar(http, fecha, n, por_cliente, dni_inicial):
+    for i in range(por_cliente):
+        dni = dni_inicial + n * por_cliente + i
+        hora = HORAS[dni % len(HORAS)]
+        res = await http.post("/api/inscribirse", json=grupo(fecha, hora, dni))
+        res.raise_for_status()
+
+
+async def leer(http, fecha, fin, latencias):
+    while not fin.is_set():
+        inicio = time.perf_counter()
+        res = await http.get("/api/turnos", params={"fecha": fecha})
+        res.raise_for_status()
+        latencias.append(time.perf_counter() - inicio)
+        # Un acierto del cache no cede el event loop: pausa entre lecturas
+        await asyncio.sleep(PAUSA_LECTURA)
+
+
+async def medir(agrupada, fecha, clientes, por_cliente, dni_inicial):
+    """(reservas/s, reservas por COMMIT, p95 de GET /api/turnos en ms)."""
+    from back.app import crear_app, lifespan
+
+    os.environ["ECOPARK_ESCRITURA_AGRUPADA"] = "1" if agrupada else "0"
+    app = crear_app(modo_async=True)
+    latencias, fin = [], asyncio.Event()
+    async with lifespan(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transporte, base_url="http://bench"
+        ) as http:
+            lectores = [
+                asyncio.create_task(leer(http, fecha, fin, latencias))
+                for _ in range(LECTORES)
+            ]
+            commits_antes = ESCRITOR_LOTE.cantidad()
+            inicio = time.perf_counter()
+            reservas_clientes = [
+                reservar(http, fecha, n, por_cliente, dni_inicial)
+                for n in range(clientes)
+            ]
+            await asyncio.gather(*reservas_clientes)
+            total = time.perf_counter() - inicio
+            fin.set()
+            await asyncio.gather(*lectores)
+    reservas = clientes * por_cliente
+    commits = ESCRITOR_LOTE.cantidad() - commits_antes
+    latencias.sort()
+    p95 = latencias[int(len(latencias) * 0.95) - 1] if latencias else 0.0
+    por_commit = reservas / commits if commits else 1.0
+    return reservas / total, por_commit, p95 * 1e3
+
+
+async def main(clientes=64, por_cliente=20):
+    os.environ["ECOPARK_OUTBOX_ACTIVO"] = "0"
+    fecha = fecha_reservable().isoformat()
+    print(
+        f"modo async, {clientes} clientes × {por_cliente} reservas, "
+        f"{LECTORES} lectores de /api/turnos"
+    )
+    print(
+        f"{'':<20}{'agrupada':>10}{'res/s':>10}"
+        f"{'res/commit':>12}{'GET p95 ms':>12}"
+    )
+    pragmas_app = conexion.PRAGMAS
+    for synchronous in ("NORMAL", "FULL"):
+        conexion.PRAGMAS = tuple(
+            p.replace("NORMAL", synchronous) if "synchronous" in p else p
+            for p in pragmas_app
+        )
+        for agrupada, dni_inicial in ((False, 40_000_000), (True, 50_000_000)):
+            db_path = crear_bd_sintetica(dias=3)
+            ampliar_cupos(db_path)
+            base.DB_PATH = db_path
+            rps, por_commit, p95 = await medir(
+                agrupada, fecha, clientes, por_cliente, dni_inicial
+            )
+            cerrar_pools()
+            print(
+                f"{'synchronous=' + synchronous:<20}"
+                f"{'sí' if agrupada else 'no':>10}"
+                f"{rps:>10.0f}{por_commit:>12.1f}{p95:>12.1f}"
+            )
+    conexion.PRAGMAS = pragmas_app
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(a) for a in sys.argv[1:3])))
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark del pub/sub de cupos: memoria por suscriptor ocioso y
+latencia de reparto cuando un hilo de reserva publica deltas para una
+fecha con miles de clientes SSE conectados (sin un hilo por cliente).
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_eventos_cupo [suscriptores]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+
+from back.src.eventos_cupo import BusCupos
+
+FECHAS = [f"2025-10-{d:02d}" for d in range(1, 29)]
+DELTAS = 200
+
+
+async def cliente(suscripcion, enviados, latencias):
+    for _ in range(DELTAS):
+        evento = await suscripcion.siguiente()
+        latencias.append(
+            time.perf_counter() - enviados[evento["cupos_disponibles"]]
+        )
+
+
+async def main(cantidad=10000):
+    bus = BusCupos()
+    bus.vincular(asyncio.get_running_loop())
+
+    tracemalloc.start()
+    suscripciones = [
+        bus.suscribir(FECHAS[i % len(FECHAS)]) for i in range(cantidad)
+    ]
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"{cantidad} suscriptores en {len(FECHAS)} fechas: "
+        f"{memoria / cantidad:.0f} B por suscriptor"
+    )
+
+    # Solo los clientes de la fecha publicada reciben los deltas
+    fecha = FECHAS[0]
+    destinatarios = [s for s in suscripciones if s.fecha == fecha]
+    latencias, enviados = [], {}
+    tareas = [
+        asyncio.create_task(cliente(s, enviados, latencias))
+        for s in destinatarios
+    ]
+
+    def publicar():
+        # Como el hilo de una reserva; el cupo identifica el delta medido
+        for cupo in range(DELTAS):
+            enviados[cupo] = time.perf_counter()
+            bus.publicar(fecha, 1, cupo)
+            time.sleep(0.001)
+
+    inicio = time.perf_counter()
+    await asyncio.to_thread(publicar)
+    await asyncio.gather(*tareas)
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    print(
+        f"{DELTAS} deltas a {len(destinatarios)} clientes: "
+        f"{len(latencias) / total:.0f} entregas/s, "
+        f"p50 {statistics.median(latencias) * 1e3:.2f} ms, "
+        f"p95 {latencias[int(len(latencias) * 0.95)] * 1e3:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
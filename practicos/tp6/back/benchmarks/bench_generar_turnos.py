@@ -0,0 +1,104 @@
+"""
+Micro-benchmark: generación de un año de turnos para 50 actividades con el
+algoritmo anterior (un SELECT COUNT(*) por actividad y día y un INSERT por
+turno) contra generar_turnos (turnos faltantes en memoria + executemany en
+una sola transacción), más la extensión incremental de una semana.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_generar_turnos [actividades] [semanas]
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from back.db import create_db
+from back.db.create_db import conectar, generar_turnos
+
+
+def generar_turnos_anterior(cursor, hoy, horizonte_semanas):
+    """Copia del algoritmo anterior de create_db.generar_turnos."""
+    fecha_limite = hoy + timedelta(weeks=horizonte_semanas)
+    cursor.execute("SELECT id, capacidad_maxima FROM Actividad")
+    for actividad_id, capacidad in cursor.fetchall():
+        fecha = hoy
+        while fecha <= fecha_limite:
+            if (
+                fecha.weekday() not in create_db.DIAS_CERRADOS
+                and fecha.strftime("%Y-%m-%d") not in create_db.FERIADOS
+            ):
+                cursor.execute(
+                    "SELECT COUNT(*) FROM Turno WHERE actividad_id=? "
+                    "AND fecha=?",
+                    (actividad_id, fecha.isoformat()),
+                )
+                if cursor.fetchone()[0] == 0:
+                    hora = datetime.combine(fecha, create_db.HORARIO_INICIO)
+                    fin = datetime.combine(fecha, create_db.HORARIO_FIN)
+                    while hora < fin:
+                        cursor.execute(
+                            "INSERT INTO Turno (actividad_id, fecha, hora, "
+                            "cupo_disponible) VALUES (?, ?, ?, ?)",
+                            (
+                                actividad_id,
+                                fecha.isoformat(),
+                                hora.strftime("%H:%M"),
+                                capacidad,
+                            ),
+                        )
+                        hora += timedelta(minutes=create_db.DURACION_TURNO_MIN)
+            fecha += timedelta(days=1)
+
+
+def bd_con_actividades(cantidad) -> sqlite3.Connection:
+    conn = conectar(
+        Path(tempfile.mkdtemp(prefix="bench_ecopark_")) / "bd_bench.db"
+    )
+    create_db.asegurar_actividades(
+        conn.cursor(),
+        [(f"Actividad {i}", 10, 0, None) for i in range(cantidad)],
+    )
+    conn.commit()
+    return conn
+
+
+def medir(nombre, funcion):
+    inicio = time.perf_counter()
+    funcion()
+    total = time.perf_counter() - inicio
+    print(f"{nombre:<28} {total:8.2f} s")
+    return total
+
+
+def main(actividades=50, semanas=52):
+    hoy = date.today()
+    print(f"{actividades} actividades, {semanas} semanas")
+
+    conn = bd_con_actividades(actividades)
+    t_anterior = medir(
+        "anterior (fila por fila)",
+        lambda: (
+            generar_turnos_anterior(conn.cursor(), hoy, semanas),
+            conn.commit(),
+        ),
+    )
+    filas = conn.execute("SELECT COUNT(*) FROM Turno").fetchone()[0]
+
+    conn = bd_con_actividades(actividades)
+    t_lote = medir(
+        "generar_turnos", lambda: generar_turnos(conn, hoy, semanas)
+    )
+    assert conn.execute("SELECT COUNT(*) FROM Turno").fetchone()[0] == filas
+    medir(
+        "extensión de una semana",
+        lambda: generar_turnos(conn, hoy, semanas + 1),
+    )
+    print(f"{filas} turnos, aceleración: x{t_anterior / t_lote:.1f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,97 @@
+"""
+Benchmark: N reservas con POST /api/inscribirse contra las mismas N en un
+solo POST /api/inscripciones/lote (un commit en vez de N, sin repetir la
+búsqueda de turnos ni las consultas de choques por cada grupo).
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_lote [tamano_lote] [rondas]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from back.benchmarks._bd import (
+    ACTIVIDADES,
+    HORAS,
+    ampliar_cupos,
+    crear_bd_sintetica,
+)
+from back.benchmarks.suite import fecha_reservable
+from back.src.repositorios import base
+from back.src.repositorios.conexion import cerrar_pools
+
+
+def grupos(fecha, cantidad, dni_inicial):
+    return [
+        {
+            "actividad": ACTIVIDADES[i % len(ACTIVIDADES)][0],
+            "fecha": fecha,
+            "hora": HORAS[i % len(HORAS)],
+            "participantes": [
+                {
+                    "nombre": "Visitante",
+                    "dni": dni_inicial + i * 3 + j,
+                    "edad": 30,
+                    "talle": "M",
+                }
+                for j in range(3)
+            ],
+            "email": "escuela@ecopark.com",
+            "acepta_terminos": True,
+        }
+        for i in range(cantidad)
+    ]
+
+
+async def main(tamano=50, rondas=10):
+    from back.app import crear_app, lifespan
+
+    db_path = crear_bd_sintetica(dias=4)
+    ampliar_cupos(db_path)
+    base.DB_PATH = db_path
+    os.environ["ECOPARK_OUTBOX_ACTIVO"] = "0"
+    fecha = fecha_reservable().isoformat()
+    app = crear_app(modo_async=True)
+
+    async with lifespan(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transporte, base_url="http://bench"
+        ) as http:
+            t_individual = t_lote = 0.0
+            for r in range(rondas):
+                for pedido in grupos(fecha, tamano, 40_000_000 + r * 1000):
+                    inicio = time.perf_counter()
+                    res = await http.post("/api/inscribirse", json=pedido)
+                    res.raise_for_status()
+                    t_individual += time.perf_counter() - inicio
+
+                pedidos = grupos(fecha, tamano, 60_000_000 + r * 1000)
+                inicio = time.perf_counter()
+                res = await http.post(
+                    "/api/inscripciones/lote", json={"inscripciones": pedidos}
+                )
+                res.raise_for_status()
+                t_lote += time.perf_counter() - inicio
+    cerrar_pools()
+
+    total = tamano * rondas
+    print(f"BD: {db_path} ({rondas} rondas de {tamano} inscripciones)")
+    print(
+        f"{'POST /api/inscribirse x N':<28} "
+        f"{t_individual / total * 1e3:8.2f} ms/inscripción"
+    )
+    print(
+        f"{'POST /api/inscripciones/lote':<28} "
+        f"{t_lote / total * 1e3:8.2f} ms/inscripción"
+    )
+    print(f"aceleración: x{t_individual / t_lote:.1f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(main(*args))
@@ -0,0 +1,89 @@
+"""
+Micro-benchmark: costo de las métricas. Mide una observación de
+histograma, el costo fijo que MiddlewareMetricas agrega a cada pedido
+(llamando la app ASGI directamente, sin red) y lo compara con la duración
+de un GET /api/turnos?fecha= real.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_metricas [pedidos]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+import httpx
+
+from back.benchmarks._bd import crear_bd_sintetica
+from back.src.metricas import MiddlewareMetricas, RegistroMetricas
+from back.src.repositorios import base
+
+
+class Ruta:
+    path = "/api/turnos"
+
+
+async def app_vacia(scope, receive, send):
+    scope["route"] = Ruta
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"[]"})
+
+
+async def enviar(mensaje):
+    pass
+
+
+def medir_observacion(repeticiones=200000):
+    hist = RegistroMetricas().histograma("x_segundos", "x", ("ruta",))
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        hist.observar(0.003, "/api/turnos")
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+async def medir_app(app, repeticiones=100000):
+    scope = {"type": "http", "method": "GET", "path": "/api/turnos"}
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        await app(dict(scope), None, enviar)
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+async def medir_pedido(fecha, pedidos):
+    from back.app import crear_app, lifespan
+
+    app = crear_app(modo_async=True, metricas=False)
+    async with lifespan(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transporte, base_url="http://bench"
+        ) as http:
+            tiempos = []
+            for _ in range(pedidos):
+                inicio = time.perf_counter()
+                res = await http.get("/api/turnos", params={"fecha": fecha})
+                res.raise_for_status()
+                tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+async def main(pedidos=500):
+    base.DB_PATH = crear_bd_sintetica()
+    os.environ["ECOPARK_OUTBOX_ACTIVO"] = "0"
+    fecha = (date.today() + timedelta(days=1)).isoformat()
+
+    print(f"observación de histograma:   {medir_observacion() * 1e9:8.0f} ns")
+    sin = await medir_app(app_vacia)
+    con = await medir_app(MiddlewareMetricas(app_vacia))
+    sobrecarga = con - sin
+    print(f"costo del middleware:        {sobrecarga * 1e6:8.2f} µs/pedido")
+    pedido = await medir_pedido(fecha, pedidos)
+    print(f"GET /api/turnos?fecha= (p50): {pedido * 1e6:8.1f} µs")
+    print(f"sobrecarga relativa:         {sobrecarga / pedido * 100:8.2f} %")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,91 @@
+"""
+Prueba de carga: endpoints sincrónicos (threadpool de Starlette) contra
+endpoints async (ejecutor de BD dedicado), con N clientes concurrentes
+golpeando GET /api/turnos y POST /api/validar-dnis.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_modos_app [pedidos_por_cliente]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+from back.benchmarks._bd import crear_bd_sintetica
+from back.src.repositorios import base
+from back.src.repositorios.conexion import cerrar_pools
+
+CONCURRENCIAS = (50, 200, 500)
+
+
+async def cliente(http, fechas, pedidos, latencias):
+    for i in range(pedidos):
+        fecha = fechas[i % len(fechas)]
+        inicio = time.perf_counter()
+        if i % 2:
+            res = await http.get("/api/turnos", params={"fecha": fecha})
+        else:
+            res = await http.post(
+                "/api/validar-dnis",
+                json={
+                    "fecha": fecha,
+                    "hora": "10:00",
+                    "dnis": [30000000 + i, 30000001 + i],
+                },
+            )
+        res.raise_for_status()
+        latencias.append(time.perf_counter() - inicio)
+
+
+async def medir(app, fechas, concurrencia, pedidos):
+    latencias = []
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transporte, base_url="http://bench"
+    ) as http:
+        inicio = time.perf_counter()
+        await asyncio.gather(
+            *(
+                cliente(http, fechas, pedidos, latencias)
+                for _ in range(concurrencia)
+            )
+        )
+        total = time.perf_counter() - inicio
+    latencias.sort()
+    p95 = latencias[int(len(latencias) * 0.95) - 1]
+    return len(latencias) / total, statistics.median(latencias), p95
+
+
+async def main(pedidos=20):
+    from back.app import crear_app, lifespan
+
+    db_path = crear_bd_sintetica()
+    base.DB_PATH = db_path
+    os.environ["ECOPARK_OUTBOX_ACTIVO"] = "0"
+    fechas = sorted({f for (f,) in base.RepositorioBase().ejecutar(
+        "SELECT DISTINCT fecha FROM Turno", fetchall=True
+    )})
+
+    print(f"BD: {db_path} ({pedidos} pedidos por cliente)")
+    print(
+        f"{'modo':<6} {'clientes':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}"
+    )
+    for modo_async in (False, True):
+        app = crear_app(modo_async=modo_async)
+        async with lifespan(app):
+            for concurrencia in CONCURRENCIAS:
+                rps, p50, p95 = await medir(app, fechas, concurrencia, pedidos)
+                nombre = "async" if modo_async else "sync"
+                print(
+                    f"{nombre:<6} {concurrencia:>8} {rps:9.0f} "
+                    f"{p50 * 1e3:8.1f} {p95 * 1e3:8.1f}"
+                )
+        cerrar_pools()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
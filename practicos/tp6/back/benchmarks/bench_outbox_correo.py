@@ -0,0 +1,132 @@
+"""
+Latencia de una reserva con envío del comprobante en línea (comportamiento
+anterior de /api/inscribirse) contra la reserva que solo encola el correo
+en el outbox. También mide cuánto tarda el TrabajadorOutbox en vaciar el
+outbox reutilizando una sola sesión SMTP por lote.
+
+Usa un servidor SMTP local (aiosmtpd) con una demora artificial por
+conexión para simular un servidor remoto.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_outbox_correo [reservas] [demora_ms]
+"""
+
+import asyncio
+import socket
+import sys
+import time
+from datetime import date, time as hora_del_dia
+
+from aiosmtpd.controller import Controller
+
+from back.benchmarks._bd import crear_bd_sintetica
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.outbox_correo import TrabajadorOutbox
+from back.src.repositorios.correo_repo import CorreoPendienteRepo
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+from back.src.servicio_correo import ServicioCorreo
+
+
+class BuzonLento:
+    """Handler SMTP que demora cada saludo, como un servidor remoto."""
+
+    def __init__(self, demora):
+        self.demora = demora
+        self.recibidos = 0
+
+    async def handle_EHLO(
+        self, server, session, envelope, hostname, responses
+    ):
+        await asyncio.sleep(self.demora)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recibidos += 1
+        return "250 OK"
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _inscripcion(turno_id, n):
+    turno = Turno(
+        id=turno_id,
+        actividad_nombre="Safari",
+        fecha=date.today(),
+        hora=hora_del_dia(9, 0),
+        cupo_ocupado=0,
+    )
+    return Inscripcion(
+        turno=turno,
+        visitantes=[Visitante(nombre="Ana", dni=n, edad=30)],
+        total_personas=1,
+        acepta_terminos=True,
+        email_contacto=f"visitante{n}@mail.com",
+    )
+
+
+def main(reservas=50, demora_ms=20):
+    buzon = BuzonLento(demora_ms / 1000)
+    controller = Controller(buzon, hostname="127.0.0.1", port=_puerto_libre())
+    controller.start()
+    correo = ServicioCorreo(
+        "parque@ecoharmony.com",
+        "",
+        servidor="127.0.0.1",
+        puerto=controller.port,
+        usar_tls=False,
+    )
+    repo = InscripcionRepo(crear_bd_sintetica(dias=1))
+    repo.ejecutar("UPDATE Turno SET cupo_disponible = 1000000")
+    turnos = [
+        r[0] for r in repo.ejecutar("SELECT id FROM Turno", fetchall=True)
+    ]
+
+    try:
+        inicio = time.perf_counter()
+        for n in range(reservas):
+            inscripcion = _inscripcion(turnos[n % len(turnos)], n)
+            id_inscripcion = repo.reservar(inscripcion)
+            correo.enviar_comprobante(
+                inscripcion, inscripcion.email_contacto, id_inscripcion
+            )
+        en_linea = (time.perf_counter() - inicio) / reservas
+
+        inicio = time.perf_counter()
+        for n in range(reservas):
+            repo.reservar(
+                _inscripcion(turnos[n % len(turnos)], n),
+                encolar_comprobante=True,
+            )
+        con_outbox = (time.perf_counter() - inicio) / reservas
+
+        trabajador = TrabajadorOutbox(
+            CorreoPendienteRepo(repo.db_path), correo, tamano_lote=20
+        )
+        inicio = time.perf_counter()
+        while trabajador.procesar_lote():
+            pass
+        vaciado = time.perf_counter() - inicio
+    finally:
+        controller.stop()
+
+    print(
+        f"{reservas} reservas, demora SMTP simulada {demora_ms} ms por sesión"
+    )
+    print(f"reserva + envío en línea   {en_linea * 1000:8.2f} ms/reserva")
+    print(f"reserva + outbox           {con_outbox * 1000:8.2f} ms/reserva")
+    print(
+        f"vaciado del outbox         {vaciado * 1000:8.2f} ms en total "
+        f"({buzon.recibidos} correos recibidos)"
+    )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
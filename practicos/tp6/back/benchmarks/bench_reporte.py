@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: reporte de inscripciones con la consulta anterior
+(un join de inscripciones + un SELECT de visitantes por inscripción)
+contra la consulta única agrupada mientras se recorre el cursor, y
+exportación a NDJSON con pico de memoria (tracemalloc).
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_reporte [inscripciones]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from back.benchmarks._bd import crear_bd_sintetica
+from back.src.reporte_inscripciones import (
+    abrir_solo_lectura,
+    exportar_ndjson,
+    iterar_inscripciones,
+)
+
+
+def poblar(db_path, cantidad):
+    conn = sqlite3.connect(db_path)
+    turnos = [t for (t,) in conn.execute("SELECT id FROM Turno")]
+    conn.executemany(
+        "INSERT INTO Inscripcion "
+        "(id, turno_id, email_contacto, total_personas, acepta_terminos) "
+        "VALUES (?, ?, 'a@mail.com', 2, 1)",
+        ((i, turnos[i % len(turnos)]) for i in range(1, cantidad + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO Visitante (inscripcion_id, nombre, dni, edad) "
+        "VALUES (?, 'Visitante', ?, 30)",
+        ((i // 2 + 1, 30000000 + i) for i in range(cantidad * 2)),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def reporte_anterior(conn):
+    """Copia de las consultas de la versión anterior de ver_insc (N+1)."""
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        SELECT I.id, I.turno_id, I.email_contacto, I.total_personas,
+               I.acepta_terminos, T.fecha, T.hora, A.nombre
+        FROM Inscripcion I
+        JOIN Turno T ON I.turno_id = T.id
+        JOIN Actividad A ON T.actividad_id = A.id
+        ORDER BY T.fecha, T.hora
+        """
+    )
+    for ins in cursor.fetchall():
+        conn.execute(
+            "SELECT nombre, dni, edad, talle FROM Visitante "
+            "WHERE inscripcion_id = ?",
+            (ins[0],),
+        ).fetchall()
+
+
+def medir(nombre, funcion):
+    inicio = time.perf_counter()
+    funcion()
+    total = time.perf_counter() - inicio
+    # La memoria se mide en otra pasada: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{nombre:<24} {total * 1e3:9.1f} ms {pico / 1024:9.0f} KiB pico")
+    return total
+
+
+def main(cantidad=20000):
+    db_path = crear_bd_sintetica()
+    poblar(db_path, cantidad)
+    conn = abrir_solo_lectura(db_path)
+    destino = os.path.join(
+        tempfile.mkdtemp(prefix="bench_ecopark_"), "reporte.ndjson"
+    )
+
+    print(f"BD: {db_path} ({cantidad} inscripciones)")
+    t_viejo = medir("N+1 consultas", lambda: reporte_anterior(conn))
+    t_nuevo = medir(
+        "consulta única", lambda: sum(1 for _ in iterar_inscripciones(conn))
+    )
+    medir(
+        "exportar NDJSON",
+        lambda: exportar_ndjson(iterar_inscripciones(conn), destino),
+    )
+    print(f"aceleración: x{t_viejo / t_nuevo:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
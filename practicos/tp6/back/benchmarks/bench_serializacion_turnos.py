@@ -0,0 +1,102 @@
+"""
+Benchmark: serialización de 10k turnos para GET /api/turnos.
+
+Compara el camino anterior (un dict por fila, jsonable_encoder y
+JSONResponse) con la codificación directa de las tuplas (plantilla + json
+stdlib, y orjson si está instalado), y mide tamaño y tiempo de gzip/brotli
+sobre el cuerpo resultante.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_serializacion_turnos [filas] [repeticiones]
+"""
+
+import sqlite3
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from back.benchmarks._bd import ACTIVIDADES, HORAS, crear_bd_sintetica
+from back.src import serializacion
+from back.src.serializacion import comprimir, turnos_a_json
+
+
+def camino_anterior(filas) -> bytes:
+    datos = [
+        {
+            "id": i,
+            "actividad_id": a,
+            "fecha": f,
+            "hora": h,
+            "cupos_disponibles": c,
+        }
+        for i, a, f, h, c in filas
+    ]
+    return JSONResponse(jsonable_encoder(datos)).body
+
+
+def con_stdlib(filas) -> bytes:
+    orjson, serializacion.orjson = serializacion.orjson, None
+    try:
+        return turnos_a_json(filas)
+    finally:
+        serializacion.orjson = orjson
+
+
+def medir(funcion, argumento, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(argumento)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main(filas=10_000, repeticiones=20):
+    dias = -(-filas // (len(HORAS) * len(ACTIVIDADES)))
+    db_path = crear_bd_sintetica(dias=dias)
+    with sqlite3.connect(db_path) as conn:
+        turnos = conn.execute(
+            "SELECT id, actividad_id, fecha, hora, cupo_disponible "
+            "FROM Turno ORDER BY fecha, hora, id LIMIT ?",
+            (filas,),
+        ).fetchall()
+
+    variantes = {
+        "dicts + jsonable_encoder": camino_anterior,
+        "tuplas, stdlib": con_stdlib,
+    }
+    if serializacion.orjson is not None:
+        variantes["tuplas, orjson"] = turnos_a_json
+    else:
+        print("orjson no está instalado: se omite esa variante")
+
+    print(f"{len(turnos)} turnos, mejor de {repeticiones}")
+    cuerpos = {}
+    for nombre, funcion in variantes.items():
+        segundos, cuerpos[nombre] = medir(funcion, turnos, repeticiones)
+        print(
+            f"{nombre:<26}{segundos * 1e3:9.2f} ms  "
+            f"{len(cuerpos[nombre]) / 1024:8.0f} KiB"
+        )
+    distintos = len(set(cuerpos.values()))
+    assert distintos == 1, "las variantes no producen el mismo JSON"
+
+    cuerpo = next(iter(cuerpos.values()))
+    codificaciones = ["gzip"]
+    if serializacion.brotli is not None:
+        codificaciones.append("br")
+    for codificacion in codificaciones:
+        segundos, comprimido = medir(
+            lambda c: comprimir(c, codificacion), cuerpo, repeticiones
+        )
+        print(
+            f"{codificacion:<26}{segundos * 1e3:9.2f} ms  "
+            f"{len(comprimido) / 1024:8.0f} KiB "
+            f"({len(comprimido) / len(cuerpo):.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
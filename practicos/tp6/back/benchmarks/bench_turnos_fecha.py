@@ -0,0 +1,61 @@
+"""
+Micro-benchmark: turnos de una fecha con el filtro anterior
+(`fecha LIKE '%...%' OR date(fecha) = date(?)`, recorre toda la tabla)
+contra la igualdad sobre la fecha canónica (usa ix_turno_fecha_hora).
+La BD tiene un año de turnos para todas las actividades.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_turnos_fecha [repeticiones]
+"""
+
+import sys
+import time
+from datetime import date, timedelta
+
+from back.benchmarks._bd import crear_bd_sintetica
+from back.src.repositorios.turno_repo import RepositorioTurno
+
+CONSULTA_LIKE = """
+    SELECT id, actividad_id, fecha, hora, cupo_disponible
+    FROM Turno
+    WHERE fecha LIKE ? OR date (fecha) = date (?)
+    ORDER BY hora ASC
+"""
+
+
+def medir(nombre, funcion, repeticiones):
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        funcion(i)
+    total = time.perf_counter() - inicio
+    print(f"{nombre:<22} {total / repeticiones * 1e6:9.1f} µs/consulta")
+    return total
+
+
+def main(repeticiones=500):
+    db_path = crear_bd_sintetica(dias=365)
+    repo = RepositorioTurno(db_path)
+    fechas = [
+        (date.today() + timedelta(days=d)).isoformat() for d in range(365)
+    ]
+    filas = repo.ejecutar("SELECT COUNT(*) FROM Turno", fetchone=True)[0]
+
+    def con_like(i):
+        fecha = fechas[i % len(fechas)]
+        return repo.ejecutar(
+            CONSULTA_LIKE, (f"%{fecha}%", fecha), fetchall=True
+        )
+
+    print(f"BD: {db_path} ({filas} turnos, {repeticiones} consultas)")
+    assert con_like(0) == repo.obtener_por_fecha(fechas[0])
+    t_like = medir("LIKE / date()", con_like, repeticiones)
+    t_indice = medir(
+        "igualdad con índice",
+        lambda i: repo.obtener_por_fecha(fechas[i % len(fechas)]),
+        repeticiones,
+    )
+    print(f"aceleración: x{t_like / t_indice:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,65 @@
+"""
+Micro-benchmark: listado de turnos futuros cargando todo en memoria
+(fetchall + lista de dicts + json, comportamiento anterior) contra la
+transmisión NDJSON por páginas keyset. Mide tiempo hasta el primer bloque
+y pico de memoria (tracemalloc) para distintos horizontes.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.bench_turnos_stream
+"""
+
+import json
+import time
+import tracemalloc
+from datetime import date
+
+from back.app import lineas_ndjson, turno_a_dict
+from back.benchmarks._bd import crear_bd_sintetica
+from back.src.paginacion import paginas_turnos
+from back.src.repositorios.turno_repo import RepositorioTurno
+
+HORIZONTES = (28, 182, 365)
+
+
+def todo_en_memoria(repo, hoy):
+    turnos = repo.obtener_desde(hoy)
+    yield json.dumps([turno_a_dict(t) for t in turnos])
+
+
+def ndjson(repo, hoy):
+    for pagina in paginas_turnos(repo, hoy):
+        yield lineas_ndjson(pagina)
+
+
+def medir(generador):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    primero = None
+    for _ in generador:
+        if primero is None:
+            primero = time.perf_counter() - inicio
+    total = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return primero, total, pico
+
+
+def main():
+    hoy = date.today().isoformat()
+    print(
+        f"{'días':>5} {'turnos':>7} {'modo':<10} {'1er bloque ms':>13} "
+        f"{'total ms':>9} {'pico KiB':>9}"
+    )
+    for dias in HORIZONTES:
+        repo = RepositorioTurno(crear_bd_sintetica(dias=dias))
+        filas = repo.ejecutar("SELECT COUNT(*) FROM Turno", fetchone=True)[0]
+        for nombre, modo in (("memoria", todo_en_memoria), ("ndjson", ndjson)):
+            primero, total, pico = medir(modo(repo, hoy))
+            print(
+                f"{dias:>5} {filas:>7} {nombre:<10} {primero * 1e3:13.1f} "
+                f"{total * 1e3:9.1f} {pico / 1024:9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
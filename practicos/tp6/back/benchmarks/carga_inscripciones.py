@@ -0,0 +1,309 @@
+"""
+Generador de carga de reservas con verificación de invariantes.
+
+Dispara POST /api/inscribirse a una tasa objetivo con un máximo de pedidos
+en vuelo. Una fracción (`--sesgo`) va al turno "caliente" y el resto se
+reparte entre los turnos del día; los grupos mezclan tamaños, talles y
+edades (algunos pedidos son rechazados por reglas de negocio, como en la
+vida real). Informa throughput y latencias p50/p95/p99 y, al terminar,
+revisa la BD:
+  - ningún turno con cupo_disponible negativo,
+  - capacidad_maxima - cupo_disponible = suma de total_personas del turno,
+  - ningún DNI reservado dos veces en el mismo horario.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.carga_inscripciones [--tasa 300]
+        [--concurrencia 50] [--pedidos 2000] [--sesgo 0.5]
+        [--modo sync|async]
+    python -m back.benchmarks.carga_inscripciones
+        --url http://localhost:8000 --bd back/db/bd_ecopark.db
+
+Sin --url levanta la app en proceso (cliente ASGI) sobre una BD sintética.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+from back.benchmarks._bd import crear_bd_sintetica
+from back.benchmarks.suite import fecha_reservable
+
+TAMANOS_GRUPO = (1, 2, 3, 4, 5, 6)
+PESOS_GRUPO = (30, 30, 15, 15, 6, 4)
+TALLES = ("S", "M", "L", "XL", None)
+PESOS_TALLE = (20, 30, 25, 15, 10)
+NOMBRES = ("Ana", "Beto", "Ceci", "Dario", "Ema", "Fede", "Gala", "Julio")
+
+SQL_CUPO_NEGATIVO = (
+    "SELECT id, cupo_disponible FROM Turno WHERE cupo_disponible < 0"
+)
+
+SQL_OCUPACION = """
+    SELECT T.id, A.capacidad_maxima - T.cupo_disponible AS ocupado,
+           COALESCE(SUM(I.total_personas), 0) AS inscriptos
+    FROM Turno T
+    JOIN Actividad A ON A.id = T.actividad_id
+    LEFT JOIN Inscripcion I ON I.turno_id = T.id
+    GROUP BY T.id
+    HAVING ocupado != inscriptos
+"""
+
+SQL_DNI_REPETIDO = """
+    SELECT T.fecha, T.hora, V.dni, COUNT(*) AS veces
+    FROM Visitante V
+    JOIN Inscripcion I ON I.id = V.inscripcion_id
+    JOIN Turno T ON T.id = I.turno_id
+    GROUP BY T.fecha, T.hora, V.dni
+    HAVING veces > 1
+"""
+
+INVARIANTES = {
+    "cupo_negativo": SQL_CUPO_NEGATIVO,
+    "ocupacion_inconsistente": SQL_OCUPACION,
+    "dni_repetido_en_horario": SQL_DNI_REPETIDO,
+}
+
+
+def verificar_invariantes(ruta) -> dict:
+    """Violaciones de cada invariante (listas vacías si está todo bien)."""
+    conn = sqlite3.connect(ruta)
+    try:
+        return {
+            nombre: conn.execute(sql).fetchall()
+            for nombre, sql in INVARIANTES.items()
+        }
+    finally:
+        conn.close()
+
+
+def percentil(ordenados, p):
+    return ordenados[min(int(len(ordenados) * p), len(ordenados) - 1)]
+
+
+class GeneradorPedidos:
+    """Arma payloads de inscripción con la distribución pedida."""
+
+    def __init__(
+        self, turnos, actividades, sesgo=0.5, dnis=5000, semilla=None
+    ):
+        # turnos: dicts de GET /api/turnos; actividades: id -> nombre
+        self.turnos = turnos
+        self.caliente = turnos[len(turnos) // 2]
+        self.actividades = actividades
+        self.sesgo = sesgo
+        self.dnis = range(30_000_000, 30_000_000 + dnis)
+        self.azar = random.Random(semilla)
+
+    def payload(self) -> dict:
+        azar = self.azar
+        al_caliente = azar.random() < self.sesgo
+        turno = self.caliente if al_caliente else azar.choice(self.turnos)
+        grupo = azar.choices(TAMANOS_GRUPO, PESOS_GRUPO)[0]
+        return {
+            "actividad": self.actividades[turno["actividad_id"]],
+            "fecha": turno["fecha"],
+            "hora": turno["hora"],
+            "participantes": [
+                {
+                    "nombre": azar.choice(NOMBRES),
+                    "dni": dni,
+                    "edad": azar.randint(4, 75),
+                    "talle": azar.choices(TALLES, PESOS_TALLE)[0],
+                }
+                for dni in azar.sample(self.dnis, grupo)
+            ],
+            "email": "carga@ecopark.com",
+            "acepta_terminos": True,
+        }
+
+
+def motivo_rechazo(res) -> str:
+    """El detail de un 4xx como texto: en un 422 de FastAPI es una lista."""
+    detalle = res.json().get("detail", "")
+    if isinstance(detalle, str):
+        return detalle
+    return json.dumps(detalle, ensure_ascii=False, sort_keys=True)
+
+
+async def generar_carga(http, generador, pedidos, tasa, concurrencia) -> dict:
+    """
+    Lanza `pedidos` reservas a `tasa` por segundo (0 = sin límite) con a lo
+    sumo `concurrencia` en vuelo. La latencia se mide desde que sale cada
+    pedido; si la app no da abasto la tasa real queda por debajo de la pedida.
+    """
+    latencias, estados, rechazos = [], Counter(), Counter()
+    en_vuelo = asyncio.Semaphore(concurrencia)
+
+    async def enviar(payload):
+        try:
+            inicio = time.perf_counter()
+            try:
+                res = await http.post("/api/inscribirse", json=payload)
+                estados[res.status_code] += 1
+                if 400 <= res.status_code < 500:
+                    rechazos[motivo_rechazo(res)] += 1
+            except httpx.HTTPError as e:
+                estados[type(e).__name__] += 1
+            latencias.append(time.perf_counter() - inicio)
+        finally:
+            en_vuelo.release()
+
+    tareas = []
+    inicio = time.perf_counter()
+    for i in range(pedidos):
+        if tasa:
+            espera = inicio + i / tasa - time.perf_counter()
+            if espera > 0:
+                await asyncio.sleep(espera)
+        await en_vuelo.acquire()
+        tareas.append(asyncio.create_task(enviar(generador.payload())))
+    await asyncio.gather(*tareas)
+    duracion = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "pedidos": pedidos,
+        "duracion_s": duracion,
+        "pedidos_por_s": pedidos / duracion,
+        "reservas_por_s": estados[200] / duracion,
+        "estados": dict(estados),
+        "rechazos": dict(rechazos.most_common(5)),
+        "p50_ms": percentil(latencias, 0.50) * 1e3,
+        "p95_ms": percentil(latencias, 0.95) * 1e3,
+        "p99_ms": percentil(latencias, 0.99) * 1e3,
+    }
+
+
+async def _turnos_del_dia(http, fecha):
+    actividades = (await http.get("/api/actividades")).json()
+    turnos = (await http.get("/api/turnos", params={"fecha": fecha})).json()
+    if not turnos:
+        raise RuntimeError(f"No hay turnos el {fecha}")
+    return turnos, {a["id"]: a["nombre"] for a in actividades}
+
+
+async def correr_contra(http, args) -> dict:
+    fecha = fecha_reservable().isoformat()
+    turnos, actividades = await _turnos_del_dia(http, fecha)
+    generador = GeneradorPedidos(
+        turnos, actividades, args.sesgo, args.dnis, args.semilla
+    )
+    return await generar_carga(
+        http, generador, args.pedidos, args.tasa, args.concurrencia
+    )
+
+
+async def correr_en_proceso(args):
+    """App en proceso sobre una BD sintética. Devuelve (resultado, ruta)."""
+    from back.app import crear_app, lifespan
+    from back.src.repositorios import base
+    from back.src.repositorios.conexion import cerrar_pools
+
+    ruta = crear_bd_sintetica(dias=4)
+    base.DB_PATH = ruta
+    os.environ["ECOPARK_OUTBOX_ACTIVO"] = "0"
+    app = crear_app(modo_async=args.modo == "async")
+    try:
+        async with lifespan(app):
+            transporte = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transporte, base_url="http://carga"
+            ) as http:
+                return await correr_contra(http, args), ruta
+    finally:
+        cerrar_pools()
+
+
+async def correr_remoto(args):
+    limites = httpx.Limits(max_connections=args.concurrencia)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limites, timeout=30
+    ) as http:
+        return await correr_contra(http, args), args.bd
+
+
+def imprimir(resultado, violaciones):
+    print(
+        f"{resultado['pedidos']} pedidos en {resultado['duracion_s']:.1f} s: "
+        f"{resultado['pedidos_por_s']:.0f} pedidos/s, "
+        f"{resultado['reservas_por_s']:.0f} reservas/s"
+    )
+    print(
+        f"latencia p50 {resultado['p50_ms']:.1f} ms "
+        f"· p95 {resultado['p95_ms']:.1f} ms "
+        f"· p99 {resultado['p99_ms']:.1f} ms"
+    )
+    estados = sorted(resultado["estados"].items(), key=str)
+    print("estados:", ", ".join(f"{k}: {v}" for k, v in estados))
+    for motivo, cantidad in resultado["rechazos"].items():
+        print(f"  {cantidad:>6} × {motivo}")
+    if violaciones is None:
+        print("⚠️ sin --bd no se verifican los invariantes")
+        return
+    for invariante, filas in violaciones.items():
+        marca = "✅"
+        if filas:
+            marca = f"❌ {len(filas)} violaciones, p. ej. {filas[:3]}"
+        print(f"{invariante}: {marca}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Carga concurrente de reservas"
+    )
+    parser.add_argument(
+        "--tasa",
+        type=float,
+        default=300,
+        help="pedidos por segundo (0 = sin límite)",
+    )
+    parser.add_argument(
+        "--concurrencia",
+        type=int,
+        default=50,
+        help="máximo de pedidos en vuelo",
+    )
+    parser.add_argument("--pedidos", type=int, default=2000)
+    parser.add_argument(
+        "--sesgo",
+        type=float,
+        default=0.5,
+        help="fracción de pedidos al turno caliente",
+    )
+    parser.add_argument(
+        "--dnis", type=int, default=5000, help="tamaño del padrón de DNI"
+    )
+    parser.add_argument("--semilla", type=int)
+    parser.add_argument(
+        "--modo",
+        choices=("sync", "async"),
+        default="sync",
+        help="modo de la app en proceso",
+    )
+    parser.add_argument(
+        "--url", help="app ya levantada (por defecto, en proceso)"
+    )
+    parser.add_argument(
+        "--bd", help="BD de la app remota, para verificar invariantes"
+    )
+    args = parser.parse_args(argv)
+
+    if args.url:
+        resultado, ruta = asyncio.run(correr_remoto(args))
+    else:
+        resultado, ruta = asyncio.run(correr_en_proceso(args))
+    violaciones = verificar_invariantes(ruta) if ruta else None
+    imprimir(resultado, violaciones)
+    return 1 if violaciones and any(violaciones.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
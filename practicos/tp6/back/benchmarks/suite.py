@@ -0,0 +1,455 @@
+"""
+Suite de benchmarks con resultados en JSON y comparación contra una línea base.
+
+Mide tres familias de casos:
+  - servicio: ServicioInscripcion (armado del índice e `inscribir`) con
+    distintos tamaños de grupo y de 10 a 1M inscripciones previas.
+  - repo: las consultas de los repositorios sobre BDs sintéticas con esa
+    misma cantidad de inscripciones.
+  - http: POST /api/inscribirse de punta a punta con un cliente ASGI, en
+    modo sincrónico y async.
+
+Uso (desde la carpeta tp6):
+    python -m back.benchmarks.suite correr [--salida resultados.json]
+        [--rapida] [--familia servicio]
+    python -m back.benchmarks.suite comparar resultados.json
+        [--base linea_base.json] [--tolerancia 0.2]
+
+`comparar` sale con código 1 si algún caso empeoró más que la tolerancia
+respecto de la línea base (back/benchmarks/linea_base.json por defecto).
+Para renovarla: `correr --salida back/benchmarks/linea_base.json`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as hora, timedelta
+from itertools import product
+from pathlib import Path
+
+from back.benchmarks._bd import (
+    ACTIVIDADES,
+    HORAS,
+    ampliar_cupos,
+    cargar_inscripciones,
+    crear_bd_sintetica,
+)
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+
+LINEA_BASE = Path(__file__).resolve().parent / "linea_base.json"
+TOLERANCIA = 0.2
+
+PREVIAS = (10, 1_000, 100_000, 1_000_000)
+PREVIAS_RAPIDA = (10, 1_000, 10_000)
+GRUPOS = (1, 4, 10)
+
+
+# --- Medición ---
+def resumir(tiempos, repeticiones=None) -> dict:
+    """Mediana, p95 y media en microsegundos de una lista de duraciones (s)."""
+    tiempos = sorted(tiempos)
+    p95 = tiempos[max(int(len(tiempos) * 0.95) - 1, 0)]
+    return {
+        "mediana_us": round(statistics.median(tiempos) * 1e6, 2),
+        "p95_us": round(p95 * 1e6, 2),
+        "media_us": round(statistics.fmean(tiempos) * 1e6, 2),
+        "repeticiones": repeticiones or len(tiempos),
+    }
+
+
+def medir(funcion, repeticiones, calentamiento=5) -> dict:
+    for i in range(calentamiento):
+        funcion(i)
+    tiempos = []
+    for i in range(calentamiento, calentamiento + repeticiones):
+        inicio = time.perf_counter()
+        funcion(i)
+        tiempos.append(time.perf_counter() - inicio)
+    return resumir(tiempos)
+
+
+async def medir_async(funcion, repeticiones, calentamiento=5) -> dict:
+    for i in range(calentamiento):
+        await funcion(i)
+    tiempos = []
+    for i in range(calentamiento, calentamiento + repeticiones):
+        inicio = time.perf_counter()
+        await funcion(i)
+        tiempos.append(time.perf_counter() - inicio)
+    return resumir(tiempos)
+
+
+def fecha_reservable(hoy=None) -> date:
+    """
+    Primer día desde mañana que acepta inscripciones: no es lunes ni
+    feriado y está a menos de 3 días.
+    """
+    hoy = hoy or date.today()
+    for d in (1, 2, 0):
+        fecha = hoy + timedelta(days=d)
+        feriado = (fecha.month, fecha.day) in ((1, 1), (12, 31))
+        if fecha.weekday() != 0 and not feriado:
+            return fecha
+    raise RuntimeError("No hay fechas reservables en los próximos días")
+
+
+# --- Familia: servicio ---
+SETUP_SERVICIO = {
+    nombre: {
+        "capacidad": 10**9,
+        "edad_minima": edad_minima,
+        "requiere_talle": bool(requiere_talle),
+    }
+    for nombre, _, requiere_talle, edad_minima in ACTIVIDADES
+}
+
+
+def inscripciones_previas(cantidad, hoy):
+    """Inscripciones de un visitante repartidas en 4 semanas de turnos."""
+    turnos = [
+        Turno(
+            id=i,
+            actividad_nombre=act[0],
+            fecha=hoy + timedelta(days=d),
+            hora=hora.fromisoformat(h),
+            cupo_ocupado=0,
+        )
+        for i, (act, d, h) in enumerate(product(ACTIVIDADES, range(28), HORAS))
+    ]
+    return [
+        Inscripcion(
+            turno=turnos[i % len(turnos)],
+            visitantes=[
+                Visitante(
+                    nombre="Visitante", dni=10_000_000 + i, edad=30, talle="M"
+                )
+            ],
+            total_personas=1,
+            acepta_terminos=True,
+            email_contacto="bench@ecopark.com",
+        )
+        for i in range(cantidad)
+    ]
+
+
+def casos_servicio(previas, grupos, repeticiones):
+    from back.src.repositorios.memoria import RepositorioEnMemoria
+    from back.src.servicio_inscripcion import ServicioInscripcion
+
+    hoy = date(2025, 10, 15)  # miércoles: fechas fijas, resultados comparables
+    turno = Turno(
+        id=-1,
+        actividad_nombre="Palestra",
+        fecha=hoy + timedelta(days=1),
+        hora=hora(10, 0),
+        cupo_ocupado=0,
+    )
+    resultados = {}
+    for cantidad in previas:
+        existentes = inscripciones_previas(cantidad, hoy)
+        servicio = None
+
+        def construir(_):
+            nonlocal servicio
+            repo = RepositorioEnMemoria(list(existentes))
+            servicio = ServicioInscripcion(
+                SETUP_SERVICIO, [turno], repo, fecha_actual=hoy
+            )
+
+        # Armar el índice es O(previas): pocas repeticiones si es grande
+        veces = max(3, min(repeticiones, 1_000_000 // max(cantidad, 1)))
+        resultados[f"servicio.construir[previas={cantidad}]"] = medir(
+            construir, veces, calentamiento=1
+        )
+        for grupo in grupos:
+            dni = 50_000_000
+
+            def inscribir(_):
+                nonlocal dni
+                participantes = [
+                    Visitante(nombre="Nuevo", dni=dni + j, edad=30, talle="M")
+                    for j in range(grupo)
+                ]
+                dni += grupo
+                servicio.inscribir(
+                    turno, participantes, True, "bench@ecopark.com"
+                )
+
+            caso = f"servicio.inscribir[grupo={grupo},previas={cantidad}]"
+            resultados[caso] = medir(inscribir, repeticiones)
+        del existentes, servicio
+    return resultados
+
+
+# --- Familia: repo ---
+def casos_repo(previas, repeticiones):
+    from back.src.repositorios.conexion import cerrar_pools
+    from back.src.repositorios.inscripcion_repo import InscripcionRepo
+    from back.src.repositorios.turno_repo import RepositorioTurno
+    from back.src.repositorios.visitante_repo import VisitanteRepo
+
+    fechas = [
+        (date.today() + timedelta(days=d)).isoformat() for d in range(28)
+    ]
+    resultados = {}
+    for cantidad in previas:
+        with tempfile.TemporaryDirectory(prefix="bench_suite_") as directorio:
+            ruta = crear_bd_sintetica(dias=28, directorio=directorio)
+            dni = cargar_inscripciones(ruta, cantidad)
+            ampliar_cupos(ruta)
+            turnos = RepositorioTurno(ruta)
+            visitantes = VisitanteRepo(ruta)
+            inscripciones = InscripcionRepo(ruta)
+            turno = Turno(id=1, actividad_nombre="Safari", fecha=date.today(),
+                          hora=hora(9, 0), cupo_ocupado=0)
+            sufijo = f"[previas={cantidad}]"
+
+            def reservar(i):
+                visitantes_grupo = [
+                    Visitante(
+                        nombre="Nuevo", dni=dni + i * 4 + j, edad=30, talle="M"
+                    )
+                    for j in range(4)
+                ]
+                inscripciones.reservar(
+                    Inscripcion(
+                        turno, visitantes_grupo, 4, True, "bench@ecopark.com"
+                    )
+                )
+
+            casos = {
+                "repo.turnos.obtener_por_fecha": lambda i: (
+                    turnos.obtener_por_fecha(fechas[i % 28])
+                ),
+                "repo.turnos.obtener_pagina_desde[limite=500]": lambda i: (
+                    turnos.obtener_pagina_desde(fechas[i % 28], limite=500)
+                ),
+                "repo.turnos.obtener_por_actividad_y_fecha": lambda i: (
+                    turnos.obtener_por_actividad_y_fecha(
+                        i % 4 + 1, fechas[i % 28], fechas[i % 28]
+                    )
+                ),
+                "repo.visitantes.dnis_con_choque[dnis=10]": lambda i: (
+                    visitantes.dnis_con_choque(
+                        [10_000_000 + i * 10 + j for j in range(10)],
+                        fechas[i % 28],
+                        HORAS[i % 18],
+                    )
+                ),
+                "repo.visitantes.dnis_en_horario": lambda i: (
+                    visitantes.dnis_en_horario(fechas[i % 28], HORAS[i % 18])
+                ),
+                "repo.inscripciones.reservar[grupo=4]": reservar,
+            }
+            for nombre, funcion in casos.items():
+                resultados[nombre + sufijo] = medir(funcion, repeticiones)
+            cerrar_pools()
+    return resultados
+
+
+# --- Familia: http ---
+async def _casos_http_app(app, fecha, repeticiones, dni_inicial):
+    import httpx
+
+    from back.app import lifespan
+
+    async with lifespan(app):
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transporte, base_url="http://bench"
+        ) as http:
+
+            async def inscribirse(i):
+                actividad = ACTIVIDADES[i % len(ACTIVIDADES)][0]
+                res = await http.post(
+                    "/api/inscribirse",
+                    json={
+                        "actividad": actividad,
+                        "fecha": fecha,
+                        "hora": HORAS[(i // len(ACTIVIDADES)) % len(HORAS)],
+                        "participantes": [
+                            {
+                                "nombre": "Visitante",
+                                "dni": dni_inicial + i * 2 + j,
+                                "edad": 30,
+                                "talle": "M",
+                            }
+                            for j in range(2)
+                        ],
+                        "email": "bench@ecopark.com",
+                        "acepta_terminos": True,
+                    },
+                )
+                res.raise_for_status()
+
+            return await medir_async(inscribirse, repeticiones)
+
+
+def casos_http(repeticiones):
+    from back.app import crear_app
+    from back.src.repositorios import base
+    from back.src.repositorios.conexion import cerrar_pools
+
+    os.environ["ECOPARK_OUTBOX_ACTIVO"] = "0"
+    fecha = fecha_reservable().isoformat()
+    resultados = {}
+    ruta_original = base.DB_PATH
+    try:
+        for modo_async in (False, True):
+            with tempfile.TemporaryDirectory(prefix="bench_suite_") as tmp:
+                ruta = crear_bd_sintetica(dias=4, directorio=tmp)
+                ampliar_cupos(ruta)
+                base.DB_PATH = ruta
+                app = crear_app(modo_async=modo_async)
+                modo = "async" if modo_async else "sync"
+                nombre = f"http.inscribirse[modo={modo}]"
+                resultados[nombre] = asyncio.run(
+                    _casos_http_app(app, fecha, repeticiones, 60_000_000)
+                )
+                cerrar_pools()
+    finally:
+        base.DB_PATH = ruta_original
+    return resultados
+
+
+# --- Ejecución y comparación ---
+def correr(familias=("servicio", "repo", "http"), rapida=False) -> dict:
+    previas = PREVIAS_RAPIDA if rapida else PREVIAS
+    repeticiones = 100 if rapida else 500
+    resultados = {}
+    if "servicio" in familias:
+        resultados.update(casos_servicio(previas, GRUPOS, repeticiones))
+    if "repo" in familias:
+        resultados.update(casos_repo(previas, repeticiones))
+    if "http" in familias:
+        resultados.update(casos_http(repeticiones // 2))
+    return {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "maquina": platform.machine(),
+            "rapida": rapida,
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar_resultados(
+    base: dict, nuevo: dict, tolerancia=TOLERANCIA
+) -> list:
+    """
+    Compara la mediana de cada caso. Devuelve filas (caso, base_us, nuevo_us,
+    cociente, estado) con estado: regresión, mejora, igual, nuevo o ausente.
+    """
+    previos, actuales = base["resultados"], nuevo["resultados"]
+    filas = []
+    for caso in sorted(previos.keys() | actuales.keys()):
+        if caso not in actuales:
+            filas.append(
+                (caso, previos[caso]["mediana_us"], None, None, "ausente")
+            )
+            continue
+        if caso not in previos:
+            filas.append(
+                (caso, None, actuales[caso]["mediana_us"], None, "nuevo")
+            )
+            continue
+        antes = previos[caso]["mediana_us"]
+        ahora = actuales[caso]["mediana_us"]
+        cociente = ahora / antes if antes else float("inf")
+        if cociente > 1 + tolerancia:
+            estado = "regresión"
+        elif cociente < 1 - tolerancia:
+            estado = "mejora"
+        else:
+            estado = "igual"
+        filas.append((caso, antes, ahora, cociente, estado))
+    return filas
+
+
+def _us(valor):
+    return "-" if valor is None else f"{valor:.1f}"
+
+
+def imprimir_resultados(resultados: dict):
+    print(f"{'caso':<62} {'p50 µs':>10} {'p95 µs':>10}")
+    for caso, r in resultados["resultados"].items():
+        print(f"{caso:<62} {r['mediana_us']:10.1f} {r['p95_us']:10.1f}")
+
+
+def imprimir_comparacion(filas):
+    print(f"{'caso':<62} {'base µs':>10} {'nuevo µs':>10} {'x':>6}  estado")
+    for caso, antes, ahora, cociente, estado in filas:
+        x = "-" if cociente is None else f"{cociente:.2f}"
+        print(f"{caso:<62} {_us(antes):>10} {_us(ahora):>10} {x:>6}  {estado}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Suite de benchmarks de EcoHarmony Park"
+    )
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p_correr = comandos.add_parser("correr", help="correr los benchmarks")
+    p_correr.add_argument(
+        "--salida", help="archivo JSON donde guardar los resultados"
+    )
+    p_correr.add_argument(
+        "--rapida",
+        action="store_true",
+        help="tamaños chicos (hasta 10k previas)",
+    )
+    p_correr.add_argument(
+        "--familia", action="append", choices=("servicio", "repo", "http"),
+        help="correr solo esta familia (se puede repetir)",
+    )
+
+    p_comparar = comandos.add_parser(
+        "comparar", help="comparar contra la línea base"
+    )
+    p_comparar.add_argument("resultados")
+    p_comparar.add_argument("--base", default=LINEA_BASE)
+    p_comparar.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+
+    args = parser.parse_args(argv)
+    if args.comando == "correr":
+        resultados = correr(
+            args.familia or ("servicio", "repo", "http"), args.rapida
+        )
+        imprimir_resultados(resultados)
+        if args.salida:
+            Path(args.salida).write_text(
+                json.dumps(resultados, indent=2) + "\n", encoding="utf-8"
+            )
+            print(f"✅ resultados guardados en {args.salida}")
+        return 0
+
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    nuevo = json.loads(Path(args.resultados).read_text(encoding="utf-8"))
+    if base["meta"].get("rapida") != nuevo["meta"].get("rapida"):
+        print("⚠️ la línea base y los resultados usan tamaños distintos")
+    filas = comparar_resultados(base, nuevo, args.tolerancia)
+    imprimir_comparacion(filas)
+    regresiones = [f for f in filas if f[4] == "regresión"]
+    if regresiones:
+        print(
+            f"❌ {len(regresiones)} regresiones "
+            f"(tolerancia {args.tolerancia:.0%})"
+        )
+        return 1
+    print("✅ sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
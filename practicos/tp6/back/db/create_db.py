@@ -1,76 +1,31 @@
 import sqlite3
-from datetime import datetime, timedelta, time
+from datetime import date, datetime, timedelta, time
+from pathlib import Path
+
+from back.src.repositorios.migraciones import aplicar_migraciones
 
 # ========================================
 # CONEXIÓN Y CREACIÓN DE TABLAS
 # ========================================
-# Para correr este script, asegurarse de estar parado
-# sobre la carpeta de BD y ejecutar:
-#       python create_db.py
+# Para correr este script, pararse sobre la carpeta tp6
+# y ejecutar:
+#       python -m back.db.create_db
 # Esto creará la base de datos y las tablas necesarias
-# si no existen y cargará las ACTIVIDADES y TURNOS de
-# las próximas 4 semanas.
+# (migraciones) si no existen y cargará las ACTIVIDADES y
+# los TURNOS que falten hasta las próximas 4 semanas.
+#
+# También se puede importar: generar_turnos(conn) solo
+# agrega los días del horizonte en los que una actividad
+# todavía no tiene turnos (completa también los huecos).
 # ========================================
-RUTA_BD = "./bd_ecopark.db"
-
-# Crear o conectar a la base de datos
-conn = sqlite3.connect(RUTA_BD)
-cursor = conn.cursor()
-
-# Crear tablas si no existen
-cursor.execute(
-    """
-    CREATE TABLE IF NOT EXISTS Actividad (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        nombre TEXT NOT NULL,
-        capacidad_maxima INTEGER NOT NULL,
-        requiere_vestimenta INTEGER NOT NULL DEFAULT 0,
-        edad_minima INTEGER
-    )
-"""
-)
-
-cursor.execute(
-    """
-    CREATE TABLE IF NOT EXISTS Turno (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        actividad_id INTEGER NOT NULL,
-        fecha TEXT NOT NULL,
-        hora TEXT NOT NULL,
-        cupo_disponible INTEGER NOT NULL,
-        FOREIGN KEY (actividad_id) REFERENCES Actividad(id)
-    )
-"""
-)
+RUTA_BD = Path(__file__).resolve().parent / "bd_ecopark.db"
 
-cursor.execute(
-    """
-    CREATE TABLE IF NOT EXISTS Inscripcion (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        turno_id INTEGER NOT NULL,
-        email_contacto TEXT NOT NULL,
-        total_personas INTEGER NOT NULL,
-        acepta_terminos INTEGER NOT NULL DEFAULT 0,
-        FOREIGN KEY (turno_id) REFERENCES Turno(id)
-    )
-"""
-)
 
-cursor.execute(
-    """
-    CREATE TABLE IF NOT EXISTS Visitante (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        inscripcion_id INTEGER NOT NULL,
-        nombre TEXT NOT NULL,
-        dni INTEGER NOT NULL,
-        edad INTEGER NOT NULL,
-        talle TEXT,
-        FOREIGN KEY (inscripcion_id) REFERENCES Inscripcion(id)
-    )
-"""
-)
+def conectar(ruta=RUTA_BD) -> sqlite3.Connection:
+    """Aplica las migraciones pendientes y abre una conexión a la BD."""
+    aplicar_migraciones(ruta)
+    return sqlite3.connect(ruta)
 
-conn.commit()
 
 # ========================================
 # CONFIGURACIÓN DEL PARQUE NATURAL
@@ -99,76 +54,110 @@ ACTIVIDADES_PREDEFINIDAS = [
 # ========================================
 
 
-def asegurar_actividades(cursor):
+def asegurar_actividades(cursor, actividades=ACTIVIDADES_PREDEFINIDAS):
     """Inserta las actividades base si no existen."""
-    for nombre, cupo, requiere_vestimenta, edad_minima in ACTIVIDADES_PREDEFINIDAS:
-        cursor.execute("SELECT id FROM Actividad WHERE nombre = ?", (nombre,))
-        if cursor.fetchone() is None:
-            cursor.execute(
-                """
-                INSERT INTO Actividad (nombre, capacidad_maxima, requiere_vestimenta, edad_minima)
-                VALUES (?, ?, ?, ?)
-            """,
-                (nombre, cupo, requiere_vestimenta, edad_minima),
-            )
+    cursor.execute("SELECT nombre FROM Actividad")
+    existentes = {nombre for (nombre,) in cursor.fetchall()}
+    cursor.executemany(
+        """
+        INSERT INTO Actividad
+            (nombre, capacidad_maxima, requiere_vestimenta, edad_minima)
+        VALUES (?, ?, ?, ?)
+        """,
+        [a for a in actividades if a[0] not in existentes],
+    )
     print("✅ Actividades base verificadas o insertadas correctamente.")
 
 
-def obtener_ultima_fecha(cursor):
-    cursor.execute("SELECT MAX(fecha) FROM Turno")
-    resultado = cursor.fetchone()[0]
-    if resultado:
-        return datetime.strptime(resultado, "%Y-%m-%d").date()
-    return None
+def dias_con_turnos(cursor, desde: date, hasta: date) -> set:
+    """(actividad_id, 'YYYY-MM-DD') que ya tienen turnos en el rango.
+
+    Usa el índice único de Turno.
+    """
+    cursor.execute(
+        "SELECT DISTINCT actividad_id, fecha FROM Turno "
+        "WHERE fecha BETWEEN ? AND ?",
+        (desde.isoformat(), hasta.isoformat()),
+    )
+    return set(cursor.fetchall())
+
+
+def horarios_del_dia() -> list:
+    """Horas de inicio de los turnos de un día ('HH:MM')."""
+    hora = datetime.combine(date.min, HORARIO_INICIO)
+    fin = datetime.combine(date.min, HORARIO_FIN)
+    horarios = []
+    while hora < fin:
+        horarios.append(hora.strftime("%H:%M"))
+        hora += timedelta(minutes=DURACION_TURNO_MIN)
+    return horarios
+
+
+def dias_abiertos(desde: date, hasta: date) -> list:
+    """Fechas ('YYYY-MM-DD') entre desde y hasta en las que abre el parque."""
+    dias = []
+    fecha = desde
+    while fecha <= hasta:
+        # Saltar lunes y feriados
+        if (
+            fecha.weekday() not in DIAS_CERRADOS
+            and fecha.isoformat() not in FERIADOS
+        ):
+            dias.append(fecha.isoformat())
+        fecha += timedelta(days=1)
+    return dias
+
+
+def turnos_faltantes(actividades, existentes, desde: date, hasta: date):
+    """
+    Genera las filas (actividad_id, fecha, hora, cupo) que faltan: para cada
+    actividad, los días abiertos del rango en los que todavía no tiene
+    turnos, estén al final del horizonte o en medio (huecos). Como antes,
+    un día que ya tiene turnos no se toca.
+    """
+    dias = dias_abiertos(desde, hasta)
+    horarios = horarios_del_dia()
+    for actividad_id, capacidad in actividades:
+        for fecha in dias:
+            if (actividad_id, fecha) in existentes:
+                continue
+            for hora in horarios:
+                yield (actividad_id, fecha, hora, capacidad)
 
 
-def generar_turnos(cursor):
-    """Genera turnos nuevos según las reglas del parque."""
-    hoy = datetime.now().date()
-    fecha_limite = hoy + timedelta(weeks=HORIZONTE_SEMANAS)
+def generar_turnos(conn, hoy=None, horizonte_semanas=HORIZONTE_SEMANAS) -> int:
+    """
+    Genera los turnos que faltan hasta el horizonte en una sola transacción
+    y devuelve cuántos se insertaron. Los turnos ya existentes se ignoran
+    (índice único por actividad, fecha y hora).
+    """
+    hoy = hoy or datetime.now().date()
+    fecha_limite = hoy + timedelta(weeks=horizonte_semanas)
 
     print(f"🧩 Generando turnos desde {hoy} hasta {fecha_limite}...")
 
-    cursor.execute("SELECT id, capacidad_maxima FROM Actividad")
-    actividades = cursor.fetchall()
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, capacidad_maxima FROM Actividad")
+        actividades = cursor.fetchall()
+        antes = conn.total_changes
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO Turno
+                (actividad_id, fecha, hora, cupo_disponible)
+            VALUES (?, ?, ?, ?)
+            """,
+            turnos_faltantes(
+                actividades,
+                dias_con_turnos(cursor, hoy, fecha_limite),
+                hoy,
+                fecha_limite,
+            ),
+        )
+        insertados = conn.total_changes - antes
 
-    for actividad_id, capacidad in actividades:
-        fecha = hoy
-        while fecha <= fecha_limite:
-            # Saltar lunes y feriados
-            if (
-                fecha.weekday() not in DIAS_CERRADOS
-                and fecha.strftime("%Y-%m-%d") not in FERIADOS
-            ):
-                # Verificar si ya existen turnos para esa fecha y actividad
-                cursor.execute(
-                    "SELECT COUNT(*) FROM Turno WHERE actividad_id=? AND fecha=?",
-                    (actividad_id, fecha),
-                )
-                ya_existen = cursor.fetchone()[0]
-
-                if ya_existen == 0:
-                    hora = datetime.combine(fecha, HORARIO_INICIO)
-                    fin = datetime.combine(fecha, HORARIO_FIN)
-
-                    while hora < fin:
-                        cursor.execute(
-                            """
-                            INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible)
-                            VALUES (?, ?, ?, ?)
-                        """,
-                            (
-                                actividad_id,
-                                fecha.strftime("%Y-%m-%d"),
-                                hora.strftime("%H:%M"),
-                                capacidad,
-                            ),
-                        )
-                        hora += timedelta(minutes=DURACION_TURNO_MIN)
-
-            fecha += timedelta(days=1)
-
-    print("✅ Turnos generados correctamente.")
+    print(f"✅ {insertados} turnos generados correctamente.")
+    return insertados
 
 
 # ========================================
@@ -176,10 +165,11 @@ def generar_turnos(cursor):
 # ========================================
 
 if __name__ == "__main__":
+    conn = conectar()
     try:
-        asegurar_actividades(cursor)
-        generar_turnos(cursor)
+        asegurar_actividades(conn.cursor())
         conn.commit()
+        generar_turnos(conn)
         print("🎉 Proceso completado sin errores.")
     except Exception as e:
         print("⚠️ Error durante la generación de turnos:", e)
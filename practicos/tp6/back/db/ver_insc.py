@@ -1,78 +1,143 @@
+import argparse
 import sqlite3
+from pathlib import Path
+
+from back.src.reporte_inscripciones import (
+    EXPORTADORES,
+    abrir_solo_lectura,
+    imprimir_inscripciones,
+    iterar_inscripciones,
+)
+
+# ========================================
+# Desde la carpeta tp6:
+#   python -m back.db.ver_insc [--desde AAAA-MM-DD] [--hasta AAAA-MM-DD]
+#       [--actividad NOMBRE]
+#   python -m back.db.ver_insc exportar reporte.csv
+#       [--formato csv|ndjson] [filtros]
+#   python -m back.db.ver_insc limpiar --confirmar
+# Ver y exportar solo leen la BD; limpiar borra todas las
+# inscripciones y restaura los cupos.
+# ========================================
+RUTA_BD = Path(__file__).resolve().parent / "bd_ecopark.db"
+
+
+def ver_inscripciones(
+    ruta=RUTA_BD, desde=None, hasta=None, actividad=None
+) -> int:
+    conn = abrir_solo_lectura(ruta)
+    try:
+        print("📋 INSCRIPCIONES REGISTRADAS:\n")
+        cantidad = imprimir_inscripciones(
+            iterar_inscripciones(conn, desde, hasta, actividad)
+        )
+        if not cantidad:
+            print("🟢 No hay inscripciones registradas.\n")
+        return cantidad
+    finally:
+        conn.close()
+
+
+def exportar_inscripciones(
+    destino,
+    formato="csv",
+    ruta=RUTA_BD,
+    desde=None,
+    hasta=None,
+    actividad=None,
+) -> int:
+    conn = abrir_solo_lectura(ruta)
+    try:
+        cantidad = EXPORTADORES[formato](
+            iterar_inscripciones(conn, desde, hasta, actividad), destino
+        )
+        print(f"✅ {cantidad} inscripciones exportadas a {destino}")
+        return cantidad
+    finally:
+        conn.close()
+
+
+def limpiar_inscripciones(ruta=RUTA_BD) -> int:
+    """Borra las inscripciones, sus visitantes y correos; restaura cupos."""
+    conn = sqlite3.connect(ruta)
+    try:
+        with conn:
+            cantidad = conn.execute(
+                "SELECT COUNT(*) FROM Inscripcion"
+            ).fetchone()[0]
+            print(f"🗑️ Eliminando {cantidad} inscripciones...\n")
+
+            # Borrar en orden: CorreoPendiente / Visitante → Inscripcion
+            conn.execute("DELETE FROM CorreoPendiente")
+            conn.execute("DELETE FROM Visitante")
+            conn.execute("DELETE FROM Inscripcion")
+
+            # Restaurar cupos disponibles
+            conn.execute(
+                """
+                UPDATE Turno
+                SET cupo_disponible = (
+                    SELECT capacidad_maxima
+                    FROM Actividad
+                    WHERE Actividad.id = Turno.actividad_id
+                )
+                """
+            )
+        print("✅ Inscripciones eliminadas y cupos restaurados correctamente.\n")
+        return cantidad
+    finally:
+        conn.close()
 
-RUTA_BD = "./bd_ecopark.db"
 
+def _agregar_filtros(parser, default=None):
+    parser.add_argument(
+        "--desde", default=default, help="fecha mínima del turno (AAAA-MM-DD)"
+    )
+    parser.add_argument(
+        "--hasta", default=default, help="fecha máxima del turno (AAAA-MM-DD)"
+    )
+    parser.add_argument(
+        "--actividad", default=default, help="nombre de la actividad"
+    )
 
-def ver_y_limpiar_inscripciones():
-    conn = sqlite3.connect(RUTA_BD)
-    cursor = conn.cursor()
 
-    print("📋 INSCRIPCIONES REGISTRADAS:\n")
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Reporte de inscripciones de EcoHarmony Park"
+    )
+    parser.add_argument(
+        "--bd", default=RUTA_BD, help="ruta de la base de datos"
+    )
+    _agregar_filtros(parser)
+    comandos = parser.add_subparsers(dest="comando")
 
-    # Traer inscripciones con sus visitantes
-    cursor.execute(
-        """
-        SELECT I.id, I.turno_id, I.email_contacto, I.total_personas, I.acepta_terminos,
-               T.fecha, T.hora, A.nombre
-        FROM Inscripcion I
-        JOIN Turno T ON I.turno_id = T.id
-        JOIN Actividad A ON T.actividad_id = A.id
-        ORDER BY T.fecha, T.hora
-    """
+    exportar = comandos.add_parser("exportar", help="exportar a CSV o NDJSON")
+    exportar.add_argument("destino")
+    exportar.add_argument(
+        "--formato", choices=sorted(EXPORTADORES), default="csv"
     )
+    # SUPPRESS: que los filtros puedan ir antes o después del subcomando
+    _agregar_filtros(exportar, default=argparse.SUPPRESS)
 
-    inscripciones = cursor.fetchall()
-
-    if not inscripciones:
-        print("🟢 No hay inscripciones registradas.\n")
-    else:
-        for ins in inscripciones:
-            ins_id, turno_id, email, total, acepta, fecha, hora, actividad = ins
-            print(f"🧾 Inscripción #{ins_id}")
-            print(f"   Actividad: {actividad}")
-            print(f"   Turno: {fecha} {hora}")
-            print(f"   Email: {email}")
-            print(f"   Personas: {total}")
-            print(f"   Acepta términos: {'Sí' if acepta else 'No'}")
-
-            # Obtener visitantes asociados
-            cursor.execute(
-                """
-                SELECT nombre, dni, edad, talle
-                FROM Visitante
-                WHERE inscripcion_id = ?
-            """,
-                (ins_id,),
-            )
-            visitantes = cursor.fetchall()
-
-            for v in visitantes:
-                print(f"     👤 {v[0]} (DNI {v[1]}, {v[2]} años, talle {v[3]})")
-            print("")
-
-        print(f"🗑️ Eliminando {len(inscripciones)} inscripciones...\n")
-
-        # Borrar en orden correcto (Visitante → Inscripcion)
-        cursor.execute("DELETE FROM Visitante")
-        cursor.execute("DELETE FROM Inscripcion")
-
-        # Restaurar cupos disponibles
-        cursor.execute(
-            """
-            UPDATE Turno
-            SET cupo_disponible = (
-                SELECT capacidad_maxima
-                FROM Actividad
-                WHERE Actividad.id = Turno.actividad_id
-            )
-        """
+    limpiar = comandos.add_parser(
+        "limpiar", help="borrar todas las inscripciones"
+    )
+    limpiar.add_argument("--confirmar", action="store_true", required=True)
+
+    args = parser.parse_args(argv)
+    if args.comando == "limpiar":
+        return limpiar_inscripciones(args.bd)
+    if args.comando == "exportar":
+        return exportar_inscripciones(
+            args.destino,
+            args.formato,
+            args.bd,
+            args.desde,
+            args.hasta,
+            args.actividad,
         )
-
-        conn.commit()
-        print("✅ Inscripciones eliminadas y cupos restaurados correctamente.\n")
-
-    conn.close()
+    return ver_inscripciones(args.bd, args.desde, args.hasta, args.actividad)
 
 
 if __name__ == "__main__":
-    ver_y_limpiar_inscripciones()
+    main()
@@ -0,0 +1,133 @@
+"""
+Cache de respuestas de lectura con ETag.
+
+Guarda el cuerpo ya serializado (bytes) de GET /api/actividades y
+GET /api/turnos por ruta y query, junto con la versión de los datos con la
+que se armó. La versión sale de BUS_CUPOS, que la sube cada vez que una
+reserva confirma, así que un acierto no lee tablas. Para ver lo que
+escriben otros procesos (create_db.py, otros workers) además se mira
+PRAGMA data_version de la conexión del hilo (ECOPARK_CACHE_ENTRE_PROCESOS,
+activo por defecto): si cambió, otra conexión escribió y la versión sube.
+
+El ETag es un hash del cuerpo: si un cambio no altera una respuesta, su
+ETag sigue igual y los clientes siguen recibiendo 304.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple, Optional
+
+from back.src.eventos_cupo import BUS_CUPOS, BusCupos
+from back.src.serializacion import comprimir
+
+CAPACIDAD = 512  # respuestas guardadas (se descartan las menos usadas)
+
+
+class Entrada(NamedTuple):
+    version: int
+    etag: str
+    cuerpo: bytes
+    headers: Dict[str, str]
+    variantes: Dict[str, bytes]  # codificación (gzip, br) -> cuerpo comprimido
+
+    def comprimido(self, codificacion: str) -> bytes:
+        """El cuerpo comprimido, armado la primera vez que se pide."""
+        cuerpo = self.variantes.get(codificacion)
+        if cuerpo is None:
+            cuerpo = self.variantes[codificacion] = comprimir(
+                self.cuerpo, codificacion
+            )
+        return cuerpo
+
+
+def calcular_etag(cuerpo: bytes) -> str:
+    return '"' + hashlib.blake2b(cuerpo, digest_size=12).hexdigest() + '"'
+
+
+def etag_codificado(etag: str, codificacion: Optional[str]) -> str:
+    """Cada codificación es otra representación, con su propio ETag fuerte."""
+    return etag if codificacion is None else f'{etag[:-1]}-{codificacion}"'
+
+
+def coincide_etag(if_none_match: Optional[str], etag: str) -> bool:
+    """Evalúa If-None-Match (lista de ETags o `*`); acepta ETags débiles W/."""
+    if not if_none_match:
+        return False
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        if candidato == "*" or candidato.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class VersionDatos:
+    """
+    Versión monotónica de los datos de turnos. `data_version` (opcional)
+    devuelve PRAGMA data_version de la conexión del hilo actual: cada hilo
+    recuerda el último valor que vio y, si cambió, la versión sube.
+    """
+
+    def __init__(
+        self, bus: BusCupos = BUS_CUPOS, data_version: Callable[[], int] = None
+    ):
+        self.bus = bus
+        self.data_version = data_version
+        self._externos = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def actual(self) -> int:
+        if self.data_version is not None:
+            valor = self.data_version()
+            # La primera lectura de un hilo no tiene con qué comparar: se
+            # toma como cambio (a lo sumo un fallo de cache por hilo)
+            if getattr(self._local, "data_version", None) != valor:
+                self._local.data_version = valor
+                with self._lock:
+                    self._externos += 1
+        return self.bus.version + self._externos
+
+
+class CacheRespuestas:
+    def __init__(self, capacidad: int = CAPACIDAD):
+        self.capacidad = capacidad
+        self._entradas: "OrderedDict[Hashable, Entrada]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: Hashable, version: int) -> Optional[Entrada]:
+        """La entrada de `clave` si se armó con esta versión de los datos."""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada.version != version:
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada
+
+    def guardar(
+        self, clave: Hashable, version: int, cuerpo: bytes, headers=None
+    ) -> Entrada:
+        """
+        Guarda un cuerpo armado con los datos de `version`. La versión se
+        debe leer antes de consultar la BD: si una reserva confirma en el
+        medio, la entrada queda con una versión vieja y el próximo pedido la
+        rearma (nunca al revés).
+        """
+        entrada = Entrada(
+            version, calcular_etag(cuerpo), cuerpo, dict(headers or {}), {}
+        )
+        with self._lock:
+            actual = self._entradas.get(clave)
+            if actual is None or actual.version <= version:
+                self._entradas[clave] = entrada
+                self._entradas.move_to_end(clave)
+                while len(self._entradas) > self.capacidad:
+                    self._entradas.popitem(last=False)
+        return entrada
+
+    def limpiar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self):
+        return len(self._entradas)
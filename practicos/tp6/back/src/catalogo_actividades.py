@@ -0,0 +1,100 @@
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from back.src.repositorios.actividad_repo import RepositorioActividad
+
+
+class RegistroActividad(NamedTuple):
+    """Fila de Actividad ya tipada."""
+
+    id: int
+    nombre: str
+    capacidad_maxima: int
+    requiere_vestimenta: bool
+    edad_minima: Optional[int]
+
+    def reglas(self) -> Dict:
+        """Reglas en el formato que consume ServicioInscripcion."""
+        return {
+            "capacidad": self.capacidad_maxima,
+            "requiere_talle": self.requiere_vestimenta,
+            "edad_minima": self.edad_minima,
+        }
+
+
+class CatalogoActividades:
+    """
+    Catálogo en memoria de la tabla Actividad, indexado por id y por nombre.
+
+    Se carga una vez y se revalida de forma barata en cada acceso: primero
+    con PRAGMA data_version (no lee ninguna tabla) y, solo si otra conexión
+    escribió algo, comparando la versión de Actividad que mantienen los
+    triggers de la migración 8. Los cambios hechos desde la misma conexión
+    no alteran data_version: en ese caso hay que llamar a `invalidar()`.
+    """
+
+    def __init__(self, repo: RepositorioActividad = None):
+        self.repo = repo or RepositorioActividad()
+        self._lock = threading.Lock()
+        self._local = threading.local()  # data_version visto por cada hilo
+        self._version = None
+        self._por_id: Dict[int, RegistroActividad] = {}
+        self._por_nombre: Dict[str, RegistroActividad] = {}
+        self._reglas: Dict[str, Dict] = {}
+
+    def invalidar(self):
+        with self._lock:
+            self._version = None
+
+    def _cargar(self):
+        with self._lock:
+            version = self.repo.version()
+            if version == self._version:
+                return
+            registros = [
+                RegistroActividad(
+                    id=a[0],
+                    nombre=a[1],
+                    capacidad_maxima=a[2],
+                    requiere_vestimenta=bool(a[3]),
+                    edad_minima=a[4],
+                )
+                for a in self.repo.obtener_todas()
+            ]
+            self._por_id = {r.id: r for r in registros}
+            self._por_nombre = {r.nombre: r for r in registros}
+            self._reglas = {r.nombre: r.reglas() for r in registros}
+            self._version = version
+
+    def _revalidar(self):
+        data_version = self.repo.data_version()
+        if (
+            self._version is not None
+            and getattr(self._local, "data_version", None) == data_version
+        ):
+            return
+        self._local.data_version = data_version
+        self._cargar()
+
+    # --- Consultas ---
+    def por_id(self, actividad_id: int) -> Optional[RegistroActividad]:
+        self._revalidar()
+        return self._por_id.get(actividad_id)
+
+    def por_nombre(self, nombre: str) -> Optional[RegistroActividad]:
+        self._revalidar()
+        return self._por_nombre.get(nombre)
+
+    def todas(self) -> List[RegistroActividad]:
+        self._revalidar()
+        return list(self._por_id.values())
+
+    def version(self) -> int:
+        """Versión de la tabla Actividad del catálogo cargado."""
+        self._revalidar()
+        return self._version
+
+    def setup_actividades(self) -> Dict[str, Dict]:
+        """Reglas por actividad: capacidad, requiere_talle y edad_minima."""
+        self._revalidar()
+        return self._reglas
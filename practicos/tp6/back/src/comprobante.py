@@ -0,0 +1,275 @@
+"""
+Renderizado del comprobante de inscripción.
+
+La plantilla HTML se separa en partes fijas una sola vez y en cada
+comprobante solo se intercalan los datos de la reserva (escapados).
+El logo se lee y se codifica en base64 una única vez por proceso.
+"""
+
+import base64
+import html
+import logging
+import secrets
+from email import policy
+from email.mime.base import MIMEBase
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from functools import lru_cache
+from pathlib import Path
+from string import Formatter
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_PUBLIC = (
+    Path(__file__).resolve().parent.parent.parent
+    / "front"
+    / "ecoharmony-ui"
+    / "public"
+)
+NOMBRES_LOGO = ("logo.png", "logo.PNG")
+
+# Misma política que usa smtplib.send_message: compat32 con fin de línea CRLF
+POLITICA_SMTP = policy.compat32.clone(linesep="\r\n")
+
+PLANTILLA_COMPROBANTE = """
+<html>
+<body style="font-family: Arial, sans-serif; background-color: #E8FCCF;
+             padding: 30px; margin: 0;">
+  <div style="max-width: 650px; margin: auto; background-color: #ffffff;
+              border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+              overflow: hidden;">
+
+    <div style="background-color: #134611; text-align: center;
+                padding: 20px;">
+      <img src="cid:logo" alt="Logo"
+           style="height: 70px; margin-bottom: 10px;">
+      <h2 style="color: #E8FCCF; margin: 0;">EcoHarmony Park</h2>
+    </div>
+
+    <div style="padding: 25px 30px; background-color: #3DA35D;
+                color: white;">
+      <h3 style="text-align: center; margin-top: 0;">
+        🌿 ¡Inscripción Confirmada!
+      </h3>
+      <p style="font-size: 16px;">
+        Tu inscripción fue registrada correctamente. A continuación,
+        encontrarás los detalles del turno:
+      </p>
+
+      <table style="width: 100%; border-collapse: collapse;
+                    background-color: #E8FCCF; color: #134611;
+                    border-radius: 8px; margin-top: 15px;">
+        {fila_id}
+        <tr>
+          <td style="padding: 10px;"><strong>Actividad:</strong></td>
+          <td style="padding: 10px;">{actividad}</td>
+        </tr>
+        <tr style="background-color: #C9F3B3;">
+          <td style="padding: 10px;"><strong>Fecha:</strong></td>
+          <td style="padding: 10px;">{fecha}</td>
+        </tr>
+        <tr>
+          <td style="padding: 10px;"><strong>Hora:</strong></td>
+          <td style="padding: 10px;">{hora}</td>
+        </tr>
+        <tr style="background-color: #C9F3B3;">
+          <td style="padding: 10px;">
+            <strong>Correo de contacto:</strong>
+          </td>
+          <td style="padding: 10px;">{email}</td>
+        </tr>
+      </table>
+
+      <h4 style="margin-top: 25px; color: #134611;">👥 Participantes:</h4>
+      <ul style="color: #134611; font-size: 15px; background-color: #E8FCCF;
+                 border-radius: 8px; padding: 15px;
+                 list-style-type: circle;">
+        {participantes}
+      </ul>
+
+      <p style="margin-top: 25px; font-size: 15px; color: #134611;">
+        Te esperamos el día <strong>{fecha}</strong>
+        a las <strong>{hora}</strong>.
+      </p>
+    </div>
+
+    <div style="background-color: #96E072; text-align: center;
+                padding: 15px;">
+      <p style="font-size: 13px; color: #134611; margin: 0;">
+        Este es un mensaje automático, por favor no respondas a este correo.
+      </p>
+    </div>
+  </div>
+</body>
+</html>
+"""
+
+FILA_ID = (
+    '<tr><td style="padding: 10px;"><strong>N° Inscripción:</strong></td>'
+    '<td style="padding: 10px;">{}</td></tr>'
+)
+
+
+def compilar_plantilla(plantilla: str):
+    """Separa la plantilla en [(texto fijo, campo o None), ...]."""
+    return [
+        (literal, campo)
+        for literal, campo, _, _ in Formatter().parse(plantilla)
+    ]
+
+
+def buscar_logo(directorio: Path = DIRECTORIO_PUBLIC):
+    for nombre in NOMBRES_LOGO:
+        ruta = directorio / nombre
+        if ruta.exists():
+            return ruta
+    return None
+
+
+class RenderizadorComprobante:
+    """Arma el HTML y el mensaje MIME de los comprobantes."""
+
+    def __init__(self, ruta_logo=None, plantilla: str = PLANTILLA_COMPROBANTE):
+        self._partes = compilar_plantilla(plantilla)
+        ruta_logo = ruta_logo or buscar_logo()
+        self._logo_b64 = None
+        self._logo_serializado = None
+        if ruta_logo is not None and Path(ruta_logo).exists():
+            # encodebytes corta en líneas de 76 caracteres, como pide MIME
+            self._logo_b64 = base64.encodebytes(
+                Path(ruta_logo).read_bytes()
+            ).decode("ascii")
+        else:
+            logger.warning(
+                "No se encontró el logo en %s", ruta_logo or DIRECTORIO_PUBLIC
+            )
+
+    @property
+    def tiene_logo(self) -> bool:
+        return self._logo_b64 is not None
+
+    def _valores(self, inscripcion, email_contacto, id_inscripcion):
+        turno = inscripcion.turno
+        participantes = "".join(
+            f"<li>{html.escape(str(v.nombre))} (DNI: {v.dni}, Edad: {v.edad}"
+            f"{' - Talle ' + html.escape(v.talle) if v.talle else ''})</li>"
+            for v in inscripcion.visitantes
+        )
+        fila_id = ""
+        if id_inscripcion is not None:
+            fila_id = FILA_ID.format(html.escape(str(id_inscripcion)))
+        return {
+            "fila_id": fila_id,
+            "actividad": html.escape(turno.actividad_nombre),
+            "fecha": turno.fecha.strftime("%d/%m/%Y"),
+            "hora": turno.hora.strftime("%H:%M"),
+            "email": html.escape(email_contacto),
+            "participantes": participantes,
+        }
+
+    def generar_html(
+        self, inscripcion, email_contacto, id_inscripcion=None
+    ) -> str:
+        valores = self._valores(inscripcion, email_contacto, id_inscripcion)
+        return "".join(
+            [
+                literal + (valores[campo] if campo else "")
+                for literal, campo in self._partes
+            ]
+        )
+
+    def renderizar_lote(self, comprobantes):
+        """Genera el HTML de cada (inscripcion, email, id_inscripcion)."""
+        for inscripcion, email_contacto, id_inscripcion in comprobantes:
+            yield self.generar_html(
+                inscripcion, email_contacto, id_inscripcion
+            )
+
+    def parte_logo(self):
+        """Parte MIME del logo, reutilizando el base64 ya calculado."""
+        if self._logo_b64 is None:
+            return None
+        img = MIMEBase("image", "png")
+        img.set_payload(self._logo_b64)
+        img["Content-Transfer-Encoding"] = "base64"
+        # Debe coincidir con el cid usado en el HTML
+        img.add_header("Content-ID", "<logo>")
+        img.add_header("Content-Disposition", "inline", filename="logo.png")
+        return img
+
+    def construir_mensaje(
+        self,
+        inscripcion,
+        email_contacto,
+        remitente,
+        id_inscripcion=None,
+        con_logo=True,
+    ):
+        mensaje = MIMEMultipart("related", boundary=_nuevo_separador())
+        actividad = inscripcion.turno.actividad_nombre
+        if id_inscripcion is not None:
+            mensaje["Subject"] = (
+                f"Comprobante de inscripción #{id_inscripcion} - {actividad}"
+            )
+        else:
+            mensaje["Subject"] = f"Comprobante de inscripción - {actividad}"
+        mensaje["From"] = remitente
+        mensaje["To"] = email_contacto
+        mensaje.attach(
+            MIMEText(
+                self.generar_html(inscripcion, email_contacto, id_inscripcion),
+                "html",
+            )
+        )
+        logo = self.parte_logo() if con_logo else None
+        if logo is not None:
+            mensaje.attach(logo)
+        return mensaje
+
+    def serializar_mensaje(
+        self, inscripcion, email_contacto, remitente, id_inscripcion=None
+    ) -> bytes:
+        """
+        Devuelve el mensaje listo para `sendmail`. Serializar el logo (~1 MB
+        en base64) es lo más caro del envío, así que esa parte se serializa
+        una sola vez y se intercala antes del separador de cierre.
+        """
+        mensaje = self.construir_mensaje(
+            inscripcion,
+            email_contacto,
+            remitente,
+            id_inscripcion,
+            con_logo=False,
+        )
+        datos = mensaje.as_bytes(policy=POLITICA_SMTP)
+        if self._logo_b64 is None:
+            return datos
+        if self._logo_serializado is None:
+            self._logo_serializado = self.parte_logo().as_bytes(
+                policy=POLITICA_SMTP
+            )
+        separador = mensaje.get_boundary().encode("ascii")
+        cierre = datos.rindex(b"--" + separador + b"--")
+        return b"".join(
+            [
+                datos[:cierre],
+                b"--",
+                separador,
+                b"\r\n",
+                self._logo_serializado,
+                b"\r\n",
+                datos[cierre:],
+            ]
+        )
+
+
+def _nuevo_separador() -> str:
+    # '_' no aparece en base64, así que el separador no puede chocar con
+    # el logo
+    return f"===============ecoharmony_{secrets.token_hex(8)}=="
+
+
+@lru_cache(maxsize=1)
+def renderizador_por_defecto() -> RenderizadorComprobante:
+    """Renderizador compartido por el proceso (el logo se carga una vez)."""
+    return RenderizadorComprobante()
@@ -0,0 +1,130 @@
+"""
+Configuración de la app leída de variables de entorno.
+Los valores por defecto son los que usa el parque en desarrollo.
+"""
+
+import os
+from dataclasses import dataclass
+
+
+def _bool(valor: str) -> bool:
+    return valor.strip().lower() in ("1", "true", "si", "sí", "yes")
+
+
+@dataclass
+class Configuracion:
+    # --- API ---
+    # Endpoints async con ejecutor de BD dedicado (opcional)
+    modo_async: bool = False
+    hilos_bd: int = 8  # tamaño del ejecutor de BD del modo async
+    metricas: bool = False  # medir pedidos para GET /metrics (opcional)
+    # Sin token /api/admin responde 404; con token lo exige en X-Admin-Token
+    admin_token: str = ""
+    # "memoria": repositorios en memoria (tests y desarrollo)
+    almacen: str = "sqlite"
+    # GET de actividades y turnos con ETag y cuerpo en cache
+    cache_respuestas: bool = True
+    # Invalidar también por PRAGMA data_version: ve lo que escriben otros
+    # procesos (create_db.py, otros workers)
+    cache_entre_procesos: bool = True
+    # Bytes desde los que se comprime el JSON (0 = nunca)
+    compresion_minimo: int = 1024
+    multiproceso: bool = False  # varios workers sobre la misma BD
+
+    # --- SQLite ---
+    # Espera por el lock de escritura en cada intento
+    sqlite_busy_ms: int = 5000
+    sqlite_reintentos: int = 5  # reintentos con backoff si la BD sigue ocupada
+    # Un hilo confirma varias reservas por COMMIT
+    escritura_agrupada: bool = False
+    escritura_max_lote: int = 32  # reservas por COMMIT como máximo
+    # Espera para juntar reservas antes del COMMIT
+    escritura_ventana_ms: float = 2.0
+
+    # --- Instrumentación de SQL ---
+    sql_instrumentar: bool = False
+    # Las sentencias más lentas van al log de consultas lentas
+    sql_umbral_ms: float = 50.0
+    sql_log_lentas: str = ""  # archivo del log (vacío = solo logging)
+
+    # --- Correo (SMTP) ---
+    smtp_servidor: str = "smtp.gmail.com"
+    smtp_puerto: int = 587
+    smtp_tls: bool = True
+    smtp_remitente: str = "inscripcionesecoharmonypark@gmail.com"
+    smtp_password: str = "odqn rlpj ntjl azud"  # clave de aplicación de Gmail
+
+    # --- Outbox de comprobantes ---
+    outbox_activo: bool = True
+    outbox_intervalo: float = 1.0  # segundos entre lotes
+    outbox_tamano_lote: int = 20
+    outbox_max_intentos: int = 5
+
+
+def cargar_configuracion() -> Configuracion:
+    """Arma la configuración a partir de las variables ECOPARK_*."""
+    env = os.environ
+    base = Configuracion()
+    multiproceso = _bool(
+        env.get("ECOPARK_MULTIPROCESO", str(base.multiproceso))
+    )
+    return Configuracion(
+        modo_async=_bool(env.get("ECOPARK_MODO_ASYNC", str(base.modo_async))),
+        hilos_bd=int(env.get("ECOPARK_HILOS_BD", base.hilos_bd)),
+        metricas=_bool(env.get("ECOPARK_METRICAS", str(base.metricas))),
+        admin_token=env.get("ECOPARK_ADMIN_TOKEN", base.admin_token),
+        almacen=env.get("ECOPARK_ALMACEN", base.almacen).strip().lower(),
+        cache_respuestas=_bool(
+            env.get("ECOPARK_CACHE_RESPUESTAS", str(base.cache_respuestas))
+        ),
+        # Con varios workers el cache tiene que ver las escrituras de los demás
+        cache_entre_procesos=_bool(
+            env.get(
+                "ECOPARK_CACHE_ENTRE_PROCESOS",
+                str(base.cache_entre_procesos or multiproceso),
+            )
+        ),
+        compresion_minimo=int(
+            env.get("ECOPARK_COMPRESION_MINIMO", base.compresion_minimo)
+        ),
+        multiproceso=multiproceso,
+        sqlite_busy_ms=int(
+            env.get("ECOPARK_SQLITE_BUSY_MS", base.sqlite_busy_ms)
+        ),
+        sqlite_reintentos=int(
+            env.get("ECOPARK_SQLITE_REINTENTOS", base.sqlite_reintentos)
+        ),
+        escritura_agrupada=_bool(
+            env.get("ECOPARK_ESCRITURA_AGRUPADA", str(base.escritura_agrupada))
+        ),
+        escritura_max_lote=int(
+            env.get("ECOPARK_ESCRITURA_MAX_LOTE", base.escritura_max_lote)
+        ),
+        escritura_ventana_ms=float(
+            env.get("ECOPARK_ESCRITURA_VENTANA_MS", base.escritura_ventana_ms)
+        ),
+        sql_instrumentar=_bool(
+            env.get("ECOPARK_SQL_INSTRUMENTAR", str(base.sql_instrumentar))
+        ),
+        sql_umbral_ms=float(
+            env.get("ECOPARK_SQL_UMBRAL_MS", base.sql_umbral_ms)
+        ),
+        sql_log_lentas=env.get("ECOPARK_SQL_LOG_LENTAS", base.sql_log_lentas),
+        smtp_servidor=env.get("ECOPARK_SMTP_SERVIDOR", base.smtp_servidor),
+        smtp_puerto=int(env.get("ECOPARK_SMTP_PUERTO", base.smtp_puerto)),
+        smtp_tls=_bool(env.get("ECOPARK_SMTP_TLS", str(base.smtp_tls))),
+        smtp_remitente=env.get("ECOPARK_SMTP_REMITENTE", base.smtp_remitente),
+        smtp_password=env.get("ECOPARK_SMTP_PASSWORD", base.smtp_password),
+        outbox_activo=_bool(
+            env.get("ECOPARK_OUTBOX_ACTIVO", str(base.outbox_activo))
+        ),
+        outbox_intervalo=float(
+            env.get("ECOPARK_OUTBOX_INTERVALO", base.outbox_intervalo)
+        ),
+        outbox_tamano_lote=int(
+            env.get("ECOPARK_OUTBOX_TAMANO_LOTE", base.outbox_tamano_lote)
+        ),
+        outbox_max_intentos=int(
+            env.get("ECOPARK_OUTBOX_MAX_INTENTOS", base.outbox_max_intentos)
+        ),
+    )
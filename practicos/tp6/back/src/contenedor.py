@@ -0,0 +1,111 @@
+"""
+Contenedor de la app: los objetos que viven lo mismo que el proceso.
+
+Se arma una vez en el lifespan (configuración, repositorios, pool de
+conexiones, catálogo de actividades y servicio de correo) y los endpoints
+lo reciben con `Depends(obtener_contenedor)` en vez de construir sus
+dependencias en cada pedido.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from fastapi import Request
+
+from back.src.cache_respuestas import CacheRespuestas, VersionDatos
+from back.src.catalogo_actividades import CatalogoActividades
+from back.src.configuracion import Configuracion
+from back.src.escritor_agrupado import EscritorAgrupado
+from back.src.repositorios import base
+from back.src.repositorios.almacenes import (
+    ALMACEN_SQLITE,
+    Repositorios,
+    crear_repositorios,
+)
+from back.src.repositorios.asincrono import en_cada_hilo
+from back.src.repositorios.conexion import PoolConexiones, obtener_pool
+from back.src.servicio_correo import ServicioCorreo
+
+
+@dataclass
+class ContenedorApp:
+    config: Configuracion
+    repos: Repositorios
+    pool: Optional[PoolConexiones]  # None con ECOPARK_ALMACEN=memoria
+    catalogo: CatalogoActividades
+    correo: ServicioCorreo
+    version_datos: VersionDatos
+    cache: Optional[CacheRespuestas]  # None con ECOPARK_CACHE_RESPUESTAS=0
+    # Solo con ECOPARK_ESCRITURA_AGRUPADA=1 y SQLite
+    escritor: Optional[EscritorAgrupado]
+
+
+def crear_servicio_correo(config: Configuracion) -> ServicioCorreo:
+    return ServicioCorreo(
+        remitente=config.smtp_remitente,
+        password_app=config.smtp_password,
+        servidor=config.smtp_servidor,
+        puerto=config.smtp_puerto,
+        usar_tls=config.smtp_tls,
+    )
+
+
+def crear_contenedor(config: Configuracion) -> ContenedorApp:
+    sqlite = config.almacen == ALMACEN_SQLITE
+    if config.multiproceso and not sqlite:
+        raise ValueError(
+            "ECOPARK_MULTIPROCESO necesita ECOPARK_ALMACEN=sqlite: "
+            "la memoria no se comparte"
+        )
+    repos = crear_repositorios(config.almacen)
+    # Entre procesos la versión también mira PRAGMA data_version
+    data_version = None
+    if sqlite and config.cache_entre_procesos:
+        data_version = repos.actividades.data_version
+    return ContenedorApp(
+        config=config,
+        repos=repos,
+        pool=obtener_pool(base.DB_PATH) if sqlite else None,
+        catalogo=CatalogoActividades(repos.actividades),
+        correo=crear_servicio_correo(config),
+        version_datos=VersionDatos(data_version=data_version),
+        cache=CacheRespuestas() if config.cache_respuestas else None,
+        escritor=(
+            EscritorAgrupado(
+                repos.inscripciones,
+                max_lote=config.escritura_max_lote,
+                ventana=config.escritura_ventana_ms / 1000,
+            )
+            if sqlite and config.escritura_agrupada
+            else None
+        ),
+    )
+
+
+def precalentar(contenedor: ContenedorApp, modo_async: bool):
+    """
+    Deja todo listo antes del primer pedido: el catálogo cargado y, en cada
+    hilo que va a usar la BD, su conexión abierta con las sentencias del
+    camino de reserva ya preparadas y sus páginas en caché.
+    """
+    repos = contenedor.repos
+    hoy = date.today().isoformat()
+
+    def calentar():
+        repos.turnos.obtener_por_fecha(hoy)
+        repos.turnos.obtener_por_actividad_y_fecha(0, hoy, hoy)
+        repos.turnos.obtener_pagina_desde(hoy, None, 1)
+        repos.visitantes.dnis_con_choque([0], hoy, "09:00")
+        repos.visitantes.existe_choque_por_dni_y_fecha_hora(0, hoy, "09:00")
+
+    contenedor.catalogo.todas()
+    contenedor.version_datos.actual()
+    calentar()
+    if modo_async:
+        en_cada_hilo(calentar)
+
+
+async def obtener_contenedor(request: Request) -> ContenedorApp:
+    # async: FastAPI la resuelve en el event loop, sin pasar por el threadpool
+    return request.app.state.contenedor
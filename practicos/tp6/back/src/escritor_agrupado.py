@@ -0,0 +1,174 @@
+"""
+Group commit de reservas.
+
+Cada reserva cuesta al menos un COMMIT y, con muchas reservas concurrentes,
+el techo lo pone la latencia del fsync. Con el escritor agrupado los
+pedidos de /api/inscribirse no abren su propia transacción: dejan la
+reserva en una cola y esperan su resultado. Un único hilo escritor junta
+lo que llegó en los últimos `ventana` segundos (o hasta `max_lote`
+reservas) y lo confirma con un solo COMMIT mediante
+InscripcionRepo.reservar_varias. Cada llamador recibe su propio id o la
+excepción de su reserva (ErrorSinCupo, ErrorChoqueHorario, ...), igual
+que con InscripcionRepo.reservar.
+
+Los hilos llaman a `reservar`, que bloquea hasta el COMMIT. El event loop
+usa `encolar` y espera el Future con asyncio.wrap_future, así ningún hilo
+queda tomado mientras la reserva espera su tanda.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import NamedTuple
+
+from back.src.metricas import ESCRITOR_LOTE
+
+logger = logging.getLogger(__name__)
+
+
+class Pedido(NamedTuple):
+    inscripcion: object
+    encolar_comprobante: bool
+    futuro: Future
+
+
+class EscritorAgrupado:
+    """Confirma las reservas de varios llamadores en un COMMIT por tanda."""
+
+    def __init__(self, repo, max_lote=32, ventana=0.002):
+        self.repo = repo
+        self.max_lote = max_lote
+        self.ventana = ventana
+        self._cola = queue.SimpleQueue()
+        self._hilo = None
+        # Encolar y cerrar van bajo el mismo lock: nada entra a la cola
+        # después del centinela que termina el hilo
+        self._lock = threading.Lock()
+        self._cerrado = False
+
+    # --- Ciclo de vida ---
+    def iniciar(self):
+        with self._lock:
+            if self._hilo is not None:
+                return
+            self._cerrado = False
+            self._hilo = threading.Thread(
+                target=self._bucle, name="escritor-agrupado", daemon=True
+            )
+            self._hilo.start()
+
+    def detener(self, timeout=5.0):
+        """
+        Confirma lo que ya estaba encolado y termina el hilo. Si el hilo no
+        termina a tiempo sigue activo (se puede volver a llamar a detener).
+        """
+        with self._lock:
+            hilo = self._hilo
+            if hilo is None:
+                return
+            if not self._cerrado:
+                self._cerrado = True
+                self._cola.put(None)
+        hilo.join(timeout)
+        if hilo.is_alive():
+            logger.warning("El escritor agrupado no terminó en %ss", timeout)
+            return
+        self._rechazar_pendientes()
+        with self._lock:
+            self._hilo = None
+
+    def _rechazar_pendientes(self):
+        """Falla los pedidos que quedaron en la cola sin tanda."""
+        while True:
+            try:
+                pedido = self._cola.get_nowait()
+            except queue.Empty:
+                return
+            if pedido is None:
+                continue
+            if pedido.futuro.set_running_or_notify_cancel():
+                pedido.futuro.set_exception(
+                    RuntimeError("El escritor agrupado se detuvo")
+                )
+
+    @property
+    def activo(self) -> bool:
+        return self._hilo is not None and not self._cerrado
+
+    # --- API para los llamadores ---
+    def reservar(self, inscripcion, encolar_comprobante=False):
+        """Igual que InscripcionRepo.reservar; bloquea hasta el COMMIT."""
+        futuro = self._poner(inscripcion, encolar_comprobante)
+        if futuro is None:
+            # Sin escritor (o cerrándose): la reserva abre su transacción
+            return self.repo.reservar(inscripcion, encolar_comprobante)
+        return futuro.result()
+
+    def encolar(self, inscripcion, encolar_comprobante=False) -> Future:
+        """Encola la reserva en la próxima tanda y devuelve su Future."""
+        futuro = self._poner(inscripcion, encolar_comprobante)
+        if futuro is None:
+            raise RuntimeError("El escritor agrupado no está iniciado")
+        return futuro
+
+    def _poner(self, inscripcion, encolar_comprobante):
+        with self._lock:
+            if self._hilo is None or self._cerrado:
+                return None
+            futuro = Future()
+            self._cola.put(Pedido(inscripcion, encolar_comprobante, futuro))
+            return futuro
+
+    # --- Hilo escritor ---
+    def _juntar(self, primero):
+        """Tanda que empieza con `primero`: (pedidos, hay que terminar)."""
+        pedidos = [primero]
+        limite = time.monotonic() + self.ventana
+        while len(pedidos) < self.max_lote:
+            try:
+                restante = max(limite - time.monotonic(), 0)
+                pedido = self._cola.get(timeout=restante)
+            except queue.Empty:
+                break
+            if pedido is None:
+                return pedidos, True
+            pedidos.append(pedido)
+        return pedidos, False
+
+    def _bucle(self):
+        terminar = False
+        while not terminar:
+            primero = self._cola.get()
+            if primero is None:
+                break
+            pedidos, terminar = self._juntar(primero)
+            self.confirmar(pedidos)
+
+    def confirmar(self, pedidos):
+        # Los cancelados (el cliente se desconectó) no se reservan; el resto
+        # queda "en curso" y ya no se puede cancelar
+        pedidos = [
+            p for p in pedidos if p.futuro.set_running_or_notify_cancel()
+        ]
+        if not pedidos:
+            return
+        ESCRITOR_LOTE.observar(len(pedidos))
+        try:
+            resultados = self.repo.reservar_varias(
+                [(p.inscripcion, p.encolar_comprobante) for p in pedidos]
+            )
+        except Exception as e:
+            # Falló la transacción entera: no se guardó ninguna de la tanda
+            logger.warning(
+                "Falló el commit de %s reservas: %s", len(pedidos), e
+            )
+            for pedido in pedidos:
+                pedido.futuro.set_exception(e)
+            return
+        for pedido, resultado in zip(pedidos, resultados):
+            if isinstance(resultado, Exception):
+                pedido.futuro.set_exception(resultado)
+            else:
+                pedido.futuro.set_result(resultado)
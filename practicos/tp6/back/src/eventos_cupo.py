@@ -0,0 +1,106 @@
+"""
+Pub/sub en proceso de los cambios de cupo de los turnos.
+
+Cada cliente del stream SSE es una Suscripcion con una asyncio.Queue en el
+event loop de la app, así miles de clientes ociosos no ocupan un hilo cada
+uno. Las reservas confirman en hilos del ejecutor de BD: `publicar` es
+thread-safe y hace un solo salto al loop, que reparte el delta entre los
+suscriptores de esa fecha.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+
+TAMANO_COLA = 256
+
+# Se encola cuando un cliente no da abasto: debe volver a pedir el snapshot
+RESINCRONIZAR = {"resincronizar": True}
+
+
+class Suscripcion:
+    def __init__(self, fecha: str, tamano_cola=TAMANO_COLA):
+        self.fecha = fecha
+        self.cola = asyncio.Queue(maxsize=tamano_cola)
+        self.desbordada = False
+
+    def entregar(self, evento):
+        if self.desbordada:
+            return
+        try:
+            self.cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            # Se descartan los deltas pendientes y se pide un snapshot nuevo
+            self.desbordada = True
+            while not self.cola.empty():
+                self.cola.get_nowait()
+            self.cola.put_nowait(RESINCRONIZAR)
+
+    async def siguiente(self, timeout=None):
+        """Próximo evento, o None si pasó `timeout` segundos sin novedades."""
+        try:
+            evento = await asyncio.wait_for(self.cola.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if evento is RESINCRONIZAR:
+            self.desbordada = False
+        return evento
+
+
+class BusCupos:
+    def __init__(self):
+        self._loop = None
+        self._suscriptores = defaultdict(set)
+        # Sube con cada cambio publicado (se publica desde varios hilos)
+        self._lock_version = threading.Lock()
+        self.version = 0
+
+    # --- Ciclo de vida (lifespan de la app) ---
+    def vincular(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def desvincular(self):
+        self._loop = None
+        self._suscriptores.clear()
+
+    # --- Suscriptores (se llaman desde el event loop) ---
+    def suscribir(self, fecha: str, tamano_cola=TAMANO_COLA) -> Suscripcion:
+        suscripcion = Suscripcion(fecha, tamano_cola)
+        self._suscriptores[fecha].add(suscripcion)
+        return suscripcion
+
+    def desuscribir(self, suscripcion: Suscripcion):
+        suscriptores = self._suscriptores.get(suscripcion.fecha)
+        if suscriptores is not None:
+            suscriptores.discard(suscripcion)
+            if not suscriptores:
+                del self._suscriptores[suscripcion.fecha]
+
+    def cantidad_suscriptores(self) -> int:
+        return sum(len(s) for s in self._suscriptores.values())
+
+    # --- Publicación (desde cualquier hilo) ---
+    def publicar(self, fecha: str, turno_id: int, cupo_disponible: int):
+        """
+        Anuncia el nuevo cupo de un turno y sube `version` (la usa el cache
+        de respuestas). Sin app escuchando no reparte nada.
+        """
+        with self._lock_version:
+            self.version += 1
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        evento = {"id": turno_id, "cupos_disponibles": cupo_disponible}
+        try:
+            loop.call_soon_threadsafe(self._repartir, fecha, evento)
+        except RuntimeError:
+            # El loop se cerró entre el chequeo y la llamada
+            pass
+
+    def _repartir(self, fecha, evento):
+        for suscripcion in list(self._suscriptores.get(fecha, ())):
+            suscripcion.entregar(evento)
+
+
+# Bus compartido por los repositorios y el endpoint SSE
+BUS_CUPOS = BusCupos()
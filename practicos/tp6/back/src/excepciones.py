@@ -68,3 +68,22 @@ class ErrorEnvioCorreo(ValidacionError):
     """Error al enviar el correo electrónico."""
 
     pass
+
+
+class ErrorLote(Exception):
+    """
+    Falló al menos una inscripción de un lote y no se guardó ninguna.
+    `errores` es una lista de (posición en el lote, excepción).
+    """
+
+    def __init__(self, errores):
+        self.errores = list(errores)
+        super().__init__(
+            f"{len(self.errores)} inscripciones del lote con errores"
+        )
+
+
+class ErrorBDOcupada(Exception):
+    """La BD siguió bloqueada por otro escritor tras todos los reintentos."""
+
+    pass
@@ -0,0 +1,73 @@
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import date, time
+from typing import Dict, Iterable, Set, Tuple
+
+from back.src.modelos.inscripcion import Inscripcion
+
+
+def clave_horario(fecha, hora) -> Tuple[str, str]:
+    """Normaliza (fecha, hora) al formato de la BD: YYYY-MM-DD / HH:MM."""
+    if isinstance(fecha, date):
+        fecha = fecha.strftime("%Y-%m-%d")
+    if isinstance(hora, time):
+        hora = hora.strftime("%H:%M")
+    return fecha, hora
+
+
+class IndiceChoques(ABC):
+    """
+    Interfaz del índice de choques de horario usado por ServicioInscripcion.
+    Dado un horario (fecha, hora) devuelve los DNI que ya tienen una
+    inscripción en ese horario, en cualquier actividad.
+    """
+
+    @abstractmethod
+    def dnis_reservados(self, fecha, hora) -> Set[int]:
+        ...
+
+    def registrar(self, inscripcion: Inscripcion):
+        """
+        Avisa al índice de una inscripción nueva aceptada por el servicio.
+        Los índices que leen de la BD o del almacén no necesitan hacer nada.
+        """
+        pass
+
+
+class IndiceChoquesEnMemoria(IndiceChoques):
+    """Índice en memoria: diccionario (fecha, hora) -> conjunto de DNI."""
+
+    def __init__(self):
+        self._dnis: Dict[Tuple[str, str], Set[int]] = defaultdict(set)
+
+    @classmethod
+    def desde_inscripciones(cls, inscripciones: Iterable[Inscripcion]):
+        indice = cls()
+        for ins in inscripciones:
+            indice.registrar(ins)
+        return indice
+
+    def agregar(self, fecha, hora, dnis: Iterable[int]):
+        """Marca DNI ya conocidos como reservados en ese horario."""
+        self._dnis[clave_horario(fecha, hora)].update(dnis)
+
+    def registrar(self, inscripcion: Inscripcion):
+        turno = getattr(inscripcion, "turno", None)
+        if turno is None:
+            return
+        dnis = self._dnis[clave_horario(turno.fecha, turno.hora)]
+        for v in getattr(inscripcion, "visitantes", []) or []:
+            dnis.add(v.dni)
+
+    def dnis_reservados(self, fecha, hora) -> Set[int]:
+        return self._dnis.get(clave_horario(fecha, hora), set())
+
+
+class IndiceChoquesSQL(IndiceChoques):
+    """Índice respaldado por la BD: consulta solo las reservas del horario."""
+
+    def __init__(self, repo_visitante):
+        self.repo_visitante = repo_visitante
+
+    def dnis_reservados(self, fecha, hora) -> Set[int]:
+        return self.repo_visitante.dnis_en_horario(*clave_horario(fecha, hora))
@@ -0,0 +1,259 @@
+"""
+Métricas de la app en formato de texto de Prometheus (sin dependencias).
+
+Contadores e histogramas con etiquetas, pensados para quedar siempre
+activos: registrar una observación es un bisect y un par de sumas bajo un
+lock por métrica. `exponer()` arma el texto que sirve GET /metrics.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from back.src.excepciones import ValidacionError
+
+BUCKETS_LATENCIA = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escapar(valor) -> str:
+    return (
+        str(valor)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _etiquetas(nombres, valores) -> str:
+    if not nombres:
+        return ""
+    pares = (f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores))
+    return "{" + ",".join(pares) + "}"
+
+
+def _numero(valor) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Contador:
+    tipo = "counter"
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *valores, cantidad=1):
+        with self._lock:
+            self._valores[valores] = self._valores.get(valores, 0) + cantidad
+
+    def inicializar(self, *valores):
+        """Expone la serie en 0 aunque todavía no haya ocurrido."""
+        with self._lock:
+            self._valores.setdefault(valores, 0)
+
+    def valor(self, *valores):
+        return self._valores.get(valores, 0)
+
+    def lineas(self):
+        with self._lock:
+            valores = sorted(self._valores.items())
+        for clave, valor in valores:
+            etiquetas = _etiquetas(self.etiquetas, clave)
+            yield f"{self.nombre}{etiquetas} {_numero(valor)}"
+
+
+class Histograma:
+    tipo = "histogram"
+
+    def __init__(self, nombre, ayuda, etiquetas=(), buckets=BUCKETS_LATENCIA):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.buckets = tuple(buckets)
+        # etiquetas -> [conteos por bucket (no acumulados) + inf, suma, total]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor, *valores):
+        posicion = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(valores)
+            if serie is None:
+                conteos = [0] * (len(self.buckets) + 1)
+                serie = self._series[valores] = [conteos, 0.0, 0]
+            serie[0][posicion] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def cantidad(self, *valores):
+        serie = self._series.get(valores)
+        return serie[2] if serie else 0
+
+    @contextmanager
+    def medir(self, *valores):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(time.perf_counter() - inicio, *valores)
+
+    def lineas(self):
+        with self._lock:
+            series = sorted(
+                (clave, (list(conteos), suma, total))
+                for clave, (conteos, suma, total) in self._series.items()
+            )
+        nombres = self.etiquetas + ("le",)
+        for clave, (conteos, suma, total) in series:
+            acumulado = 0
+            for limite, conteo in zip(self.buckets + ("+Inf",), conteos):
+                acumulado += conteo
+                etiquetas = _etiquetas(nombres, clave + (limite,))
+                yield f"{self.nombre}_bucket{etiquetas} {acumulado}"
+            etiquetas = _etiquetas(self.etiquetas, clave)
+            yield f"{self.nombre}_sum{etiquetas} {_numero(suma)}"
+            yield f"{self.nombre}_count{etiquetas} {total}"
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._metricas = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, metrica):
+        with self._lock:
+            return self._metricas.setdefault(metrica.nombre, metrica)
+
+    def contador(self, nombre, ayuda, etiquetas=()) -> Contador:
+        return self._registrar(Contador(nombre, ayuda, etiquetas))
+
+    def histograma(
+        self, nombre, ayuda, etiquetas=(), buckets=BUCKETS_LATENCIA
+    ) -> Histograma:
+        return self._registrar(Histograma(nombre, ayuda, etiquetas, buckets))
+
+    def exponer(self) -> str:
+        with self._lock:
+            metricas = list(self._metricas.values())
+        lineas = []
+        for m in metricas:
+            lineas.append(f"# HELP {m.nombre} {m.ayuda}")
+            lineas.append(f"# TYPE {m.nombre} {m.tipo}")
+            lineas.extend(m.lineas())
+        return "\n".join(lineas) + "\n"
+
+
+# Registro compartido por toda la app
+METRICAS = RegistroMetricas()
+
+HTTP_PEDIDOS = METRICAS.contador(
+    "ecopark_http_pedidos_total",
+    "Pedidos HTTP atendidos.",
+    ("metodo", "ruta", "estado"),
+)
+HTTP_DURACION = METRICAS.histograma(
+    "ecopark_http_duracion_segundos",
+    "Duración de los pedidos HTTP.",
+    ("metodo", "ruta"),
+)
+ETAPAS_INSCRIPCION = METRICAS.histograma(
+    "ecopark_inscripcion_etapa_segundos",
+    "Duración de cada etapa de POST /api/inscribirse.",
+    ("etapa",),
+)
+ERRORES_VALIDACION = METRICAS.contador(
+    "ecopark_validacion_errores_total",
+    "Errores de validación de inscripciones, por tipo.",
+    ("tipo",),
+)
+for _tipo in ValidacionError.__subclasses__():
+    ERRORES_VALIDACION.inicializar(_tipo.__name__)
+
+OUTBOX_ENVIO = METRICAS.histograma(
+    "ecopark_outbox_envio_segundos",
+    "Duración del envío SMTP de cada comprobante.",
+)
+OUTBOX_CORREOS = METRICAS.contador(
+    "ecopark_outbox_correos_total",
+    "Correos procesados por el outbox, por resultado.",
+    ("resultado",),
+)
+
+CACHE_RESPUESTAS = METRICAS.contador(
+    "ecopark_cache_respuestas_total",
+    "Lecturas del cache de respuestas, por resultado "
+    "(acierto, fallo, no_modificado).",
+    ("ruta", "resultado"),
+)
+
+REINTENTOS_BD = METRICAS.contador(
+    "ecopark_sqlite_reintentos_total",
+    "Escrituras que encontraron la BD ocupada (reintento) "
+    "o se rindieron (agotado).",
+    ("resultado",),
+)
+
+ESCRITOR_LOTE = METRICAS.histograma(
+    "ecopark_escritor_reservas_por_commit",
+    "Reservas confirmadas juntas en cada COMMIT del escritor agrupado.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+
+def medir_etapa(etapa: str):
+    """Context manager: registra cuánto dura una etapa de la inscripción."""
+    return ETAPAS_INSCRIPCION.medir(etapa)
+
+
+def registrar_error_validacion(error: Exception):
+    ERRORES_VALIDACION.inc(type(error).__name__)
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI que cuenta los pedidos y mide su duración por ruta.
+    La ruta es la plantilla (p. ej. /api/turnos), no el path con parámetros,
+    para que la cantidad de series quede acotada. Los streams de eventos
+    (text/event-stream) se cuentan pero no entran en el histograma: duran
+    lo que el cliente siga conectado.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        estado = 500
+        es_stream = False
+
+        async def enviar(mensaje):
+            nonlocal estado, es_stream
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+                es_stream = any(
+                    nombre.lower() == b"content-type"
+                    and valor.startswith(b"text/event-stream")
+                    for nombre, valor in mensaje.get("headers", ())
+                )
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            ruta = getattr(scope.get("route"), "path", "sin_ruta")
+            metodo = scope["method"]
+            HTTP_PEDIDOS.inc(metodo, ruta, estado)
+            if not es_stream:
+                duracion = time.perf_counter() - inicio
+                HTTP_DURACION.observar(duracion, metodo, ruta)
@@ -5,7 +5,7 @@ from .visitante import Visitante
 
 
 # Clase definida pero sin funciones implementadas
-@dataclass
+@dataclass(slots=True)
 class Inscripcion:
     """Representa el registro exitoso de una reserva."""
 
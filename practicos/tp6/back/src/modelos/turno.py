@@ -3,7 +3,7 @@ from datetime import date, time
 
 
 # Clase definida pero sin funciones implementadas
-@dataclass
+@dataclass(slots=True)
 class Turno:
     """Representa un horario específico de una actividad con estado de ocupación."""
 
@@ -4,7 +4,7 @@ from datetime import date, time
 
 
 # Clase definida pero sin funciones implementadas
-@dataclass
+@dataclass(slots=True)
 class Visitante:
     nombre: str
     dni: int
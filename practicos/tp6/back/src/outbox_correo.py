@@ -0,0 +1,236 @@
+"""
+Envío en segundo plano de los comprobantes guardados en el outbox
+(tabla CorreoPendiente).
+
+Un hilo trabajador toma los correos pendientes en lotes y los envía todos
+sobre una única sesión SMTP. Los errores se reintentan con backoff
+exponencial y, si el servidor de correo deja de responder, un circuit
+breaker corta los intentos durante un tiempo para no martillarlo.
+"""
+
+import json
+import logging
+import smtplib
+import threading
+import time
+
+from back.src.metricas import OUTBOX_CORREOS, OUTBOX_ENVIO
+from back.src.repositorios.correo_repo import (
+    RESERVA_SEGUNDOS,
+    inscripcion_desde_payload,
+)
+
+logger = logging.getLogger(__name__)
+
+# Errores atribuibles a un mensaje puntual: el resto del lote puede seguir
+ERRORES_DEL_MENSAJE = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+class CircuitoCorreo:
+    """Circuit breaker simple: cerrado -> abierto -> semiabierto -> cerrado."""
+
+    CERRADO = "cerrado"
+    ABIERTO = "abierto"
+    SEMIABIERTO = "semiabierto"
+
+    def __init__(
+        self, umbral_fallos=3, enfriamiento=30.0, reloj=time.monotonic
+    ):
+        self.umbral_fallos = umbral_fallos
+        self.enfriamiento = enfriamiento
+        self.reloj = reloj
+        self.estado = self.CERRADO
+        self.fallos = 0
+        self._abierto_en = 0.0
+
+    def permite(self) -> bool:
+        """Indica si se puede intentar hablar con el servidor."""
+        if self.estado == self.ABIERTO:
+            if self.reloj() - self._abierto_en < self.enfriamiento:
+                return False
+            # Pasado el enfriamiento se deja pasar un intento de prueba
+            self.estado = self.SEMIABIERTO
+        return True
+
+    def registrar_exito(self):
+        self.estado = self.CERRADO
+        self.fallos = 0
+
+    def registrar_fallo(self):
+        self.fallos += 1
+        if (
+            self.estado == self.SEMIABIERTO
+            or self.fallos >= self.umbral_fallos
+        ):
+            self.estado = self.ABIERTO
+            self._abierto_en = self.reloj()
+
+
+class TrabajadorOutbox:
+    """Vacía el outbox de comprobantes en lotes desde un hilo propio."""
+
+    def __init__(
+        self,
+        repo,
+        servicio_correo,
+        tamano_lote=20,
+        intervalo=1.0,
+        max_intentos=5,
+        backoff_base=2.0,
+        backoff_max=300.0,
+        circuito=None,
+        reserva_segundos=RESERVA_SEGUNDOS,
+    ):
+        self.repo = repo
+        self.servicio_correo = servicio_correo
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.max_intentos = max_intentos
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.circuito = circuito or CircuitoCorreo()
+        self.reserva_segundos = reserva_segundos
+        self._detener = threading.Event()
+        self._hilo = None
+
+    # --- Ciclo de vida ---
+    def iniciar(self):
+        if self._hilo is not None:
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(
+            target=self._bucle, name="outbox-correo", daemon=True
+        )
+        self._hilo.start()
+
+    def detener(self, timeout=5.0):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+            self._hilo = None
+
+    def _bucle(self):
+        while not self._detener.is_set():
+            try:
+                # Mientras haya lotes completos se sigue vaciando sin esperar
+                while (
+                    self.procesar_lote() == self.tamano_lote
+                    and not self._detener.is_set()
+                ):
+                    pass
+            except Exception:
+                logger.exception(
+                    "Error inesperado procesando el outbox de correos"
+                )
+            self._detener.wait(self.intervalo)
+
+    # --- Procesamiento ---
+    def _espera(self, intentos: int) -> float:
+        return min(self.backoff_max, self.backoff_base * 2 ** (intentos - 1))
+
+    def _fallo(self, correo_id, reserva, intentos, error):
+        intentos += 1
+        if intentos >= self.max_intentos:
+            logger.warning(
+                "Correo %s descartado tras %s intentos: %s",
+                correo_id,
+                intentos,
+                error,
+            )
+            OUTBOX_CORREOS.inc("fallido")
+            self.repo.marcar_fallido(correo_id, reserva, intentos, str(error))
+        else:
+            OUTBOX_CORREOS.inc("reintento")
+            self.repo.reprogramar(
+                correo_id,
+                reserva,
+                intentos,
+                time.time() + self._espera(intentos),
+                str(error),
+            )
+
+    def _sigue_reservado(self, correo_id, reserva, tomado_en) -> bool:
+        """
+        Antes de enviar cada correo: pasada la mitad de la reserva se la
+        renueva, y si venció y otro trabajador lo tomó no se envía (el
+        otro lo enviaría dos veces).
+        """
+        if time.monotonic() - tomado_en < self.reserva_segundos / 2:
+            return True
+        return self.repo.renovar(correo_id, reserva, self.reserva_segundos)
+
+    def procesar_lote(self) -> int:
+        """
+        Envía un lote de correos pendientes sobre una sola sesión SMTP.
+        Devuelve cuántos correos se tomaron del outbox.
+        """
+        if not self.circuito.permite():
+            return 0
+        tomado_en = time.monotonic()
+        lote = self.repo.tomar_lote(self.tamano_lote, self.reserva_segundos)
+        if not lote:
+            return 0
+
+        try:
+            sesion = self.servicio_correo.abrir_sesion()
+        except Exception as e:
+            logger.warning("No se pudo conectar al servidor de correo: %s", e)
+            self.circuito.registrar_fallo()
+            for correo_id, _, _, intentos, reserva in lote:
+                self._fallo(correo_id, reserva, intentos, e)
+            return len(lote)
+
+        try:
+            for pos, fila in enumerate(lote):
+                correo_id, destinatario, payload, intentos, reserva = fila
+                if not self._sigue_reservado(correo_id, reserva, tomado_en):
+                    logger.info(
+                        "Correo %s reservado por otro trabajador", correo_id
+                    )
+                    continue
+                try:
+                    mensaje = self.servicio_correo.serializar_comprobante(
+                        inscripcion_desde_payload(payload),
+                        destinatario,
+                        json.loads(payload)["id_inscripcion"],
+                    )
+                except Exception as e:
+                    # Un payload roto no se arregla reintentando
+                    OUTBOX_CORREOS.inc("fallido")
+                    self.repo.marcar_fallido(
+                        correo_id,
+                        reserva,
+                        intentos + 1,
+                        f"Payload inválido: {e}",
+                    )
+                    continue
+                try:
+                    with OUTBOX_ENVIO.medir():
+                        sesion.sendmail(
+                            self.servicio_correo.remitente,
+                            [destinatario],
+                            mensaje,
+                        )
+                except ERRORES_DEL_MENSAJE as e:
+                    self._fallo(correo_id, reserva, intentos, e)
+                except Exception as e:
+                    # Se cayó la conexión: se reprograma el resto del lote
+                    logger.warning("Se interrumpió la sesión SMTP: %s", e)
+                    self.circuito.registrar_fallo()
+                    for pendiente_id, _, _, intentos, reserva in lote[pos:]:
+                        self._fallo(pendiente_id, reserva, intentos, e)
+                    return len(lote)
+                else:
+                    OUTBOX_CORREOS.inc("enviado")
+                    self.repo.marcar_enviado(correo_id, reserva)
+            self.circuito.registrar_exito()
+        finally:
+            try:
+                sesion.quit()
+            except Exception:
+                sesion.close()
+        return len(lote)
@@ -0,0 +1,73 @@
+"""
+Paginación por keyset de los turnos.
+
+El cursor es la clave (fecha, hora, id) de la última fila entregada,
+codificada en base64 para que el cliente la trate como un valor opaco.
+Recorrer los turnos página por página mantiene acotada la memoria sin
+importar cuántas semanas de turnos haya cargadas.
+"""
+
+import base64
+import json
+
+LIMITE_POR_DEFECTO = 500
+LIMITE_MAXIMO = 5000
+
+
+def clave_turno(fila) -> tuple:
+    # fila = (id, actividad_id, fecha, hora, cupo_disponible)
+    return (fila[2], fila[3], fila[0])
+
+
+def codificar_cursor(fila) -> str:
+    clave = json.dumps(list(clave_turno(fila)), separators=(",", ":"))
+    return base64.urlsafe_b64encode(clave.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> tuple:
+    """Devuelve la clave (fecha, hora, id).
+
+    Lanza ValueError si el cursor no es válido.
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        fecha, hora, turno_id = json.loads(
+            base64.urlsafe_b64decode(cursor + relleno)
+        )
+        return (str(fecha), str(hora), int(turno_id))
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+
+def paginas_turnos(
+    repo, fecha, despues=None, tamano_pagina=LIMITE_POR_DEFECTO
+):
+    """Genera los turnos desde `fecha` de a una página (lista de filas)."""
+    while True:
+        pagina = repo.obtener_pagina_desde(fecha, despues, tamano_pagina)
+        if pagina:
+            yield pagina
+        if len(pagina) < tamano_pagina:
+            return
+        despues = clave_turno(pagina[-1])
+
+
+async def paginas_turnos_async(
+    repo, fecha, despues=None, tamano_pagina=LIMITE_POR_DEFECTO
+):
+    """Como paginas_turnos, pero cada página se lee en el ejecutor de BD."""
+    while True:
+        pagina = await repo.asincrono.obtener_pagina_desde(
+            fecha, despues, tamano_pagina
+        )
+        if pagina:
+            yield pagina
+        if len(pagina) < tamano_pagina:
+            return
+        despues = clave_turno(pagina[-1])
+
+
+def iterar_turnos(repo, fecha, despues=None, tamano_pagina=LIMITE_POR_DEFECTO):
+    """Genera los turnos desde `fecha` de a uno, leyendo una página por vez."""
+    for pagina in paginas_turnos(repo, fecha, despues, tamano_pagina):
+        yield from pagina
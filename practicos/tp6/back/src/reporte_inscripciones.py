@@ -0,0 +1,148 @@
+"""
+Reporte y exportación de inscripciones.
+
+Las inscripciones se leen junto con sus visitantes en una sola consulta
+ordenada y se agrupan mientras se recorre el cursor, así que la memoria no
+depende de cuántas inscripciones haya. La conexión se abre en modo solo
+lectura: este módulo nunca modifica la BD (la limpieza está en
+db/ver_insc.py como comando aparte).
+"""
+
+import csv
+import json
+import sqlite3
+from itertools import groupby
+from pathlib import Path
+
+CAMPOS_VISITANTE = ["nombre", "dni", "edad", "talle"]
+COLUMNAS_CSV = [
+    "id_inscripcion",
+    "actividad",
+    "fecha",
+    "hora",
+    "email",
+    "total_personas",
+    "acepta_terminos",
+    *CAMPOS_VISITANTE,
+]
+
+SQL_REPORTE = """
+    SELECT I.id, I.turno_id, I.email_contacto, I.total_personas,
+           I.acepta_terminos, T.fecha, T.hora, A.nombre,
+           V.nombre, V.dni, V.edad, V.talle
+    FROM Turno T
+    JOIN Inscripcion I ON I.turno_id = T.id
+    JOIN Actividad A ON T.actividad_id = A.id
+    LEFT JOIN Visitante V ON V.inscripcion_id = I.id
+    {filtros}
+    ORDER BY T.fecha, T.hora, I.id, V.id
+"""
+
+
+def abrir_solo_lectura(db_path) -> sqlite3.Connection:
+    return sqlite3.connect(
+        f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True
+    )
+
+
+def consulta_reporte(desde=None, hasta=None, actividad=None):
+    """Arma la consulta del reporte con los filtros pedidos."""
+    filtros, params = [], []
+    if desde:
+        filtros.append("T.fecha >= ?")
+        params.append(str(desde))
+    if hasta:
+        filtros.append("T.fecha <= ?")
+        params.append(str(hasta))
+    if actividad:
+        filtros.append("A.nombre = ?")
+        params.append(actividad)
+    where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+    return SQL_REPORTE.format(filtros=where), params
+
+
+def iterar_inscripciones(conn, desde=None, hasta=None, actividad=None):
+    """
+    Genera cada inscripción como dict con sus visitantes, en orden de turno.
+    Las filas llegan ordenadas por inscripción, así que se agrupan sin
+    guardar más que la inscripción actual.
+    """
+    sql, params = consulta_reporte(desde, hasta, actividad)
+    filas = conn.execute(sql, params)
+    for _, grupo in groupby(filas, key=lambda f: f[0]):
+        grupo = list(grupo)
+        ins_id, turno_id, email, total, acepta, fecha, hora, nombre_act = (
+            grupo[0][:8]
+        )
+        yield {
+            "id_inscripcion": ins_id,
+            "turno_id": turno_id,
+            "actividad": nombre_act,
+            "fecha": fecha,
+            "hora": hora,
+            "email": email,
+            "total_personas": total,
+            "acepta_terminos": bool(acepta),
+            "visitantes": [
+                {"nombre": f[8], "dni": f[9], "edad": f[10], "talle": f[11]}
+                for f in grupo
+                if f[8] is not None
+            ],
+        }
+
+
+def exportar_csv(inscripciones, destino) -> int:
+    """Una fila por visitante. Devuelve cuántas inscripciones exportó."""
+    cantidad = 0
+    with open(destino, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(COLUMNAS_CSV)
+        for ins in inscripciones:
+            datos = [
+                ins["id_inscripcion"],
+                ins["actividad"],
+                ins["fecha"],
+                ins["hora"],
+                ins["email"],
+                ins["total_personas"],
+                int(ins["acepta_terminos"]),
+            ]
+            for v in ins["visitantes"] or [{}]:
+                escritor.writerow(datos + [v.get(c) for c in CAMPOS_VISITANTE])
+            cantidad += 1
+    return cantidad
+
+
+def exportar_ndjson(inscripciones, destino) -> int:
+    """Escribe una línea JSON por inscripción. Devuelve cuántas exportó."""
+    cantidad = 0
+    with open(destino, "w", encoding="utf-8") as archivo:
+        for ins in inscripciones:
+            archivo.write(json.dumps(ins, ensure_ascii=False) + "\n")
+            cantidad += 1
+    return cantidad
+
+
+EXPORTADORES = {"csv": exportar_csv, "ndjson": exportar_ndjson}
+
+
+def imprimir_inscripciones(inscripciones) -> int:
+    """Imprime el reporte. Devuelve cuántas inscripciones mostró."""
+    cantidad = 0
+    for ins in inscripciones:
+        print(f"🧾 Inscripción #{ins['id_inscripcion']}")
+        print(f"   Actividad: {ins['actividad']}")
+        print(f"   Turno: {ins['fecha']} {ins['hora']}")
+        print(f"   Email: {ins['email']}")
+        print(f"   Personas: {ins['total_personas']}")
+        print(
+            f"   Acepta términos: {'Sí' if ins['acepta_terminos'] else 'No'}"
+        )
+        for v in ins["visitantes"]:
+            print(
+                f"     👤 {v['nombre']} (DNI {v['dni']}, {v['edad']} años, "
+                f"talle {v['talle']})"
+            )
+        print("")
+        cantidad += 1
+    return cantidad
@@ -14,3 +14,15 @@ class RepositorioActividad(RepositorioBase):
         return self.ejecutar(
             "SELECT * FROM Actividad WHERE nombre = ?", (nombre,), fetchone=True
         )
+
+    def version(self):
+        """Versión de la tabla Actividad (la suben triggers en cada cambio)."""
+        row = self.ejecutar(
+            "SELECT version FROM VersionTabla WHERE tabla = 'Actividad'",
+            fetchone=True,
+        )
+        return row[0] if row else 0
+
+    def data_version(self):
+        """PRAGMA data_version: cambia si otra conexión escribió en la BD."""
+        return self.ejecutar("PRAGMA data_version", fetchone=True)[0]
@@ -0,0 +1,65 @@
+"""
+Selección del almacenamiento de la app (ECOPARK_ALMACEN).
+
+`crear_repositorios` arma el juego de repositorios que usan los endpoints:
+los de SQLite (por defecto) o los de memoria sobre un AlmacenMemoria, que
+arranca con una copia de la BD si existe.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from back.src.repositorios import base
+from back.src.repositorios.actividad_repo import RepositorioActividad
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+from back.src.repositorios.memoria import (
+    AlmacenMemoria,
+    InscripcionRepoMemoria,
+    RepositorioActividadMemoria,
+    RepositorioTurnoMemoria,
+    VisitanteRepoMemoria,
+)
+from back.src.repositorios.turno_repo import RepositorioTurno
+from back.src.repositorios.visitante_repo import VisitanteRepo
+
+ALMACEN_SQLITE = "sqlite"
+ALMACEN_MEMORIA = "memoria"
+
+
+@dataclass
+class Repositorios:
+    actividades: object
+    turnos: object
+    inscripciones: object
+    visitantes: object
+    almacen: Optional[AlmacenMemoria] = None  # solo en memoria
+
+
+def crear_repositorios(
+    almacen: str = ALMACEN_SQLITE, db_path=None
+) -> Repositorios:
+    if almacen == ALMACEN_SQLITE:
+        return Repositorios(
+            RepositorioActividad(),
+            RepositorioTurno(),
+            InscripcionRepo(),
+            VisitanteRepo(),
+        )
+    if almacen == ALMACEN_MEMORIA:
+        ruta = db_path or base.DB_PATH
+        datos = (
+            AlmacenMemoria.desde_sqlite(ruta)
+            if os.path.exists(ruta)
+            else AlmacenMemoria()
+        )
+        return Repositorios(
+            RepositorioActividadMemoria(datos),
+            RepositorioTurnoMemoria(datos),
+            InscripcionRepoMemoria(datos),
+            VisitanteRepoMemoria(datos),
+            almacen=datos,
+        )
+    raise ValueError(
+        f"Almacenamiento desconocido: {almacen!r} (sqlite o memoria)"
+    )
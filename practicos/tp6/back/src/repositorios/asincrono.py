@@ -0,0 +1,91 @@
+"""
+Soporte async para los repositorios.
+
+sqlite3 es bloqueante, así que las consultas del modo async corren en un
+ejecutor de hilos dedicado a la BD (separado del threadpool de Starlette).
+Cada hilo del ejecutor usa su propia conexión del pool, por lo que la
+cantidad de conexiones queda acotada por el tamaño del ejecutor.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+HILOS_BD = 8
+
+_ejecutor = None
+_lock = threading.Lock()
+
+
+def obtener_ejecutor() -> ThreadPoolExecutor:
+    global _ejecutor
+    with _lock:
+        if _ejecutor is None:
+            _ejecutor = ThreadPoolExecutor(
+                max_workers=HILOS_BD, thread_name_prefix="bd"
+            )
+        return _ejecutor
+
+
+def configurar_ejecutor(hilos: int):
+    """Cambia el tamaño del ejecutor (se aplica al próximo uso)."""
+    global HILOS_BD
+    cerrar_ejecutor()
+    HILOS_BD = hilos
+
+
+def cerrar_ejecutor():
+    global _ejecutor
+    with _lock:
+        ejecutor, _ejecutor = _ejecutor, None
+    if ejecutor is not None:
+        ejecutor.shutdown(wait=True)
+
+
+def en_cada_hilo(funcion, espera=10.0):
+    """
+    Ejecuta `funcion` una vez en cada hilo del ejecutor (para abrir sus
+    conexiones antes del primer pedido). Una barrera obliga a que cada
+    tarea tome un hilo distinto.
+    """
+    ejecutor = obtener_ejecutor()
+    barrera = threading.Barrier(HILOS_BD)
+
+    def tarea():
+        barrera.wait(espera)
+        funcion()
+
+    for futuro in [ejecutor.submit(tarea) for _ in range(HILOS_BD)]:
+        futuro.result()
+
+
+async def ejecutar_en_bd(funcion, *args, **kwargs):
+    """Ejecuta una función bloqueante de BD en el ejecutor dedicado."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        obtener_ejecutor(), functools.partial(funcion, *args, **kwargs)
+    )
+
+
+class ProxyAsincrono:
+    """
+    Expone los métodos de un repositorio como corrutinas:
+        await repo.asincrono.obtener_por_fecha("2025-10-15")
+    """
+
+    def __init__(self, repo):
+        self._repo = repo
+
+    def __getattr__(self, nombre):
+        metodo = getattr(self._repo, nombre)
+        if not callable(metodo):
+            return metodo
+
+        @functools.wraps(metodo)
+        async def envoltura(*args, **kwargs):
+            return await ejecutar_en_bd(metodo, *args, **kwargs)
+
+        # Queda en el proxy: las próximas llamadas no vuelven a armarla
+        setattr(self, nombre, envoltura)
+        return envoltura
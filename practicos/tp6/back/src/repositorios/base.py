@@ -1,48 +1,88 @@
 import sqlite3
-from typing import List
+from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
 
+from back.src.repositorios.asincrono import ProxyAsincrono
+from back.src.repositorios.conexion import obtener_pool
+from back.src.repositorios.instrumentacion import (
+    CursorInstrumentado,
+    INSTRUMENTACION,
+)
+from back.src.repositorios.reintentos import REINTENTOS
+
 # --- RUTA DINÁMICA ---
 DIRECTORIO_SCRIPT = Path(__file__).resolve().parent
 DB_PATH = DIRECTORIO_SCRIPT.parent.parent / "db" / "bd_ecopark.db"
 
 
 class RepositorioBase:
-    def __init__(self):
-        self.db_path = DB_PATH
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DB_PATH
+        self.pool = obtener_pool(self.db_path)
+
+    @cached_property
+    def asincrono(self) -> ProxyAsincrono:
+        """Versión awaitable de los métodos del repositorio (modo async)."""
+        return ProxyAsincrono(self)
 
     def get_connection(self):
-        return sqlite3.connect(self.db_path)
+        """Conexión del pool para el hilo actual (no se debe cerrar)."""
+        return self.pool.conexion()
 
-    def ejecutar(self, query, params=(), fetchone=False, fetchall=False, commit=False):
-        conn = self.get_connection()
-        cur = conn.cursor()
+    def nuevo_cursor(self):
+        """Cursor de la conexión del hilo, medido si se instrumenta el SQL."""
+        cur = self.get_connection().cursor()
+        if INSTRUMENTACION.activa:
+            return CursorInstrumentado(cur, INSTRUMENTACION)
+        return cur
 
-        cur.execute(query, params)
+    def ejecutar(self, query, params=(), fetchone=False, fetchall=False, commit=False):
+        # Las conexiones están en modo autocommit: cada sentencia suelta
+        # se confirma sola, `commit` se mantiene por compatibilidad.
+        cur = self.nuevo_cursor()
+        try:
+            try:
+                cur.execute(query, params)
+            except sqlite3.OperationalError as e:
+                # Una sentencia suelta que falló por lock no escribió nada
+                REINTENTOS.reintentar(e, cur.execute, query, params)
 
-        result = None
-        if fetchone:
-            result = cur.fetchone()
-        elif fetchall:
-            result = cur.fetchall()
+            result = None
+            if fetchone:
+                result = cur.fetchone()
+            elif fetchall:
+                result = cur.fetchall()
+            return result
+        finally:
+            cur.close()
 
-        if commit:
+    @contextmanager
+    def transaccion(self, inmediata=False):
+        """
+        Abre una transacción explícita sobre la conexión del pool y
+        devuelve un cursor. Hace COMMIT al salir o ROLLBACK si hay error.
+        Las que escriben deben ser `inmediata`: el lock de escritura se toma
+        en el BEGIN, que es el único paso que se reintenta si la BD está
+        ocupada por otro proceso.
+        """
+        conn = self.get_connection()
+        cur = self.nuevo_cursor()
+        inicio = "BEGIN IMMEDIATE" if inmediata else "BEGIN"
+        try:
+            cur.execute(inicio)
+        except sqlite3.OperationalError as e:
+            try:
+                REINTENTOS.reintentar(e, cur.execute, inicio)
+            except BaseException:
+                cur.close()
+                raise
+        try:
+            yield cur
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
             conn.commit()
-
-        conn.close()
-        return result
-
-
-# Repositorio en memoria para pruebas
-from back.src.modelos.inscripcion import Inscripcion
-
-
-class RepositorioEnMemoria(RepositorioBase):
-    """Mock de repositorio que guarda las inscripciones en una lista."""
-
-    def __init__(self, inscripciones: List[Inscripcion] = None):
-        self.inscripciones = inscripciones or []
-
-    # Método para simular la persistencia que usará el servicio
-    def guardar_inscripcion(self, inscripcion: Inscripcion):
-        self.inscripciones.append(inscripcion)
+        finally:
+            cur.close()
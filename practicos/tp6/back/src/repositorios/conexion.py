@@ -0,0 +1,122 @@
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+
+# --- AJUSTES DE CONEXIÓN ---
+# Se aplican una sola vez, al abrir cada conexión del pool.
+BUSY_TIMEOUT_MS = 5000
+MMAP_SIZE = 64 * 1024 * 1024  # 64 MiB
+CACHE_SENTENCIAS = 128  # sentencias preparadas por conexión
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    f"PRAGMA mmap_size = {MMAP_SIZE}",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def configurar_conexiones(busy_timeout_ms: int = 5000):
+    """
+    Espera máxima por el lock de escritura de las conexiones que se abran
+    a partir de ahora (las ya abiertas conservan la suya).
+    """
+    global BUSY_TIMEOUT_MS
+    BUSY_TIMEOUT_MS = busy_timeout_ms
+
+
+def abrir_conexion(db_path) -> sqlite3.Connection:
+    """
+    Abre una conexión nueva ya configurada.
+    Se usa modo autocommit (isolation_level=None): las transacciones
+    se abren explícitamente con BEGIN desde el repositorio.
+    """
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        isolation_level=None,
+        check_same_thread=False,
+        cached_statements=CACHE_SENTENCIAS,
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    conn.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT_MS)}")
+    return conn
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones SQLite con una conexión por hilo.
+    Cada hilo abre su conexión la primera vez que la pide y la reutiliza
+    en todas las consultas siguientes. Las conexiones de hilos que ya
+    terminaron se cierran al abrir una nueva, así que con hilos que van y
+    vienen el pool no crece sin límite.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # hilo -> su conexión; la entrada se va sola si el hilo se libera
+        self._conexiones = weakref.WeakKeyDictionary()
+
+    def conexion(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = abrir_conexion(self.db_path)
+            self._local.conn = conn
+            with self._lock:
+                muertas = [
+                    (hilo, c) for hilo, c in list(self._conexiones.items())
+                    if not hilo.is_alive()
+                ]
+                for hilo, _ in muertas:
+                    del self._conexiones[hilo]
+                hilo = threading.current_thread()
+                self._conexiones[hilo] = conn
+            # Si el hilo se libera sin que nadie barra el pool, se cierra igual
+            weakref.finalize(hilo, conn.close)
+            for _, c in muertas:
+                c.close()
+        return conn
+
+    def abiertas(self) -> int:
+        """Cantidad de conexiones que el pool tiene registradas."""
+        with self._lock:
+            return len(self._conexiones)
+
+    def cerrar(self):
+        """Cierra todas las conexiones abiertas por el pool."""
+        with self._lock:
+            conexiones = list(self._conexiones.values())
+            self._conexiones = weakref.WeakKeyDictionary()
+        for conn in conexiones:
+            conn.close()
+        self._local = threading.local()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def obtener_pool(db_path) -> PoolConexiones:
+    """Devuelve el pool compartido para una ruta de base de datos."""
+    clave = str(Path(db_path).resolve())
+    with _pools_lock:
+        pool = _pools.get(clave)
+        if pool is None:
+            pool = PoolConexiones(db_path)
+            _pools[clave] = pool
+        return pool
+
+
+def cerrar_pools():
+    """
+    Cierra las conexiones de todos los pools (fin de la app o de un test).
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.cerrar()
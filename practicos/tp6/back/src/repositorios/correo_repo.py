@@ -0,0 +1,180 @@
+import json
+import time
+import uuid
+from datetime import datetime
+
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.base import RepositorioBase
+
+PENDIENTE = "pendiente"
+ENVIADO = "enviado"
+FALLIDO = "fallido"
+
+# Segundos que un trabajador se reserva cada correo que toma del outbox
+RESERVA_SEGUNDOS = 60.0
+
+
+def payload_comprobante(inscripcion, id_inscripcion) -> str:
+    """Serializa lo necesario para armar el comprobante más tarde."""
+    turno = inscripcion.turno
+    return json.dumps(
+        {
+            "id_inscripcion": id_inscripcion,
+            "turno_id": turno.id,
+            "actividad": turno.actividad_nombre,
+            "fecha": turno.fecha.strftime("%Y-%m-%d"),
+            "hora": turno.hora.strftime("%H:%M"),
+            "email": inscripcion.email_contacto,
+            "visitantes": [
+                {
+                    "nombre": v.nombre,
+                    "dni": v.dni,
+                    "edad": v.edad,
+                    "talle": v.talle,
+                }
+                for v in inscripcion.visitantes
+            ],
+        },
+        ensure_ascii=False,
+    )
+
+
+def inscripcion_desde_payload(payload: str) -> Inscripcion:
+    datos = json.loads(payload)
+    visitantes = [Visitante(**v) for v in datos["visitantes"]]
+    return Inscripcion(
+        turno=Turno(
+            id=datos["turno_id"],
+            actividad_nombre=datos["actividad"],
+            fecha=datetime.strptime(datos["fecha"], "%Y-%m-%d").date(),
+            hora=datetime.strptime(datos["hora"], "%H:%M").time(),
+            cupo_ocupado=0,
+        ),
+        visitantes=visitantes,
+        total_personas=len(visitantes),
+        acepta_terminos=True,
+        email_contacto=datos["email"],
+    )
+
+
+class CorreoPendienteRepo(RepositorioBase):
+    """Outbox de comprobantes: correos a enviar en segundo plano."""
+
+    @staticmethod
+    def encolar(cur, inscripcion, id_inscripcion):
+        """
+        Encola el comprobante usando el cursor de una transacción abierta,
+        así el correo queda guardado si y solo si se guarda la inscripción.
+        """
+        cur.execute(
+            """
+            INSERT INTO CorreoPendiente
+                (inscripcion_id, destinatario, payload, proximo_intento)
+            VALUES (?, ?, ?, ?)
+            """,
+            (
+                id_inscripcion,
+                inscripcion.email_contacto,
+                payload_comprobante(inscripcion, id_inscripcion),
+                time.time(),
+            ),
+        )
+
+    def tomar_lote(
+        self, limite: int, reserva_segundos: float = RESERVA_SEGUNDOS
+    ):
+        """
+        Devuelve hasta `limite` correos pendientes cuyo próximo intento ya
+        venció y los reserva a nombre de un token nuevo, corriendo su próximo
+        intento `reserva_segundos`, para que otro trabajador no los tome
+        mientras se envían. Si el proceso se cae a mitad del envío, vuelven a
+        estar disponibles al vencer la reserva; si la reserva vence y otro los
+        toma, el token viejo ya no puede renovarlos ni marcarlos.
+        Filas: (id, destinatario, payload, intentos, reserva).
+        """
+        ahora = time.time()
+        reserva = uuid.uuid4().hex
+        with self.transaccion(inmediata=True) as cur:
+            filas = cur.execute(
+                """
+                SELECT id, destinatario, payload, intentos
+                FROM CorreoPendiente
+                WHERE estado = ? AND proximo_intento <= ?
+                ORDER BY proximo_intento
+                LIMIT ?
+                """,
+                (PENDIENTE, ahora, limite),
+            ).fetchall()
+            cur.executemany(
+                "UPDATE CorreoPendiente SET proximo_intento = ?, reserva = ? "
+                "WHERE id = ?",
+                [(ahora + reserva_segundos, reserva, f[0]) for f in filas],
+            )
+        return [(*f, reserva) for f in filas]
+
+    def _si_es_de(self, reserva: str, sql: str, params) -> bool:
+        """
+        Ejecuta un UPDATE de un correo (`params` termina en su id) solo si
+        sigue pendiente y reservado con `reserva`. Indica si lo actualizó.
+        """
+        with self.transaccion(inmediata=True) as cur:
+            cur.execute(
+                sql + " WHERE id = ? AND estado = ? AND reserva = ?",
+                (*params, PENDIENTE, reserva),
+            )
+            return cur.rowcount == 1
+
+    def renovar(
+        self,
+        correo_id: int,
+        reserva: str,
+        reserva_segundos: float = RESERVA_SEGUNDOS,
+    ) -> bool:
+        """Extiende la reserva de un correo; False si ya no es de `reserva`."""
+        return self._si_es_de(
+            reserva,
+            "UPDATE CorreoPendiente SET proximo_intento = ?",
+            (time.time() + reserva_segundos, correo_id),
+        )
+
+    def marcar_enviado(self, correo_id: int, reserva: str) -> bool:
+        return self._si_es_de(
+            reserva,
+            "UPDATE CorreoPendiente "
+            "SET estado = ?, intentos = intentos + 1, ultimo_error = NULL",
+            (ENVIADO, correo_id),
+        )
+
+    def reprogramar(
+        self,
+        correo_id: int,
+        reserva: str,
+        intentos: int,
+        proximo_intento: float,
+        error: str,
+    ) -> bool:
+        return self._si_es_de(
+            reserva,
+            "UPDATE CorreoPendiente "
+            "SET intentos = ?, proximo_intento = ?, ultimo_error = ?",
+            (intentos, proximo_intento, error, correo_id),
+        )
+
+    def marcar_fallido(
+        self, correo_id: int, reserva: str, intentos: int, error: str
+    ) -> bool:
+        return self._si_es_de(
+            reserva,
+            "UPDATE CorreoPendiente "
+            "SET estado = ?, intentos = ?, ultimo_error = ?",
+            (FALLIDO, intentos, error, correo_id),
+        )
+
+    def contar_por_estado(self) -> dict:
+        filas = self.ejecutar(
+            "SELECT estado, COUNT(*) FROM CorreoPendiente GROUP BY estado",
+            fetchall=True,
+        )
+        return dict(filas)
@@ -1,40 +1,176 @@
+from back.src.eventos_cupo import BUS_CUPOS
+from back.src.excepciones import (
+    ErrorChoqueHorario,
+    ErrorLote,
+    ErrorSinCupo,
+    ValidacionError,
+)
+from back.src.indice_choques import clave_horario
+from back.src.metricas import medir_etapa
 from back.src.repositorios.base import RepositorioBase
+from back.src.repositorios.correo_repo import CorreoPendienteRepo
+from back.src.repositorios.visitante_repo import VisitanteRepo
+
+SQL_INSERTAR_INSCRIPCION = """
+    INSERT INTO Inscripcion
+        (turno_id, email_contacto, total_personas, acepta_terminos)
+    VALUES (?, ?, ?, ?)
+"""
+
+SQL_INSERTAR_VISITANTE = """
+    INSERT INTO Visitante (inscripcion_id, nombre, dni, edad, talle)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+SQL_DESCONTAR_CUPO = """
+    UPDATE Turno
+    SET cupo_disponible = cupo_disponible - ?
+    WHERE id = ? AND cupo_disponible >= ?
+    RETURNING cupo_disponible, fecha
+"""
 
 
 class InscripcionRepo(RepositorioBase):
     def guardar(self, inscripcion):
         """Guarda una inscripción completa en la base de datos."""
-        turno_id = inscripcion.turno.id
-        email_contacto = inscripcion.email_contacto
-        acepta_terminos = inscripcion.acepta_terminos
-        total_personas = inscripcion.total_personas
+        # Usar una única transacción para asegurar que lastrowid corresponda
+        with self.transaccion(inmediata=True) as cur:
+            return self._insertar(cur, inscripcion)
 
-        # Usar una única conexión/transaction para asegurar que lastrowid corresponda
-        conn = self.get_connection()
-        try:
-            cur = conn.cursor()
-            # Insert Inscripcion
-            cur.execute(
-                """
-                INSERT INTO Inscripcion (turno_id, email_contacto, total_personas, acepta_terminos)
-                VALUES (?, ?, ?, ?)
-                """,
-                (turno_id, email_contacto, total_personas, int(acepta_terminos)),
+    def reservar(self, inscripcion, encolar_comprobante=False):
+        """
+        Descuenta el cupo del turno y guarda la inscripción con sus
+        visitantes en una única transacción (BEGIN IMMEDIATE) y, al confirmar,
+        publica el nuevo cupo en BUS_CUPOS.
+        El UPDATE condicional garantiza que el cupo nunca quede negativo
+        aunque haya reservas concurrentes; si no alcanza, lanza ErrorSinCupo
+        y no se guarda nada. Los choques de horario se revisan otra vez
+        dentro de la transacción (ErrorChoqueHorario): el chequeo previo de
+        la API no alcanza si dos reservas del mismo DNI llegan juntas.
+        Con `encolar_comprobante` también deja el correo de comprobante en
+        el outbox dentro de la misma transacción.
+        """
+        with self.transaccion(inmediata=True) as cur:
+            inscripcion_id, cupo, fecha = self._reservar_en(
+                cur, inscripcion, encolar_comprobante
             )
-            inscripcion_id = cur.lastrowid
-            # Insert Visitantes
-            for v in inscripcion.visitantes:
-                cur.execute(
-                    """
-                    INSERT INTO Visitante (inscripcion_id, nombre, dni, edad, talle)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (inscripcion_id, v.nombre, v.dni, v.edad, v.talle or ""),
-                )
-            conn.commit()
-            return inscripcion_id
-        finally:
-            conn.close()
+
+        # Ya confirmada: avisar el nuevo cupo a los clientes del stream
+        BUS_CUPOS.publicar(fecha, inscripcion.turno.id, cupo)
+        return inscripcion_id
+
+    def reservar_lote(self, inscripciones, encolar_comprobante=False):
+        """
+        Reserva todas las inscripciones en una sola transacción: o se
+        guardan todas o ninguna. Se intentan todas aunque alguna falle, así
+        ErrorLote informa cada error con su posición en el lote.
+        Devuelve los ids en el mismo orden.
+        """
+        ids, errores, cupos = [], [], {}
+        with self.transaccion(inmediata=True) as cur:
+            for indice, inscripcion in enumerate(inscripciones):
+                try:
+                    inscripcion_id, cupo, fecha = self._reservar_en(
+                        cur, inscripcion, encolar_comprobante
+                    )
+                except (ErrorChoqueHorario, ErrorSinCupo) as e:
+                    errores.append((indice, e))
+                    continue
+                ids.append(inscripcion_id)
+                cupos[inscripcion.turno.id] = (fecha, cupo)
+            if errores:
+                # Sale por excepción: la transacción hace ROLLBACK
+                raise ErrorLote(errores)
+
+        for turno_id, (fecha, cupo) in cupos.items():
+            BUS_CUPOS.publicar(fecha, turno_id, cupo)
+        return ids
+
+    def reservar_varias(self, pedidos):
+        """
+        Reserva inscripciones independientes con un único COMMIT (lo usa el
+        EscritorAgrupado). `pedidos` son pares
+        (inscripcion, encolar_comprobante). A diferencia de reservar_lote
+        cada una se confirma o falla por su cuenta: un SAVEPOINT por
+        inscripción deshace solo la que falló.
+        Devuelve, en el mismo orden, el id de cada inscripción o el error de
+        validación que la rechazó. Cualquier otro error (BEGIN, COMMIT, la
+        BD misma) deshace la transacción entera y se propaga: no se guardó
+        ninguna.
+        """
+        resultados, cupos = [], {}
+        with self.transaccion(inmediata=True) as cur:
+            for inscripcion, encolar_comprobante in pedidos:
+                cur.execute("SAVEPOINT reserva")
+                try:
+                    inscripcion_id, cupo, fecha = self._reservar_en(
+                        cur, inscripcion, encolar_comprobante
+                    )
+                except ValidacionError as e:
+                    # Incluye ErrorSinCupo y ErrorChoqueHorario
+                    cur.execute("ROLLBACK TO reserva")
+                    cur.execute("RELEASE reserva")
+                    resultados.append(e)
+                    continue
+                cur.execute("RELEASE reserva")
+                resultados.append(inscripcion_id)
+                cupos[inscripcion.turno.id] = (fecha, cupo)
+
+        for turno_id, (fecha, cupo) in cupos.items():
+            BUS_CUPOS.publicar(fecha, turno_id, cupo)
+        return resultados
+
+    def _reservar_en(self, cur, inscripcion, encolar_comprobante):
+        """Una reserva dentro de una transacción abierta: (id, cupo, fecha)."""
+        total_personas = inscripcion.total_personas
+        turno = inscripcion.turno
+        with medir_etapa("revalidar_choques"):
+            choques = VisitanteRepo.dnis_con_choque_en(
+                cur,
+                [v.dni for v in inscripcion.visitantes],
+                *clave_horario(turno.fecha, turno.hora),
+            )
+        if choques:
+            raise ErrorChoqueHorario(
+                f"El DNI {min(choques)} ya tiene una inscripción "
+                "en ese horario"
+            )
+        with medir_etapa("descontar_cupo"):
+            descontado = cur.execute(
+                SQL_DESCONTAR_CUPO,
+                (total_personas, turno.id, total_personas),
+            ).fetchall()
+        if not descontado:
+            raise ErrorSinCupo(
+                "No hay suficiente cupo para todos los participantes."
+            )
+        with medir_etapa("guardar"):
+            inscripcion_id = self._insertar(cur, inscripcion)
+        if encolar_comprobante:
+            with medir_etapa("encolar_correo"):
+                CorreoPendienteRepo.encolar(cur, inscripcion, inscripcion_id)
+        cupo, fecha = descontado[0]
+        return inscripcion_id, cupo, fecha
+
+    def _insertar(self, cur, inscripcion):
+        cur.execute(
+            SQL_INSERTAR_INSCRIPCION,
+            (
+                inscripcion.turno.id,
+                inscripcion.email_contacto,
+                inscripcion.total_personas,
+                int(inscripcion.acepta_terminos),
+            ),
+        )
+        inscripcion_id = cur.lastrowid
+        cur.executemany(
+            SQL_INSERTAR_VISITANTE,
+            [
+                (inscripcion_id, v.nombre, v.dni, v.edad, v.talle or "")
+                for v in inscripcion.visitantes
+            ],
+        )
+        return inscripcion_id
 
     def obtener_por_turno(self, turno_id):
         return self.ejecutar(
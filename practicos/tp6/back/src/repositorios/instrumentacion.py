@@ -0,0 +1,224 @@
+"""
+Instrumentación opcional de las consultas SQL de los repositorios.
+
+Con la instrumentación activa, RepositorioBase entrega cursores envueltos
+que miden cada sentencia: texto normalizado, cantidad de parámetros,
+duración y filas devueltas. Las estadísticas se agregan por "forma" de
+consulta y las sentencias que superan el umbral van al log de consultas
+lentas junto con su EXPLAIN QUERY PLAN. Apagada no agrega costo: los
+repositorios usan el cursor de sqlite3 directamente.
+"""
+
+import logging
+import re
+import threading
+import time
+
+logger_lentas = logging.getLogger("ecopark.sql.lentas")
+
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql: str) -> str:
+    """Forma de la consulta: sin literales, IN colapsados, espacios simples."""
+    sql = _LITERALES.sub("?", sql)
+    sql = _LISTAS.sub("(?, ...)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+class EstadisticasSQL:
+    """Cantidad, duración y filas por forma de consulta (thread-safe)."""
+
+    def __init__(self):
+        self._por_forma = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, forma, parametros, duracion, filas):
+        with self._lock:
+            stats = self._por_forma.get(forma)
+            if stats is None:
+                stats = self._por_forma[forma] = {
+                    "consulta": forma,
+                    "parametros": parametros,
+                    "cantidad": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "filas": 0,
+                    "lentas": 0,
+                }
+            ms = duracion * 1000
+            stats["cantidad"] += 1
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+            stats["filas"] += max(filas, 0)
+            return stats
+
+    def marcar_lenta(self, stats):
+        with self._lock:
+            stats["lentas"] += 1
+
+    def resumen(self, orden="total_ms", limite=50) -> list:
+        with self._lock:
+            filas = [dict(s) for s in self._por_forma.values()]
+        for s in filas:
+            s["promedio_ms"] = s["total_ms"] / s["cantidad"]
+        return sorted(filas, key=lambda s: s[orden], reverse=True)[:limite]
+
+    def reiniciar(self):
+        with self._lock:
+            self._por_forma.clear()
+
+
+class Instrumentacion:
+    def __init__(self):
+        self.activa = False
+        self.umbral_ms = 50.0
+        self.estadisticas = EstadisticasSQL()
+
+    def configurar(
+        self, activa: bool, umbral_ms: float = 50.0, archivo_lentas=None
+    ):
+        self.activa = activa
+        self.umbral_ms = umbral_ms
+        if archivo_lentas and not any(
+            getattr(h, "baseFilename", None) == str(archivo_lentas)
+            for h in logger_lentas.handlers
+        ):
+            manejador = logging.FileHandler(archivo_lentas, encoding="utf-8")
+            manejador.setFormatter(
+                logging.Formatter("%(asctime)s %(message)s")
+            )
+            logger_lentas.addHandler(manejador)
+            logger_lentas.setLevel(logging.WARNING)
+
+    def registrar(self, cursor, sql, params, duracion, filas):
+        forma = normalizar_sql(sql)
+        stats = self.estadisticas.registrar(
+            forma, _cantidad_parametros(params), duracion, filas
+        )
+        if duracion * 1000 >= self.umbral_ms:
+            self.estadisticas.marcar_lenta(stats)
+            logger_lentas.warning(
+                "%.1f ms, %s filas: %s | plan: %s",
+                duracion * 1000,
+                filas,
+                forma,
+                _plan(cursor.connection, sql, params),
+            )
+
+
+def _cantidad_parametros(params) -> int:
+    try:
+        return len(params)
+    except TypeError:
+        return 0
+
+
+def _plan(conn, sql, params) -> str:
+    inicio = sql.lstrip().upper()
+    if not inicio.startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+        return "-"
+    try:
+        plan = conn.execute("EXPLAIN QUERY PLAN " + sql, params)
+        return "; ".join(f[3] for f in plan)
+    except Exception as e:
+        return f"sin plan ({e})"
+
+
+class CursorInstrumentado:
+    """
+    Envoltorio de sqlite3.Cursor que mide cada sentencia. La duración
+    incluye la lectura de las filas: la medición se cierra al ejecutar la
+    sentencia siguiente o al cerrar el cursor.
+    """
+
+    def __init__(self, cursor, instrumentacion: Instrumentacion):
+        self._cursor = cursor
+        self._instr = instrumentacion
+        self._pendiente = None
+
+    def _cerrar_medicion(self):
+        if self._pendiente is not None:
+            sql, params, duracion, filas = self._pendiente
+            self._pendiente = None
+            self._instr.registrar(self._cursor, sql, params, duracion, filas)
+
+    def _medir(self, metodo, sql, params, params_fila):
+        self._cerrar_medicion()
+        inicio = time.perf_counter()
+        metodo(sql, params)
+        duracion = time.perf_counter() - inicio
+        # rowcount es -1 para SELECT: las filas se suman al leerlas
+        filas = max(self._cursor.rowcount, 0)
+        self._pendiente = [sql, params_fila, duracion, filas]
+        return self
+
+    def execute(self, sql, params=()):
+        return self._medir(self._cursor.execute, sql, params, params)
+
+    def executemany(self, sql, filas):
+        filas = list(filas)
+        primera = filas[0] if filas else ()
+        return self._medir(self._cursor.executemany, sql, filas, primera)
+
+    def _leido(self, inicio, cantidad):
+        if self._pendiente is not None:
+            self._pendiente[2] += time.perf_counter() - inicio
+            self._pendiente[3] += cantidad
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        fila = self._cursor.fetchone()
+        self._leido(inicio, 1 if fila is not None else 0)
+        return fila
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        if size is None:
+            size = self._cursor.arraysize
+        filas = self._cursor.fetchmany(size)
+        self._leido(inicio, len(filas))
+        return filas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        filas = self._cursor.fetchall()
+        self._leido(inicio, len(filas))
+        return filas
+
+    def __iter__(self):
+        # Fila por fila, sin materializar el resultado: el tiempo y la
+        # cantidad se suman a la sentencia que produjo las filas
+        medicion = self._pendiente
+        filas = iter(self._cursor)
+        while True:
+            inicio = time.perf_counter()
+            fila = next(filas, None)
+            if medicion is not None:
+                medicion[2] += time.perf_counter() - inicio
+                medicion[3] += fila is not None
+            if fila is None:
+                return
+            yield fila
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def connection(self):
+        return self._cursor.connection
+
+    def close(self):
+        self._cerrar_medicion()
+        self._cursor.close()
+
+
+# Estado compartido por todos los repositorios
+INSTRUMENTACION = Instrumentacion()
@@ -0,0 +1,484 @@
+"""
+Almacenamiento en memoria con la misma interfaz que los repositorios SQLite.
+
+AlmacenMemoria guarda actividades, turnos e inscripciones (los modelos de
+dominio, que usan __slots__) y mantiene índices hash por turno, por horario
+(fecha, hora) y por DNI: cada consulta de los repositorios es una búsqueda
+directa en vez de recorrer todas las inscripciones. Las escrituras se hacen
+bajo un único lock, que cumple el papel de BEGIN IMMEDIATE.
+
+Sirve como backend de tests y de desarrollo local (ECOPARK_ALMACEN=memoria):
+los repositorios devuelven las mismas tuplas que sus versiones SQLite, pero
+nada se persiste al cerrar la app.
+"""
+
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import date, time
+from functools import cached_property
+from typing import Iterable, List, Optional
+
+from back.src.eventos_cupo import BUS_CUPOS
+from back.src.excepciones import ErrorChoqueHorario, ErrorLote, ErrorSinCupo
+from back.src.indice_choques import (
+    IndiceChoques,
+    IndiceChoquesEnMemoria,
+    clave_horario,
+)
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.asincrono import ProxyAsincrono
+from back.src.repositorios.turno_repo import fecha_canonica
+
+
+class AlmacenMemoria:
+    def __init__(self):
+        self.lock = threading.RLock()
+        # Actividad: id -> (id, nombre, capacidad_maxima,
+        #                   requiere_vestimenta, edad_minima)
+        self.actividades = {}
+        self.version_actividades = 0
+        # Turno: id -> [id, actividad_id, fecha, hora, cupo_disponible]
+        self.turnos = {}
+        # Claves (fecha, hora, id) ordenadas, para rangos y páginas
+        self.orden_turnos = []
+        # fecha -> [(hora, id)] ordenadas
+        self.turnos_por_fecha = defaultdict(list)
+        # Inscripcion: id -> modelo; sus visitantes tienen ids consecutivos
+        self.inscripciones = {}
+        self.horario_de = {}  # id de inscripción -> (fecha, hora)
+        self._horarios = {}  # (fecha, hora) -> la misma tupla
+        # id de inscripción -> id de su primer visitante
+        self.primer_visitante = {}
+        # Visitantes agregados después (agregar_visitante):
+        # id de inscripción -> [(id, modelo)]
+        self.visitantes_agregados = defaultdict(list)
+        # Índices
+        self.por_turno = defaultdict(list)  # turno_id -> ids de inscripción
+        self.por_horario = defaultdict(set)  # (fecha, hora) -> DNI inscriptos
+        # dni -> id de su primera inscripción (un int, no una lista por DNI)
+        self.por_dni = {}
+        # ids de inscripción con comprobante encolado
+        self.correos_pendientes = []
+        self._ids = {
+            "actividad": 0,
+            "turno": 0,
+            "inscripcion": 0,
+            "visitante": 0,
+        }
+
+    def _proximo_id(self, tabla, cantidad=1):
+        primero = self._ids[tabla] + 1
+        self._ids[tabla] += cantidad
+        return primero
+
+    # --- Carga ---
+    def agregar_actividad(
+        self,
+        nombre,
+        capacidad_maxima,
+        requiere_vestimenta=False,
+        edad_minima=None,
+        id=None,
+    ) -> int:
+        with self.lock:
+            if id is None:
+                id = self._proximo_id("actividad")
+            self._ids["actividad"] = max(self._ids["actividad"], id)
+            self.actividades[id] = (
+                id,
+                nombre,
+                capacidad_maxima,
+                int(requiere_vestimenta),
+                edad_minima,
+            )
+            self.version_actividades += 1
+            return id
+
+    def agregar_turno(
+        self, actividad_id, fecha, hora, cupo_disponible, id=None
+    ) -> int:
+        fecha = fecha_canonica(fecha)
+        if isinstance(hora, time):
+            hora = hora.strftime("%H:%M")
+        with self.lock:
+            if id is None:
+                id = self._proximo_id("turno")
+            self._ids["turno"] = max(self._ids["turno"], id)
+            self.turnos[id] = [id, actividad_id, fecha, hora, cupo_disponible]
+            insort(self.orden_turnos, (fecha, hora, id))
+            insort(self.turnos_por_fecha[fecha], (hora, id))
+            return id
+
+    @classmethod
+    def desde_sqlite(cls, ruta) -> "AlmacenMemoria":
+        """Copia actividades, turnos e inscripciones de una BD SQLite."""
+        almacen = cls()
+        conn = sqlite3.connect(ruta)
+        try:
+            for fila in conn.execute("SELECT * FROM Actividad ORDER BY id"):
+                almacen.agregar_actividad(*fila[1:], id=fila[0])
+            for t_id, act_id, fecha, hora, cupo in conn.execute(
+                "SELECT id, actividad_id, fecha, hora, cupo_disponible "
+                "FROM Turno"
+            ):
+                almacen.turnos[t_id] = [t_id, act_id, fecha, hora, cupo]
+                almacen.turnos_por_fecha[fecha].append((hora, t_id))
+                almacen._ids["turno"] = max(almacen._ids["turno"], t_id)
+            almacen.orden_turnos = sorted(
+                (t[2], t[3], t[0]) for t in almacen.turnos.values()
+            )
+            for filas in almacen.turnos_por_fecha.values():
+                filas.sort()
+
+            visitantes, primeros = defaultdict(list), {}
+            for v_id, ins_id, nombre, dni, edad, talle in conn.execute(
+                "SELECT * FROM Visitante ORDER BY id"
+            ):
+                primeros.setdefault(ins_id, v_id)
+                visitantes[ins_id].append(
+                    Visitante(nombre, dni, edad, talle or None)
+                )
+            modelos_turno = {}
+            for ins_id, turno_id, email, total, acepta in conn.execute(
+                "SELECT * FROM Inscripcion ORDER BY id"
+            ):
+                turno = modelos_turno.get(turno_id)
+                if turno is None:
+                    turno = almacen.modelo_turno(turno_id)
+                    modelos_turno[turno_id] = turno
+                # Conservar los ids de SQLite
+                almacen._ids["inscripcion"] = ins_id - 1
+                almacen._ids["visitante"] = (
+                    primeros.get(ins_id, almacen._ids["visitante"] + 1) - 1
+                )
+                almacen.insertar(
+                    Inscripcion(
+                        turno,
+                        visitantes.pop(ins_id, []),
+                        total,
+                        bool(acepta),
+                        email,
+                    )
+                )
+        finally:
+            conn.close()
+        return almacen
+
+    def modelo_turno(self, turno_id) -> Turno:
+        t_id, act_id, fecha, hora, cupo = self.turnos[turno_id]
+        actividad = self.actividades.get(act_id)
+        capacidad = actividad[2] if actividad else cupo
+        return Turno(
+            t_id,
+            actividad[1] if actividad else "",
+            date.fromisoformat(fecha),
+            time.fromisoformat(hora),
+            capacidad - cupo,
+        )
+
+    # --- Escritura (con el lock tomado) ---
+    def _horario(self, turno) -> tuple:
+        fila = self.turnos.get(getattr(turno, "id", None))
+        if fila is not None:
+            horario = (fila[2], fila[3])
+        else:
+            horario = clave_horario(turno.fecha, turno.hora)
+        # Una sola tupla por horario, compartida por todas sus inscripciones
+        return self._horarios.setdefault(horario, horario)
+
+    def insertar(self, inscripcion) -> int:
+        """Agrega la inscripción y actualiza los índices; no toca el cupo."""
+        with self.lock:
+            ins_id = self._proximo_id("inscripcion")
+            horario = self._horario(inscripcion.turno)
+            self.inscripciones[ins_id] = inscripcion
+            self.horario_de[ins_id] = horario
+            self.primer_visitante[ins_id] = self._proximo_id(
+                "visitante", len(inscripcion.visitantes)
+            )
+            self.por_turno[inscripcion.turno.id].append(ins_id)
+            dnis = self.por_horario[horario]
+            for v in inscripcion.visitantes:
+                dnis.add(v.dni)
+                self.por_dni.setdefault(v.dni, ins_id)
+            return ins_id
+
+    def agregar_visitante(self, ins_id, visitante) -> int:
+        """Suma un visitante a una inscripción guardada; no toca el cupo."""
+        with self.lock:
+            if ins_id not in self.inscripciones:
+                raise KeyError(f"No existe la inscripción {ins_id}")
+            v_id = self._proximo_id("visitante")
+            self.visitantes_agregados[ins_id].append((v_id, visitante))
+            self.por_horario[self.horario_de[ins_id]].add(visitante.dni)
+            self.por_dni.setdefault(visitante.dni, ins_id)
+            return v_id
+
+    def quitar(self, ins_id):
+        """Deshace `insertar` (rollback de un lote)."""
+        with self.lock:
+            inscripcion = self.inscripciones.pop(ins_id)
+            horario = self.horario_de.pop(ins_id)
+            del self.primer_visitante[ins_id]
+            self.visitantes_agregados.pop(ins_id, None)
+            self.por_turno[inscripcion.turno.id].remove(ins_id)
+            for v in inscripcion.visitantes:
+                self.por_horario[horario].discard(v.dni)
+                # Los lotes se deshacen en orden inverso: si apunta acá,
+                # no hay otra anterior
+                if self.por_dni.get(v.dni) == ins_id:
+                    del self.por_dni[v.dni]
+
+    def reservar(self, inscripcion, encolar_comprobante=False):
+        """Como InscripcionRepo.reservar. Devuelve (id, cupo, fecha)."""
+        with self.lock:
+            turno = self.turnos.get(inscripcion.turno.id)
+            horario = self._horario(inscripcion.turno)
+            reservados = self.por_horario.get(horario, ())
+            choques = [
+                v.dni for v in inscripcion.visitantes if v.dni in reservados
+            ]
+            if choques:
+                raise ErrorChoqueHorario(
+                    f"El DNI {min(choques)} ya tiene una inscripción "
+                    "en ese horario"
+                )
+            if turno is None or turno[4] < inscripcion.total_personas:
+                raise ErrorSinCupo(
+                    "No hay suficiente cupo para todos los participantes."
+                )
+            turno[4] -= inscripcion.total_personas
+            ins_id = self.insertar(inscripcion)
+            if encolar_comprobante:
+                self.correos_pendientes.append(ins_id)
+            return ins_id, turno[4], turno[2]
+
+    # --- Filas con la forma de SQLite ---
+    def fila_inscripcion(self, ins_id) -> tuple:
+        ins = self.inscripciones[ins_id]
+        return (
+            ins_id,
+            ins.turno.id,
+            ins.email_contacto,
+            ins.total_personas,
+            int(ins.acepta_terminos),
+        )
+
+    def filas_visitantes(self, ins_id) -> List[tuple]:
+        primero = self.primer_visitante[ins_id]
+        inscripcion = self.inscripciones[ins_id]
+        visitantes = list(enumerate(inscripcion.visitantes, start=primero))
+        visitantes += self.visitantes_agregados.get(ins_id, ())
+        return [
+            (v_id, ins_id, v.nombre, v.dni, v.edad, v.talle or "")
+            for v_id, v in visitantes
+        ]
+
+
+class IndiceChoquesAlmacen(IndiceChoques):
+    """
+    Índice de choques que lee directo el índice por horario del almacén.
+    Las inscripciones que el servicio acepta se registran aparte hasta que
+    se guardan, como en IndiceChoquesEnMemoria.
+    """
+
+    def __init__(self, almacen: AlmacenMemoria):
+        self.almacen = almacen
+        self._nuevas = IndiceChoquesEnMemoria()
+
+    def registrar(self, inscripcion: Inscripcion):
+        self._nuevas.registrar(inscripcion)
+
+    def dnis_reservados(self, fecha, hora):
+        clave = clave_horario(fecha, hora)
+        guardados = self.almacen.por_horario.get(clave, set())
+        nuevas = self._nuevas.dnis_reservados(*clave)
+        return guardados | nuevas if nuevas else guardados
+
+
+class RepositorioMemoria:
+    def __init__(self, almacen: Optional[AlmacenMemoria] = None):
+        self.almacen = almacen or AlmacenMemoria()
+
+    @cached_property
+    def asincrono(self) -> ProxyAsincrono:
+        return ProxyAsincrono(self)
+
+
+class RepositorioActividadMemoria(RepositorioMemoria):
+    def obtener_todas(self):
+        return list(self.almacen.actividades.values())
+
+    def obtener_por_id(self, actividad_id):
+        return self.almacen.actividades.get(actividad_id)
+
+    def obtener_por_nombre(self, nombre):
+        return next(
+            (a for a in self.almacen.actividades.values() if a[1] == nombre),
+            None,
+        )
+
+    def version(self):
+        return self.almacen.version_actividades
+
+    def data_version(self):
+        return self.almacen.version_actividades
+
+
+class RepositorioTurnoMemoria(RepositorioMemoria):
+    def _filas(self, ids):
+        turnos = self.almacen.turnos
+        return [tuple(turnos[i]) for i in ids]
+
+    def obtener_por_fecha(self, fecha):
+        filas = self.almacen.turnos_por_fecha.get(fecha_canonica(fecha), ())
+        return self._filas(t_id for _, t_id in filas)
+
+    def obtener_desde(self, fecha):
+        orden = self.almacen.orden_turnos
+        inicio = bisect_left(orden, (fecha_canonica(fecha),))
+        return self._filas(clave[2] for clave in orden[inicio:])
+
+    def obtener_pagina_desde(self, fecha, despues=None, limite=500):
+        orden = self.almacen.orden_turnos
+        inicio = bisect_left(orden, (fecha_canonica(fecha),))
+        if despues is not None:
+            inicio = max(inicio, bisect_right(orden, tuple(despues)))
+        claves = orden[inicio : inicio + limite]
+        return self._filas(clave[2] for clave in claves)
+
+    def obtener_por_actividad_y_fecha(self, actividad_id, fecha_a, fecha_b):
+        orden = self.almacen.orden_turnos
+        inicio = bisect_left(orden, (fecha_a,))
+        fin = bisect_left(orden, (fecha_b + "\0",))
+        turnos = self.almacen.turnos
+        return [
+            tuple(turnos[clave[2]])
+            for clave in orden[inicio:fin]
+            if turnos[clave[2]][1] == actividad_id
+        ]
+
+    def actualizar_cupo(self, turno_id: int, nuevo_cupo: int):
+        with self.almacen.lock:
+            turno = self.almacen.turnos.get(turno_id)
+            if turno is None:
+                return
+            turno[4] = max(nuevo_cupo, 0)
+        BUS_CUPOS.publicar(turno[2], turno_id, turno[4])
+
+
+class InscripcionRepoMemoria(RepositorioMemoria):
+    @property
+    def indice_choques(self) -> IndiceChoquesAlmacen:
+        """ServicioInscripcion lo usa en vez de indexar cada inscripción."""
+        return IndiceChoquesAlmacen(self.almacen)
+
+    def guardar(self, inscripcion):
+        return self.almacen.insertar(inscripcion)
+
+    def reservar(self, inscripcion, encolar_comprobante=False):
+        ins_id, cupo, fecha = self.almacen.reservar(
+            inscripcion, encolar_comprobante
+        )
+        BUS_CUPOS.publicar(fecha, inscripcion.turno.id, cupo)
+        return ins_id
+
+    def reservar_lote(self, inscripciones, encolar_comprobante=False):
+        almacen = self.almacen
+        ids, errores, cupos = [], [], {}
+        with almacen.lock:
+            for indice, inscripcion in enumerate(inscripciones):
+                try:
+                    ins_id, cupo, fecha = almacen.reservar(
+                        inscripcion, encolar_comprobante
+                    )
+                except (ErrorChoqueHorario, ErrorSinCupo) as e:
+                    errores.append((indice, e))
+                    continue
+                ids.append(ins_id)
+                cupos[inscripcion.turno.id] = (fecha, cupo)
+            if errores:
+                # Rollback: devolver el cupo y sacar lo insertado
+                for ins_id in reversed(ids):
+                    inscripcion = almacen.inscripciones[ins_id]
+                    turno = almacen.turnos[inscripcion.turno.id]
+                    turno[4] += inscripcion.total_personas
+                    almacen.quitar(ins_id)
+                    if encolar_comprobante:
+                        almacen.correos_pendientes.remove(ins_id)
+                raise ErrorLote(errores)
+        for turno_id, (fecha, cupo) in cupos.items():
+            BUS_CUPOS.publicar(fecha, turno_id, cupo)
+        return ids
+
+    def obtener_por_turno(self, turno_id):
+        return [
+            self.almacen.fila_inscripcion(i)
+            for i in self.almacen.por_turno.get(turno_id, ())
+        ]
+
+    def obtener_todas(self):
+        return [
+            self.almacen.fila_inscripcion(i)
+            for i in self.almacen.inscripciones
+        ]
+
+
+class VisitanteRepoMemoria(RepositorioMemoria):
+    def agregar_visitante(self, inscripcion_id, nombre, dni, edad, talle=""):
+        self.almacen.agregar_visitante(
+            inscripcion_id, Visitante(nombre, dni, edad, talle or None)
+        )
+
+    def obtener_por_dni(self, dni):
+        ins_id = self.almacen.por_dni.get(dni)
+        if ins_id is None:
+            return None
+        return next(
+            f for f in self.almacen.filas_visitantes(ins_id) if f[3] == dni
+        )
+
+    def obtener_por_inscipcion_id(self, inscripcion_id):
+        if inscripcion_id not in self.almacen.inscripciones:
+            return None
+        filas = self.almacen.filas_visitantes(inscripcion_id)
+        return filas[0] if filas else None
+
+    def existe_choque_por_dni_y_fecha_hora(
+        self, dni: int, fecha: str, hora: str
+    ) -> bool:
+        return dni in self.almacen.por_horario.get((fecha, hora), ())
+
+    def dnis_con_choque(self, dnis, fecha: str, hora: str) -> set:
+        reservados = self.almacen.por_horario.get((fecha, hora), set())
+        return {int(d) for d in dnis} & reservados
+
+    def dnis_en_horario(self, fecha: str, hora: str) -> set:
+        return set(self.almacen.por_horario.get((fecha, hora), ()))
+
+
+class RepositorioEnMemoria(InscripcionRepoMemoria):
+    """
+    Repositorio de inscripciones en memoria para tests del servicio: acepta
+    una lista inicial de inscripciones, aunque sus turnos no estén cargados.
+    """
+
+    def __init__(
+        self,
+        inscripciones: Iterable[Inscripcion] = None,
+        almacen: Optional[AlmacenMemoria] = None,
+    ):
+        super().__init__(almacen)
+        for inscripcion in inscripciones or ():
+            self.almacen.insertar(inscripcion)
+
+    @property
+    def inscripciones(self) -> List[Inscripcion]:
+        return list(self.almacen.inscripciones.values())
+
+    def guardar_inscripcion(self, inscripcion: Inscripcion):
+        self.guardar(inscripcion)
@@ -0,0 +1,296 @@
+"""
+Migraciones versionadas del esquema de la BD del parque.
+
+Cada migración tiene un número de versión, una descripción y las sentencias
+a ejecutar. La versión aplicada se guarda en la tabla `schema_version`, así
+que `aplicar_migraciones` puede llamarse en cada arranque de la app: solo
+ejecuta las migraciones que todavía no se aplicaron.
+"""
+
+from datetime import datetime
+
+from back.src.repositorios.conexion import obtener_pool
+
+# Turnos que solo difieren en el formato ('2025-10-15' y
+# '2025-10-15 00:00:00') o que están repetidos tal cual se funden en el de
+# menor id: sus inscripciones pasan a ese turno y su ocupación se descuenta
+# de su cupo, sin bajar de 0 si entre los dos superan la capacidad. Corre
+# antes de crear el índice único (migración 2) y antes de normalizar los
+# formatos (migración 9), que si no chocarían con ese índice.
+SQL_FUNDIR_TURNOS_DUPLICADOS = [
+    """
+    CREATE TEMP TABLE _turno_duplicado AS
+    SELECT T.id AS id, G.destino AS destino
+    FROM Turno T
+    JOIN (
+        SELECT actividad_id,
+               COALESCE(date(fecha), fecha) AS fecha,
+               COALESCE(strftime('%H:%M', hora), hora) AS hora,
+               MIN(id) AS destino
+        FROM Turno
+        GROUP BY 1, 2, 3
+        HAVING COUNT(*) > 1
+    ) G ON G.actividad_id = T.actividad_id
+       AND G.fecha = COALESCE(date(T.fecha), T.fecha)
+       AND G.hora = COALESCE(strftime('%H:%M', T.hora), T.hora)
+    """,
+    "DELETE FROM _turno_duplicado WHERE id = destino",
+    """
+    UPDATE Turno SET cupo_disponible = MAX(0, cupo_disponible - (
+        SELECT COALESCE(SUM(I.total_personas), 0)
+        FROM Inscripcion I JOIN _turno_duplicado D ON D.id = I.turno_id
+        WHERE D.destino = Turno.id
+    ))
+    WHERE id IN (SELECT destino FROM _turno_duplicado)
+    """,
+    """
+    UPDATE Inscripcion
+    SET turno_id = (
+        SELECT destino FROM _turno_duplicado WHERE id = Inscripcion.turno_id
+    )
+    WHERE turno_id IN (SELECT id FROM _turno_duplicado)
+    """,
+    "DELETE FROM Turno WHERE id IN (SELECT id FROM _turno_duplicado)",
+    "DROP TABLE _turno_duplicado",
+]
+
+MIGRACIONES = [
+    (
+        1,
+        "Tablas base",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS Actividad (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nombre TEXT NOT NULL,
+                capacidad_maxima INTEGER NOT NULL,
+                requiere_vestimenta INTEGER NOT NULL DEFAULT 0,
+                edad_minima INTEGER
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS Turno (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                actividad_id INTEGER NOT NULL,
+                fecha TEXT NOT NULL,
+                hora TEXT NOT NULL,
+                cupo_disponible INTEGER NOT NULL,
+                FOREIGN KEY (actividad_id) REFERENCES Actividad(id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS Inscripcion (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                turno_id INTEGER NOT NULL,
+                email_contacto TEXT NOT NULL,
+                total_personas INTEGER NOT NULL,
+                acepta_terminos INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (turno_id) REFERENCES Turno(id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS Visitante (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                inscripcion_id INTEGER NOT NULL,
+                nombre TEXT NOT NULL,
+                dni INTEGER NOT NULL,
+                edad INTEGER NOT NULL,
+                talle TEXT,
+                FOREIGN KEY (inscripcion_id) REFERENCES Inscripcion(id)
+            )
+            """,
+        ],
+    ),
+    (
+        2,
+        "Índice único de turnos por actividad, fecha y hora",
+        [
+            *SQL_FUNDIR_TURNOS_DUPLICADOS,
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_turno_actividad_fecha_hora "
+            "ON Turno (actividad_id, fecha, hora)",
+        ],
+    ),
+    (
+        3,
+        "Índice de turnos por fecha y hora",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_turno_fecha_hora "
+            "ON Turno (fecha, hora)"
+        ],
+    ),
+    (
+        4,
+        "Índice de visitantes por DNI",
+        ["CREATE INDEX IF NOT EXISTS ix_visitante_dni ON Visitante (dni)"],
+    ),
+    (
+        5,
+        "Índice de inscripciones por turno",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_inscripcion_turno "
+            "ON Inscripcion (turno_id)"
+        ],
+    ),
+    (
+        6,
+        "Índice de visitantes por inscripción",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_visitante_inscripcion "
+            "ON Visitante (inscripcion_id)"
+        ],
+    ),
+    (
+        7,
+        "Outbox de correos de comprobante",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS CorreoPendiente (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                inscripcion_id INTEGER NOT NULL,
+                destinatario TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                estado TEXT NOT NULL DEFAULT 'pendiente',
+                intentos INTEGER NOT NULL DEFAULT 0,
+                proximo_intento REAL NOT NULL,
+                ultimo_error TEXT,
+                FOREIGN KEY (inscripcion_id) REFERENCES Inscripcion(id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_correo_pendiente "
+            "ON CorreoPendiente (estado, proximo_intento)",
+        ],
+    ),
+    (
+        8,
+        "Contador de versión de tablas para invalidar caches",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS VersionTabla (
+                tabla TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+            """,
+            "INSERT OR IGNORE INTO VersionTabla (tabla, version) "
+            "VALUES ('Actividad', 0)",
+            """
+            CREATE TRIGGER IF NOT EXISTS tr_actividad_insert
+            AFTER INSERT ON Actividad
+            BEGIN
+                UPDATE VersionTabla SET version = version + 1
+                WHERE tabla = 'Actividad';
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tr_actividad_update
+            AFTER UPDATE ON Actividad
+            BEGIN
+                UPDATE VersionTabla SET version = version + 1
+                WHERE tabla = 'Actividad';
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tr_actividad_delete
+            AFTER DELETE ON Actividad
+            BEGIN
+                UPDATE VersionTabla SET version = version + 1
+                WHERE tabla = 'Actividad';
+            END
+            """,
+        ],
+    ),
+    (
+        9,
+        "Fecha y hora de los turnos en formato canónico (YYYY-MM-DD / HH:MM)",
+        [
+            *SQL_FUNDIR_TURNOS_DUPLICADOS,
+            "UPDATE Turno SET fecha = date(fecha) "
+            "WHERE date(fecha) IS NOT NULL AND fecha <> date(fecha)",
+            "UPDATE Turno SET hora = strftime('%H:%M', hora) "
+            "WHERE strftime('%H:%M', hora) IS NOT NULL "
+            "AND hora <> strftime('%H:%M', hora)",
+            """
+            CREATE TRIGGER IF NOT EXISTS tr_turno_formato_insert
+            BEFORE INSERT ON Turno
+            WHEN NEW.fecha IS NOT date(NEW.fecha)
+                OR NEW.hora IS NOT strftime('%H:%M', NEW.hora)
+            BEGIN
+                SELECT RAISE(
+                    ABORT, 'Turno: fecha debe ser YYYY-MM-DD y hora HH:MM'
+                );
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tr_turno_formato_update
+            BEFORE UPDATE OF fecha, hora ON Turno
+            WHEN NEW.fecha IS NOT date(NEW.fecha)
+                OR NEW.hora IS NOT strftime('%H:%M', NEW.hora)
+            BEGIN
+                SELECT RAISE(
+                    ABORT, 'Turno: fecha debe ser YYYY-MM-DD y hora HH:MM'
+                );
+            END
+            """,
+        ],
+    ),
+    (
+        10,
+        "Dueño de la reserva de cada correo del outbox",
+        ["ALTER TABLE CorreoPendiente ADD COLUMN reserva TEXT"],
+    ),
+]
+
+VERSION_ESQUEMA = MIGRACIONES[-1][0]
+
+
+def version_actual(conn) -> int:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            descripcion TEXT NOT NULL,
+            aplicada_en TEXT NOT NULL
+        )
+        """
+    )
+    return conn.execute(
+        "SELECT COALESCE(MAX(version), 0) FROM schema_version"
+    ).fetchone()[0]
+
+
+def aplicar_migraciones(db_path=None) -> int:
+    """
+    Aplica en orden las migraciones pendientes y devuelve cuántas se aplicaron.
+    Cada migración corre en su propia transacción (BEGIN IMMEDIATE), de modo
+    que dos procesos arrancando a la vez no aplican la misma versión dos veces.
+    """
+    if db_path is None:
+        from back.src.repositorios import base
+
+        db_path = base.DB_PATH
+
+    conn = obtener_pool(db_path).conexion()
+    aplicadas = 0
+    for version, descripcion, sentencias in MIGRACIONES:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version_actual(conn) >= version:
+                conn.rollback()
+                continue
+            for sql in sentencias:
+                conn.execute(sql)
+            conn.execute(
+                "INSERT INTO schema_version (version, descripcion, "
+                "aplicada_en) "
+                "VALUES (?, ?, ?)",
+                (
+                    version,
+                    descripcion,
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+            conn.commit()
+            aplicadas += 1
+        except BaseException:
+            conn.rollback()
+            raise
+    return aplicadas
@@ -0,0 +1,73 @@
+"""
+Reintentos ante "database is locked" (SQLITE_BUSY).
+
+Con varios procesos sobre la misma BD (workers de uvicorn/gunicorn) el
+busy_timeout de cada conexión cubre la espera normal por el lock de
+escritura, pero bajo contención fuerte puede vencerse. Los reintentos se
+aplican solo donde todavía no se escribió nada: el BEGIN IMMEDIATE de una
+transacción o una sentencia suelta en modo autocommit. Entre intentos se
+espera con backoff exponencial y jitter completo, para que los procesos
+que chocaron no vuelvan a pedir el lock todos al mismo tiempo.
+"""
+
+import random
+import sqlite3
+import time
+
+from back.src.excepciones import ErrorBDOcupada
+from back.src.metricas import REINTENTOS_BD
+
+CODIGOS_OCUPADA = (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+def es_bd_ocupada(error: Exception) -> bool:
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    codigo = getattr(error, "sqlite_errorcode", None)
+    if codigo is not None:
+        # Los códigos extendidos (SQLITE_BUSY_SNAPSHOT, ...) llevan
+        # el primario en el byte bajo
+        return codigo & 0xFF in CODIGOS_OCUPADA
+    return "locked" in str(error) or "busy" in str(error)
+
+
+class PoliticaReintentos:
+    def __init__(self, intentos=5, espera_base=0.005, espera_maxima=0.2):
+        self.configurar(intentos, espera_base, espera_maxima)
+
+    def configurar(self, intentos=5, espera_base=0.005, espera_maxima=0.2):
+        # Reintentos después del primer fallo (0 = ninguno)
+        self.intentos = intentos
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+
+    def espera(self, intento: int) -> float:
+        """Segundos a esperar antes del reintento `intento` (desde 0)."""
+        tope = min(self.espera_maxima, self.espera_base * 2**intento)
+        return random.uniform(0, tope)
+
+    def reintentar(self, error: Exception, funcion, *args):
+        """
+        Se llama desde el `except` del primer intento: si la BD estaba ocupada
+        vuelve a llamar a `funcion(*args)` hasta `intentos` veces y devuelve su
+        resultado; cualquier otro error se propaga tal cual. Si se agotan los
+        reintentos lanza ErrorBDOcupada.
+        """
+        for intento in range(self.intentos + 1):
+            if not es_bd_ocupada(error):
+                raise error
+            if intento == self.intentos:
+                break
+            REINTENTOS_BD.inc("reintento")
+            time.sleep(self.espera(intento))
+            try:
+                return funcion(*args)
+            except sqlite3.OperationalError as e:
+                error = e
+        REINTENTOS_BD.inc("agotado")
+        raise ErrorBDOcupada(
+            "La base de datos está ocupada, reintentar más tarde"
+        ) from error
+
+
+REINTENTOS = PoliticaReintentos()
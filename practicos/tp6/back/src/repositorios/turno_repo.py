@@ -1,28 +1,109 @@
+import logging
+from datetime import date, datetime, time
+
+from back.src.eventos_cupo import BUS_CUPOS
 from back.src.repositorios.base import RepositorioBase
 
+logger = logging.getLogger(__name__)
+
+
+def fecha_canonica(fecha) -> str:
+    """
+    Normaliza una fecha (date, datetime o texto ISO de fecha o fecha y hora)
+    a 'YYYY-MM-DD'. Lanza ValueError si el texto no es ISO.
+    """
+    if isinstance(fecha, datetime):
+        return fecha.date().isoformat()
+    if isinstance(fecha, date):
+        return fecha.isoformat()
+    texto = str(fecha).strip()
+    if len(texto) > 10:
+        # Solo se acepta un sufijo de hora ISO ('T' o espacio): cualquier
+        # otra cosa después de la fecha es un ValueError
+        if texto[10] not in "T ":
+            raise ValueError(f"Fecha inválida: {texto!r}")
+        return datetime.fromisoformat(texto).date().isoformat()
+    return date.fromisoformat(texto).isoformat()
+
+
+def hora_canonica(hora) -> str:
+    """
+    Normaliza una hora (time o texto ISO, con o sin segundos en cero) a
+    'HH:MM'. Lanza ValueError si no es ISO o tiene segundos.
+    """
+    if not isinstance(hora, time):
+        hora = time.fromisoformat(str(hora).strip())
+    if hora.second or hora.microsecond or hora.tzinfo:
+        raise ValueError(f"Hora inválida: {hora!r}")
+    return hora.strftime("%H:%M")
+
 
 class RepositorioTurno(RepositorioBase):
     def obtener_por_fecha(self, fecha):
         """
         Devuelve los turnos de una fecha específica (YYYY-MM-DD).
-        Incluye log para depuración.
+        La fecha se guarda en formato canónico, así que alcanza con una
+        igualdad que usa el índice (fecha, hora).
         """
-        print(f"🧩 DEBUG: buscando turnos para fecha = {fecha}")
-
+        fecha = fecha_canonica(fecha)
         resultados = self.ejecutar(
             """
-                                   SELECT id, actividad_id, fecha, hora, cupo_disponible
-                                   FROM Turno
-                                   WHERE fecha LIKE ? OR date (fecha) = date (?)
-                                   ORDER BY hora ASC
-                                   """,
-            (f"%{fecha}%", fecha),
+            SELECT id, actividad_id, fecha, hora, cupo_disponible
+            FROM Turno
+            WHERE fecha = ?
+            ORDER BY hora ASC
+            """,
+            (fecha,),
             fetchall=True,
         )
-
-        print(f"✅ DEBUG: se encontraron {len(resultados)} turnos para {fecha}")
+        logger.debug(
+            "Se encontraron %s turnos para %s", len(resultados), fecha
+        )
         return resultados
 
+    def obtener_desde(self, fecha):
+        """Devuelve los turnos desde la fecha dada (YYYY-MM-DD) en adelante."""
+        return self.ejecutar(
+            """
+            SELECT id, actividad_id, fecha, hora, cupo_disponible
+            FROM Turno
+            WHERE fecha >= ?
+            ORDER BY fecha, hora
+            """,
+            (fecha_canonica(fecha),),
+            fetchall=True,
+        )
+
+    def obtener_pagina_desde(self, fecha, despues=None, limite=500):
+        """
+        Página de turnos desde `fecha` ordenada por (fecha, hora, id).
+        `despues` es la clave (fecha, hora, id) de la última fila de la página
+        anterior: cada página es una búsqueda por índice, sin OFFSET.
+        """
+        if despues is None:
+            return self.ejecutar(
+                """
+                SELECT id, actividad_id, fecha, hora, cupo_disponible
+                FROM Turno
+                WHERE fecha >= ?
+                ORDER BY fecha, hora, id
+                LIMIT ?
+                """,
+                (fecha_canonica(fecha), limite),
+                fetchall=True,
+            )
+        return self.ejecutar(
+            """
+            SELECT id, actividad_id, fecha, hora, cupo_disponible
+            FROM Turno
+            WHERE fecha >= ? AND (fecha, hora, id) > (?, ?, ?)
+            ORDER BY fecha, hora, id
+            LIMIT ?
+            """,
+            (fecha_canonica(fecha), *despues, limite),
+            fetchall=True,
+        )
+
     def obtener_por_actividad_y_fecha(self, actividad_id, fecha_a, fecha_b):
         return self.ejecutar(
             """SELECT * FROM Turno 
@@ -45,24 +126,16 @@ class RepositorioTurno(RepositorioBase):
             nuevo_cupo = 0
 
         # Ejecutar actualización en la base de datos
-        self.ejecutar(
-            """
-                      UPDATE Turno
-                      SET cupo_disponible = ?
-                      WHERE id = ?
-                      """,
-            (nuevo_cupo, turno_id),
-            commit=True,
-        )
-
-        # (Opcional) Verificar si se actualizó correctamente
         actualizado = self.ejecutar(
-            "SELECT cupo_disponible FROM Turno WHERE id = ?", (turno_id,), fetchone=True
+            "UPDATE Turno SET cupo_disponible = ? WHERE id = ? "
+            "RETURNING fecha",
+            (nuevo_cupo, turno_id),
+            fetchall=True,
         )
-
         if actualizado:
-            print(
-                f"✅ Cupo actualizado correctamente para turno {turno_id}: nuevo cupo = {actualizado[0]}"
+            logger.debug(
+                "Cupo del turno %s actualizado a %s", turno_id, nuevo_cupo
             )
+            BUS_CUPOS.publicar(actualizado[0][0], turno_id, nuevo_cupo)
         else:
-            print(f"⚠️ Advertencia: no se encontró el turno con id {turno_id}")
+            logger.warning("No se encontró el turno con id %s", turno_id)
@@ -1,5 +1,16 @@
+import json
+
 from back.src.repositorios.base import RepositorioBase
 
+SQL_DNIS_CON_CHOQUE = """
+    SELECT DISTINCT v.dni
+    FROM Turno t
+    JOIN Inscripcion i ON i.turno_id = t.id
+    JOIN Visitante v ON v.inscripcion_id = i.id
+    WHERE t.fecha = ? AND t.hora = ?
+      AND v.dni IN (SELECT value FROM json_each(?))
+"""
+
 
 class VisitanteRepo(RepositorioBase):
     def obtener_por_dni(self, dni):
@@ -48,3 +59,46 @@ class VisitanteRepo(RepositorioBase):
             fetchone=True,
         )
         return row is not None
+
+    def dnis_con_choque(self, dnis, fecha: str, hora: str) -> set:
+        """
+        Versión en lote de existe_choque_por_dni_y_fecha_hora: devuelve el
+        subconjunto de `dnis` que ya está inscripto en esa fecha y hora.
+        La lista viaja como un único parámetro JSON, así la sentencia es
+        siempre la misma (y queda en la cache) sin importar cuántos DNI haya.
+        """
+        dnis = [int(d) for d in dnis]
+        if not dnis:
+            return set()
+        rows = self.ejecutar(
+            SQL_DNIS_CON_CHOQUE, (fecha, hora, json.dumps(dnis)), fetchall=True
+        )
+        return {r[0] for r in rows}
+
+    @staticmethod
+    def dnis_con_choque_en(cur, dnis, fecha: str, hora: str) -> set:
+        """
+        Igual que dnis_con_choque pero con el cursor de una transacción
+        abierta: con BEGIN IMMEDIATE ninguna otra reserva puede colarse entre
+        esta consulta y el INSERT.
+        """
+        rows = cur.execute(
+            SQL_DNIS_CON_CHOQUE,
+            (fecha, hora, json.dumps([int(d) for d in dnis])),
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def dnis_en_horario(self, fecha: str, hora: str) -> set:
+        """Los DNI inscriptos en cualquier actividad en esa fecha y hora."""
+        rows = self.ejecutar(
+            """
+            SELECT v.dni
+            FROM Turno t
+            JOIN Inscripcion i ON i.turno_id = t.id
+            JOIN Visitante v ON v.inscripcion_id = i.id
+            WHERE t.fecha = ? AND t.hora = ?
+            """,
+            (fecha, hora),
+            fetchall=True,
+        )
+        return {r[0] for r in rows}
@@ -0,0 +1,108 @@
+"""
+Serialización rápida de respuestas JSON.
+
+Los listados de turnos se codifican directo desde las tuplas del cursor a
+bytes, sin pasar por jsonable_encoder: con orjson si está instalado y, si
+no, con una plantilla por fila y el codificador de strings en C del módulo
+json. La salida es la misma que la de JSONResponse (JSON compacto, UTF-8).
+
+`comprimir` aplica gzip (o brotli, si está instalado y el cliente lo
+acepta) a los cuerpos que superan un tamaño mínimo.
+"""
+
+import gzip
+import json
+from json.encoder import encode_basestring
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional
+    brotli = None
+
+NIVEL_GZIP = 6
+CALIDAD_BROTLI = 5
+
+# Fila de Turno: (id, actividad_id, fecha, hora, cupo_disponible)
+_PLANTILLA_TURNO = (
+    '{"id":%d,"actividad_id":%d,"fecha":%s,"hora":%s,"cupos_disponibles":%d}'
+)
+
+
+def a_json(datos) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(datos)
+    return json.dumps(
+        datos, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _turnos_como_dicts(filas):
+    return [
+        {
+            "id": i,
+            "actividad_id": a,
+            "fecha": f,
+            "hora": h,
+            "cupos_disponibles": c,
+        }
+        for i, a, f, h, c in filas
+    ]
+
+
+def _lineas_turnos(filas):
+    cadena = encode_basestring
+    return [
+        _PLANTILLA_TURNO % (i, a, cadena(f), cadena(h), c)
+        for i, a, f, h, c in filas
+    ]
+
+
+def turnos_a_json(filas) -> bytes:
+    """Arreglo JSON de turnos a partir de las filas de la BD."""
+    if orjson is not None:
+        return orjson.dumps(_turnos_como_dicts(filas))
+    return ("[" + ",".join(_lineas_turnos(filas)) + "]").encode("utf-8")
+
+
+def turnos_a_ndjson(filas) -> bytes:
+    """Un objeto JSON por línea (formato=ndjson)."""
+    if not filas:
+        return b""
+    if orjson is not None:
+        lineas = (orjson.dumps(t) for t in _turnos_como_dicts(filas))
+        return b"\n".join(lineas) + b"\n"
+    return ("\n".join(_lineas_turnos(filas)) + "\n").encode("utf-8")
+
+
+def elegir_codificacion(accept_encoding: Optional[str]) -> Optional[str]:
+    """Codificación a usar según Accept-Encoding: br, gzip o ninguna."""
+    if not accept_encoding:
+        return None
+    aceptadas = set()
+    for parte in accept_encoding.split(","):
+        nombre, _, parametro = parte.partition(";")
+        parametro = parametro.strip().replace(" ", "")
+        try:
+            q = float(parametro[2:]) if parametro.startswith("q=") else 1.0
+        except ValueError:
+            q = 0.0
+        if q > 0:
+            aceptadas.add(nombre.strip().lower())
+    if brotli is not None and "br" in aceptadas:
+        return "br"
+    if "gzip" in aceptadas or "*" in aceptadas:
+        return "gzip"
+    return None
+
+
+def comprimir(cuerpo: bytes, codificacion: str) -> bytes:
+    if codificacion == "br":
+        return brotli.compress(cuerpo, quality=CALIDAD_BROTLI)
+    # mtime=0: el mismo cuerpo da siempre los mismos bytes
+    return gzip.compress(cuerpo, compresslevel=NIVEL_GZIP, mtime=0)
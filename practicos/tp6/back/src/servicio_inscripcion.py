@@ -18,7 +18,8 @@ from back.src.excepciones import (
     ErrorFechaPasada,
     ErrorEnvioCorreo,
 )
-from back.src.repositorios.base import RepositorioEnMemoria
+from back.src.repositorios.memoria import RepositorioEnMemoria
+from back.src.indice_choques import IndiceChoques, IndiceChoquesEnMemoria
 
 
 class ServicioInscripcion:
@@ -31,6 +32,7 @@ class ServicioInscripcion:
         repo: RepositorioEnMemoria,
         fecha_actual: Optional[date] = None,
         servicio_correo=None,
+        indice_choques: Optional[IndiceChoques] = None,
     ):
         self.setup_actividades = setup_actividades
         self.turnos_disponibles = {t.id: t for t in turnos_disponibles}
@@ -39,6 +41,15 @@ class ServicioInscripcion:
         self.horario_apertura = time(9, 0)
         self.fecha_actual = fecha_actual or date.today()
         self.servicio_correo = servicio_correo
+        # Sin índice explícito se usa el del repo (AlmacenMemoria ya indexa
+        # por horario) o se indexan las inscripciones que tenga
+        if indice_choques is None:
+            indice_choques = getattr(repo, "indice_choques", None)
+        if indice_choques is None:
+            indice_choques = IndiceChoquesEnMemoria.desde_inscripciones(
+                getattr(repo, "inscripciones", None) or []
+            )
+        self.indice_choques = indice_choques
 
     def _validar_email(self, email: str) -> bool:
         if not isinstance(email, str):
@@ -52,27 +63,9 @@ class ServicioInscripcion:
         return True
 
     def _persistir_inscripcion(self, inscripcion: Inscripcion):
-        # Intentar persistir en el repositorio de forma flexible
-        if hasattr(self.repo, "inscripciones") and isinstance(
-            self.repo.inscripciones, list
-        ):
-            self.repo.inscripciones.append(inscripcion)
-        elif hasattr(self.repo, "guardar"):
-            try:
-                self.repo.guardar(inscripcion)
-            except Exception:
-                # Fallback a otros posibles nombres
-                if hasattr(self.repo, "agregar"):
-                    self.repo.agregar(inscripcion)
-                else:
-                    raise
-        elif hasattr(self.repo, "agregar"):
-            self.repo.agregar(inscripcion)
-        else:
-            # Si no se puede persistir, al menos no romper el flujo; guardar en atributo temporal
-            if not hasattr(self.repo, "_inscripciones_temp"):
-                self.repo._inscripciones_temp = []
-            self.repo._inscripciones_temp.append(inscripcion)
+        # Los repos de inscripciones (SQLite y memoria) exponen guardar()
+        self.repo.guardar(inscripcion)
+        self.indice_choques.registrar(inscripcion)
 
     # python
     # archivo: back/src/servicio_inscripcion.py
@@ -183,37 +176,15 @@ class ServicioInscripcion:
                     )
 
         # 10) Choque de horario con inscripciones existentes
-        # Suponemos que repo.inscripciones es lista de Inscripcion o que existen métodos para listar
-        inscripciones_existentes = []
-        if hasattr(self.repo, "inscripciones"):
-            inscripciones_existentes = list(self.repo.inscripciones)
-        elif hasattr(self.repo, "listar") and callable(self.repo.listar):
-            try:
-                inscripciones_existentes = list(self.repo.listar())
-            except Exception:
-                inscripciones_existentes = []
-        elif hasattr(self.repo, "obtener_todas") and callable(self.repo.obtener_todas):
-            try:
-                inscripciones_existentes = list(self.repo.obtener_todas())
-            except Exception:
-                inscripciones_existentes = []
-
-        for ins in inscripciones_existentes:
-            if not hasattr(ins, "turno"):
-                continue
-            turno_exist = ins.turno
-            # Si coinciden fecha y hora
-            if turno_exist.fecha == turno.fecha and turno_exist.hora == turno.hora:
-                # verificar si algún participante ya está inscrito en ese turno
-                visitantes_existentes = getattr(ins, "visitantes", []) or []
-                dnis_existentes = {
-                    getattr(v, "dni", None) for v in visitantes_existentes
-                }
-                for p in participantes:
-                    if getattr(p, "dni", None) in dnis_existentes:
-                        raise ErrorChoqueHorario(
-                            "El visitante ya tiene otra actividad en el mismo horario."
-                        )
+        # El índice devuelve solo los DNI reservados en esa fecha y hora
+        dnis_existentes = self.indice_choques.dnis_reservados(
+            turno.fecha, turno.hora
+        )
+        for p in participantes:
+            if getattr(p, "dni", None) in dnis_existentes:
+                raise ErrorChoqueHorario(
+                    f"El DNI {p.dni} ya tiene una inscripción en ese horario"
+                )
 
         # Si todo ok: crear Inscripcion, actualizar cupo y persistir
         nueva_inscripcion = Inscripcion(
@@ -224,6 +195,10 @@ class ServicioInscripcion:
             email_contacto=email_contacto,
         )
 
+        # El índice en memoria ve la inscripción nueva: un segundo pedido del
+        # mismo DNI en ese horario choca aunque el servicio viva mucho tiempo
+        self.indice_choques.registrar(nueva_inscripcion)
+
         # Actualizar cupo del turno
         if hasattr(turno, "cupo_ocupado"):
             try:
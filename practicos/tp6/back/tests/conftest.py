@@ -0,0 +1,29 @@
+import pytest
+
+from back.src.repositorios import base
+from back.src.repositorios.conexion import cerrar_pools, obtener_pool
+from back.src.repositorios.migraciones import aplicar_migraciones
+
+ACTIVIDADES = [
+    ("Safari", 8, 0, None),
+    ("Palestra", 12, 1, 12),
+    ("Jardinería", 12, 0, None),
+    ("Tirolesa", 10, 1, 8),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Base de datos temporal con el esquema y las actividades base."""
+    ruta = tmp_path / "bd_test.db"
+    aplicar_migraciones(ruta)
+    conn = obtener_pool(ruta).conexion()
+    conn.executemany(
+        "INSERT INTO Actividad (nombre, capacidad_maxima, requiere_vestimenta,"
+        " edad_minima) VALUES (?, ?, ?, ?)",
+        ACTIVIDADES,
+    )
+    # Los repositorios creados sin ruta explícita usan la BD temporal
+    monkeypatch.setattr(base, "DB_PATH", ruta)
+    yield ruta
+    cerrar_pools()
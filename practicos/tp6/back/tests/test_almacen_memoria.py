@@ -0,0 +1,180 @@
+import pytest
+
+from back.src.excepciones import ErrorChoqueHorario, ErrorLote, ErrorSinCupo
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.almacenes import crear_repositorios
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+
+TURNOS = [
+    (1, "2025-10-15", "10:00", 8),
+    (3, "2025-10-15", "10:00", 12),
+    (1, "2025-10-15", "14:00", 8),
+    (2, "2025-10-16", "09:00", 12),
+    (4, "2025-10-17", "11:30", 10),
+]
+
+
+@pytest.fixture(params=["sqlite", "memoria"])
+def repos(request, db_path):
+    # Los turnos se cargan en SQLite; el almacén en memoria parte de una copia
+    sql = InscripcionRepo()
+    for turno in TURNOS:
+        sql.ejecutar(
+            "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+            "VALUES (?, ?, ?, ?)",
+            turno,
+        )
+    return crear_repositorios(request.param)
+
+
+def _inscripcion(turno_id, *dnis, fecha="2025-10-15", hora="10:00"):
+    return Inscripcion(
+        turno=Turno(
+            id=turno_id,
+            actividad_nombre="Safari",
+            fecha=fecha,
+            hora=hora,
+            cupo_ocupado=0,
+        ),
+        visitantes=[
+            Visitante(nombre="Ana", dni=dni, edad=30, talle="M")
+            for dni in dnis
+        ],
+        total_personas=len(dnis),
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+
+
+def _cupo(repos, turno_id):
+    turnos = repos.turnos.obtener_desde("2025-01-01")
+    return next(t[4] for t in turnos if t[0] == turno_id)
+
+
+def test_turnos_por_fecha_y_paginas(repos):
+    turnos = repos.turnos
+    del_dia = turnos.obtener_por_fecha("2025-10-15")
+    assert [t[0] for t in del_dia] == [1, 2, 3]
+    pagina = turnos.obtener_pagina_desde("2025-10-15", limite=2)
+    despues = pagina[-1][2:4] + (pagina[-1][0],)
+    siguiente = turnos.obtener_pagina_desde(
+        "2025-10-15", despues=despues, limite=2
+    )
+    assert [t[0] for t in pagina + siguiente] == [1, 2, 3, 4]
+    safari = turnos.obtener_por_actividad_y_fecha(
+        1, "2025-10-15", "2025-10-16"
+    )
+    assert [t[0] for t in safari] == [1, 3]
+
+
+def test_reservar_descuenta_cupo_y_registra_visitantes(repos):
+    ins_id = repos.inscripciones.reservar(_inscripcion(1, 30123456, 25678901))
+
+    assert _cupo(repos, 1) == 6
+    visitantes = repos.visitantes
+    primero = visitantes.obtener_por_inscipcion_id(ins_id)
+    assert primero[1:] == (ins_id, "Ana", 30123456, 30, "M")
+    segundo = visitantes.obtener_por_dni(25678901)
+    assert segundo[1:] == (ins_id, "Ana", 25678901, 30, "M")
+    choque = visitantes.existe_choque_por_dni_y_fecha_hora
+    assert choque(30123456, "2025-10-15", "10:00")
+    assert not choque(30123456, "2025-10-15", "14:00")
+    choques = visitantes.dnis_con_choque([1, 25678901], "2025-10-15", "10:00")
+    assert choques == {25678901}
+    assert len(repos.inscripciones.obtener_por_turno(1)) == 1
+
+
+def test_agregar_visitante_a_una_inscripcion(repos):
+    ins_id = repos.inscripciones.reservar(_inscripcion(1, 30123456))
+
+    repos.visitantes.agregar_visitante(ins_id, "Beto", 25678901, 28, "L")
+
+    beto = repos.visitantes.obtener_por_dni(25678901)
+    assert beto[1:] == (ins_id, "Beto", 25678901, 28, "L")
+    choques = repos.visitantes.dnis_con_choque(
+        [25678901], "2025-10-15", "10:00"
+    )
+    assert choques == {25678901}
+
+
+def test_reservar_sin_cupo_o_con_choque_no_guarda_nada(repos):
+    repos.inscripciones.reservar(_inscripcion(1, 30123456))
+
+    with pytest.raises(ErrorSinCupo):
+        repos.inscripciones.reservar(_inscripcion(1, *range(1, 9)))
+    # Mismo horario, otra actividad
+    with pytest.raises(ErrorChoqueHorario):
+        repos.inscripciones.reservar(_inscripcion(2, 30123456))
+
+    assert _cupo(repos, 1) == 7
+    assert _cupo(repos, 2) == 12
+    assert repos.inscripciones.obtener_por_turno(2) == []
+
+
+def test_reservar_lote_es_todo_o_nada(repos):
+    with pytest.raises(ErrorLote) as error:
+        repos.inscripciones.reservar_lote(
+            [
+                _inscripcion(1, 1, 2),
+                _inscripcion(1, *range(10, 17)),
+                _inscripcion(2, 3),
+            ]
+        )
+
+    errores = [(i, type(e)) for i, e in error.value.errores]
+    assert errores == [(1, ErrorSinCupo)]
+    assert (_cupo(repos, 1), _cupo(repos, 2)) == (8, 12)
+    assert repos.visitantes.dnis_en_horario("2025-10-15", "10:00") == set()
+
+    ids = repos.inscripciones.reservar_lote(
+        [_inscripcion(1, 1, 2), _inscripcion(2, 3)]
+    )
+    assert len(ids) == 2
+    assert (_cupo(repos, 1), _cupo(repos, 2)) == (6, 11)
+    assert repos.visitantes.dnis_en_horario("2025-10-15", "10:00") == {1, 2, 3}
+
+
+def test_almacen_desconocido():
+    with pytest.raises(ValueError):
+        crear_repositorios("redis")
+
+
+def test_api_en_memoria_no_escribe_la_bd(db_path, monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from back.app import crear_app
+    from back.tests.test_api import _fecha_reservable, _grupo
+
+    sql = InscripcionRepo()
+    fecha = _fecha_reservable()
+    sql.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, ?, '10:00', 8)",
+        (fecha,),
+    )
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    monkeypatch.setenv("ECOPARK_ALMACEN", "memoria")
+
+    with TestClient(crear_app()) as cliente:
+        res = cliente.post(
+            "/api/inscribirse",
+            json=_grupo("Safari", fecha, 30123456, 25678901),
+        )
+        assert res.status_code == 200, res.text
+        turnos = cliente.get("/api/turnos", params={"fecha": fecha}).json()
+        assert turnos[0]["cupos_disponibles"] == 6
+        choques = cliente.post(
+            "/api/validar-dnis",
+            json={"fecha": fecha, "hora": "10:00", "dnis": [30123456]},
+        )
+        assert choques.json() == {"choques": [30123456]}
+
+    (cupo,) = sql.ejecutar("SELECT cupo_disponible FROM Turno", fetchone=True)
+    assert cupo == 8
+    (inscripciones,) = sql.ejecutar(
+        "SELECT COUNT(*) FROM Inscripcion", fetchone=True
+    )
+    assert inscripciones == 0
@@ -0,0 +1,367 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+from back.app import crear_app
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+
+
+@pytest.fixture(params=[True, False], ids=["async", "sync"])
+def cliente(request, db_path, monkeypatch):
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    with TestClient(crear_app(modo_async=request.param)) as c:
+        yield c
+
+
+@pytest.fixture
+def turno_con_reserva(db_path):
+    repo = InscripcionRepo()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15', '14:00', 8)"
+    )
+    turno = Turno(
+        id=1, actividad_nombre="Safari", fecha=None, hora=None, cupo_ocupado=0
+    )
+    repo.reservar(
+        Inscripcion(
+            turno=turno,
+            visitantes=[
+                Visitante(nombre="Ana", dni=30123456, edad=30),
+                Visitante(nombre="Beto", dni=25678901, edad=28),
+            ],
+            total_personas=2,
+            acepta_terminos=True,
+            email_contacto="ana@mail.com",
+        )
+    )
+    return turno
+
+
+def test_validar_dnis_en_lote_informa_los_que_chocan(
+    cliente, turno_con_reserva
+):
+    res = cliente.post(
+        "/api/validar-dnis",
+        json={
+            "fecha": "2025-10-15",
+            "hora": "14:00",
+            "dnis": [25678901, 11111111, 30123456],
+        },
+    )
+
+    assert res.status_code == 200
+    assert res.json() == {"choques": [25678901, 30123456]}
+
+
+def test_validar_dnis_otro_horario_sin_choques(cliente, turno_con_reserva):
+    res = cliente.post(
+        "/api/validar-dnis",
+        json={"fecha": "2025-10-15", "hora": "14:30", "dnis": [30123456]},
+    )
+
+    assert res.json() == {"choques": []}
+
+
+def test_listar_actividades_desde_el_catalogo(cliente):
+    res = cliente.get("/api/actividades")
+
+    assert res.status_code == 200
+    assert {
+        "id": 2,
+        "nombre": "Palestra",
+        "cupos": 12,
+        "requiere_talle": True,
+        "edad_min": 12,
+    } in res.json()
+    assert len(res.json()) == 4
+
+
+def test_listar_turnos_por_fecha(cliente, turno_con_reserva):
+    res = cliente.get("/api/turnos", params={"fecha": "2025-10-15"})
+
+    assert res.status_code == 200
+    assert res.json() == [
+        {
+            "id": 1,
+            "actividad_id": 1,
+            "fecha": "2025-10-15",
+            "hora": "14:00",
+            "cupos_disponibles": 6,
+        }
+    ]
+
+
+def test_validar_dni_individual(cliente, turno_con_reserva):
+    res = cliente.get(
+        "/api/validar-dni",
+        params={"dni": 30123456, "fecha": "2025-10-15", "hora": "14:00"},
+    )
+
+    assert res.json() == {"existe": True}
+
+
+def test_inscribirse_actividad_inexistente_devuelve_404(cliente):
+    res = cliente.post(
+        "/api/inscribirse",
+        json={
+            "actividad": "Buceo",
+            "fecha": "2025-10-15",
+            "hora": "14:00",
+            "participantes": [{"nombre": "Ana", "dni": 30123456, "edad": 30}],
+            "acepta_terminos": True,
+            "email": "ana@mail.com",
+        },
+    )
+
+    assert res.status_code == 404
+
+
+def test_listar_turnos_fecha_invalida_devuelve_400(cliente):
+    res = cliente.get("/api/turnos", params={"fecha": "15/10/2025"})
+
+    assert res.status_code == 400
+
+
+@pytest.fixture
+def turnos_futuros(db_path):
+    repo = InscripcionRepo()
+    manana = (date.today() + timedelta(days=1)).isoformat()
+    pasado = (date.today() + timedelta(days=2)).isoformat()
+    filas = [
+        (1, manana, "10:00"),
+        (2, manana, "09:00"),
+        (1, pasado, "09:00"),
+        (3, manana, "09:00"),
+        (1, manana, "09:30"),
+    ]
+    for act, fecha, hora in filas:
+        repo.ejecutar(
+            "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+            "VALUES (?, ?, ?, 8)",
+            (act, fecha, hora),
+        )
+    return [
+        (manana, "09:00", 2),
+        (manana, "09:00", 4),
+        (manana, "09:30", 5),
+        (manana, "10:00", 1),
+        (pasado, "09:00", 3),
+    ]
+
+
+def test_listar_turnos_paginado_con_cursor(cliente, turnos_futuros):
+    vistos, cursor = [], None
+    while True:
+        params = {"limite": 2, **({"cursor": cursor} if cursor else {})}
+        res = cliente.get("/api/turnos", params=params)
+        vistos += [(t["fecha"], t["hora"], t["id"]) for t in res.json()]
+        cursor = res.headers.get("X-Siguiente-Cursor")
+        if not cursor:
+            break
+
+    assert vistos == turnos_futuros
+
+
+def test_listar_turnos_ndjson(cliente, turnos_futuros):
+    res = cliente.get("/api/turnos", params={"formato": "ndjson"})
+
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lineas = [json.loads(l) for l in res.text.splitlines()]
+    assert [(t["fecha"], t["hora"], t["id"]) for t in lineas] == turnos_futuros
+
+
+def test_listar_turnos_cursor_invalido_devuelve_400(cliente):
+    res = cliente.get("/api/turnos", params={"cursor": "no-es-un-cursor"})
+
+    assert res.status_code == 400
+
+
+def test_stream_turnos_fecha_invalida_devuelve_400(cliente):
+    res = cliente.get("/api/turnos/stream", params={"fecha": "15/10/2025"})
+
+    assert res.status_code == 400
+
+
+def _fecha_reservable():
+    # Mañana o pasado: el parque cierra los lunes, el 1/1 y el 31/12
+    for dias in (1, 2):
+        fecha = date.today() + timedelta(days=dias)
+        feriado = (fecha.month, fecha.day) in ((1, 1), (12, 31))
+        if fecha.weekday() != 0 and not feriado:
+            return fecha.isoformat()
+
+
+@pytest.fixture
+def turnos_lote(db_path):
+    repo = InscripcionRepo()
+    fecha = _fecha_reservable()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, ?, '10:00', 8)",
+        (fecha,),
+    )
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (3, ?, '10:00', 12)",
+        (fecha,),
+    )
+    return fecha
+
+
+def _grupo(actividad, fecha, *dnis, hora="10:00"):
+    return {
+        "actividad": actividad,
+        "fecha": fecha,
+        "hora": hora,
+        "participantes": [
+            {"nombre": "Ana", "dni": dni, "edad": 30} for dni in dnis
+        ],
+        "acepta_terminos": True,
+        "email": "escuela@mail.com",
+    }
+
+
+def _cupos():
+    filas = InscripcionRepo().ejecutar(
+        "SELECT id, cupo_disponible FROM Turno", fetchall=True
+    )
+    return dict(filas)
+
+
+def test_lote_guarda_todas_las_inscripciones_en_una_transaccion(
+    cliente, turnos_lote
+):
+    res = cliente.post(
+        "/api/inscripciones/lote",
+        json={
+            "inscripciones": [
+                _grupo("Safari", turnos_lote, 1, 2, 3),
+                _grupo("Jardinería", turnos_lote, 4, 5),
+                _grupo("Safari", turnos_lote, 6),
+            ]
+        },
+    )
+
+    assert res.status_code == 200
+    assert len(res.json()["ids_inscripcion"]) == 3
+    assert _cupos() == {1: 4, 2: 10}
+    (correos,) = InscripcionRepo().ejecutar(
+        "SELECT COUNT(*) FROM CorreoPendiente", fetchone=True
+    )
+    assert correos == 3
+
+
+def test_lote_con_errores_no_guarda_nada_e_informa_cada_uno(
+    cliente, turnos_lote
+):
+    res = cliente.post(
+        "/api/inscripciones/lote",
+        json={
+            "inscripciones": [
+                _grupo("Safari", turnos_lote, 1, 2),
+                # Mismo DNI y horario que el grupo 0
+                _grupo("Jardinería", turnos_lote, 2),
+                _grupo("Buceo", turnos_lote, 3),
+                # Supera el cupo que deja el grupo 0
+                _grupo("Safari", turnos_lote, 4, 5, 6, 7, 8, 9, 10),
+            ]
+        },
+    )
+
+    assert res.status_code == 400
+    detalle = res.json()["detail"]["errores"]
+    errores = {e["indice"]: e["detalle"] for e in detalle}
+    assert sorted(errores) == [1, 2, 3]
+    assert "DNI 2 " in errores[1]
+    assert errores[2] == "Actividad no encontrada"
+    assert "cupo" in errores[3]
+    assert _cupos() == {1: 8, 2: 12}
+    assert InscripcionRepo().obtener_todas() == []
+
+
+def test_lote_vacio_es_invalido(cliente):
+    res = cliente.post("/api/inscripciones/lote", json={"inscripciones": []})
+    assert res.status_code == 422
+
+
+def test_inscribirse_normaliza_fecha_y_hora_antes_de_consultar(
+    cliente, turnos_lote
+):
+    res = cliente.post(
+        "/api/inscribirse",
+        json=_grupo("Safari", turnos_lote, 1, hora="10:00:00"),
+    )
+
+    assert res.status_code == 200
+    assert res.json()["mensaje"].endswith(f"el {turnos_lote} a las 10:00")
+    # Mismo horario escrito con hora en la fecha: el choque se detecta igual
+    res = cliente.post(
+        "/api/inscribirse",
+        json=_grupo("Jardinería", f"{turnos_lote}T00:00", 1),
+    )
+    assert res.status_code == 400
+    assert "DNI 1 " in res.json()["detail"]
+
+
+def test_inscribirse_hora_invalida_devuelve_400(cliente, turnos_lote):
+    res = cliente.post(
+        "/api/inscribirse", json=_grupo("Safari", turnos_lote, 1, hora="10h")
+    )
+
+    assert res.status_code == 400
+
+
+def test_lote_normaliza_fecha_y_hora_e_informa_las_invalidas(
+    cliente, turnos_lote
+):
+    res = cliente.post(
+        "/api/inscripciones/lote",
+        json={
+            "inscripciones": [
+                _grupo("Safari", turnos_lote, 1, hora="10:00:00"),
+                # Mismo horario que el grupo 0
+                _grupo("Jardinería", f"{turnos_lote}T00:00", 1),
+                _grupo("Jardinería", "15/10/2025", 2),
+            ]
+        },
+    )
+
+    assert res.status_code == 400
+    errores = {
+        e["indice"]: e["detalle"] for e in res.json()["detail"]["errores"]
+    }
+    assert sorted(errores) == [1, 2]
+    assert "DNI 1 " in errores[1]
+    assert errores[2].startswith("Fecha u hora inválida")
+
+
+def test_validar_dnis_normaliza_fecha_y_hora(cliente, turno_con_reserva):
+    res = cliente.get(
+        "/api/validar-dni",
+        params={"dni": 30123456, "fecha": "2025-10-15", "hora": "14:00:00"},
+    )
+    assert res.json() == {"existe": True}
+
+    res = cliente.post(
+        "/api/validar-dnis",
+        json={
+            "fecha": "2025-10-15T00:00",
+            "hora": "14:00:00",
+            "dnis": [30123456],
+        },
+    )
+    assert res.json() == {"choques": [30123456]}
+
+    res = cliente.get(
+        "/api/validar-dni",
+        params={"dni": 30123456, "fecha": "2025-10-15", "hora": "14h"},
+    )
+    assert res.status_code == 400
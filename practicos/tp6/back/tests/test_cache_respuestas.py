@@ -0,0 +1,234 @@
+import sqlite3
+import threading
+
+import pytest
+
+from back.src.cache_respuestas import (
+    CacheRespuestas,
+    VersionDatos,
+    calcular_etag,
+    coincide_etag,
+)
+from back.src.eventos_cupo import BusCupos
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+from back.app import crear_app
+from back.tests.test_api import _fecha_reservable, _grupo
+
+
+def test_coincide_etag_con_listas_debiles_y_comodin():
+    etag = calcular_etag(b"[]")
+
+    assert coincide_etag(etag, etag)
+    assert coincide_etag(f'"otro", W/{etag}', etag)
+    assert coincide_etag("*", etag)
+    assert not coincide_etag('"otro"', etag)
+    assert not coincide_etag(None, etag)
+
+
+def test_cache_descarta_versiones_viejas_y_las_menos_usadas():
+    cache = CacheRespuestas(capacidad=2)
+    cache.guardar("a", 1, b"a1")
+    cache.guardar("b", 1, b"b1")
+
+    assert cache.obtener("a", 2) is None
+    assert cache.obtener("a", 1).cuerpo == b"a1"
+    # Un armado más viejo no pisa uno más nuevo
+    cache.guardar("a", 3, b"a3")
+    cache.guardar("a", 2, b"a2")
+    assert cache.obtener("a", 3).cuerpo == b"a3"
+    cache.guardar("c", 1, b"c1")  # "b" era la menos usada
+    assert cache.obtener("b", 1) is None
+    assert len(cache) == 2
+
+
+def test_version_sube_con_cada_publicacion_y_con_data_version():
+    bus = BusCupos()
+    externo = [7]
+    version = VersionDatos(bus, data_version=lambda: externo[0])
+
+    inicial = version.actual()
+    assert version.actual() == inicial
+    bus.publicar("2025-10-15", 1, 3)
+    assert version.actual() == inicial + 1
+    externo[0] = 8
+    assert version.actual() == inicial + 2
+
+
+@pytest.fixture(params=[True, False], ids=["async", "sync"])
+def crear_cliente(request, db_path, monkeypatch):
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    fecha = _fecha_reservable()
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+            "VALUES (?, ?, ?, 8)",
+            [(1, fecha, "10:00"), (1, fecha, "11:00"), (3, fecha, "10:00")],
+        )
+
+    def crear(**entorno):
+        for variable, valor in entorno.items():
+            monkeypatch.setenv(variable, valor)
+        return TestClient(crear_app(modo_async=request.param))
+
+    crear.fecha = fecha
+    return crear
+
+
+def test_turnos_con_etag_vigente_responden_304_sin_ir_a_la_bd(
+    crear_cliente, monkeypatch
+):
+    fecha = crear_cliente.fecha
+    with crear_cliente() as cliente:
+        primera = cliente.get("/api/turnos", params={"fecha": fecha})
+        assert primera.status_code == 200
+        etag = primera.headers["etag"]
+
+        repo_turno = cliente.app.state.contenedor.repos.turnos
+        monkeypatch.setattr(
+            repo_turno,
+            "obtener_por_fecha",
+            lambda fecha: pytest.fail("consultó la BD"),
+        )
+        res = cliente.get(
+            "/api/turnos",
+            params={"fecha": fecha},
+            headers={"If-None-Match": etag},
+        )
+        assert res.status_code == 304
+        assert res.content == b""
+        assert res.headers["etag"] == etag
+        # Sin If-None-Match: mismo cuerpo, también desde el cache
+        otra = cliente.get("/api/turnos", params={"fecha": fecha})
+        assert otra.json() == primera.json()
+
+
+def test_una_reserva_cambia_el_etag(crear_cliente):
+    fecha = crear_cliente.fecha
+    with crear_cliente() as cliente:
+        antes = cliente.get("/api/turnos", params={"fecha": fecha})
+        etag = antes.headers["etag"]
+        grupo = _grupo("Safari", fecha, 1, 2)
+        assert cliente.post("/api/inscribirse", json=grupo).status_code == 200
+
+        res = cliente.get(
+            "/api/turnos",
+            params={"fecha": fecha},
+            headers={"If-None-Match": etag},
+        )
+        assert res.status_code == 200
+        assert res.headers["etag"] != etag
+        assert [t["cupos_disponibles"] for t in res.json()] == [6, 8, 8]
+
+
+def test_pagina_cacheada_conserva_el_cursor(crear_cliente):
+    with crear_cliente() as cliente:
+        primera = cliente.get("/api/turnos", params={"limite": 2})
+        res = cliente.get(
+            "/api/turnos",
+            params={"limite": 2},
+            headers={"If-None-Match": primera.headers["etag"]},
+        )
+
+        assert res.status_code == 304
+        cursor = primera.headers["x-siguiente-cursor"]
+        assert res.headers["x-siguiente-cursor"] == cursor
+
+
+def test_actividades_con_etag(crear_cliente):
+    with crear_cliente() as cliente:
+        primera = cliente.get("/api/actividades")
+        res = cliente.get(
+            "/api/actividades",
+            headers={"If-None-Match": primera.headers["etag"]},
+        )
+
+        assert res.status_code == 304
+
+
+def test_escritura_de_otro_proceso_invalida_por_defecto(
+    crear_cliente, db_path, monkeypatch
+):
+    monkeypatch.delenv("ECOPARK_CACHE_ENTRE_PROCESOS", raising=False)
+    fecha = crear_cliente.fecha
+    with crear_cliente() as cliente:
+        antes = cliente.get("/api/turnos", params={"fecha": fecha})
+        etag = antes.headers["etag"]
+        with sqlite3.connect(db_path) as otro:
+            otro.execute("UPDATE Turno SET cupo_disponible = 1")
+
+        res = cliente.get(
+            "/api/turnos",
+            params={"fecha": fecha},
+            headers={"If-None-Match": etag},
+        )
+        assert res.status_code == 200
+        assert {t["cupos_disponibles"] for t in res.json()} == {1}
+
+
+def test_data_version_no_se_lee_en_el_event_loop(db_path, monkeypatch):
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    monkeypatch.setenv("ECOPARK_CACHE_ENTRE_PROCESOS", "1")
+    hilos = []
+    with TestClient(crear_app(modo_async=True)) as cliente:
+        version_datos = cliente.app.state.contenedor.version_datos
+        data_version = version_datos.data_version
+
+        def registrar():
+            hilos.append(threading.current_thread())
+            return data_version()
+
+        monkeypatch.setattr(version_datos, "data_version", registrar)
+        res = cliente.get("/api/turnos", params={"fecha": "2025-10-15"})
+        assert res.status_code == 200
+
+    assert hilos and all(h.name.startswith("bd") for h in hilos)
+
+
+def test_sin_cache_no_hay_etag(crear_cliente):
+    with crear_cliente(ECOPARK_CACHE_RESPUESTAS="0") as cliente:
+        res = cliente.get("/api/turnos", params={"fecha": crear_cliente.fecha})
+
+        assert res.status_code == 200
+        assert "etag" not in res.headers
+
+
+def test_respuesta_grande_va_comprimida_con_su_propio_etag(crear_cliente):
+    fecha = crear_cliente.fecha
+    with crear_cliente(ECOPARK_COMPRESION_MINIMO="1") as cliente:
+        plano = cliente.get(
+            "/api/turnos",
+            params={"fecha": fecha},
+            headers={"Accept-Encoding": "identity"},
+        )
+        res = cliente.get(
+            "/api/turnos",
+            params={"fecha": fecha},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert "content-encoding" not in plano.headers
+        assert res.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in res.headers["vary"]
+        assert res.json() == plano.json()
+        assert res.headers["etag"] != plano.headers["etag"]
+        revalidada = cliente.get(
+            "/api/turnos",
+            params={"fecha": fecha},
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": res.headers["etag"],
+            },
+        )
+        assert revalidada.status_code == 304
+
+
+def test_respuesta_chica_no_se_comprime(crear_cliente):
+    with crear_cliente() as cliente:
+        res = cliente.get(
+            "/api/actividades", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert "content-encoding" not in res.headers
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+import pytest
+
+from back.benchmarks.carga_inscripciones import (
+    GeneradorPedidos,
+    generar_carga,
+    verificar_invariantes,
+)
+from back.src.repositorios.base import RepositorioBase
+
+TURNOS = [
+    {"id": 1, "actividad_id": 1, "fecha": "2025-10-16", "hora": "10:00"},
+    {"id": 2, "actividad_id": 2, "fecha": "2025-10-16", "hora": "10:00"},
+]
+
+
+def _reservar(repo, turno_id, dni, personas=1):
+    repo.ejecutar(
+        "INSERT INTO Inscripcion "
+        "(turno_id, email_contacto, total_personas, acepta_terminos) "
+        "VALUES (?, 'a@b.com', ?, 1)",
+        (turno_id, personas),
+    )
+    repo.ejecutar(
+        "INSERT INTO Visitante (inscripcion_id, nombre, dni, edad) "
+        "VALUES ((SELECT max(id) FROM Inscripcion), 'Ana', ?, 30)",
+        (dni,),
+    )
+
+
+def test_invariantes_en_bd_consistente(db_path):
+    repo = RepositorioBase()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-16', '10:00', 7)"
+    )
+    _reservar(repo, 1, 30123456)
+
+    assert verificar_invariantes(db_path) == {
+        "cupo_negativo": [],
+        "ocupacion_inconsistente": [],
+        "dni_repetido_en_horario": [],
+    }
+
+
+def test_invariantes_detectan_sobreventa_y_dni_repetido(db_path):
+    repo = RepositorioBase()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-16', '10:00', -1)"
+    )
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (2, '2025-10-16', '10:00', 11)"
+    )
+    _reservar(repo, 1, 30123456, personas=9)
+    _reservar(repo, 2, 30123456)
+
+    violaciones = verificar_invariantes(db_path)
+
+    assert violaciones["cupo_negativo"] == [(1, -1)]
+    assert violaciones["ocupacion_inconsistente"] == []
+    assert violaciones["dni_repetido_en_horario"] == [
+        ("2025-10-16", "10:00", 30123456, 2)
+    ]
+
+
+def test_generador_respeta_el_sesgo_y_no_repite_dni_en_un_grupo():
+    generador = GeneradorPedidos(
+        TURNOS, {1: "Safari", 2: "Palestra"}, sesgo=1.0, semilla=3
+    )
+
+    for _ in range(50):
+        payload = generador.payload()
+        dnis = [p["dni"] for p in payload["participantes"]]
+        # El turno caliente es el del medio
+        assert payload["actividad"] == "Palestra"
+        assert 1 <= len(dnis) <= 6 and len(set(dnis)) == len(dnis)
+
+
+def test_generar_carga_agrupa_rechazos_con_detail_en_lista():
+    httpx = pytest.importorskip("httpx")
+    detalle_422 = [
+        {"loc": ["body", "email"], "msg": "Field required", "type": "missing"}
+    ]
+
+    def responder(request):
+        if b"Palestra" in request.content:
+            return httpx.Response(422, json={"detail": detalle_422})
+        return httpx.Response(400, json={"detail": "Sin cupo"})
+
+    async def correr():
+        transporte = httpx.MockTransport(responder)
+        generador = GeneradorPedidos(
+            TURNOS, {1: "Safari", 2: "Palestra"}, sesgo=0.5, semilla=3
+        )
+        async with httpx.AsyncClient(
+            transport=transporte, base_url="http://carga"
+        ) as http:
+            return await generar_carga(
+                http, generador, pedidos=20, tasa=0, concurrencia=4
+            )
+
+    resultado = asyncio.run(correr())
+
+    assert sum(resultado["estados"].values()) == 20
+    assert set(resultado["rechazos"]) == {
+        "Sin cupo",
+        json.dumps(detalle_422, sort_keys=True),
+    }
@@ -0,0 +1,48 @@
+import sqlite3
+
+from back.src.catalogo_actividades import CatalogoActividades
+from back.src.repositorios.conexion import obtener_pool
+
+
+def test_catalogo_indexa_por_id_y_nombre(db_path):
+    catalogo = CatalogoActividades()
+
+    palestra = catalogo.por_nombre("Palestra")
+
+    assert catalogo.por_id(palestra.id) is palestra
+    assert palestra.capacidad_maxima == 12
+    assert palestra.requiere_vestimenta is True
+    assert catalogo.setup_actividades()["Tirolesa"] == {
+        "capacidad": 10,
+        "requiere_talle": True,
+        "edad_minima": 8,
+    }
+    assert catalogo.por_nombre("Buceo") is None
+
+
+def test_catalogo_no_vuelve_a_leer_actividad_si_no_hubo_cambios(db_path):
+    catalogo = CatalogoActividades()
+    catalogo.todas()
+    sentencias = []
+    conn = obtener_pool(db_path).conexion()
+    conn.set_trace_callback(sentencias.append)
+
+    for _ in range(5):
+        catalogo.por_nombre("Safari")
+
+    conn.set_trace_callback(None)
+    assert not any("Actividad" in s for s in sentencias)
+
+
+def test_catalogo_se_invalida_cuando_otra_conexion_cambia_la_tabla(db_path):
+    catalogo = CatalogoActividades()
+    assert catalogo.por_nombre("Safari").capacidad_maxima == 8
+
+    otra = sqlite3.connect(db_path)
+    otra.execute(
+        "UPDATE Actividad SET capacidad_maxima = 6 WHERE nombre = 'Safari'"
+    )
+    otra.commit()
+    otra.close()
+
+    assert catalogo.por_nombre("Safari").capacidad_maxima == 6
@@ -0,0 +1,84 @@
+from datetime import date, time
+from email import message_from_bytes
+
+from back.src.comprobante import RenderizadorComprobante, buscar_logo
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+
+
+def _inscripcion(nombre="Ana"):
+    return Inscripcion(
+        turno=Turno(
+            id=1,
+            actividad_nombre="Tirolesa",
+            fecha=date(2025, 10, 15),
+            hora=time(14, 0),
+            cupo_ocupado=0,
+        ),
+        visitantes=[
+            Visitante(nombre=nombre, dni=30123456, edad=30, talle="M")
+        ],
+        total_personas=1,
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+
+
+def test_html_incluye_datos_de_la_reserva():
+    html = RenderizadorComprobante().generar_html(
+        _inscripcion(), "ana@mail.com", id_inscripcion=7
+    )
+
+    assert "<strong>N° Inscripción:</strong>" in html and ">7</td>" in html
+    assert "Tirolesa" in html and "15/10/2025" in html and "14:00" in html
+    assert "<li>Ana (DNI: 30123456, Edad: 30 - Talle M)</li>" in html
+
+
+def test_html_escapa_nombres_de_visitantes():
+    html = RenderizadorComprobante().generar_html(
+        _inscripcion("<script>x</script>"), "ana@mail.com"
+    )
+
+    assert "<script>" not in html
+    assert "&lt;script&gt;x&lt;/script&gt;" in html
+
+
+def test_renderizar_lote():
+    renderizador = RenderizadorComprobante()
+    lote = [(_inscripcion(), "ana@mail.com", i) for i in range(3)]
+
+    htmls = list(renderizador.renderizar_lote(lote))
+
+    assert len(htmls) == 3
+    assert all(f">{i}</td>" in h for i, h in enumerate(htmls))
+
+
+def test_mensaje_adjunta_el_logo_codificado_una_vez():
+    ruta = buscar_logo()
+    renderizador = RenderizadorComprobante()
+
+    mensaje = renderizador.construir_mensaje(
+        _inscripcion(), "ana@mail.com", "parque@ecoharmony.com", 7
+    )
+
+    partes = mensaje.get_payload()
+    assert mensaje["Subject"] == "Comprobante de inscripción #7 - Tirolesa"
+    assert len(partes) == 2
+    assert partes[1]["Content-ID"] == "<logo>"
+    assert partes[1].get_payload(decode=True) == ruta.read_bytes()
+    mensaje.as_bytes()  # se puede serializar
+
+
+def test_mensaje_serializado_es_mime_valido_con_logo():
+    renderizador = RenderizadorComprobante()
+
+    datos = renderizador.serializar_mensaje(
+        _inscripcion(), "ana@mail.com", "parque@ecoharmony.com", 7
+    )
+
+    mensaje = message_from_bytes(datos)
+    html, logo = mensaje.get_payload()
+    assert mensaje["To"] == "ana@mail.com"
+    assert "Tirolesa" in html.get_payload(decode=True).decode("utf-8")
+    assert logo.get_payload(decode=True) == buscar_logo().read_bytes()
@@ -0,0 +1,145 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.actividad_repo import RepositorioActividad
+from back.src.repositorios.asincrono import (
+    HILOS_BD,
+    cerrar_ejecutor,
+    configurar_ejecutor,
+    ejecutar_en_bd,
+    en_cada_hilo,
+)
+from back.src.repositorios.conexion import obtener_pool
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+from back.src.repositorios.turno_repo import RepositorioTurno
+from back.src.repositorios.visitante_repo import VisitanteRepo
+
+
+def test_repositorios_comparten_la_conexion_del_hilo(db_path):
+    repos = [
+        RepositorioTurno(),
+        InscripcionRepo(),
+        VisitanteRepo(),
+        RepositorioActividad(),
+    ]
+
+    conexiones = {id(r.get_connection()) for r in repos}
+
+    assert len(conexiones) == 1
+
+
+def test_cada_hilo_tiene_su_propia_conexion(db_path):
+    repo = RepositorioActividad()
+    otras = []
+    hilo = threading.Thread(target=lambda: otras.append(repo.get_connection()))
+    hilo.start()
+    hilo.join()
+
+    assert otras[0] is not repo.get_connection()
+
+
+def test_conexiones_de_hilos_terminados_se_cierran(db_path):
+    pool = obtener_pool(db_path)
+    pool.conexion()
+    viejas = []
+
+    def consultar():
+        conn = pool.conexion()
+        conn.execute("SELECT 1")
+        viejas.append(conn)
+
+    for _ in range(50):
+        hilo = threading.Thread(target=consultar)
+        hilo.start()
+        hilo.join()
+
+    # La del hilo principal y a lo sumo la del último hilo
+    assert pool.abiertas() <= 2
+    with pytest.raises(sqlite3.ProgrammingError):
+        viejas[0].execute("SELECT 1")
+
+
+def test_conexion_configurada_con_wal_y_busy_timeout(db_path):
+    conn = obtener_pool(db_path).conexion()
+
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+
+
+def test_guardar_revierte_si_falla_un_visitante(db_path):
+    repo = InscripcionRepo()
+    turno = Turno(
+        id=1, actividad_nombre="Safari", fecha=None, hora=None, cupo_ocupado=0
+    )
+    inscripcion = Inscripcion(
+        turno=turno,
+        visitantes=[
+            Visitante(nombre="Ana", dni=1, edad=30),
+            Visitante(nombre=None, dni=2, edad=30),
+        ],
+        total_personas=2,
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+
+    with pytest.raises(sqlite3.IntegrityError):
+        repo.guardar(inscripcion)
+
+    assert repo.obtener_todas() == []
+    assert (
+        repo.ejecutar("SELECT COUNT(*) FROM Visitante", fetchone=True)[0] == 0
+    )
+    assert not repo.get_connection().in_transaction
+
+
+def test_proxy_asincrono_corre_en_el_ejecutor_de_bd(db_path):
+    repo = RepositorioActividad()
+
+    async def consultar():
+        hilo = await ejecutar_en_bd(lambda: threading.current_thread().name)
+        return hilo, await repo.asincrono.obtener_todas()
+
+    try:
+        hilo, actividades = asyncio.run(consultar())
+    finally:
+        cerrar_ejecutor()
+
+    assert hilo.startswith("bd")
+    assert len(actividades) == 4
+
+
+def test_proxy_asincrono_se_reutiliza(db_path):
+    repo = RepositorioActividad()
+
+    assert repo.asincrono is repo.asincrono
+    assert repo.asincrono.obtener_todas is repo.asincrono.obtener_todas
+
+
+def test_en_cada_hilo_abre_una_conexion_por_hilo_del_ejecutor(db_path):
+    pool = obtener_pool(db_path)
+    antes = pool.abiertas()
+    configurar_ejecutor(3)
+    hilos = []
+    lock = threading.Lock()
+
+    def abrir():
+        RepositorioActividad().get_connection()
+        with lock:
+            hilos.append(threading.current_thread().name)
+
+    try:
+        en_cada_hilo(abrir)
+        abiertas = pool.abiertas()
+    finally:
+        cerrar_ejecutor()
+        configurar_ejecutor(HILOS_BD)
+
+    assert len(set(hilos)) == 3
+    assert abiertas - antes == 3
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+from back.app import crear_app
+from back.src.repositorios.conexion import obtener_pool
+
+
+@pytest.fixture
+def app(db_path, monkeypatch):
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    monkeypatch.setenv("ECOPARK_HILOS_BD", "3")
+    return crear_app(modo_async=True)
+
+
+def test_lifespan_arma_el_contenedor_y_precalienta_las_conexiones(
+    app, db_path
+):
+    antes = obtener_pool(db_path).abiertas()
+    with TestClient(app):
+        contenedor = app.state.contenedor
+        # Una conexión por hilo del ejecutor más la del hilo del lifespan
+        assert contenedor.pool.abiertas() - antes == 4
+        assert contenedor.catalogo.por_nombre("Safari").capacidad_maxima == 8
+        assert contenedor.repos.turnos.pool is contenedor.pool
+
+
+def test_los_pedidos_usan_el_mismo_contenedor(app, monkeypatch):
+    with TestClient(app) as cliente:
+        repo_turno = app.state.contenedor.repos.turnos
+        consultas = []
+        monkeypatch.setattr(
+            repo_turno,
+            "obtener_por_fecha",
+            lambda fecha: consultas.append(fecha) or [],
+        )
+
+        fechas = ["2025-10-15", "2025-10-16", "2025-10-17"]
+        for fecha in fechas:
+            res = cliente.get("/api/turnos", params={"fecha": fecha})
+            assert res.json() == []
+
+    assert consultas == fechas
@@ -0,0 +1,75 @@
+import sqlite3
+from datetime import date
+
+from back.db.create_db import asegurar_actividades, generar_turnos
+
+MARTES = date(2025, 10, 14)
+TURNOS_POR_DIA = 18  # 09:00 a 17:30 cada 30 minutos
+
+
+def _contar(conn, sql="SELECT COUNT(*) FROM Turno", params=()):
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def test_generar_turnos_salta_lunes_y_no_duplica(db_path):
+    conn = sqlite3.connect(db_path)
+
+    insertados = generar_turnos(conn, hoy=MARTES, horizonte_semanas=4)
+
+    # 29 días del 14/10 al 11/11, menos 4 lunes
+    assert insertados == 4 * 25 * TURNOS_POR_DIA
+    lunes = _contar(
+        conn, "SELECT COUNT(*) FROM Turno WHERE fecha = '2025-10-20'"
+    )
+    assert lunes == 0
+    assert generar_turnos(conn, hoy=MARTES, horizonte_semanas=4) == 0
+
+
+def test_generar_turnos_no_toca_los_dias_ya_generados(db_path):
+    conn = sqlite3.connect(db_path)
+    generar_turnos(conn, hoy=MARTES, horizonte_semanas=1)
+    conn.execute(
+        "UPDATE Turno SET cupo_disponible = 0 WHERE fecha = '2025-10-15'"
+    )
+    conn.commit()
+
+    insertados = generar_turnos(conn, hoy=MARTES, horizonte_semanas=2)
+
+    # Del 22/10 al 28/10, menos el lunes 27
+    assert insertados == 4 * 6 * TURNOS_POR_DIA
+    cupo = _contar(
+        conn,
+        "SELECT SUM(cupo_disponible) FROM Turno WHERE fecha = ?",
+        ("2025-10-15",),
+    )
+    assert cupo == 0
+
+
+def test_actividad_nueva_recibe_turnos_desde_hoy(db_path):
+    conn = sqlite3.connect(db_path)
+    generar_turnos(conn, hoy=MARTES, horizonte_semanas=1)
+    asegurar_actividades(conn.cursor(), [("Kayak", 6, 1, 10)])
+    conn.commit()
+
+    insertados = generar_turnos(conn, hoy=MARTES, horizonte_semanas=1)
+
+    assert insertados == 7 * TURNOS_POR_DIA
+
+
+def test_generar_turnos_completa_huecos_dentro_del_horizonte(db_path):
+    conn = sqlite3.connect(db_path)
+    generar_turnos(conn, hoy=MARTES, horizonte_semanas=1)
+    conn.execute(
+        "DELETE FROM Turno WHERE actividad_id = 2 AND fecha = '2025-10-16'"
+    )
+    conn.commit()
+
+    insertados = generar_turnos(conn, hoy=MARTES, horizonte_semanas=1)
+
+    assert insertados == TURNOS_POR_DIA
+    turnos = _contar(
+        conn,
+        "SELECT COUNT(*) FROM Turno WHERE actividad_id = 2 AND fecha = ?",
+        ("2025-10-16",),
+    )
+    assert turnos == TURNOS_POR_DIA
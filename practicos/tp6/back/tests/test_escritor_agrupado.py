@@ -0,0 +1,340 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import Future
+from datetime import date, time
+
+import pytest
+
+from back.src.escritor_agrupado import EscritorAgrupado, Pedido
+from back.src.excepciones import (
+    ErrorBDOcupada,
+    ErrorChoqueHorario,
+    ErrorSinCupo,
+)
+from back.src.metricas import ESCRITOR_LOTE
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+from back.src.repositorios.turno_repo import RepositorioTurno
+
+CAPACIDAD = 10
+LLAMADORES = 30
+
+
+@pytest.fixture
+def turno_id(db_path):
+    repo = RepositorioTurno()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (4, '2025-10-15', '14:00', ?)",
+        (CAPACIDAD,),
+    )
+    return repo.ejecutar("SELECT max(id) FROM Turno", fetchone=True)[0]
+
+
+def _inscripcion(turno_id, *dnis):
+    turno = Turno(
+        id=turno_id,
+        actividad_nombre="Tirolesa",
+        fecha=date(2025, 10, 15),
+        hora=time(14, 0),
+        cupo_ocupado=0,
+    )
+    return Inscripcion(
+        turno=turno,
+        visitantes=[
+            Visitante(nombre="Ana", dni=dni, edad=30, talle="M")
+            for dni in dnis
+        ],
+        total_personas=len(dnis),
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+
+
+def _cupo(turno_id):
+    (cupo,) = InscripcionRepo().ejecutar(
+        "SELECT cupo_disponible FROM Turno WHERE id = ?",
+        (turno_id,),
+        fetchone=True,
+    )
+    return cupo
+
+
+def _contar(tabla):
+    (cantidad,) = InscripcionRepo().ejecutar(
+        f"SELECT COUNT(*) FROM {tabla}", fetchone=True
+    )
+    return cantidad
+
+
+def test_reservar_varias_confirma_cada_una_por_su_cuenta(turno_id):
+    repo = InscripcionRepo()
+
+    resultados = repo.reservar_varias(
+        [
+            (_inscripcion(turno_id, 1, 2, 3), True),
+            # No alcanza el cupo
+            (_inscripcion(turno_id, *range(10, 20)), True),
+            # El DNI 3 ya reservó en esta tanda
+            (_inscripcion(turno_id, 3), True),
+            (_inscripcion(turno_id, 4, 5), True),
+        ]
+    )
+
+    assert isinstance(resultados[0], int) and isinstance(resultados[3], int)
+    assert isinstance(resultados[1], ErrorSinCupo)
+    assert isinstance(resultados[2], ErrorChoqueHorario)
+    guardadas = [fila[0] for fila in repo.obtener_por_turno(turno_id)]
+    assert guardadas == [resultados[0], resultados[3]]
+    assert _contar("Visitante") == 5
+    assert _contar("CorreoPendiente") == 2
+    assert _cupo(turno_id) == CAPACIDAD - 5
+
+
+def test_reservar_varias_deshace_todo_ante_un_error_inesperado(
+    turno_id, monkeypatch
+):
+    repo = InscripcionRepo()
+    insertar = repo._insertar
+    llamadas = []
+
+    def falla_la_segunda(cur, inscripcion):
+        llamadas.append(inscripcion)
+        if len(llamadas) == 2:
+            raise sqlite3.IntegrityError("falla de la BD")
+        return insertar(cur, inscripcion)
+
+    monkeypatch.setattr(repo, "_insertar", falla_la_segunda)
+
+    pedidos = [(_inscripcion(turno_id, dni), True) for dni in (1, 2)]
+    with pytest.raises(sqlite3.IntegrityError):
+        repo.reservar_varias(pedidos)
+
+    assert repo.obtener_por_turno(turno_id) == []
+    assert _contar("CorreoPendiente") == 0
+    assert _cupo(turno_id) == CAPACIDAD
+
+
+def test_llamadores_concurrentes_reciben_su_resultado_con_menos_commits(
+    turno_id,
+):
+    escritor = EscritorAgrupado(InscripcionRepo(), max_lote=64, ventana=0.02)
+    escritor.iniciar()
+    commits_antes = ESCRITOR_LOTE.cantidad()
+    barrera = threading.Barrier(LLAMADORES)
+    resultados = {}
+
+    def llamador(n):
+        barrera.wait()
+        inscripcion = _inscripcion(turno_id, 30_000_000 + n)
+        try:
+            resultados[n] = escritor.reservar(inscripcion)
+        except ErrorSinCupo as e:
+            resultados[n] = e
+
+    hilos = [
+        threading.Thread(target=llamador, args=(n,)) for n in range(LLAMADORES)
+    ]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    escritor.detener()
+
+    ids = [r for r in resultados.values() if isinstance(r, int)]
+    assert len(resultados) == LLAMADORES
+    assert len(ids) == CAPACIDAD == len(set(ids))
+    filas = InscripcionRepo().obtener_por_turno(turno_id)
+    assert sorted(ids) == sorted(fila[0] for fila in filas)
+    assert _cupo(turno_id) == 0
+    assert ESCRITOR_LOTE.cantidad() - commits_antes < LLAMADORES
+
+
+def test_si_falla_el_commit_fallan_todos_los_de_la_tanda(
+    turno_id, monkeypatch
+):
+    repo = InscripcionRepo()
+    escritor = EscritorAgrupado(repo)
+
+    def ocupada(pedidos):
+        raise ErrorBDOcupada(
+            "La base de datos está ocupada, reintentar más tarde"
+        )
+
+    monkeypatch.setattr(repo, "reservar_varias", ocupada)
+    escritor.iniciar()
+    try:
+        with pytest.raises(ErrorBDOcupada):
+            escritor.reservar(_inscripcion(turno_id, 1))
+        # El hilo escritor sigue vivo para la próxima tanda
+        monkeypatch.undo()
+        assert isinstance(escritor.reservar(_inscripcion(turno_id, 1)), int)
+    finally:
+        escritor.detener()
+
+
+def test_pedido_cancelado_no_se_reserva(turno_id):
+    escritor = EscritorAgrupado(InscripcionRepo())
+    cancelado = Future()
+    cancelado.cancel()
+    vigente = Future()
+
+    escritor.confirmar(
+        [
+            Pedido(_inscripcion(turno_id, 1), False, cancelado),
+            Pedido(_inscripcion(turno_id, 2), False, vigente),
+        ]
+    )
+
+    assert isinstance(vigente.result(), int)
+    assert _cupo(turno_id) == CAPACIDAD - 1
+
+
+def test_encolar_mientras_se_detiene_no_deja_futuros_colgados(turno_id):
+    escritor = EscritorAgrupado(InscripcionRepo(), ventana=0.001)
+    escritor.iniciar()
+    barrera = threading.Barrier(LLAMADORES + 1)
+    futuros, rechazados = [], []
+
+    def llamador(n):
+        barrera.wait()
+        for i in range(20):
+            inscripcion = _inscripcion(turno_id, n * 100 + i)
+            try:
+                futuros.append(escritor.encolar(inscripcion))
+            except RuntimeError:
+                rechazados.append(n)
+
+    hilos = [
+        threading.Thread(target=llamador, args=(n,)) for n in range(LLAMADORES)
+    ]
+    for h in hilos:
+        h.start()
+    barrera.wait()
+    escritor.detener()
+    for h in hilos:
+        h.join()
+
+    assert not escritor.activo
+    assert len(futuros) + len(rechazados) == LLAMADORES * 20
+    for futuro in futuros:
+        # Cada pedido aceptado se confirmó o se rechazó: ninguno queda colgado
+        error = futuro.exception(timeout=1)
+        assert error is None or isinstance(error, ErrorSinCupo)
+    with pytest.raises(RuntimeError):
+        escritor.encolar(_inscripcion(turno_id, 1))
+
+
+def test_detener_con_timeout_no_suelta_un_hilo_vivo(turno_id, monkeypatch):
+    repo = InscripcionRepo()
+    escritor = EscritorAgrupado(repo)
+    liberar = threading.Event()
+    reservar_varias = repo.reservar_varias
+
+    def lenta(pedidos):
+        liberar.wait(5)
+        return reservar_varias(pedidos)
+
+    monkeypatch.setattr(repo, "reservar_varias", lenta)
+    escritor.iniciar()
+    futuro = escritor.encolar(_inscripcion(turno_id, 1))
+
+    escritor.detener(timeout=0.05)
+    assert escritor._hilo is not None and escritor._hilo.is_alive()
+    assert not escritor.activo
+
+    liberar.set()
+    escritor.detener()
+    assert escritor._hilo is None
+    assert isinstance(futuro.result(timeout=1), int)
+
+
+def test_sin_iniciar_reserva_directo_con_el_repositorio(turno_id):
+    escritor = EscritorAgrupado(InscripcionRepo())
+
+    assert isinstance(escritor.reservar(_inscripcion(turno_id, 1)), int)
+    assert _cupo(turno_id) == CAPACIDAD - 1
+
+
+def test_api_con_escritura_agrupada(db_path, monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from back.app import crear_app
+    from back.tests.test_api import _fecha_reservable, _grupo
+
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    monkeypatch.setenv("ECOPARK_ESCRITURA_AGRUPADA", "1")
+    fecha = _fecha_reservable()
+    RepositorioTurno().ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, ?, '10:00', 8)",
+        (fecha,),
+    )
+
+    with TestClient(crear_app()) as cliente:
+        assert cliente.app.state.contenedor.escritor is not None
+        pareja = _grupo("Safari", fecha, 30123456, 30123457)
+        ok = cliente.post("/api/inscribirse", json=pareja)
+        sola = _grupo("Safari", fecha, 30123456)
+        repetida = cliente.post("/api/inscribirse", json=sola)
+
+    assert ok.status_code == 200
+    guardada = InscripcionRepo().obtener_por_turno(1)[0]
+    assert ok.json()["id_inscripcion"] == guardada[0]
+    assert repetida.status_code == 400
+
+
+def test_api_async_espera_el_commit_sin_ocupar_hilos_de_bd(
+    db_path, monkeypatch
+):
+    httpx = pytest.importorskip("httpx")
+
+    from back.app import crear_app, lifespan
+    from back.tests.test_api import _fecha_reservable, _grupo
+
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    monkeypatch.setenv("ECOPARK_ESCRITURA_AGRUPADA", "1")
+    monkeypatch.setenv("ECOPARK_ESCRITURA_VENTANA_MS", "200")
+    monkeypatch.setenv("ECOPARK_HILOS_BD", "2")
+    fecha = _fecha_reservable()
+    RepositorioTurno().ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (3, ?, '10:00', 12)",
+        (fecha,),
+    )
+    pedidos = 10
+    grupos = [
+        _grupo("Jardinería", fecha, 30_000_000 + n) for n in range(pedidos)
+    ]
+    app = crear_app(modo_async=True)
+
+    async def correr():
+        async with lifespan(app):
+            escritor = app.state.contenedor.escritor
+            tandas = []
+            confirmar = escritor.confirmar
+
+            def registrar(tanda):
+                tandas.append(len(tanda))
+                confirmar(tanda)
+
+            escritor.confirmar = registrar
+            transporte = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transporte, base_url="http://test"
+            ) as http:
+                respuestas = await asyncio.gather(
+                    *(http.post("/api/inscribirse", json=g) for g in grupos)
+                )
+            return respuestas, tandas
+
+    respuestas, tandas = asyncio.run(correr())
+
+    assert [r.status_code for r in respuestas] == [200] * pedidos
+    # Con 2 hilos de BD, si cada pedido retuviera uno la tanda no pasaría de 2
+    assert max(tandas) > 2
+    assert _cupo(1) == 12 - pedidos
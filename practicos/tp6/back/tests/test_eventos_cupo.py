@@ -0,0 +1,81 @@
+import asyncio
+import threading
+
+from back.app import flujo_turnos
+from back.src.eventos_cupo import BUS_CUPOS, RESINCRONIZAR, BusCupos
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.asincrono import cerrar_ejecutor
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+
+
+def test_publicar_desde_otro_hilo_llega_solo_a_la_fecha(db_path):
+    async def escenario():
+        bus = BusCupos()
+        bus.vincular(asyncio.get_running_loop())
+        mia = bus.suscribir("2025-10-15")
+        otra = bus.suscribir("2025-10-16")
+        hilo = threading.Thread(target=bus.publicar, args=("2025-10-15", 1, 5))
+        hilo.start()
+        hilo.join()
+        return await mia.siguiente(1), await otra.siguiente(0.05)
+
+    mia, otra = asyncio.run(escenario())
+    assert mia == {"id": 1, "cupos_disponibles": 5}
+    assert otra is None
+
+
+def test_cliente_atrasado_recibe_resincronizar(db_path):
+    async def escenario():
+        bus = BusCupos()
+        bus.vincular(asyncio.get_running_loop())
+        suscripcion = bus.suscribir("2025-10-15", tamano_cola=2)
+        for cupo in range(5):
+            bus.publicar("2025-10-15", 1, cupo)
+        await asyncio.sleep(0)
+        return [await suscripcion.siguiente(0.05) for _ in range(2)]
+
+    assert asyncio.run(escenario()) == [RESINCRONIZAR, None]
+
+
+def test_flujo_envia_snapshot_y_luego_deltas_de_la_reserva(db_path):
+    repo = InscripcionRepo()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15', '14:00', 8)"
+    )
+    inscripcion = Inscripcion(
+        turno=Turno(
+            id=1,
+            actividad_nombre="Safari",
+            fecha=None,
+            hora=None,
+            cupo_ocupado=0,
+        ),
+        visitantes=[Visitante(nombre="Ana", dni=30123456, edad=30)],
+        total_personas=1,
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+
+    async def escenario():
+        BUS_CUPOS.vincular(asyncio.get_running_loop())
+        flujo = flujo_turnos("2025-10-15", latido=1)
+        snapshot = await flujo.__anext__()
+        # La reserva confirma en otro hilo, como en el ejecutor de BD
+        await asyncio.to_thread(repo.reservar, inscripcion)
+        delta = await flujo.__anext__()
+        await flujo.aclose()
+        return snapshot, delta, BUS_CUPOS.cantidad_suscriptores()
+
+    try:
+        snapshot, delta, suscriptores = asyncio.run(escenario())
+    finally:
+        BUS_CUPOS.desvincular()
+        cerrar_ejecutor()
+
+    assert snapshot.startswith("event: snapshot\n")
+    assert '"cupos_disponibles": 8' in snapshot
+    assert delta == 'event: cupo\ndata: {"id": 1, "cupos_disponibles": 7}\n\n'
+    assert suscriptores == 0
@@ -0,0 +1,141 @@
+from datetime import date, time
+
+import pytest
+
+from back.src.excepciones import ErrorChoqueHorario
+from back.src.indice_choques import (
+    IndiceChoques,
+    IndiceChoquesEnMemoria,
+    IndiceChoquesSQL,
+)
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+from back.src.repositorios.memoria import RepositorioEnMemoria
+from back.src.repositorios.visitante_repo import VisitanteRepo
+from back.src.servicio_inscripcion import ServicioInscripcion
+
+FECHA = date(2025, 10, 15)
+
+
+def _inscripcion(turno, *dnis):
+    return Inscripcion(
+        turno=turno,
+        visitantes=[
+            Visitante(nombre="Ana", dni=d, edad=30, talle="M") for d in dnis
+        ],
+        total_personas=len(dnis),
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+
+
+def test_indice_en_memoria_agrupa_por_fecha_y_hora():
+    turno = Turno(
+        id=1,
+        actividad_nombre="Safari",
+        fecha=FECHA,
+        hora=time(14, 0),
+        cupo_ocupado=0,
+    )
+    indice = IndiceChoquesEnMemoria.desde_inscripciones(
+        [_inscripcion(turno, 1, 2)]
+    )
+
+    assert indice.dnis_reservados(FECHA, time(14, 0)) == {1, 2}
+    assert indice.dnis_reservados("2025-10-15", "14:00") == {1, 2}
+    assert indice.dnis_reservados(FECHA, time(14, 30)) == set()
+
+
+def test_indice_sql_detecta_choque_en_otra_actividad(db_path):
+    repo_insc = InscripcionRepo()
+    repo_insc.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) VALUES"
+        " (1, '2025-10-15', '14:00', 8), (3, '2025-10-15', '14:00', 12)"
+    )
+    safari = Turno(
+        id=1,
+        actividad_nombre="Safari",
+        fecha=FECHA,
+        hora=time(14, 0),
+        cupo_ocupado=0,
+    )
+    jardineria = Turno(
+        id=2,
+        actividad_nombre="Jardinería",
+        fecha=FECHA,
+        hora=time(14, 0),
+        cupo_ocupado=0,
+    )
+    repo_insc.guardar(_inscripcion(safari, 30123456))
+    servicio = ServicioInscripcion(
+        {
+            "Jardinería": {
+                "capacidad": 12,
+                "requiere_talle": False,
+                "edad_minima": None,
+            }
+        },
+        [jardineria],
+        repo_insc,
+        fecha_actual=FECHA,
+        indice_choques=IndiceChoquesSQL(VisitanteRepo()),
+    )
+
+    with pytest.raises(ErrorChoqueHorario):
+        servicio.inscribir(
+            turno=jardineria,
+            participantes=[Visitante(nombre="Ana", dni=30123456, edad=30)],
+            acepta_terminos=True,
+            email_contacto="ana@mail.com",
+        )
+
+
+class _RepoLista:
+    """Repositorio mínimo sin índice: el servicio arma uno en memoria."""
+
+    def __init__(self):
+        self.inscripciones = []
+
+
+@pytest.mark.parametrize("repo", [_RepoLista, RepositorioEnMemoria])
+def test_servicio_ve_sus_propias_inscripciones_nuevas(repo):
+    # Con los dos backends: lo aceptado por el servicio todavía no se guardó
+    turno = Turno(
+        id=1,
+        actividad_nombre="Safari",
+        fecha=FECHA,
+        hora=time(14, 0),
+        cupo_ocupado=0,
+    )
+    servicio = ServicioInscripcion(
+        {
+            "Safari": {
+                "capacidad": 8,
+                "requiere_talle": False,
+                "edad_minima": None,
+            }
+        },
+        [turno],
+        repo(),
+        fecha_actual=FECHA,
+    )
+    pedido = dict(
+        turno=turno,
+        participantes=[Visitante(nombre="Ana", dni=30123456, edad=30)],
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+
+    servicio.inscribir(**pedido)
+    with pytest.raises(ErrorChoqueHorario):
+        servicio.inscribir(**pedido)
+
+
+def test_indice_incompleto_falla_al_instanciarse():
+    class SinConsulta(IndiceChoques):
+        pass
+
+    with pytest.raises(TypeError):
+        SinConsulta()
@@ -0,0 +1,116 @@
+import logging
+
+import pytest
+
+from back.src.repositorios.instrumentacion import (
+    INSTRUMENTACION,
+    normalizar_sql,
+)
+from back.src.repositorios.turno_repo import RepositorioTurno
+
+
+@pytest.fixture
+def instrumentada(db_path):
+    INSTRUMENTACION.estadisticas.reiniciar()
+    INSTRUMENTACION.configurar(True, umbral_ms=1000)
+    yield INSTRUMENTACION
+    INSTRUMENTACION.configurar(False)
+    INSTRUMENTACION.estadisticas.reiniciar()
+
+
+def test_normalizar_sql_quita_literales_y_espacios():
+    sql = """
+        SELECT * FROM Turno
+        WHERE fecha = '2025-10-15' AND id IN (?, ?, ?) LIMIT 10
+    """
+
+    assert normalizar_sql(sql) == (
+        "SELECT * FROM Turno WHERE fecha = ? AND id IN (?, ...) LIMIT ?"
+    )
+
+
+def test_estadisticas_por_forma_con_filas_y_parametros(instrumentada):
+    repo = RepositorioTurno()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15', '09:00', 8), "
+        "(2, '2025-10-15', '09:30', 8)"
+    )
+    repo.obtener_por_fecha("2025-10-15")
+    repo.obtener_por_fecha("2025-10-16")
+
+    stats = {s["consulta"]: s for s in instrumentada.estadisticas.resumen()}
+    por_fecha = next(
+        s for c, s in stats.items()
+        if c.startswith("SELECT id, actividad_id") and "fecha = ?" in c
+    )
+    assert por_fecha["cantidad"] == 2
+    assert por_fecha["filas"] == 2
+    assert por_fecha["parametros"] == 1
+
+
+def test_iterar_el_cursor_es_perezoso_y_cuenta_las_filas(instrumentada):
+    repo = RepositorioTurno()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15', '09:00', 8), "
+        "(2, '2025-10-15', '09:30', 8), (3, '2025-10-15', '10:00', 8)"
+    )
+    instrumentada.estadisticas.reiniciar()
+    cur = repo.nuevo_cursor()
+    filas = iter(cur.execute("SELECT id FROM Turno ORDER BY id"))
+    primera = next(filas)
+    # Lo que no se leyó sigue pendiente: cada forma de leer suma sus filas
+    assert cur.fetchone() == (2,)
+    assert cur.fetchmany(5) == [(3,)]
+    assert list(filas) == []
+    cur.close()
+
+    (stats,) = instrumentada.estadisticas.resumen()
+    assert primera == (1,)
+    assert stats["filas"] == 3
+
+
+def test_consulta_lenta_se_loguea_con_su_plan(instrumentada, caplog):
+    instrumentada.umbral_ms = 0
+    with caplog.at_level(logging.WARNING, logger="ecopark.sql.lentas"):
+        RepositorioTurno().obtener_por_fecha("2025-10-15")
+
+    assert any("ix_turno_fecha_hora" in r.getMessage() for r in caplog.records)
+
+
+def test_endpoint_admin_exige_token(instrumentada, monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from back.app import crear_app
+
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    monkeypatch.setenv("ECOPARK_ADMIN_TOKEN", "secreto")
+    with TestClient(crear_app()) as cliente:
+        cliente.get("/api/turnos", params={"fecha": "2025-10-15"})
+
+        assert cliente.get("/api/admin/sql").status_code == 403
+        res = cliente.get(
+            "/api/admin/sql", headers={"X-Admin-Token": "secreto"}
+        )
+
+    assert res.json()["activa"] is True
+    assert any("FROM Turno" in c["consulta"] for c in res.json()["consultas"])
+
+
+def test_endpoint_admin_cerrado_sin_token_configurado(
+    instrumentada, monkeypatch
+):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from back.app import crear_app
+
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    monkeypatch.delenv("ECOPARK_ADMIN_TOKEN", raising=False)
+    with TestClient(crear_app()) as cliente:
+        assert cliente.get("/api/admin/sql").status_code == 404
+        res = cliente.get("/api/admin/sql", headers={"X-Admin-Token": ""})
+        assert res.status_code == 404
+        assert cliente.post("/api/admin/sql/reiniciar").status_code == 404
@@ -0,0 +1,125 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+from back.app import crear_app
+from back.src.metricas import (
+    ERRORES_VALIDACION,
+    ETAPAS_INSCRIPCION,
+    HTTP_DURACION,
+    HTTP_PEDIDOS,
+    MiddlewareMetricas,
+    RegistroMetricas,
+)
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+
+
+def test_histograma_expone_buckets_acumulados():
+    registro = RegistroMetricas()
+    hist = registro.histograma(
+        "demora_segundos", "Demora.", ("ruta",), buckets=(0.1, 1.0)
+    )
+    hist.observar(0.05, "/a")
+    hist.observar(0.5, "/a")
+    hist.observar(3.0, "/a")
+
+    texto = registro.exponer()
+
+    assert "# TYPE demora_segundos histogram" in texto
+    assert 'demora_segundos_bucket{ruta="/a",le="0.1"} 1' in texto
+    assert 'demora_segundos_bucket{ruta="/a",le="1.0"} 2' in texto
+    assert 'demora_segundos_bucket{ruta="/a",le="+Inf"} 3' in texto
+    assert 'demora_segundos_count{ruta="/a"} 3' in texto
+
+
+def test_contador_escapa_etiquetas():
+    registro = RegistroMetricas()
+    registro.contador("pedidos_total", "Pedidos.", ("ruta",)).inc('/a"b')
+
+    assert 'pedidos_total{ruta="/a\\"b"} 1' in registro.exponer()
+
+
+@pytest.mark.parametrize(
+    "tipo, en_histograma",
+    [(b"text/event-stream", False), (b"application/x-ndjson", True)],
+)
+def test_middleware_no_mide_la_duracion_de_los_streams_de_eventos(
+    tipo, en_histograma
+):
+    ruta = f"/prueba/{tipo.decode()}"
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", tipo)],
+            }
+        )
+        await send(
+            {"type": "http.response.body", "body": b"", "more_body": False}
+        )
+
+    async def enviar(mensaje):
+        pass
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "route": SimpleNamespace(path=ruta),
+    }
+    asyncio.run(MiddlewareMetricas(app)(scope, None, enviar))
+
+    assert HTTP_PEDIDOS.valor("GET", ruta, 200) == 1
+    assert HTTP_DURACION.cantidad("GET", ruta) == int(en_histograma)
+
+
+@pytest.fixture
+def cliente(db_path, monkeypatch):
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    with TestClient(crear_app(metricas=True)) as c:
+        yield c
+
+
+def test_metrics_cuenta_pedidos_por_ruta(cliente):
+    cliente.get("/api/turnos", params={"fecha": "2025-10-15"})
+
+    res = cliente.get("/metrics")
+
+    assert res.headers["content-type"].startswith("text/plain; version=0.0.4")
+    serie = (
+        "ecopark_http_pedidos_total"
+        '{metodo="GET",ruta="/api/turnos",estado="200"}'
+    )
+    assert serie in res.text
+    assert 'ecopark_validacion_errores_total{tipo="ErrorSinCupo"}' in res.text
+
+
+def test_inscripcion_registra_etapas_y_errores_de_validacion(cliente):
+    InscripcionRepo().ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15', '14:00', 8)"
+    )
+    errores_antes = ERRORES_VALIDACION.valor("ErrorTerminosNoAceptados")
+    choques_antes = ETAPAS_INSCRIPCION.cantidad("choques")
+
+    res = cliente.post(
+        "/api/inscribirse",
+        json={
+            "actividad": "Safari",
+            "fecha": "2025-10-15",
+            "hora": "14:00",
+            "participantes": [{"nombre": "Ana", "dni": 30123456, "edad": 30}],
+            "acepta_terminos": False,
+            "email": "ana@mail.com",
+        },
+    )
+
+    assert res.status_code == 400
+    errores = ERRORES_VALIDACION.valor("ErrorTerminosNoAceptados")
+    assert errores == errores_antes + 1
+    assert ETAPAS_INSCRIPCION.cantidad("choques") == choques_antes + 1
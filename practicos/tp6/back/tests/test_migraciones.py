@@ -0,0 +1,373 @@
+import sqlite3
+from datetime import date, time
+
+import pytest
+
+from back.src.repositorios.actividad_repo import RepositorioActividad
+from back.src.repositorios.conexion import obtener_pool
+from back.src.repositorios.correo_repo import CorreoPendienteRepo
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+from back.src.repositorios.migraciones import (
+    MIGRACIONES,
+    VERSION_ESQUEMA,
+    aplicar_migraciones,
+    version_actual,
+)
+from back.src.repositorios.turno_repo import RepositorioTurno, fecha_canonica
+from back.src.repositorios.visitante_repo import VisitanteRepo
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+
+
+def test_migraciones_son_idempotentes(db_path):
+    conn = obtener_pool(db_path).conexion()
+
+    assert version_actual(conn) == VERSION_ESQUEMA
+    assert aplicar_migraciones(db_path) == 0
+
+
+def test_migraciones_sobre_bd_existente_sin_version(tmp_path):
+    ruta = tmp_path / "vieja.db"
+    conn = obtener_pool(ruta).conexion()
+    conn.execute(
+        "CREATE TABLE Turno (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "actividad_id INTEGER NOT NULL, "
+        "fecha TEXT NOT NULL, hora TEXT NOT NULL, "
+        "cupo_disponible INTEGER NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15', '09:00', 8)"
+    )
+
+    assert aplicar_migraciones(ruta) == VERSION_ESQUEMA
+    assert conn.execute("SELECT COUNT(*) FROM Turno").fetchone()[0] == 1
+    indices = {
+        r[0]
+        for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    assert {
+        "ux_turno_actividad_fecha_hora",
+        "ix_turno_fecha_hora",
+        "ix_visitante_dni",
+        "ix_inscripcion_turno",
+    } <= indices
+
+
+def test_migracion_normaliza_fecha_y_hora_de_turnos(tmp_path):
+    ruta = tmp_path / "vieja.db"
+    conn = obtener_pool(ruta).conexion()
+    conn.execute(
+        "CREATE TABLE Turno (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "actividad_id INTEGER NOT NULL, "
+        "fecha TEXT NOT NULL, hora TEXT NOT NULL, "
+        "cupo_disponible INTEGER NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15 00:00:00', '09:00:00', 8)"
+    )
+
+    aplicar_migraciones(ruta)
+
+    turno = conn.execute("SELECT fecha, hora FROM Turno").fetchone()
+    assert turno == ("2025-10-15", "09:00")
+
+
+def test_migracion_funde_turnos_que_solo_difieren_en_el_formato(tmp_path):
+    ruta = tmp_path / "vieja.db"
+    conn = obtener_pool(ruta).conexion()
+    for sql in MIGRACIONES[0][2]:
+        conn.execute(sql)
+    conn.executemany(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, ?, ?, ?)",
+        [
+            ("2025-10-15", "09:00", 6),
+            ("2025-10-15 00:00:00", "09:00:00", 7),
+            ("2025-10-16", "09:00", 8),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO Inscripcion (turno_id, email_contacto, total_personas) "
+        "VALUES (?, 'ana@mail.com', ?)",
+        [(1, 2), (2, 1)],
+    )
+
+    aplicar_migraciones(ruta)
+
+    assert conn.execute(
+        "SELECT id, fecha, hora, cupo_disponible FROM Turno ORDER BY id"
+    ).fetchall() == [
+        (1, "2025-10-15", "09:00", 5),
+        (3, "2025-10-16", "09:00", 8),
+    ]
+    inscripciones = conn.execute("SELECT turno_id FROM Inscripcion").fetchall()
+    assert inscripciones == [(1,), (1,)]
+
+
+def test_bd_vieja_con_turnos_repetidos_migra_antes_del_indice_unico(tmp_path):
+    ruta = tmp_path / "vieja.db"
+    conn = obtener_pool(ruta).conexion()
+    for sql in MIGRACIONES[0][2]:
+        conn.execute(sql)
+    conn.executemany(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15', '09:00', ?)",
+        [(6,), (7,)],
+    )
+    conn.execute(
+        "INSERT INTO Inscripcion (turno_id, email_contacto, total_personas) "
+        "VALUES (2, 'ana@mail.com', 1)"
+    )
+
+    assert aplicar_migraciones(ruta) == VERSION_ESQUEMA
+
+    turnos = conn.execute("SELECT id, cupo_disponible FROM Turno").fetchall()
+    assert turnos == [(1, 5)]
+    inscripciones = conn.execute("SELECT turno_id FROM Inscripcion").fetchall()
+    assert inscripciones == [(1,)]
+
+
+def test_migracion_no_deja_cupo_negativo_al_fundir_turnos(tmp_path):
+    ruta = tmp_path / "vieja.db"
+    conn = obtener_pool(ruta).conexion()
+    for sql in MIGRACIONES[0][2]:
+        conn.execute(sql)
+    # Cada duplicado con 8 de capacidad y 5 personas: juntos se pasan
+    conn.executemany(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, ?, ?, 3)",
+        [("2025-10-15", "09:00"), ("2025-10-15 00:00:00", "09:00:00")],
+    )
+    conn.executemany(
+        "INSERT INTO Inscripcion (turno_id, email_contacto, total_personas) "
+        "VALUES (?, 'ana@mail.com', 5)",
+        [(1,), (2,)],
+    )
+
+    aplicar_migraciones(ruta)
+
+    turnos = conn.execute("SELECT id, cupo_disponible FROM Turno").fetchall()
+    assert turnos == [(1, 0)]
+
+
+def test_turno_con_fecha_no_canonica_se_rechaza(db_path):
+    conn = obtener_pool(db_path).conexion()
+
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+            "VALUES (1, '15/10/2025', '09:00', 8)"
+        )
+
+
+@pytest.mark.parametrize(
+    "texto",
+    [
+        "2025-10-15",
+        " 2025-10-15 ",
+        "2025-10-15T09:30:00",
+        "2025-10-15 00:00:00",
+    ],
+)
+def test_fecha_canonica_acepta_fecha_o_fecha_y_hora_iso(texto):
+    assert fecha_canonica(texto) == "2025-10-15"
+
+
+@pytest.mark.parametrize(
+    "texto", ["2025-10-15garbage", "2025-10-15x10:00", "15/10/2025", ""]
+)
+def test_fecha_canonica_rechaza_texto_no_iso(texto):
+    with pytest.raises(ValueError):
+        fecha_canonica(texto)
+
+
+# --- EXPLAIN QUERY PLAN de cada consulta de back/src/repositorios ---
+
+INSCRIPCION = Inscripcion(
+    turno=Turno(
+        id=1, actividad_nombre="Safari", fecha=None, hora=None, cupo_ocupado=0
+    ),
+    visitantes=[Visitante(nombre="Ana", dni=30123456, edad=30, talle="M")],
+    total_personas=1,
+    acepta_terminos=True,
+    email_contacto="ana@mail.com",
+)
+
+# Con fecha y hora: el comprobante del outbox las necesita
+INSCRIPCION_CON_HORARIO = Inscripcion(
+    turno=Turno(
+        id=1,
+        actividad_nombre="Safari",
+        fecha=date(2025, 10, 15),
+        hora=time(9, 0),
+        cupo_ocupado=0,
+    ),
+    visitantes=[Visitante(nombre="Ana", dni=30123457, edad=30, talle="M")],
+    total_personas=1,
+    acepta_terminos=True,
+    email_contacto="ana@mail.com",
+)
+
+
+def _encolar_correo():
+    with CorreoPendienteRepo().transaccion(inmediata=True) as cur:
+        CorreoPendienteRepo.encolar(cur, INSCRIPCION_CON_HORARIO, 1)
+
+
+# (llamada al repositorio, tablas que se permite recorrer completas)
+CONSULTAS = {
+    "actividad.obtener_todas": (
+        lambda: RepositorioActividad().obtener_todas(),
+        {"Actividad"},
+    ),
+    "actividad.obtener_por_id": (
+        lambda: RepositorioActividad().obtener_por_id(1),
+        set(),
+    ),
+    # Actividad tiene una fila por actividad del parque: recorrerla es gratis
+    "actividad.obtener_por_nombre": (
+        lambda: RepositorioActividad().obtener_por_nombre("Safari"),
+        {"Actividad"},
+    ),
+    "actividad.version": (lambda: RepositorioActividad().version(), set()),
+    "turno.obtener_por_fecha": (
+        lambda: RepositorioTurno().obtener_por_fecha("2025-10-15"),
+        set(),
+    ),
+    "turno.obtener_desde": (
+        lambda: RepositorioTurno().obtener_desde("2025-10-15"),
+        set(),
+    ),
+    "turno.obtener_primera_pagina": (
+        lambda: RepositorioTurno().obtener_pagina_desde(
+            "2025-10-15", None, 100
+        ),
+        set(),
+    ),
+    "turno.obtener_pagina_desde": (
+        lambda: RepositorioTurno().obtener_pagina_desde(
+            "2025-10-15", ("2025-10-15", "09:00", 1), 100
+        ),
+        set(),
+    ),
+    "turno.obtener_por_actividad_y_fecha": (
+        lambda: RepositorioTurno().obtener_por_actividad_y_fecha(
+            1, "2025-10-15", "2025-10-15"
+        ),
+        set(),
+    ),
+    "turno.actualizar_cupo": (
+        lambda: RepositorioTurno().actualizar_cupo(1, 7),
+        set(),
+    ),
+    "inscripcion.guardar": (
+        lambda: InscripcionRepo().guardar(INSCRIPCION),
+        set(),
+    ),
+    "inscripcion.reservar": (
+        lambda: InscripcionRepo().reservar(INSCRIPCION),
+        {"json_each"},
+    ),
+    "inscripcion.reservar_lote": (
+        lambda: InscripcionRepo().reservar_lote([INSCRIPCION]),
+        {"json_each"},
+    ),
+    "inscripcion.reservar_varias": (
+        lambda: InscripcionRepo().reservar_varias(
+            [(INSCRIPCION_CON_HORARIO, True)]
+        ),
+        {"json_each"},
+    ),
+    "inscripcion.obtener_por_turno": (
+        lambda: InscripcionRepo().obtener_por_turno(1),
+        set(),
+    ),
+    "inscripcion.obtener_todas": (
+        lambda: InscripcionRepo().obtener_todas(),
+        {"Inscripcion"},
+    ),
+    "visitante.obtener_por_dni": (
+        lambda: VisitanteRepo().obtener_por_dni(30123456),
+        set(),
+    ),
+    "visitante.obtener_por_inscipcion_id": (
+        lambda: VisitanteRepo().obtener_por_inscipcion_id(1),
+        set(),
+    ),
+    "visitante.agregar_visitante": (
+        lambda: VisitanteRepo().agregar_visitante(1, "Beto", 25678901, 28),
+        set(),
+    ),
+    "visitante.existe_choque_por_dni_y_fecha_hora": (
+        lambda: VisitanteRepo().existe_choque_por_dni_y_fecha_hora(
+            30123456, "2025-10-15", "09:00"
+        ),
+        set(),
+    ),
+    "correo.encolar": (_encolar_correo, set()),
+    "correo.tomar_lote": (lambda: CorreoPendienteRepo().tomar_lote(20), set()),
+    "correo.renovar": (lambda: CorreoPendienteRepo().renovar(1, "r"), set()),
+    "correo.marcar_enviado": (
+        lambda: CorreoPendienteRepo().marcar_enviado(1, "r"),
+        set(),
+    ),
+    "correo.reprogramar": (
+        lambda: CorreoPendienteRepo().reprogramar(1, "r", 1, 0.0, "error"),
+        set(),
+    ),
+    "correo.marcar_fallido": (
+        lambda: CorreoPendienteRepo().marcar_fallido(1, "r", 5, "error"),
+        set(),
+    ),
+    "correo.contar_por_estado": (
+        lambda: CorreoPendienteRepo().contar_por_estado(),
+        {"CorreoPendiente"},
+    ),
+    "visitante.dnis_con_choque": (
+        lambda: VisitanteRepo().dnis_con_choque(
+            [30123456, 25678901], "2025-10-15", "09:00"
+        ),
+        {"json_each"},
+    ),
+    "visitante.dnis_en_horario": (
+        lambda: VisitanteRepo().dnis_en_horario("2025-10-15", "09:00"),
+        set(),
+    ),
+}
+
+
+def _sentencias(db_path, llamada):
+    """Ejecuta la llamada capturando las sentencias SQL que envía a SQLite."""
+    conn = obtener_pool(db_path).conexion()
+    sentencias = []
+    conn.set_trace_callback(sentencias.append)
+    try:
+        llamada()
+    finally:
+        conn.set_trace_callback(None)
+    dml = ("SELECT", "INSERT", "UPDATE", "DELETE")
+    return [s for s in sentencias if s.lstrip().upper().startswith(dml)]
+
+
+@pytest.mark.parametrize("nombre", sorted(CONSULTAS))
+def test_plan_de_consultas_usa_indices(db_path, nombre):
+    llamada, recorridos_permitidos = CONSULTAS[nombre]
+    conn = obtener_pool(db_path).conexion()
+    conn.execute(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15', '09:00', 8)"
+    )
+
+    sentencias = _sentencias(db_path, llamada)
+
+    assert sentencias, nombre
+    for sql in sentencias:
+        plan = [fila[3] for fila in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        recorridos = {p.split()[1] for p in plan if p.startswith("SCAN")}
+        assert recorridos <= recorridos_permitidos, (sql, plan)
+        assert not any("AUTOMATIC" in p for p in plan), (sql, plan)
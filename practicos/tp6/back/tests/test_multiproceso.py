@@ -0,0 +1,237 @@
+import multiprocessing
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from back.benchmarks.carga_inscripciones import verificar_invariantes
+from back.src.excepciones import (
+    ErrorBDOcupada,
+    ErrorChoqueHorario,
+    ErrorSinCupo,
+)
+from back.src.metricas import REINTENTOS_BD
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios import base, conexion
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+from back.src.repositorios.reintentos import REINTENTOS
+from back.src.repositorios.turno_repo import RepositorioTurno
+
+FECHA = "2025-10-15"
+HORAS = ("10:00", "11:00")
+PROCESOS = 4
+RESERVAS_POR_PROCESO = 40
+
+
+def _inscripcion(turno_id, hora, dnis):
+    turno = Turno(
+        id=turno_id,
+        actividad_nombre="Safari",
+        fecha=FECHA,
+        hora=hora,
+        cupo_ocupado=0,
+    )
+    return Inscripcion(
+        turno=turno,
+        visitantes=[
+            Visitante(nombre="Ana", dni=dni, edad=30, talle="M")
+            for dni in dnis
+        ],
+        total_personas=len(dnis),
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+
+
+def _crear_turnos(repo):
+    for actividad_id in range(1, 5):
+        for hora in HORAS:
+            repo.ejecutar(
+                "INSERT INTO Turno "
+                "(actividad_id, fecha, hora, cupo_disponible) "
+                "SELECT id, ?, ?, capacidad_maxima "
+                "FROM Actividad WHERE id = ?",
+                (FECHA, hora, actividad_id),
+            )
+    return repo.ejecutar("SELECT id, hora FROM Turno", fetchall=True)
+
+
+@pytest.fixture
+def lock_ajeno(db_path, monkeypatch):
+    """Conexión de "otro proceso", para tomar el lock de escritura."""
+    monkeypatch.setattr(conexion, "BUSY_TIMEOUT_MS", 10)
+    monkeypatch.setattr(REINTENTOS, "intentos", 50)
+    monkeypatch.setattr(REINTENTOS, "espera_maxima", 0.02)
+    otro = sqlite3.connect(
+        db_path, isolation_level=None, check_same_thread=False
+    )
+    yield otro
+    otro.close()
+
+
+def _en_hilo(funcion):
+    # Hilo nuevo: su conexión se abre con el busy_timeout del test
+    resultado = {}
+
+    def correr():
+        try:
+            resultado["valor"] = funcion()
+        except Exception as e:
+            resultado["error"] = e
+
+    hilo = threading.Thread(target=correr)
+    hilo.start()
+    hilo.join()
+    return resultado
+
+
+def test_reserva_reintenta_hasta_que_otro_proceso_suelta_el_lock(lock_ajeno):
+    ((turno_id, hora), *_) = _crear_turnos(RepositorioTurno())
+    antes = REINTENTOS_BD.valor("reintento")
+    lock_ajeno.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.2, lock_ajeno.rollback).start()
+
+    inscripcion = _inscripcion(turno_id, hora, [30123456])
+    resultado = _en_hilo(lambda: InscripcionRepo().reservar(inscripcion))
+
+    assert "error" not in resultado
+    assert REINTENTOS_BD.valor("reintento") > antes
+    assert InscripcionRepo().obtener_por_turno(turno_id) != []
+
+
+def test_sin_reintentos_la_reserva_falla_con_bd_ocupada(
+    lock_ajeno, monkeypatch
+):
+    ((turno_id, hora), *_) = _crear_turnos(RepositorioTurno())
+    lock_ajeno.execute("BEGIN IMMEDIATE")
+    monkeypatch.setattr(REINTENTOS, "intentos", 0)
+
+    inscripcion = _inscripcion(turno_id, hora, [30123456])
+    resultado = _en_hilo(lambda: InscripcionRepo().reservar(inscripcion))
+
+    assert isinstance(resultado["error"], ErrorBDOcupada)
+    lock_ajeno.rollback()
+    assert InscripcionRepo().obtener_por_turno(turno_id) == []
+
+
+def test_api_responde_503_si_la_bd_sigue_ocupada(db_path, monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from back.app import crear_app
+    from back.tests.test_api import _fecha_reservable, _grupo
+
+    monkeypatch.setenv("ECOPARK_OUTBOX_ACTIVO", "0")
+    fecha = _fecha_reservable()
+    RepositorioTurno().ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, ?, '10:00', 8)",
+        (fecha,),
+    )
+
+    def ocupada(*args, **kwargs):
+        raise ErrorBDOcupada(
+            "La base de datos está ocupada, reintentar más tarde"
+        )
+
+    with TestClient(crear_app(modo_async=False)) as cliente:
+        repos = cliente.app.state.contenedor.repos
+        monkeypatch.setattr(repos.inscripciones, "reservar", ocupada)
+        grupo = _grupo("Safari", fecha, 30123456)
+        res = cliente.post("/api/inscribirse", json=grupo)
+
+    assert res.status_code == 503
+    assert res.headers["retry-after"] == "1"
+
+
+# --- Varios procesos sobre la misma BD ---
+
+
+def _escritor(ruta, turnos, semilla, barrera, resultados):
+    base.DB_PATH = ruta
+    conexion.configurar_conexiones(20)  # locks cortos: fuerza reintentos
+    REINTENTOS.configurar(intentos=30)
+    azar = random.Random(semilla)
+    repo = InscripcionRepo()
+    cuenta = Counter()
+    barrera.wait()
+    for _ in range(RESERVAS_POR_PROCESO):
+        turno_id, hora = azar.choice(turnos)
+        # Padrón chico: hay choques de horario entre procesos
+        dnis = azar.sample(range(30_000_000, 30_000_200), azar.randint(1, 3))
+        try:
+            repo.reservar(_inscripcion(turno_id, hora, dnis))
+            cuenta["ok"] += 1
+        except (ErrorSinCupo, ErrorChoqueHorario) as e:
+            cuenta[type(e).__name__] += 1
+        except Exception as e:
+            cuenta[f"inesperado: {e!r}"] += 1
+    resultados.put(dict(cuenta))
+
+
+def _lector(ruta, barrera, duracion, resultados):
+    base.DB_PATH = ruta
+    repo = RepositorioTurno()
+    repo.obtener_por_fecha(FECHA)
+    barrera.wait()
+    lecturas, fin = 0, time.perf_counter() + duracion
+    while time.perf_counter() < fin:
+        repo.obtener_por_fecha(FECHA)
+        lecturas += 1
+    resultados.put(lecturas)
+
+
+def _correr(objetivo, procesos, *args):
+    contexto = multiprocessing.get_context("spawn")
+    barrera, resultados = contexto.Barrier(procesos), contexto.Queue()
+    hijos = [
+        contexto.Process(target=objetivo, args=(*arg, barrera, resultados))
+        for arg in (args[0](n) for n in range(procesos))
+    ]
+    for hijo in hijos:
+        hijo.start()
+    salida = [resultados.get(timeout=60) for _ in hijos]
+    for hijo in hijos:
+        hijo.join(timeout=10)
+    return salida
+
+
+def test_escrituras_desde_varios_procesos_mantienen_los_invariantes(db_path):
+    turnos = _crear_turnos(RepositorioTurno())
+
+    cuentas = _correr(_escritor, PROCESOS, lambda n: (db_path, turnos, n))
+
+    total = sum((Counter(c) for c in cuentas), Counter())
+    assert [k for k in total if k.startswith("inesperado")] == []
+    assert sum(total.values()) == PROCESOS * RESERVAS_POR_PROCESO
+    (guardadas,) = InscripcionRepo().ejecutar(
+        "SELECT COUNT(*) FROM Inscripcion", fetchone=True
+    )
+    assert total["ok"] == guardadas
+    assert verificar_invariantes(db_path) == {
+        "cupo_negativo": [],
+        "ocupacion_inconsistente": [],
+        "dni_repetido_en_horario": [],
+    }
+
+
+@pytest.mark.skipif(
+    (os.cpu_count() or 1) < 2,
+    reason="hace falta más de un núcleo para medir la escala",
+)
+def test_lecturas_escalan_con_los_procesos(db_path):
+    _crear_turnos(RepositorioTurno())
+    procesos = min(PROCESOS, os.cpu_count())
+    duracion = 0.5
+
+    uno = sum(_correr(_lector, 1, lambda n: (db_path, duracion)))
+    varios = sum(_correr(_lector, procesos, lambda n: (db_path, duracion)))
+
+    # En WAL los lectores no se bloquean entre sí
+    assert varios >= 0.6 * procesos * uno
@@ -0,0 +1,178 @@
+import socket
+from datetime import date, time
+
+import pytest
+
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.outbox_correo import CircuitoCorreo, TrabajadorOutbox
+from back.src.repositorios.correo_repo import (
+    ENVIADO,
+    PENDIENTE,
+    CorreoPendienteRepo,
+)
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+from back.src.servicio_correo import ServicioCorreo
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def servidor_smtp():
+    """Servidor SMTP local que guarda los mensajes recibidos."""
+    controller_mod = pytest.importorskip("aiosmtpd.controller")
+
+    class Buzon:
+        def __init__(self):
+            self.mensajes = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.mensajes.append(envelope)
+            return "250 OK"
+
+    buzon = Buzon()
+    controller = controller_mod.Controller(
+        buzon, hostname="127.0.0.1", port=_puerto_libre()
+    )
+    controller.start()
+    yield controller, buzon
+    controller.stop()
+
+
+@pytest.fixture
+def inscripcion_encolada(db_path):
+    repo = InscripcionRepo()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-15', '14:00', 8)"
+    )
+    inscripcion = Inscripcion(
+        turno=Turno(
+            id=1,
+            actividad_nombre="Safari",
+            fecha=date(2025, 10, 15),
+            hora=time(14, 0),
+            cupo_ocupado=0,
+        ),
+        visitantes=[Visitante(nombre="Ana", dni=30123456, edad=30)],
+        total_personas=1,
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+    return repo.reservar(inscripcion, encolar_comprobante=True)
+
+
+def _servicio(puerto):
+    return ServicioCorreo(
+        "parque@ecoharmony.com",
+        "",
+        servidor="127.0.0.1",
+        puerto=puerto,
+        usar_tls=False,
+    )
+
+
+def test_reservar_encola_el_comprobante_en_la_misma_transaccion(
+    inscripcion_encolada,
+):
+    filas = CorreoPendienteRepo().ejecutar(
+        "SELECT inscripcion_id, destinatario, estado FROM CorreoPendiente",
+        fetchall=True,
+    )
+
+    assert filas == [(inscripcion_encolada, "ana@mail.com", "pendiente")]
+
+
+def test_trabajador_envia_el_lote_por_smtp(
+    servidor_smtp, inscripcion_encolada
+):
+    controller, buzon = servidor_smtp
+    repo = CorreoPendienteRepo()
+    trabajador = TrabajadorOutbox(repo, _servicio(controller.port))
+
+    assert trabajador.procesar_lote() == 1
+    assert len(buzon.mensajes) == 1
+    assert buzon.mensajes[0].rcpt_tos == ["ana@mail.com"]
+    assert repo.contar_por_estado() == {ENVIADO: 1}
+
+
+def test_servidor_caido_reprograma_y_abre_el_circuito(inscripcion_encolada):
+    repo = CorreoPendienteRepo()
+    circuito = CircuitoCorreo(umbral_fallos=1, enfriamiento=60)
+    trabajador = TrabajadorOutbox(
+        repo, _servicio(_puerto_libre()), circuito=circuito
+    )
+
+    assert trabajador.procesar_lote() == 1
+    intentos, error = repo.ejecutar(
+        "SELECT intentos, ultimo_error FROM CorreoPendiente", fetchone=True
+    )
+    assert intentos == 1 and error
+    assert circuito.estado == CircuitoCorreo.ABIERTO
+    assert trabajador.procesar_lote() == 0
+
+
+def test_reserva_vencida_y_retomada_no_se_puede_marcar(inscripcion_encolada):
+    repo = CorreoPendienteRepo()
+    ((correo_id, *_, vieja),) = repo.tomar_lote(20, reserva_segundos=0)
+    ((_, *_, nueva),) = repo.tomar_lote(20)
+
+    assert not repo.renovar(correo_id, vieja)
+    assert not repo.marcar_enviado(correo_id, vieja)
+    assert not repo.reprogramar(correo_id, vieja, 1, 0.0, "error")
+    assert repo.contar_por_estado() == {PENDIENTE: 1}
+    assert repo.renovar(correo_id, nueva)
+    assert repo.marcar_enviado(correo_id, nueva)
+    assert repo.contar_por_estado() == {ENVIADO: 1}
+
+
+def test_trabajador_no_envia_lo_que_otro_retomo(inscripcion_encolada):
+    repo = CorreoPendienteRepo()
+    enviados = []
+
+    class Sesion:
+        def sendmail(self, remitente, destinatarios, mensaje):
+            enviados.append(destinatarios)
+
+        def quit(self):
+            pass
+
+    class Correo:
+        remitente = "parque@ecoharmony.com"
+
+        def abrir_sesion(self):
+            # Mientras tanto vence la reserva y otro trabajador toma el correo
+            assert len(repo.tomar_lote(20)) == 1
+            return Sesion()
+
+        def serializar_comprobante(
+            self, inscripcion, destinatario, id_inscripcion
+        ):
+            return "mensaje"
+
+    trabajador = TrabajadorOutbox(repo, Correo(), reserva_segundos=0)
+
+    assert trabajador.procesar_lote() == 1
+    assert enviados == []
+    assert repo.contar_por_estado() == {PENDIENTE: 1}
+
+
+def test_circuito_semiabierto_tras_enfriamiento():
+    ahora = [0.0]
+    circuito = CircuitoCorreo(
+        umbral_fallos=2, enfriamiento=10, reloj=lambda: ahora[0]
+    )
+    circuito.registrar_fallo()
+    circuito.registrar_fallo()
+
+    assert not circuito.permite()
+    ahora[0] = 11
+    assert circuito.permite()
+    assert circuito.estado == CircuitoCorreo.SEMIABIERTO
+    circuito.registrar_exito()
+    assert circuito.estado == CircuitoCorreo.CERRADO
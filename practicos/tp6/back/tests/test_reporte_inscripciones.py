@@ -0,0 +1,114 @@
+import csv
+import json
+import sqlite3
+from datetime import date, time
+
+import pytest
+
+from back.db.ver_insc import limpiar_inscripciones, main
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.reporte_inscripciones import (
+    abrir_solo_lectura,
+    iterar_inscripciones,
+)
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+
+
+@pytest.fixture
+def inscripciones(db_path):
+    repo = InscripcionRepo()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+        "VALUES (1, '2025-10-16', '10:00', 8), "
+        "(2, '2025-10-15', '14:00', 12)"
+    )
+    turnos = {
+        1: Turno(
+            id=1,
+            actividad_nombre="Safari",
+            fecha=date(2025, 10, 16),
+            hora=time(10, 0),
+            cupo_ocupado=0,
+        ),
+        2: Turno(
+            id=2,
+            actividad_nombre="Palestra",
+            fecha=date(2025, 10, 15),
+            hora=time(14, 0),
+            cupo_ocupado=0,
+        ),
+    }
+    for turno_id, visitantes in [
+        (1, [("Ana", 1), ("Beto", 2)]),
+        (2, [("Carla", 3)]),
+        (1, [("Dario", 4)]),
+    ]:
+        repo.reservar(
+            Inscripcion(
+                turno=turnos[turno_id],
+                visitantes=[
+                    Visitante(nombre=n, dni=d, edad=30) for n, d in visitantes
+                ],
+                total_personas=len(visitantes),
+                acepta_terminos=True,
+                email_contacto="a@mail.com",
+            ),
+            encolar_comprobante=True,
+        )
+    return db_path
+
+
+def test_reporte_agrupa_visitantes_en_orden_de_turno(inscripciones):
+    conn = abrir_solo_lectura(inscripciones)
+
+    reporte = list(iterar_inscripciones(conn))
+
+    assert [i["id_inscripcion"] for i in reporte] == [2, 1, 3]
+    assert [v["nombre"] for v in reporte[1]["visitantes"]] == ["Ana", "Beto"]
+    assert reporte[0]["actividad"] == "Palestra"
+
+
+def test_reporte_filtra_por_fecha_y_actividad(inscripciones):
+    conn = abrir_solo_lectura(inscripciones)
+
+    desde = iterar_inscripciones(conn, desde="2025-10-16")
+    assert [i["id_inscripcion"] for i in desde] == [1, 3]
+    palestra = iterar_inscripciones(conn, actividad="Palestra")
+    assert [i["id_inscripcion"] for i in palestra] == [2]
+    assert list(iterar_inscripciones(conn, hasta="2025-10-14")) == []
+
+
+def test_reporte_no_puede_escribir(inscripciones):
+    conn = abrir_solo_lectura(inscripciones)
+
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM Inscripcion")
+
+
+def test_exportar_csv_y_ndjson(inscripciones, tmp_path):
+    bd = str(inscripciones)
+    a_csv, a_ndjson = tmp_path / "r.csv", tmp_path / "r.ndjson"
+    main(["--bd", bd, "exportar", str(a_csv), "--desde", "2025-10-16"])
+    main(["--bd", bd, "exportar", str(a_ndjson), "--formato", "ndjson"])
+
+    with open(a_csv, newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    visitantes = [(f["id_inscripcion"], f["nombre"]) for f in filas]
+    assert visitantes == [("1", "Ana"), ("1", "Beto"), ("3", "Dario")]
+    texto = a_ndjson.read_text(encoding="utf-8")
+    lineas = [json.loads(l) for l in texto.splitlines()]
+    assert [l["id_inscripcion"] for l in lineas] == [2, 1, 3]
+
+
+def test_limpiar_borra_inscripciones_y_restaura_cupos(inscripciones):
+    assert limpiar_inscripciones(inscripciones) == 3
+
+    conn = sqlite3.connect(inscripciones)
+    assert conn.execute("SELECT COUNT(*) FROM Inscripcion").fetchone()[0] == 0
+    assert (
+        conn.execute("SELECT COUNT(*) FROM CorreoPendiente").fetchone()[0] == 0
+    )
+    cupos = conn.execute("SELECT cupo_disponible FROM Turno ORDER BY id")
+    assert cupos.fetchall() == [(8,), (12,)]
@@ -0,0 +1,186 @@
+import random
+import threading
+
+import pytest
+
+from back.src.excepciones import ErrorChoqueHorario, ErrorLote, ErrorSinCupo
+from back.src.modelos.inscripcion import Inscripcion
+from back.src.modelos.turno import Turno
+from back.src.modelos.visitante import Visitante
+from back.src.repositorios.inscripcion_repo import InscripcionRepo
+from back.src.repositorios.turno_repo import RepositorioTurno
+
+CAPACIDAD = 10
+ESCRITORES = 120
+
+
+@pytest.fixture
+def turno_id(db_path):
+    repo = RepositorioTurno()
+    repo.ejecutar(
+        "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) VALUES"
+        " (4, '2025-10-15', '14:00', ?)",
+        (CAPACIDAD,),
+    )
+    return repo.ejecutar("SELECT max(id) FROM Turno", fetchone=True)[0]
+
+
+def _inscripcion(turno_id, personas, semilla):
+    turno = Turno(
+        id=turno_id,
+        actividad_nombre="Tirolesa",
+        fecha=None,
+        hora=None,
+        cupo_ocupado=0,
+    )
+    visitantes = [
+        Visitante(nombre="Ana", dni=semilla * 10 + i, edad=30, talle="M")
+        for i in range(personas)
+    ]
+    return Inscripcion(
+        turno=turno,
+        visitantes=visitantes,
+        total_personas=personas,
+        acepta_terminos=True,
+        email_contacto="ana@mail.com",
+    )
+
+
+def test_reservar_sin_cupo_no_guarda_nada(turno_id):
+    repo = InscripcionRepo()
+
+    with pytest.raises(ErrorSinCupo):
+        repo.reservar(_inscripcion(turno_id, CAPACIDAD + 1, 1))
+
+    assert repo.obtener_por_turno(turno_id) == []
+    cupo = repo.ejecutar(
+        "SELECT cupo_disponible FROM Turno WHERE id = ?",
+        (turno_id,),
+        fetchone=True,
+    )[0]
+    assert cupo == CAPACIDAD
+
+
+def test_reservar_lote_es_todo_o_nada(turno_id):
+    repo = InscripcionRepo()
+
+    with pytest.raises(ErrorLote) as error:
+        repo.reservar_lote(
+            [
+                _inscripcion(turno_id, 3, 1),
+                _inscripcion(turno_id, CAPACIDAD, 2),
+                _inscripcion(turno_id, 2, 3),
+            ]
+        )
+
+    errores = [(i, type(e)) for i, e in error.value.errores]
+    assert errores == [(1, ErrorSinCupo)]
+    assert repo.obtener_por_turno(turno_id) == []
+    ids = repo.reservar_lote(
+        [_inscripcion(turno_id, 3, 1), _inscripcion(turno_id, 2, 3)]
+    )
+    assert len(ids) == 2
+    cupo = repo.ejecutar(
+        "SELECT cupo_disponible FROM Turno WHERE id = ?",
+        (turno_id,),
+        fetchone=True,
+    )[0]
+    assert cupo == CAPACIDAD - 5
+
+
+def test_reservas_concurrentes_nunca_dejan_cupo_negativo(turno_id):
+    barrera = threading.Barrier(ESCRITORES)
+    resultados = []
+    lock = threading.Lock()
+
+    def escritor(n):
+        repo = InscripcionRepo()
+        personas = random.Random(n).randint(1, 3)
+        barrera.wait()
+        try:
+            repo.reservar(_inscripcion(turno_id, personas, n))
+            resultado = personas
+        except ErrorSinCupo:
+            resultado = 0
+        with lock:
+            resultados.append(resultado)
+
+    hilos = [
+        threading.Thread(target=escritor, args=(n,)) for n in range(ESCRITORES)
+    ]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    repo = InscripcionRepo()
+    cupo = repo.ejecutar(
+        "SELECT cupo_disponible FROM Turno WHERE id = ?",
+        (turno_id,),
+        fetchone=True,
+    )[0]
+    reservadas = repo.ejecutar(
+        "SELECT COALESCE(SUM(total_personas), 0) FROM Inscripcion "
+        "WHERE turno_id = ?",
+        (turno_id,),
+        fetchone=True,
+    )[0]
+    assert len(resultados) == ESCRITORES
+    assert cupo >= 0
+    assert reservadas == sum(resultados) == CAPACIDAD - cupo
+    assert cupo < 3  # con tantos escritores el turno queda prácticamente lleno
+
+
+def test_mismo_dni_concurrente_en_un_horario_guarda_una_sola_reserva(db_path):
+    repo_turno = RepositorioTurno()
+    # Mismo horario en cuatro actividades distintas
+    for actividad_id in range(1, 5):
+        repo_turno.ejecutar(
+            "INSERT INTO Turno (actividad_id, fecha, hora, cupo_disponible) "
+            "VALUES (?, '2025-10-16', '10:00', 8)",
+            (actividad_id,),
+        )
+    filas = repo_turno.ejecutar("SELECT id FROM Turno", fetchall=True)
+    turnos = [t for (t,) in filas]
+    barrera = threading.Barrier(len(turnos) * 5)
+    resultados = []
+
+    def escritor(turno_id):
+        turno = Turno(
+            id=turno_id,
+            actividad_nombre="Safari",
+            fecha="2025-10-16",
+            hora="10:00",
+            cupo_ocupado=0,
+        )
+        inscripcion = Inscripcion(
+            turno=turno,
+            visitantes=[
+                Visitante(nombre="Ana", dni=30123456, edad=30, talle="M")
+            ],
+            total_personas=1,
+            acepta_terminos=True,
+            email_contacto="ana@mail.com",
+        )
+        barrera.wait()
+        try:
+            InscripcionRepo().reservar(inscripcion)
+            resultados.append(True)
+        except ErrorChoqueHorario:
+            resultados.append(False)
+
+    hilos = [
+        threading.Thread(target=escritor, args=(t,))
+        for t in turnos
+        for _ in range(5)
+    ]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    assert resultados.count(True) == 1
+    (visitantes,) = InscripcionRepo().ejecutar(
+        "SELECT COUNT(*) FROM Visitante", fetchone=True
+    )
+    assert visitantes == 1
@@ -0,0 +1,73 @@
+import gzip
+import json
+
+import pytest
+
+from back.src import serializacion
+from back.src.serializacion import (
+    comprimir,
+    elegir_codificacion,
+    turnos_a_json,
+    turnos_a_ndjson,
+)
+
+FILAS = [
+    (1, 2, "2025-10-15", "10:00", 8),
+    (2, 3, "2025-10-15", "10:30", 0),
+    (3, 4, 'fecha "rara" ñ', "11:00", 12),
+]
+
+
+def _como_dicts(filas):
+    return [
+        {
+            "id": i,
+            "actividad_id": a,
+            "fecha": f,
+            "hora": h,
+            "cupos_disponibles": c,
+        }
+        for i, a, f, h, c in filas
+    ]
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codificador(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serializacion, "orjson", None)
+    return request.param
+
+
+def test_turnos_a_json_igual_que_json_dumps(codificador):
+    esperado = json.dumps(
+        _como_dicts(FILAS), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+    assert turnos_a_json(FILAS) == esperado
+    assert turnos_a_json([]) == b"[]"
+
+
+def test_turnos_a_ndjson_una_linea_por_turno(codificador):
+    lineas = turnos_a_ndjson(FILAS).decode("utf-8").splitlines()
+
+    assert [json.loads(linea) for linea in lineas] == _como_dicts(FILAS)
+    assert turnos_a_ndjson([]) == b""
+
+
+def test_elegir_codificacion_respeta_q(monkeypatch):
+    monkeypatch.setattr(serializacion, "brotli", None)
+
+    assert elegir_codificacion("gzip, deflate") == "gzip"
+    assert elegir_codificacion("br;q=1, gzip;q=0") is None
+    assert elegir_codificacion("identity") is None
+    assert elegir_codificacion("*") == "gzip"
+    assert elegir_codificacion(None) is None
+
+
+def test_gzip_es_determinista():
+    cuerpo = turnos_a_json(FILAS * 100)
+
+    assert comprimir(cuerpo, "gzip") == comprimir(cuerpo, "gzip")
+    assert gzip.decompress(comprimir(cuerpo, "gzip")) == cuerpo
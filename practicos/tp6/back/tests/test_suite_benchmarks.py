@@ -0,0 +1,56 @@
+import json
+from datetime import date
+
+from back.benchmarks.suite import (
+    comparar_resultados,
+    fecha_reservable,
+    main,
+    resumir,
+)
+
+
+def _resultados(**medianas):
+    return {
+        "meta": {"rapida": True},
+        "resultados": {
+            caso: {"mediana_us": m} for caso, m in medianas.items()
+        },
+    }
+
+
+def test_comparar_marca_regresiones_mejoras_y_casos_sueltos():
+    base = _resultados(a=100.0, b=100.0, c=100.0, viejo=10.0)
+    nuevo = _resultados(a=130.0, b=70.0, c=110.0, agregado=5.0)
+
+    filas = comparar_resultados(base, nuevo, tolerancia=0.2)
+    estados = {fila[0]: fila[4] for fila in filas}
+
+    assert estados == {
+        "a": "regresión",
+        "b": "mejora",
+        "c": "igual",
+        "viejo": "ausente",
+        "agregado": "nuevo",
+    }
+
+
+def test_comando_comparar_sale_con_error_si_hay_regresiones(tmp_path):
+    base, nuevo = tmp_path / "base.json", tmp_path / "nuevo.json"
+    base.write_text(json.dumps(_resultados(a=100.0)))
+    nuevo.write_text(json.dumps(_resultados(a=100.0)))
+    assert main(["comparar", str(nuevo), "--base", str(base)]) == 0
+
+    nuevo.write_text(json.dumps(_resultados(a=150.0)))
+    assert main(["comparar", str(nuevo), "--base", str(base)]) == 1
+
+
+def test_resumir_en_microsegundos():
+    r = resumir([0.001, 0.002, 0.003])
+    assert r["mediana_us"] == 2000.0
+    assert r["repeticiones"] == 3
+
+
+def test_fecha_reservable_evita_lunes_y_feriados():
+    # Domingo -> martes
+    assert fecha_reservable(date(2025, 10, 12)) == date(2025, 10, 14)
+    assert fecha_reservable(date(2025, 12, 30)) == date(2025, 12, 30)
@@ -24,6 +24,8 @@ async function apiGetActividades() {
   return res.json();
 }
 
+const API_TURNOS_STREAM = "http://127.0.0.1:8000/api/turnos/stream";
+
 async function apiGetTurnos(fechaISO) {
   const url = `http://127.0.0.1:8000/api/turnos?fecha=${fechaISO}`;
   const res = await fetch(url);
@@ -207,19 +209,24 @@ export default function App() {
     fetchData();
   }, []);
 
-  // Actualizar turnos cuando cambia la fecha seleccionada
+  // Turnos de la fecha seleccionada en vivo (SSE): snapshot inicial y luego
+  // solo los cambios de cupo. Sin EventSource se cae a un GET común.
   React.useEffect(() => {
-    async function fetchTurnosFecha() {
-      try {
-        if (!fechaISO) return;
-        const t = await apiGetTurnos(fechaISO);
-        setTurnos(t);
-        console.log("Turnos cargados para fecha", fechaISO, t);
-      } catch (e) {
-        console.error("Error obteniendo turnos para fecha", fechaISO, e);
-      }
+    if (!fechaISO) return;
+    if (typeof EventSource === "undefined") {
+      apiGetTurnos(fechaISO)
+        .then(setTurnos)
+        .catch(e => console.error("Error obteniendo turnos para fecha", fechaISO, e));
+      return;
     }
-    fetchTurnosFecha();
+    const fuente = new EventSource(`${API_TURNOS_STREAM}?fecha=${fechaISO}`);
+    fuente.addEventListener("snapshot", ev => setTurnos(JSON.parse(ev.data)));
+    fuente.addEventListener("cupo", ev => {
+      const { id, cupos_disponibles } = JSON.parse(ev.data);
+      setTurnos(prev => prev.map(t => (t.id === id ? { ...t, cupos_disponibles } : t)));
+    });
+    fuente.onerror = () => console.error("Se cortó el stream de turnos para", fechaISO);
+    return () => fuente.close();
   }, [fechaISO]);
 
 
@@ -819,16 +826,26 @@ function Step2({ actividad, fechaISO, hora, participantes, setParticipantes, act
   const [nameWarns, setNameWarns] = React.useState({}); // {index: message}
   const [ageWarns, setAgeWarns] = React.useState({});
 
-  async function validarDNIHorario(i, dniValor) {
+  // Valida todos los DNI del grupo contra el horario en una sola petición
+  async function validarDNIsHorario() {
     try {
-      const dniNum = String(dniValor || "").replace(/\D/g, "");
-      if (!dniNum || !/^\d{6,10}$/.test(dniNum) || !fechaISO || !hora) return;
-      const url = `http://127.0.0.1:8000/api/validar-dni?dni=${dniNum}&fecha=${encodeURIComponent(fechaISO)}&hora=${encodeURIComponent(hora)}`;
-      const res = await fetch(url);
+      if (!fechaISO || !hora) return;
+      const dnis = participantes.map(p => String(p.dni || "").replace(/\D/g, ""));
+      const validos = dnis.filter(d => /^\d{6,10}$/.test(d)).map(Number);
+      if (!validos.length) return;
+      const res = await fetch("http://127.0.0.1:8000/api/validar-dnis", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ fecha: fechaISO, hora, dnis: validos }),
+      });
       if (!res.ok) return;
       const json = await res.json();
-      setDniWarns(prev => {
-        const nextWarn = { ...prev, [i]: json.existe ? "Este DNI ya está inscripto en ese horario." : "" };
+      const choques = new Set(json.choques);
+      setDniWarns(() => {
+        const nextWarn = {};
+        dnis.forEach((d, i) => {
+          nextWarn[i] = d && choques.has(Number(d)) ? "Este DNI ya está inscripto en ese horario." : "";
+        });
         const hasConflict = Object.values(nextWarn).some(Boolean);
         const hasFormat = Object.values(dniFormatWarns).some(Boolean);
         setTimeout(() => setDniConflicts(hasConflict || hasFormat), 0);
@@ -888,7 +905,7 @@ function Step2({ actividad, fechaISO, hora, participantes, setParticipantes, act
                 <input
                   value={p.dni}
                   onChange={(e) => update(i, "dni", e.target.value)}
-                  onBlur={(e) => validarDNIHorario(i, e.target.value)}
+                  onBlur={() => validarDNIsHorario()}
                   placeholder="Solo números"
                   inputMode="numeric"
                   pattern="[0-9]*"